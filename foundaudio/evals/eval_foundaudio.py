@@ -10,7 +10,10 @@ from arcade_evals import (
 from arcade_tdk import ToolCatalog
 
 import foundaudio
+from foundaudio.tools.get_audio_files_by_id import get_audio_files_by_id
 from foundaudio.tools.get_audio_list import get_audio_list
+from foundaudio.tools.get_similar_audio import get_similar_audio
+from foundaudio.tools.get_user_libraries import get_user_libraries
 
 # Evaluation rubric with appropriate thresholds for audio search tool
 rubric = EvalRubric(
@@ -36,7 +39,8 @@ def foundaudio_eval_suite() -> EvalSuite:
         system_message=(
             "You are an AI assistant with access to foundaudio tools. "
             "You can search for audio files using various filters including "
-            "search terms, genres, limits, and usernames. Use the "
+            "search terms, genres, limits, usernames, duration ranges (in seconds) "
+            "and upload date ranges. Use the "
             "get_audio_list tool to help users find audio content."
         ),
         catalog=catalog,
@@ -265,11 +269,97 @@ def foundaudio_eval_suite() -> EvalSuite:
         expected_tool_calls=[
             ExpectedToolCall(
                 func=get_audio_list,
-                args={},  # Duration filtering not implemented, should return all
+                args={"max_duration": 120},
             )
         ],
         critics=[
-            # No specific critics since duration filtering isn't implemented
+            NumericCritic(
+                critic_field="max_duration",
+                weight=1.0,
+                value_range=(0, 600),
+                match_threshold=0.9,
+            ),
+        ],
+    )
+
+    suite.add_case(
+        name="Audio Search with Duration and Date Range",
+        user_message="Find house mixes over an hour long uploaded since January 1st 2025",
+        expected_tool_calls=[
+            ExpectedToolCall(
+                func=get_audio_list,
+                args={
+                    "genre": "house",
+                    "min_duration": 3600,
+                    "created_after": "2025-01-01",
+                },
+            )
+        ],
+        critics=[
+            SimilarityCritic(critic_field="genre", weight=0.3),
+            NumericCritic(
+                critic_field="min_duration",
+                weight=0.35,
+                value_range=(0, 14400),
+                match_threshold=0.9,
+            ),
+            SimilarityCritic(critic_field="created_after", weight=0.35),
+        ],
+    )
+
+    suite.add_case(
+        name="Audio Search Sorted by Duration",
+        user_message="What are the 5 longest tracks?",
+        expected_tool_calls=[
+            ExpectedToolCall(
+                func=get_audio_list,
+                args={"sort": "duration desc", "limit": 5},
+            )
+        ],
+        critics=[
+            SimilarityCritic(critic_field="sort", weight=0.5),
+            NumericCritic(
+                critic_field="limit",
+                weight=0.5,
+                value_range=(1, 100),
+                match_threshold=1.0,
+            ),
+        ],
+    )
+
+    suite.add_case(
+        name="Best Title Match First",
+        user_message="Is there a track called Pool Party? Just show me the best match",
+        expected_tool_calls=[
+            ExpectedToolCall(
+                func=get_audio_list,
+                args={"search": "Pool Party", "search_mode": "relevance", "limit": 1},
+            )
+        ],
+        critics=[
+            SimilarityCritic(critic_field="search", weight=0.4),
+            BinaryCritic(critic_field="search_mode", weight=0.4),
+            NumericCritic(
+                critic_field="limit",
+                weight=0.2,
+                value_range=(1, 100),
+                match_threshold=0.8,
+            ),
+        ],
+    )
+
+    suite.add_case(
+        name="Semantic Audio Search",
+        user_message="Find me something that sounds high energy, even if it isn't described with those exact words",
+        expected_tool_calls=[
+            ExpectedToolCall(
+                func=get_audio_list,
+                args={"search": "high energy", "search_mode": "semantic"},
+            )
+        ],
+        critics=[
+            SimilarityCritic(critic_field="search", weight=0.5),
+            BinaryCritic(critic_field="search_mode", weight=0.5),
         ],
     )
 
@@ -441,6 +531,86 @@ def foundaudio_eval_suite() -> EvalSuite:
         ],
     )
 
+    # =============================================================================
+    # GET_AUDIO_FILES_BY_ID TOOL EVALUATIONS
+    # =============================================================================
+
+    suite.add_case(
+        name="Audio Details for Previously Listed Tracks",
+        user_message="Tell me more about the first two tracks you found",
+        expected_tool_calls=[
+            ExpectedToolCall(
+                func=get_audio_files_by_id,
+                args={"ids": ["a1b2c3", "d4e5f6"]},
+            )
+        ],
+        critics=[
+            BinaryCritic(critic_field="ids", weight=1.0),
+        ],
+        additional_messages=[
+            {"role": "user", "content": "Show me some house tracks"},
+            {
+                "role": "assistant",
+                "content": (
+                    "I found these house tracks:\n"
+                    "1. Pool Party (id: a1b2c3)\n"
+                    "2. Sunset Groove (id: d4e5f6)\n"
+                    "3. Deep Warehouse (id: g7h8i9)"
+                ),
+            },
+        ],
+    )
+
+    suite.add_case(
+        name="Similar Tracks to a Previously Listed Track",
+        user_message="Find me a few more tracks like Sunset Groove",
+        expected_tool_calls=[
+            ExpectedToolCall(
+                func=get_similar_audio,
+                args={"audio_id": "d4e5f6", "limit": 5},
+            )
+        ],
+        critics=[
+            BinaryCritic(critic_field="audio_id", weight=0.8),
+            NumericCritic(
+                critic_field="limit",
+                weight=0.2,
+                value_range=(1, 50),
+                match_threshold=0.8,
+            ),
+        ],
+        additional_messages=[
+            {"role": "user", "content": "Show me some house tracks"},
+            {
+                "role": "assistant",
+                "content": (
+                    "I found these house tracks:\n"
+                    "1. Pool Party (id: a1b2c3)\n"
+                    "2. Sunset Groove (id: d4e5f6)\n"
+                    "3. Deep Warehouse (id: g7h8i9)"
+                ),
+            },
+        ],
+    )
+
+    # =============================================================================
+    # GET_USER_LIBRARIES TOOL EVALUATIONS
+    # =============================================================================
+
+    suite.add_case(
+        name="Compare Several Artists' Uploads",
+        user_message="Compare what discodude, houseproducer and djsample have uploaded",
+        expected_tool_calls=[
+            ExpectedToolCall(
+                func=get_user_libraries,
+                args={"usernames": ["discodude", "houseproducer", "djsample"]},
+            )
+        ],
+        critics=[
+            BinaryCritic(critic_field="usernames", weight=1.0),
+        ],
+    )
+
     # =============================================================================
     # GET_AUDIO_LIST TOOL EVALUATIONS - USERNAME ERROR SCENARIOS
     # =============================================================================
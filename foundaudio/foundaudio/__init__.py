@@ -1,4 +1,25 @@
+from foundaudio.tools.get_audio_files_by_id import get_audio_files_by_id
 from foundaudio.tools.get_audio_list import get_audio_list
+from foundaudio.tools.get_similar_audio import get_similar_audio
+from foundaudio.tools.get_user_libraries import get_user_libraries
 from foundaudio.tools.hello import say_hello
 
-__all__ = ["say_hello", "get_audio_list"]
+__all__ = [
+    "say_hello",
+    "get_audio_list",
+    "get_audio_files_by_id",
+    "get_similar_audio",
+    "get_user_libraries",
+]
+
+# Prime the pooled client and caches in the background as soon as a worker loads the
+# toolkit through its arcade_toolkits entry point (see foundaudio.warmup), keep the
+# latest listings materialized (see foundaudio.materialized), and serve Prometheus
+# metrics when FOUNDAUDIO_METRICS_PORT is set
+from foundaudio.materialized import start_view_refresh  # noqa: E402
+from foundaudio.metrics import start_metrics_server_from_env  # noqa: E402
+from foundaudio.warmup import start_warm_up  # noqa: E402
+
+start_metrics_server_from_env()
+start_warm_up()
+start_view_refresh()
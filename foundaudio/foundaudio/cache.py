@@ -0,0 +1,226 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from foundaudio.models import AudioRecord
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Set to a redis:// URL to share the record, username and listing caches between worker
+# replicas; unset (the default) keeps every cache in process memory
+CACHE_URL = os.getenv("FOUNDAUDIO_CACHE_URL")
+
+
+class CacheBackend(ABC, Generic[K, V]):
+    """The interface shared by the toolkit's cache implementations.
+
+    Backends count their own hits and misses for the metrics endpoint. Values are
+    returned as stored (the in-memory backend may store a compact equivalent, see
+    `LRUCache`); callers copy them before mutating.
+    """
+
+    hits: int
+    misses: int
+
+    @abstractmethod
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value for a key, or None if it is missing or expired."""
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """Return the cached values for every key that is present and fresh."""
+
+    def put(self, key: K, value: V) -> None:
+        """Store one value."""
+        self.put_many([(key, value)])
+
+    @abstractmethod
+    def put_many(self, items: Iterable[Tuple[K, V]]) -> None:
+        """Store several values at once."""
+
+    @abstractmethod
+    def delete(self, key: K) -> None:
+        """Remove a key if it is cached."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry and reset the hit/miss counters."""
+
+
+class LRUCache(CacheBackend[K, V]):
+    """A thread-safe least-recently-used cache with an optional time-to-live.
+
+    Tool calls can run concurrently inside a worker, so every operation takes a lock.
+    Entries older than `ttl` seconds are treated as missing and dropped on access.
+
+    Entries live as long as the worker, so `compact` can convert each value to an
+    equivalent that takes less memory (e.g. audio file dictionaries to `AudioRecord`s)
+    when it is stored; `get` then returns the compact value.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        compact: Optional[Callable[[V], V]] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.compact = compact
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value for a key, or None if it is missing or expired."""
+        with self._lock:
+            return self._get(key, time.monotonic())
+
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """Return the cached values for every key that is present and fresh."""
+        found = {}
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                value = self._get(key, now)
+                if value is not None:
+                    found[key] = value
+        return found
+
+    def put_many(self, items: Iterable[Tuple[K, V]]) -> None:
+        """Store several values under one lock acquisition, evicting the least recently
+        used entries when full."""
+        with self._lock:
+            now = time.monotonic()
+            for key, value in items:
+                if self.compact is not None:
+                    value = self.compact(value)
+                self._entries[key] = (now, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        """Remove a key if it is cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def keys(self) -> List[K]:
+        """Return the cached keys from least to most recently used."""
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: K, now: float) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None or (self.ttl is not None and now - entry[0] > self.ttl):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+
+def make_cache(
+    name: str,
+    maxsize: int,
+    ttl: Optional[float],
+    compact: Optional[Callable[[Any], Any]] = None,
+) -> CacheBackend:
+    """Build one of the toolkit caches on the backend selected by FOUNDAUDIO_CACHE_URL.
+
+    Args:
+        name: Namespace of the cache's keys in a shared backend
+        maxsize: Entry limit of the in-memory backend (a shared backend evicts by its
+            own memory policy)
+        ttl: Seconds an entry stays fresh
+        compact: Conversion the in-memory backend applies to stored values (a shared
+            backend stores them serialized)
+    """
+    if CACHE_URL:
+        # Imported here because the Redis backend builds on this module
+        from foundaudio.redis_cache import RedisCache
+
+        return RedisCache(CACHE_URL, namespace=name, ttl=ttl)
+    return LRUCache(maxsize=maxsize, ttl=ttl, compact=compact)
+
+
+def _compact_record(audio_file: Any) -> Any:
+    """Store an audio file as an `AudioRecord`, and anything else (a partial row) as is."""
+    try:
+        return AudioRecord.from_dict(audio_file)
+    except (KeyError, TypeError, AttributeError):
+        return audio_file
+
+
+def _compact_page(page: Any) -> Any:
+    """Store a cached listing page's rows as `AudioRecord`s."""
+    if not isinstance(page, dict) or "rows" not in page:
+        return page
+    return {**page, "rows": [_compact_record(row) for row in page["rows"]]}
+
+
+# Per-id cache of validated audio files, held in memory as AudioRecords. Every
+# get_audio_list response populates it so follow-up detail lookups
+# (get_audio_files_by_id) rarely need the network.
+audio_file_cache: CacheBackend[str, Mapping[str, Any]] = make_cache(
+    "record",
+    maxsize=int(os.getenv("FOUNDAUDIO_RECORD_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("FOUNDAUDIO_RECORD_CACHE_TTL", "900")),
+    compact=_compact_record,
+)
+
+# Username -> profile id. Usernames rarely change owner, so entries live for an hour and
+# repeat calls for the same user skip the profiles lookup entirely.
+username_cache: CacheBackend[str, str] = make_cache(
+    "username",
+    maxsize=int(os.getenv("FOUNDAUDIO_USERNAME_CACHE_SIZE", "1000")),
+    ttl=float(os.getenv("FOUNDAUDIO_USERNAME_CACHE_TTL", "3600")),
+)
+
+# Seconds a cached get_audio_list page is served without asking the database. The TTL is
+# short because new uploads should show up quickly; it mainly absorbs bursts of identical
+# calls. After it, the page is revalidated with a cheap probe (see fetch_listing).
+LISTING_CACHE_TTL = float(os.getenv("FOUNDAUDIO_LISTING_CACHE_TTL", "60"))
+
+# Seconds a page is kept for revalidation; older pages are always fetched again
+LISTING_CACHE_MAX_AGE = float(os.getenv("FOUNDAUDIO_LISTING_CACHE_MAX_AGE", "3600"))
+
+# Full get_audio_list pages keyed by the normalized query, each stored with the change
+# validator of its filter scope and when that was last checked
+listing_cache: CacheBackend[Tuple[Any, ...], Dict[str, Any]] = make_cache(
+    "listing",
+    maxsize=int(os.getenv("FOUNDAUDIO_LISTING_CACHE_SIZE", "256")),
+    ttl=max(LISTING_CACHE_TTL, LISTING_CACHE_MAX_AGE),
+    compact=_compact_page,
+)
@@ -0,0 +1,228 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from foundaudio.models import AUDIO_FILE_FIELDS, AudioRecord, audio_file_from_row
+from foundaudio.queries import keyset_condition
+from foundaudio.snapshot import CatalogSnapshot, SnapshotError, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+Record = AudioRecord
+CatalogListener = Callable[[List[Record]], None]
+
+# How long a local catalog copy may be used before it is incrementally refreshed
+CATALOG_MAX_AGE = float(os.getenv("FOUNDAUDIO_CATALOG_MAX_AGE", "300"))
+
+# Snapshot file the catalog is restored from and saved to; unset (the default) turns
+# snapshots off. Point it at local disk that outlives the worker process.
+CATALOG_SNAPSHOT_PATH = os.getenv("FOUNDAUDIO_CATALOG_SNAPSHOT")
+
+# Older snapshots are not restored: deleted rows are only dropped by a full reload
+CATALOG_SNAPSHOT_MAX_AGE = float(os.getenv("FOUNDAUDIO_CATALOG_SNAPSHOT_MAX_AGE", "86400"))
+
+# Rows a refresh must change before the snapshot is rewritten (a full load always is)
+SNAPSHOT_REWRITE_ROWS = int(os.getenv("FOUNDAUDIO_CATALOG_SNAPSHOT_REWRITE_ROWS", "1000"))
+
+
+class Catalog:
+    """An in-process copy of the audio_files table, kept current by `updated_at`.
+
+    The first refresh pages through the whole table; later refreshes only fetch rows
+    whose (updated_at, id) sorts after the newest row already seen, so keeping the copy
+    current costs a single small query when nothing changed. Local indexes (similarity,
+    search) subscribe to receive every batch of new or changed records. Records are
+    kept as compact `AudioRecord`s; copy them with `dict(record)` before returning them.
+
+    With a snapshot path, the first refresh restores the copy from the snapshot file and
+    only fetches what changed since it was written; the file is rewritten in the
+    background after a full load or a refresh that changed many rows.
+
+    Deleted rows are not detected incrementally; call `clear()` to force a full reload.
+    """
+
+    def __init__(
+        self, page_size: int = 1000, snapshot_path: Optional[str] = CATALOG_SNAPSHOT_PATH
+    ):
+        self.page_size = page_size
+        self.snapshot_path = snapshot_path
+        self._records: Dict[str, Record] = {}
+        self._watermark: Optional[Tuple[str, str]] = None
+        self._refreshed_at: Optional[float] = None
+        self._listeners: List[CatalogListener] = []
+        self._reset_hooks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        # Serializes refreshes so concurrent tool calls don't fetch the same pages twice
+        self._refresh_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        # The background snapshot write started by the latest refresh, if any
+        self.snapshot_writer: Optional[threading.Thread] = None
+
+    def subscribe(
+        self, listener: CatalogListener, reset: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Register a callback that receives every batch of new or updated records.
+
+        Args:
+            listener: Called with each batch of new or updated records
+            reset: Optional callback invoked when the catalog is cleared
+        """
+        self._listeners.append(listener)
+        if reset is not None:
+            self._reset_hooks.append(reset)
+
+    def get(self, audio_id: str) -> Optional[Record]:
+        """Return the record for an id, or None if it is not in the local copy."""
+        return self._records.get(audio_id)
+
+    def records(self) -> List[Record]:
+        """Return every record in the local copy."""
+        with self._lock:
+            return list(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful refresh, or None if never loaded."""
+        if self._refreshed_at is None:
+            return None
+        return time.monotonic() - self._refreshed_at
+
+    def apply(self, records: Sequence[Mapping[str, Any]]) -> None:
+        """Insert or replace records and notify subscribers with their compact form."""
+        if not records:
+            return
+        compact = [AudioRecord.from_dict(record) for record in records]
+        with self._lock:
+            for record in compact:
+                self._records[record.id] = record
+                key = (record.updated_at, record.id)
+                if self._watermark is None or key > self._watermark:
+                    self._watermark = key
+        for listener in self._listeners:
+            listener(compact)
+
+    def refresh(self, client: Any) -> int:
+        """Fetch every row changed since the last refresh.
+
+        Args:
+            client: A Supabase client
+
+        Returns:
+            The number of new or updated records applied
+        """
+        with self._refresh_lock:
+            full_load = self._watermark is None
+            if full_load and self.snapshot_path:
+                full_load = self._restore(self.snapshot_path) == 0
+            applied = 0
+            while True:
+                query = client.from_("audio_files").select(AUDIO_FILE_FIELDS)
+                if self._watermark is not None:
+                    query = query.or_(
+                        keyset_condition("updated_at", False, *self._watermark)
+                    )
+                response = (
+                    query.order("updated_at").order("id").limit(self.page_size).execute()
+                )
+                rows = response.data or []
+                self.apply([audio_file_from_row(item) for item in rows])
+                applied += len(rows)
+                if len(rows) < self.page_size:
+                    break
+            self._refreshed_at = time.monotonic()
+            if self.snapshot_path and (full_load or applied >= SNAPSHOT_REWRITE_ROWS):
+                self.snapshot_writer = threading.Thread(
+                    target=self._save_quietly,
+                    args=(self.snapshot_path,),
+                    name="foundaudio-catalog-snapshot",
+                    daemon=True,
+                )
+                self.snapshot_writer.start()
+            return applied
+
+    def ensure_fresh(self, client: Any, max_age: float = CATALOG_MAX_AGE) -> None:
+        """Refresh the local copy if it was never loaded or is older than `max_age` seconds."""
+        age = self.age
+        if age is None or age > max_age:
+            self.refresh(client)
+
+    def load_snapshot(self, path: str, max_age: Optional[float] = None) -> int:
+        """Replace the local copy with the records of a snapshot file.
+
+        The copy's watermark becomes the snapshot's, so the next refresh only fetches
+        rows changed since it was written. The copy still counts as never refreshed
+        until then, so no listing is answered from it before it has caught up.
+
+        Restoring is still O(n) in Python: every row is decoded into a record and
+        handed to the listeners. The search and similarity indexes only queue what they
+        are given, so tokenizing titles and building feature rows waits for the first
+        semantic search or `get_similar_audio` call.
+
+        Args:
+            path: Snapshot file written by `save_snapshot`
+            max_age: Leave the copy alone if the snapshot was written longer ago than
+                this many seconds
+
+        Returns:
+            The number of records restored (0 if the snapshot was too old)
+
+        Raises:
+            SnapshotError: If the file is not a readable catalog snapshot
+            OSError: If the file cannot be opened
+        """
+        with CatalogSnapshot(path) as snapshot:
+            if max_age is not None and time.time() - snapshot.created_at > max_age:
+                return 0
+            records = snapshot.records()
+            watermark = snapshot.watermark
+        self.clear()
+        self.apply(records)
+        with self._lock:
+            self._watermark = watermark
+        return len(records)
+
+    def save_snapshot(self, path: str) -> int:
+        """Write the local copy to a snapshot file, replacing it atomically.
+
+        Returns:
+            The size of the snapshot in bytes
+        """
+        with self._lock:
+            records = list(self._records.values())
+            watermark = self._watermark
+        with self._snapshot_lock:
+            return write_snapshot(path, records, watermark)
+
+    def _restore(self, path: str) -> int:
+        """Load the snapshot at `path` if it exists and is recent; 0 if not restored."""
+        try:
+            return self.load_snapshot(path, CATALOG_SNAPSHOT_MAX_AGE)
+        except (OSError, SnapshotError):
+            # A missing, unreadable or outdated snapshot just means a full load
+            return 0
+
+    def _save_quietly(self, path: str) -> None:
+        try:
+            self.save_snapshot(path)
+        except (OSError, ValueError) as e:
+            # The snapshot only speeds up the next start, so the refresh carries on; a record
+            # that cannot be stored keeps failing until it changes, so say which one
+            logger.warning("Could not write the catalog snapshot %s: %s", path, e)
+
+    def clear(self) -> None:
+        """Drop the local copy so the next refresh reloads the whole table."""
+        with self._lock:
+            self._records.clear()
+            self._watermark = None
+            self._refreshed_at = None
+        for reset in self._reset_hooks:
+            reset()
+
+
+# Shared catalog copy used by the local indexes in this worker process
+catalog = Catalog()
@@ -0,0 +1,49 @@
+import os
+import threading
+from typing import Dict, Tuple
+
+from supabase import Client, ClientOptions, create_client
+
+from foundaudio.compression import negotiate_compression
+from foundaudio.metrics import instrument_client
+from foundaudio.ratelimit import limit_client
+from foundaudio.retries import hardened_session
+
+DEFAULT_SUPABASE_URL = "https://msocrbprgpaqvrtrcqpo.supabase.co"
+
+_clients: Dict[Tuple[str, str], Client] = {}
+_lock = threading.Lock()
+
+
+def supabase_url() -> str:
+    """Return the Supabase project URL, overridable with the SUPABASE_URL environment variable."""
+    return os.getenv("SUPABASE_URL", DEFAULT_SUPABASE_URL)
+
+
+def get_client(url: str, key: str) -> Client:
+    """Return a shared Supabase client for a project URL and API key.
+
+    Creating a client builds an HTTP session, and the first request on it pays for DNS
+    and the TLS handshake. Reusing one client per (url, key) keeps the connection pool
+    warm across tool calls; the underlying httpx client is safe to share between threads.
+    Every request on a pooled client passes the shared rate limiter in
+    foundaudio.ratelimit first, asks for a compressed response (see
+    foundaudio.compression) and is retried on transient failures within a deadline
+    (see foundaudio.retries).
+    """
+    with _lock:
+        client = _clients.get((url, key))
+        if client is None:
+            options = ClientOptions(httpx_client=hardened_session())
+            client = create_client(url, key, options=options)
+            negotiate_compression(client)
+            instrument_client(client)
+            limit_client(client)
+            _clients[(url, key)] = client
+        return client
+
+
+def clear_clients() -> None:
+    """Drop every pooled client so the next call creates a fresh one."""
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,167 @@
+import struct
+from typing import Any, Dict, List, Tuple
+
+# Leading byte of every payload, bumped whenever the encoding changes so replicas
+# running different versions treat each other's entries as misses instead of garbage
+FORMAT_VERSION = 1
+
+# Type tags
+_NONE = 0x00
+_FALSE = 0x01
+_TRUE = 0x02
+_INT = 0x03
+_FLOAT = 0x04
+_STR = 0x05
+_BYTES = 0x06
+_LIST = 0x07
+_TUPLE = 0x08
+_DICT = 0x09
+_STR_REF = 0x0A
+
+_DOUBLE = struct.Struct("<d")
+
+
+class CodecError(ValueError):
+    """Raised when a payload cannot be encoded or decoded."""
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a JSON-like value (plus tuples and bytes) as compact binary.
+
+    Integers and lengths are varints, and every string after its first occurrence is
+    written as a back-reference, so the field names and genres repeated across a page
+    of audio files cost one or two bytes each.
+    """
+    out = bytearray([FORMAT_VERSION])
+    _encode(value, out, {})
+    return bytes(out)
+
+
+def loads(data: bytes) -> Any:
+    """Decode a payload produced by `dumps`.
+
+    Raises:
+        CodecError: If the payload is truncated, malformed or from another format version
+    """
+    if not data or data[0] != FORMAT_VERSION:
+        raise CodecError("Unsupported cache payload version")
+    try:
+        value, position = _decode(memoryview(data), 1, [])
+    except (IndexError, TypeError, UnicodeDecodeError, struct.error) as e:
+        raise CodecError(f"Malformed cache payload: {e}") from e
+    if position != len(data):
+        raise CodecError("Trailing bytes in cache payload")
+    return value
+
+
+def _write_varint(number: int, out: bytearray) -> None:
+    while number > 0x7F:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _read_varint(data: memoryview, position: int) -> Tuple[int, int]:
+    number = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
+
+
+def _encode(value: Any, out: bytearray, strings: Dict[str, int]) -> None:
+    # bool is checked before int because it is a subclass of it
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        # Zigzag so small negative numbers stay small
+        _write_varint(value * 2 if value >= 0 else -value * 2 - 1, out)
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        index = strings.get(value)
+        if index is not None:
+            out.append(_STR_REF)
+            _write_varint(index, out)
+            return
+        strings[value] = len(strings)
+        encoded = value.encode("utf-8")
+        out.append(_STR)
+        _write_varint(len(encoded), out)
+        out += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(_BYTES)
+        _write_varint(len(value), out)
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out.append(_TUPLE if isinstance(value, tuple) else _LIST)
+        _write_varint(len(value), out)
+        for item in value:
+            _encode(item, out, strings)
+    elif isinstance(value, dict):
+        out.append(_DICT)
+        _write_varint(len(value), out)
+        for key, item in value.items():
+            _encode(key, out, strings)
+            _encode(item, out, strings)
+    else:
+        raise CodecError(f"Cannot encode values of type {type(value).__name__}")
+
+
+def _decode(data: memoryview, position: int, strings: List[str]) -> Tuple[Any, int]:
+    tag = data[position]
+    position += 1
+    if tag == _NONE:
+        return None, position
+    if tag == _TRUE:
+        return True, position
+    if tag == _FALSE:
+        return False, position
+    if tag == _INT:
+        number, position = _read_varint(data, position)
+        return (number >> 1) ^ -(number & 1), position
+    if tag == _FLOAT:
+        end = position + _DOUBLE.size
+        return _DOUBLE.unpack(data[position:end])[0], end
+    if tag == _STR:
+        length, position = _read_varint(data, position)
+        end = position + length
+        if end > len(data):
+            raise IndexError("string runs past the end of the payload")
+        text = str(data[position:end], "utf-8")
+        strings.append(text)
+        return text, end
+    if tag == _STR_REF:
+        index, position = _read_varint(data, position)
+        return strings[index], position
+    if tag == _BYTES:
+        length, position = _read_varint(data, position)
+        end = position + length
+        if end > len(data):
+            raise IndexError("bytes run past the end of the payload")
+        return bytes(data[position:end]), end
+    if tag in (_LIST, _TUPLE):
+        count, position = _read_varint(data, position)
+        items = []
+        for _ in range(count):
+            item, position = _decode(data, position, strings)
+            items.append(item)
+        return (tuple(items) if tag == _TUPLE else items), position
+    if tag == _DICT:
+        count, position = _read_varint(data, position)
+        mapping = {}
+        for _ in range(count):
+            key, position = _decode(data, position, strings)
+            mapping[key], position = _decode(data, position, strings)
+        return mapping, position
+    raise CodecError(f"Unknown type tag {tag:#x}")
@@ -0,0 +1,91 @@
+import gzip
+import importlib
+import os
+from typing import Any, Optional
+
+import httpx
+
+
+def _load_brotli() -> Any:
+    """Return the brotli module httpx would use to decode 'br', or None if neither is installed."""
+    for name in ("brotli", "brotlicffi"):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+brotli = _load_brotli()
+
+# httpx only decodes brotli responses when one of these packages is installed, so it is
+# only advertised then; install `brotli` to let the server pick it
+BROTLI_AVAILABLE = brotli is not None
+
+# Accept-Encoding sent on every Supabase request; "identity" turns compression off
+ACCEPT_ENCODING = os.getenv(
+    "FOUNDAUDIO_ACCEPT_ENCODING", "br, gzip" if BROTLI_AVAILABLE else "gzip"
+)
+
+# Encodings the toolkit can decode, best first
+SUPPORTED_ENCODINGS = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+# gzip level 6 and brotli quality 5 are what common gateways use for dynamic responses
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def negotiate_compression(client: Any, accept_encoding: Optional[str] = None) -> None:
+    """Ask PostgREST for compressed responses on a Supabase client's session.
+
+    httpx decodes the response transparently, so callers see the same JSON; only the
+    bytes on the wire shrink.
+    """
+    try:
+        session = client.postgrest.session
+    except AttributeError:
+        return
+    if isinstance(session, httpx.Client):
+        session.headers["Accept-Encoding"] = accept_encoding or ACCEPT_ENCODING
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Pick the best encoding both sides support from an Accept-Encoding header."""
+    offered = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip().lower()] = quality
+    for encoding in SUPPORTED_ENCODINGS:
+        if offered.get(encoding, 0.0) > 0:
+            return encoding
+    return "identity"
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Encode a response body with 'br', 'gzip' or 'identity'."""
+    if encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        compressed: bytes = brotli.compress(body, quality=BROTLI_QUALITY)
+        return compressed
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    """Decode a body produced by `compress`."""
+    if encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        decompressed: bytes = brotli.decompress(body)
+        return decompressed
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    return body
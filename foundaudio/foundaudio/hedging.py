@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+from foundaudio.metrics import registry
+
+# Hedging is off by default; set FOUNDAUDIO_HEDGING=1 to turn it on
+HEDGING_ENABLED = os.getenv("FOUNDAUDIO_HEDGING", "0").strip().lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Most extra requests hedging may add, as a share of hedgeable requests (0.05 = 5%)
+HEDGE_BUDGET = float(os.getenv("FOUNDAUDIO_HEDGE_BUDGET", "0.05"))
+
+# Hedge delay floor in milliseconds, so a fast p95 never doubles every request
+HEDGE_MIN_DELAY_MS = float(os.getenv("FOUNDAUDIO_HEDGE_MIN_DELAY_MS", "20"))
+
+# Latencies kept per query to estimate its p95, and how many are needed before hedging
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 20
+
+# Unused budget carried over, in hedges, so quiet periods cannot bank a large burst
+MAX_BANKED_HEDGES = 10.0
+
+T = TypeVar("T")
+
+hedges = registry.counter(
+    "foundaudio_hedged_requests_total",
+    "Hedged Supabase reads by query and event (fired, won, over_budget).",
+    labels=("query", "event"),
+)
+
+
+class Hedger:
+    """Duplicate a slow read once it passes the observed p95, and keep the first reply.
+
+    Each named query keeps a window of recent latencies. A call runs on a thread of its
+    own; if it has not finished after the window's p95 (at least `min_delay`), an
+    identical request is sent on a pool of `max_workers` threads and whichever succeeds
+    first is returned. Only hedges share the pool, so it never queues a primary request.
+    Every hedgeable call earns `budget` of a hedge and each hedge spends one, which caps
+    the extra load at `budget` of the traffic. Only idempotent reads may be hedged: the
+    slower request is not cancelled, its reply is just discarded.
+    """
+
+    def __init__(
+        self,
+        budget: float = HEDGE_BUDGET,
+        min_delay: float = HEDGE_MIN_DELAY_MS / 1000.0,
+        window: int = LATENCY_WINDOW,
+        min_samples: int = MIN_SAMPLES,
+        max_workers: int = 16,
+    ):
+        self.budget = budget
+        self.min_delay = min_delay
+        self.window = window
+        self.min_samples = min_samples
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._credit = 0.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="foundaudio-hedge"
+        )
+
+    def record(self, query: str, seconds: float) -> None:
+        """Add one observed latency to a query's window."""
+        with self._lock:
+            latencies = self._latencies.get(query)
+            if latencies is None:
+                latencies = self._latencies[query] = deque(maxlen=self.window)
+            latencies.append(seconds)
+
+    def delay(self, query: str) -> Optional[float]:
+        """Return how long to wait before hedging, or None until enough samples exist."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(query, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return max(p95, self.min_delay)
+
+    def call(self, query: str, request: Callable[[], T]) -> T:
+        """Run `request`, hedging it if it is slower than the query's p95."""
+        with self._lock:
+            self._credit = min(MAX_BANKED_HEDGES, self._credit + self.budget)
+
+        delay = self.delay(query)
+        if delay is None:
+            # Not enough samples to know what slow means yet; run inline and learn
+            started = time.perf_counter()
+            result = request()
+            self.record(query, time.perf_counter() - started)
+            return result
+
+        primary = self._start(query, request)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        with self._lock:
+            allowed = self._credit >= 1.0
+            if allowed:
+                self._credit -= 1.0
+        if not allowed:
+            hedges.inc(query, "over_budget")
+            return primary.result()
+
+        hedges.inc(query, "fired")
+        hedge = self._executor.submit(self._timed(query, request))
+        pending = {primary, hedge}
+        failed = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        hedges.inc(query, "won")
+                    return future.result()
+                failed.append(future)
+        # Both requests failed; report the first failure
+        return failed[0].result()
+
+    def clear(self) -> None:
+        """Forget every latency sample and the banked budget."""
+        with self._lock:
+            self._latencies.clear()
+            self._credit = 0.0
+
+    def _start(self, query: str, request: Callable[[], T]) -> "Future[T]":
+        """Run a primary request on a new thread, so it starts however busy the pool is."""
+        future: "Future[T]" = Future()
+        timed = self._timed(query, request)
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(timed())
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="foundaudio-primary", daemon=True).start()
+        return future
+
+    def _timed(self, query: str, request: Callable[[], T]) -> Callable[[], T]:
+        def timed() -> T:
+            # Timed from when the request runs, so waiting for a thread is not latency
+            started = time.perf_counter()
+            result = request()
+            self.record(query, time.perf_counter() - started)
+            return result
+
+        return timed
+
+
+hedger = Hedger()
+
+
+def hedged(query: str, request: Callable[[], T]) -> T:
+    """Run a read-only Supabase request, hedged when FOUNDAUDIO_HEDGING is on.
+
+    With hedging off this is a plain call with no threads or bookkeeping.
+
+    Args:
+        query: Name of the query whose latency window decides when to hedge
+        request: The request to run (usually a query builder's `execute`)
+    """
+    if not HEDGING_ENABLED:
+        return request()
+    return hedger.call(query, request)
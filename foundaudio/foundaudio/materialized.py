@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+from collections import Counter as Tally
+from typing import Any, Dict, List, Optional, Tuple
+
+from foundaudio.client import get_client, supabase_url
+from foundaudio.metrics import registry
+from foundaudio.models import AUDIO_FILE_FIELDS, AudioRecord, audio_file_from_row
+
+Record = AudioRecord
+
+# Background refresh is on by default (it only runs with SUPABASE_ANON_KEY in the worker
+# environment, like the warm-up); set FOUNDAUDIO_VIEWS=0 to turn it off
+VIEWS_ENABLED = os.getenv("FOUNDAUDIO_VIEWS", "1").strip().lower() not in (
+    "0",
+    "false",
+    "no",
+)
+
+# Seconds between refreshes; a view older than a call's max_staleness is not used, so a
+# failing refresh degrades to database queries instead of serving old rows
+VIEW_REFRESH_INTERVAL = float(os.getenv("FOUNDAUDIO_VIEW_REFRESH_INTERVAL", "30"))
+
+# Newest rows kept per view: deep enough for the first pages of the largest limit
+VIEW_SIZE = int(os.getenv("FOUNDAUDIO_VIEW_SIZE", "200"))
+
+# Genres given their own "latest" view: the most common among the newest GENRE_SAMPLE uploads
+VIEW_GENRES = int(os.getenv("FOUNDAUDIO_VIEW_GENRES", "10"))
+GENRE_SAMPLE = 1000
+
+# The order every view is kept in: the default get_audio_list sort, with id as tiebreaker
+VIEW_SORT = ("created_at", "desc")
+
+# Filters a view can stand in for; the keys match get_audio_list's filter dictionary
+VIEW_FILTERS = (
+    "user_id",
+    "search",
+    "genre",
+    "min_duration",
+    "max_duration",
+    "created_from",
+    "created_to",
+)
+
+view_refreshes = registry.counter(
+    "foundaudio_view_refreshes_total",
+    "Refreshes of the materialized latest listings, by result (ok, failed).",
+    labels=("result",),
+)
+
+
+class MaterializedListings:
+    """In-memory copies of the most requested listings, refreshed in the background.
+
+    Two kinds of view are kept, each holding the newest `size` rows in the default
+    order (created_at desc, id desc): "latest" over every upload, and "latest" per
+    genre for the most common genres among recent uploads. A refresh queries every view
+    and then replaces the whole set with one reference assignment, so readers always see
+    a complete, consistent snapshot without taking a lock.
+
+    Per-play statistics are not stored in audio_files, so there is no trending or
+    most-played view; one can be added here once such a column exists.
+    """
+
+    def __init__(self, size: int = VIEW_SIZE, genres: int = VIEW_GENRES):
+        self.size = size
+        self.genres = genres
+        # (view key -> rows, monotonic refresh time); the key is None for all uploads,
+        # else the genre. The tuple is replaced as a whole, never mutated.
+        self._snapshot: Tuple[Dict[Optional[str], List[Record]], Optional[float]] = (
+            {},
+            None,
+        )
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the views were last refreshed, or None if never loaded."""
+        refreshed_at = self._snapshot[1]
+        if refreshed_at is None:
+            return None
+        return time.monotonic() - refreshed_at
+
+    def view_genres(self) -> List[str]:
+        """Return the genres that currently have their own view."""
+        return [key for key in self._snapshot[0] if key is not None]
+
+    def refresh(self, client: Any) -> None:
+        """Query every view and swap the new set in at once.
+
+        If any query fails the previous snapshot stays in place (and keeps ageing) and
+        the error is raised.
+        """
+        with self._refresh_lock:
+            try:
+                views: Dict[Optional[str], List[Record]] = {None: self._latest(client, None)}
+                for genre in self._top_genres(client):
+                    views[genre] = self._latest(client, genre)
+            except Exception:
+                view_refreshes.inc("failed")
+                raise
+            self._snapshot = (views, time.monotonic())
+            view_refreshes.inc("ok")
+
+    def lookup(
+        self,
+        filters: Dict[str, Any],
+        sort: Tuple[str, str],
+        after: Optional[Tuple[Any, str]],
+        limit: Optional[int],
+    ) -> Optional[Tuple[List[Record], float]]:
+        """Return a page from a view, and the view's age, if a view holds all of it.
+
+        A listing is answerable when its only filter is a genre with a view (or there
+        is no filter), it uses the view's order, and the rows it asks for are all in
+        the view: either the page ends within it or the view holds the whole scope.
+        The rows are the view's own; callers copy them.
+        """
+        views, refreshed_at = self._snapshot
+        if refreshed_at is None or sort != VIEW_SORT:
+            return None
+        if any(filters.get(name) is not None for name in VIEW_FILTERS if name != "genre"):
+            return None
+        genre = filters.get("genre")
+        rows = views.get(genre if genre and genre.strip() else None)
+        if rows is None:
+            return None
+
+        start = 0
+        if after is not None:
+            value, row_id = after
+            start = next(
+                (
+                    index + 1
+                    for index, row in enumerate(rows)
+                    if row["id"] == row_id and row["created_at"] == value
+                ),
+                -1,
+            )
+            if start < 0:
+                # The cursor's row has left the view (or never was in it)
+                return None
+        complete = len(rows) < self.size
+        if limit is None:
+            return (rows[start:], time.monotonic() - refreshed_at) if complete else None
+        if start + limit > len(rows) and not complete:
+            return None
+        return rows[start : start + limit], time.monotonic() - refreshed_at
+
+    def start(
+        self, url: str, key: str, interval: float = VIEW_REFRESH_INTERVAL
+    ) -> threading.Thread:
+        """Refresh now and then every `interval` seconds on a daemon thread."""
+        self._stop.clear()
+
+        def run() -> None:
+            while True:
+                try:
+                    self.refresh(get_client(url, key))
+                except Exception:
+                    # Counted in view_refreshes; the views age out until the next success
+                    pass
+                if self._stop.wait(interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="foundaudio-views", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        """Stop the background refresh, waiting for a refresh in flight to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def clear(self) -> None:
+        """Drop every view; lookups miss until the next refresh."""
+        with self._refresh_lock:
+            self._snapshot = ({}, None)
+
+    def _latest(self, client: Any, genre: Optional[str]) -> List[Record]:
+        query = client.from_("audio_files").select(AUDIO_FILE_FIELDS)
+        if genre is not None:
+            query = query.contains("genres", [genre])
+        query = query.order("created_at", desc=True).order("id", desc=True)
+        response = query.limit(self.size).execute()
+        return [AudioRecord.from_dict(audio_file_from_row(item)) for item in response.data or []]
+
+    def _top_genres(self, client: Any) -> List[str]:
+        if self.genres < 1:
+            return []
+        response = (
+            client.from_("audio_files")
+            .select("genres")
+            .order("created_at", desc=True)
+            .limit(GENRE_SAMPLE)
+            .execute()
+        )
+        tally = Tally(
+            genre for row in response.data or [] for genre in row.get("genres") or []
+        )
+        return [genre for genre, _ in tally.most_common(self.genres)]
+
+
+# The views used by get_audio_list in this worker process
+materialized_listings = MaterializedListings()
+
+
+def _collect_age() -> List[str]:
+    age = materialized_listings.age
+    if age is None:
+        return []
+    return [
+        "# HELP foundaudio_view_age_seconds Seconds since the materialized listings were refreshed.",
+        "# TYPE foundaudio_view_age_seconds gauge",
+        f"foundaudio_view_age_seconds {age:.3f}",
+    ]
+
+
+registry.collector(_collect_age)
+
+
+def start_view_refresh() -> Optional[threading.Thread]:
+    """Start refreshing the materialized listings when a worker loads the toolkit.
+
+    Like the warm-up, this only runs when SUPABASE_ANON_KEY is in the worker environment.
+
+    Returns:
+        The refresh thread, or None when views are disabled or not configured
+    """
+    key = os.getenv("SUPABASE_ANON_KEY")
+    if not VIEWS_ENABLED or not key:
+        return None
+    return materialized_listings.start(supabase_url(), key)
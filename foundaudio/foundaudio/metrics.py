@@ -0,0 +1,388 @@
+import bisect
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+
+from foundaudio.cache import CacheBackend, audio_file_cache, listing_cache, username_cache
+
+# Latency buckets in seconds, from a warm cache hit up to a slow cold query
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Counter:
+    """A monotonically increasing value per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Add `amount` to the series for the given label values."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        """Return the current value of one series (0 if never incremented)."""
+        return self._values.get(label_values, 0.0)
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        with self._lock:
+            return [("", labels, value) for labels, value in self._values.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Observation counts in cumulative buckets, plus their sum and count, per label combination."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [count per bucket..., +Inf count], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation for the given label values."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[label_values] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *label_values: str) -> int:
+        """Return how many observations one series has recorded."""
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        samples: List[Tuple[str, LabelValues, float]] = []
+        with self._lock:
+            for labels, (counts, total) in self._series.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts, strict=True):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    samples.append(("_bucket", labels + (le,), float(cumulative)))
+                samples.append(("_sum", labels, total[0]))
+                samples.append(("_count", labels, float(cumulative)))
+        return samples
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Registry:
+    """A set of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, collect: Callable[[], List[str]]) -> None:
+        """Register a callback that renders extra lines at scrape time."""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            label_names = metric.labels + (("le",) if metric.kind == "histogram" else ())
+            for suffix, values, value in metric.samples():
+                names = label_names if suffix == "_bucket" else metric.labels
+                labels = _format_labels(names, values)
+                lines.append(f"{metric.name}{suffix}{labels} {_format_value(value)}")
+        for collect in self._collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset every metric (collectors read live values and are kept)."""
+        for metric in self._metrics:
+            metric.clear()
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence; 0.0 if it is empty.
+
+    Used for every latency summary (slow-query log, workload replay, load tests) so
+    their p50/p95/p99 agree on the same data.
+
+    Args:
+        ordered: Values sorted in ascending order
+        fraction: Share of values at or below the result, e.g. 0.95 for p95
+    """
+    if not ordered:
+        return 0.0
+    rank = math.ceil(fraction * len(ordered))
+    return ordered[min(len(ordered), max(1, rank)) - 1]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+registry = Registry()
+
+tool_duration = registry.histogram(
+    "foundaudio_tool_duration_seconds",
+    "Tool call latency by tool and filter shape.",
+    labels=("tool", "shape"),
+)
+tool_errors = registry.counter(
+    "foundaudio_tool_errors_total",
+    "Tool calls that raised, by tool and error kind (retryable, execution, unexpected).",
+    labels=("tool", "kind"),
+)
+supabase_requests = registry.counter(
+    "foundaudio_supabase_requests_total",
+    "HTTP requests made to Supabase by table, method and status class.",
+    labels=("table", "method", "status"),
+)
+supabase_response_bytes = registry.counter(
+    "foundaudio_supabase_response_bytes_total",
+    "Response body bytes received from Supabase on the wire (compressed) by table.",
+    labels=("table",),
+)
+supabase_decoded_bytes = registry.counter(
+    "foundaudio_supabase_response_decoded_bytes_total",
+    "Response body bytes from Supabase after decompression by table and content encoding.",
+    labels=("table", "encoding"),
+)
+listing_revalidations = registry.counter(
+    "foundaudio_listing_revalidations_total",
+    "Expired listing cache entries checked with a change probe, by outcome "
+    "(first, unchanged, changed, unavailable).",
+    labels=("result",),
+)
+
+# Caches whose hit ratios are exported, by label
+CACHES: Dict[str, CacheBackend] = {
+    "record": audio_file_cache,
+    "username": username_cache,
+    "listing": listing_cache,
+}
+
+
+def _collect_caches() -> List[str]:
+    lines = [
+        "# HELP foundaudio_cache_requests_total Cache lookups by cache and result.",
+        "# TYPE foundaudio_cache_requests_total counter",
+    ]
+    ratios = [
+        "# HELP foundaudio_cache_hit_ratio Share of cache lookups that were hits.",
+        "# TYPE foundaudio_cache_hit_ratio gauge",
+    ]
+    for name, cache in CACHES.items():
+        hits, misses = cache.hits, cache.misses
+        for result, count in (("hit", hits), ("miss", misses)):
+            labels = _format_labels(("cache", "result"), (name, result))
+            lines.append(f"foundaudio_cache_requests_total{labels} {count}")
+        ratio = hits / (hits + misses) if hits + misses else 0.0
+        labels = _format_labels(("cache",), (name,))
+        ratios.append(f"foundaudio_cache_hit_ratio{labels} {_format_value(ratio)}")
+    return lines + ratios
+
+
+registry.collector(_collect_caches)
+
+
+def observe_tool(
+    name: str, shape: Optional[Callable[[Dict[str, Any]], str]] = None
+) -> Callable[[F], F]:
+    """Decorate a tool function to record its latency and errors.
+
+    Apply it below `@tool` so Arcade still sees the original signature (it is copied
+    with functools.wraps).
+
+    Args:
+        name: Tool name used as the `tool` label
+        shape: Optional function mapping the call's bound arguments to a low-cardinality
+            `shape` label (never raw parameter values)
+    """
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            label = "all"
+            if shape is not None:
+                bound = signature.bind_partial(*args, **kwargs)
+                label = shape(bound.arguments)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except RetryableToolError:
+                tool_errors.inc(name, "retryable")
+                raise
+            except ToolExecutionError:
+                tool_errors.inc(name, "execution")
+                raise
+            except Exception:
+                tool_errors.inc(name, "unexpected")
+                raise
+            finally:
+                tool_duration.observe(time.perf_counter() - started, name, label)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def instrument_client(client: Any) -> None:
+    """Count requests and wire/decoded response bytes on a Supabase client's PostgREST session."""
+    try:
+        session = client.postgrest.session
+    except AttributeError:
+        return
+    if isinstance(session, httpx.Client):
+        session.event_hooks["response"].append(_record_response)
+
+
+def _record_response(response: httpx.Response) -> None:
+    # /rest/v1/<table> -> <table>; anything else (rpc, auth) is grouped by its first segment
+    parts = [part for part in urlsplit(str(response.request.url)).path.split("/") if part]
+    if len(parts) > 2 and parts[:2] == ["rest", "v1"]:
+        table = parts[2]
+    else:
+        table = parts[0] if parts else ""
+    status = f"{response.status_code // 100}xx"
+    supabase_requests.inc(table, response.request.method, status)
+    encoding = response.headers.get("content-encoding", "identity").lower()
+
+    def record(decoded: int) -> None:
+        # Bodies built in memory (mock transports) were never downloaded; fall back to
+        # the declared length, which is the compressed size too
+        wire = response.num_bytes_downloaded or int(
+            response.headers.get("content-length", decoded)
+        )
+        supabase_response_bytes.inc(table, amount=float(wire))
+        supabase_decoded_bytes.inc(table, encoding, amount=float(decoded))
+
+    try:
+        body = response.content
+    except httpx.ResponseNotRead:
+        pass
+    else:
+        # Already in memory, so there is nothing to download or count as it arrives
+        record(len(body))
+        return
+
+    # Count the decoded bytes as the client reads them after the hooks, rather than
+    # reading the body here; the downloaded count is final once the stream is exhausted
+    iter_bytes = response.iter_bytes
+
+    def counted(chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        decoded = 0
+        try:
+            for chunk in iter_bytes(chunk_size):
+                decoded += len(chunk)
+                yield chunk
+        finally:
+            record(decoded)
+
+    response.iter_bytes = counted  # type: ignore[method-assign]
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Scrapes every few seconds would flood stderr
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics for Prometheus from a daemon thread and return the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="foundaudio-metrics", daemon=True
+    ).start()
+    return server
+
+
+def start_metrics_server_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the scrape endpoint when FOUNDAUDIO_METRICS_PORT is set."""
+    port = os.getenv("FOUNDAUDIO_METRICS_PORT")
+    if not port:
+        return None
+    host = os.getenv("FOUNDAUDIO_METRICS_HOST", "127.0.0.1")
+    return start_metrics_server(int(port), host)
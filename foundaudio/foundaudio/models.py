@@ -0,0 +1,154 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+# Columns selected from the audio_files table - the fields that actually exist in the API response
+AUDIO_FILE_FIELDS = (
+    "id, title, description, duration, genres, user_id, created_at, updated_at"
+)
+
+# Public page for an audio file; the id is appended to build the URL
+AUDIO_URL_PREFIX = "https://foundaudio.club/audio/"
+
+# Keys of an audio file dictionary, in the order AudioFile.model_dump() returns them
+AUDIO_FILE_KEYS = (
+    "id",
+    "title",
+    "description",
+    "url",
+    "duration",
+    "genres",
+    "user_id",
+    "created_at",
+    "updated_at",
+)
+
+
+class AudioFile(BaseModel):
+    """Audio file metadata structure."""
+
+    id: str
+    title: str
+    description: Optional[str] = None
+    url: str
+    duration: Optional[float] = None
+    genres: List[str] = []
+    user_id: str
+    created_at: str
+    updated_at: str
+
+
+def audio_file_from_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a raw audio_files row and convert it to the dictionary tools return.
+
+    Args:
+        item: A row from the audio_files table as returned by PostgREST
+
+    Returns:
+        The AudioFile fields as a plain dictionary, including the generated URL
+    """
+    # Create AudioFile object first for validation
+    audio_file = AudioFile(
+        id=item["id"],
+        title=item["title"],
+        description=item.get("description"),
+        duration=item.get("duration"),
+        genres=item.get("genres", []),
+        user_id=item["user_id"],
+        created_at=item["created_at"],
+        updated_at=item["updated_at"],
+        url=AUDIO_URL_PREFIX + item["id"],
+    )
+
+    # Convert to dictionary for return
+    return audio_file.model_dump()
+
+
+class AudioRecord(Mapping):
+    """A validated audio file kept in memory for a long time (caches, catalog, views).
+
+    Reads like the dictionary `audio_file_from_row` returns: `record["title"]`,
+    `record.get("duration")`, `dict(record)` and `{**record}` all work, and it compares
+    equal to that dictionary. It stores fields in slots rather than a per-record dict,
+    derives the URL from the id, and keeps genres as a tuple of interned strings, so
+    records with the same genre or uploader share one string object each. A worker
+    holding thousands of cached records needs about half the memory for them.
+
+    Records are not meant to be modified; copy with `dict(record)` (which builds a new
+    genres list) to get a mutable dictionary.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "duration",
+        "genres",
+        "user_id",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        description: Optional[str],
+        duration: Optional[float],
+        genres: Iterable[str],
+        user_id: str,
+        created_at: str,
+        updated_at: str,
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.duration = duration
+        self.genres = tuple(sys.intern(genre) for genre in genres)
+        self.user_id = sys.intern(user_id)
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_dict(cls, audio_file: "Mapping[str, Any]") -> "AudioRecord":
+        """Compact an audio file dictionary (or return it as is if it already is a record)."""
+        if isinstance(audio_file, cls):
+            return audio_file
+        return cls(
+            audio_file["id"],
+            audio_file["title"],
+            audio_file.get("description"),
+            audio_file.get("duration"),
+            audio_file.get("genres") or (),
+            audio_file["user_id"],
+            audio_file["created_at"],
+            audio_file["updated_at"],
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "url":
+            return AUDIO_URL_PREFIX + self.id
+        if key == "genres":
+            return list(self.genres)
+        if key in AudioRecord.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(AUDIO_FILE_KEYS)
+
+    def __len__(self) -> int:
+        return len(AUDIO_FILE_KEYS)
+
+    def __repr__(self) -> str:
+        return f"AudioRecord(id={self.id!r}, title={self.title!r})"
+
+
+def audio_id_from_reference(reference: str) -> str:
+    """Accept either a bare audio file id or its foundaudio.club URL and return the id."""
+    audio_id = reference.strip()
+    if audio_id.startswith(AUDIO_URL_PREFIX):
+        audio_id = audio_id[len(AUDIO_URL_PREFIX) :].strip("/")
+    return audio_id
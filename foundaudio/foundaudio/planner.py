@@ -0,0 +1,96 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from foundaudio.cache import LISTING_CACHE_TTL
+from foundaudio.metrics import registry
+
+# Oldest data, in seconds, a get_audio_list call accepts when it passes no max_staleness.
+# The default matches the listing cache TTL, so routing never serves older data than before.
+DEFAULT_MAX_STALENESS = float(
+    os.getenv("FOUNDAUDIO_MAX_STALENESS", str(LISTING_CACHE_TTL))
+)
+
+# Starting cost estimates in milliseconds, replaced by observed costs as calls complete:
+# one materialized view page, one cached page, one catalog record scanned, one database
+# round trip
+PRIOR_COSTS_MS = {"view": 0.02, "cache": 0.05, "catalog": 0.002, "database": 60.0}
+
+# Weight of the newest observation in each source's moving-average cost
+COST_SMOOTHING = 0.2
+
+# A listing source and how old its data is, in seconds, with the work it would do
+# (records scanned for the catalog, 1 for the others)
+Candidates = Dict[str, Tuple[float, int]]
+
+query_sources = registry.counter(
+    "foundaudio_query_sources_total",
+    "get_audio_list pages by the source that answered them (view, cache, catalog, database).",
+    labels=("source",),
+)
+
+
+class QueryPlanner:
+    """Pick the cheapest source for a listing that is fresh enough for the caller.
+
+    A column-sorted get_audio_list page can come from a materialized view (the latest
+    uploads, overall or per top genre), the listing cache (a page stored by an earlier
+    call), the local catalog copy (filtered and sorted in process) or the database. Each
+    candidate source is offered with its staleness and the work it would do; a source
+    older than the caller's bound is ruled out and the cheapest of the rest wins. The
+    database has staleness 0 and is always eligible, so a bound of 0 always goes live.
+
+    Costs are moving averages of what each source actually took: per call for the views,
+    the cache and the database, and per record scanned for the catalog, so the catalog's
+    estimate grows with the table and a slow database makes local answers more attractive.
+    """
+
+    def __init__(
+        self,
+        priors: Optional[Dict[str, float]] = None,
+        smoothing: float = COST_SMOOTHING,
+    ):
+        self.priors = dict(priors if priors is not None else PRIOR_COSTS_MS)
+        self.smoothing = smoothing
+        self._costs = dict(self.priors)
+        self._lock = threading.Lock()
+
+    def estimate(self, source: str, work: int = 1) -> float:
+        """Return the estimated milliseconds for `source` to do `work` units."""
+        with self._lock:
+            return self._costs[source] * max(1, work)
+
+    def record(self, source: str, elapsed_ms: float, work: int = 1) -> None:
+        """Fold one observed cost into the source's estimate."""
+        unit = elapsed_ms / max(1, work)
+        with self._lock:
+            previous = self._costs[source]
+            self._costs[source] = previous + self.smoothing * (unit - previous)
+
+    def plan(
+        self, candidates: Candidates, max_staleness: float
+    ) -> Tuple[str, Dict[str, float]]:
+        """Choose a source for one listing.
+
+        Args:
+            candidates: Local sources able to answer, with (staleness, work) each; the
+                database is added automatically
+            max_staleness: Oldest data, in seconds, the caller accepts
+
+        Returns:
+            The chosen source and the cost estimate of every eligible source
+        """
+        estimates = {"database": self.estimate("database")}
+        for source, (staleness, work) in candidates.items():
+            if staleness <= max_staleness:
+                estimates[source] = self.estimate(source, work)
+        return min(estimates, key=estimates.__getitem__), estimates
+
+    def clear(self) -> None:
+        """Forget observed costs and start again from the priors."""
+        with self._lock:
+            self._costs = dict(self.priors)
+
+
+# Shared planner whose cost estimates are learned from this worker's calls
+planner = QueryPlanner()
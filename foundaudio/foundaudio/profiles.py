@@ -0,0 +1,50 @@
+from typing import Any, Dict, Iterable, Optional
+
+from foundaudio.cache import username_cache
+from foundaudio.hedging import hedged
+
+# Columns read from the profiles table when resolving usernames
+PROFILE_FIELDS = "id, username, email, created_at"
+
+
+def lookup_user_id(client: Any, username: str) -> Optional[str]:
+    """Return the profile id for a username, or None if no such user exists.
+
+    Resolved ids are cached, so repeat lookups for the same user need no query.
+    """
+    user_id = username_cache.get(username)
+    if user_id is not None:
+        return user_id
+
+    query = client.from_("profiles").select(PROFILE_FIELDS).eq("username", username)
+    response = hedged("profiles", query.execute)
+    if not response.data:
+        return None
+
+    # The response structure is: [{"id": "uuid", "username": "discodude", "email": "...", "created_at": "..."}]
+    user_id = response.data[0]["id"]
+    username_cache.put(username, user_id)
+    return user_id
+
+
+def resolve_usernames(client: Any, usernames: Iterable[str]) -> Dict[str, str]:
+    """Resolve several usernames with a single `in` query and cache the results.
+
+    Args:
+        client: A Supabase client
+        usernames: Usernames to resolve; already-cached names are not queried
+
+    Returns:
+        A mapping of every username that exists to its profile id
+    """
+    names = list(dict.fromkeys(name.strip() for name in usernames if name.strip()))
+    resolved = username_cache.get_many(names)
+    missing = [name for name in names if name not in resolved]
+    if missing:
+        response = (
+            client.from_("profiles").select(PROFILE_FIELDS).in_("username", missing).execute()
+        )
+        fetched = {row["username"]: row["id"] for row in response.data or []}
+        username_cache.put_many(fetched.items())
+        resolved.update(fetched)
+    return resolved
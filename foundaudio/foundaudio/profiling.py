@@ -0,0 +1,191 @@
+import cProfile
+import functools
+import inspect
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+# Fraction of calls profiled, from 0 (the default, off) to 1 (every call)
+PROFILE_SAMPLE_RATE = float(os.getenv("FOUNDAUDIO_PROFILE_SAMPLE_RATE", "0"))
+
+# Only calls with this filter shape are sampled when set (e.g. 'genre+search|mode=relevance')
+PROFILE_SHAPE = os.getenv("FOUNDAUDIO_PROFILE_SHAPE") or None
+
+# Where profiles are written, and the size the directory is trimmed back to (oldest first)
+PROFILE_DIR = os.getenv(
+    "FOUNDAUDIO_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "foundaudio", "profiles")
+)
+PROFILE_DIR_MAX_BYTES = int(os.getenv("FOUNDAUDIO_PROFILE_DIR_MAX_BYTES", "52428800"))
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class CallProfiler:
+    """Profile a random sample of tool calls with cProfile and keep the newest captures.
+
+    Every sampled call leaves two files sharing a name: `<name>.prof`, loadable with
+    `python -m pstats` or snakeviz, and `<name>.json` with the tool, filter shape, call
+    parameters, elapsed time and outcome. Once the directory holds more than `max_bytes`,
+    the oldest captures are deleted. Only one call is profiled at a time; a call that
+    would be sampled while another is being profiled runs unprofiled.
+    """
+
+    def __init__(
+        self,
+        directory: str = PROFILE_DIR,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        shape: Optional[str] = PROFILE_SHAPE,
+        max_bytes: int = PROFILE_DIR_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.shape = shape
+        self.max_bytes = max_bytes
+        self._busy = threading.Lock()
+        self._rotate_lock = threading.Lock()
+
+    def captures(self) -> List[Path]:
+        """Return the .prof files in the directory, oldest first."""
+        directory = Path(self.directory)
+        if not directory.is_dir():
+            return []
+        return sorted(directory.glob("*.prof"))
+
+    def run(
+        self,
+        func: Callable[..., Any],
+        args: Any,
+        kwargs: Any,
+        metadata: Dict[str, Any],
+    ) -> Any:
+        """Call `func` under cProfile and write the capture, or just call it if busy."""
+        if not self._busy.acquire(blocking=False):
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (a debugger, py-spy in-process) already owns the hook
+            self._busy.release()
+            return func(*args, **kwargs)
+
+        started = time.perf_counter()
+        error: Optional[str] = None
+        result: Any = None
+        try:
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profile.disable()
+            return result
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._busy.release()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            try:
+                self._write(profile, metadata, elapsed_ms, result, error)
+            except OSError:
+                # A full disk or unwritable directory must never fail the tool call
+                pass
+
+    def _write(
+        self,
+        profile: cProfile.Profile,
+        metadata: Dict[str, Any],
+        elapsed_ms: float,
+        result: Any,
+        error: Optional[str],
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        # Timestamp first so names sort oldest first; the suffix keeps names unique
+        stamp = now.strftime("%Y%m%dT%H%M%S%fZ")
+        stem = f"{stamp}-{metadata['tool']}-{uuid.uuid4().hex[:8]}"
+        directory = Path(self.directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(directory / f"{stem}.prof"))
+        entry = {
+            "ts": now.isoformat(timespec="milliseconds"),
+            **metadata,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "rows": result.get("count") if isinstance(result, dict) else None,
+            "error": error,
+        }
+        (directory / f"{stem}.json").write_text(
+            json.dumps(entry, indent=2, default=str), encoding="utf-8"
+        )
+        self._rotate()
+
+    def _rotate(self) -> None:
+        """Delete the oldest captures until the directory fits in max_bytes."""
+        with self._rotate_lock:
+            captures = self.captures()
+            sizes = {}
+            for capture in captures:
+                sizes[capture] = sum(
+                    path.stat().st_size
+                    for path in (capture, capture.with_suffix(".json"))
+                    if path.exists()
+                )
+            total = sum(sizes.values())
+            for capture in captures[:-1]:
+                if total <= self.max_bytes:
+                    break
+                for path in (capture, capture.with_suffix(".json")):
+                    path.unlink(missing_ok=True)
+                total -= sizes[capture]
+
+
+# The profiler used by `profile_calls`, or None when sampling is turned off
+call_profiler: Optional[CallProfiler] = (
+    CallProfiler() if PROFILE_SAMPLE_RATE > 0 else None
+)
+
+
+def profile_calls(
+    name: str, shape: Callable[[Dict[str, Any]], str]
+) -> Callable[[F], F]:
+    """Decorate a tool function to profile a sample of its calls.
+
+    Apply it below `@tool` and the metrics/slow-query decorators so only the tool body
+    is profiled. With sampling off the wrapper costs one global lookup; an unsampled
+    call adds one random draw.
+
+    Args:
+        name: Tool name stored with each capture
+        shape: Function mapping the call's bound arguments to its filter shape, used for
+            FOUNDAUDIO_PROFILE_SHAPE and stored with the capture
+    """
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = call_profiler
+            if profiler is None or random.random() >= profiler.sample_rate:
+                return func(*args, **kwargs)
+
+            bound = signature.bind_partial(*args, **kwargs)
+            call_shape = shape(bound.arguments)
+            if profiler.shape is not None and call_shape != profiler.shape:
+                return func(*args, **kwargs)
+
+            # Keep the parameters needed to replay the call, but not the tool context
+            parameters = {
+                key: value for key, value in bound.arguments.items() if key != "context"
+            }
+            metadata = {"tool": name, "shape": call_shape, "parameters": parameters}
+            return profiler.run(func, args, kwargs, metadata)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
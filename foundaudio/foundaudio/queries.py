@@ -0,0 +1,25 @@
+import re
+from typing import Any
+
+
+def keyset_condition(field: str, descending: bool, value: Any, row_id: str) -> str:
+    """Build a PostgREST `or` filter selecting rows strictly after (value, row_id).
+
+    Used for keyset pagination: combined with `ORDER BY field, id` in the same
+    direction, it continues exactly where the previous page ended without an OFFSET.
+    """
+    operator = "lt" if descending else "gt"
+    literal = postgrest_literal(value)
+    return (
+        f"{field}.{operator}.{literal},"
+        f"and({field}.eq.{literal},id.{operator}.{postgrest_literal(row_id)})"
+    )
+
+
+def postgrest_literal(value: Any) -> str:
+    """Quote a value for use inside a PostgREST logic tree (titles may contain commas)."""
+    text = str(value)
+    if re.search(r'[,.:()"\\\s]', text):
+        escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    return text
@@ -0,0 +1,95 @@
+import heapq
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Points for where and how the search term matches. Any title match outranks any
+# description-only match, and whole-word matches outrank substrings inside other words.
+TITLE_EXACT = 100.0
+TITLE_PREFIX = 70.0
+TITLE_WORD = 60.0
+TITLE_PARTIAL = 40.0
+DESCRIPTION_WORD = 20.0
+DESCRIPTION_PARTIAL = 10.0
+
+RankKey = Tuple[float, str, str]
+
+
+def relevance_score(term: str, title: Optional[str], description: Optional[str]) -> float:
+    """Score how well a track's title and description match a search term.
+
+    Args:
+        term: The search term as the user typed it
+        title: Track title
+        description: Track description
+
+    Returns:
+        The title score plus the description score; 0 when neither contains the term
+    """
+    needle = " ".join(term.lower().split())
+    if not needle:
+        return 0.0
+    word = re.compile(rf"(?<!\w){re.escape(needle)}(?!\w)")
+
+    score = 0.0
+    haystack = " ".join((title or "").lower().split())
+    if haystack == needle:
+        score += TITLE_EXACT
+    elif haystack.startswith(needle) and word.match(haystack):
+        score += TITLE_PREFIX
+    elif word.search(haystack):
+        score += TITLE_WORD
+    elif needle in haystack:
+        score += TITLE_PARTIAL
+
+    haystack = " ".join((description or "").lower().split())
+    if word.search(haystack):
+        score += DESCRIPTION_WORD
+    elif needle in haystack:
+        score += DESCRIPTION_PARTIAL
+    return score
+
+
+def rank_key(score: float, audio_file: Dict[str, Any]) -> RankKey:
+    """Sort key for ranked results: score, then newest upload, then id."""
+    return score, audio_file.get("created_at") or "", audio_file["id"]
+
+
+def top_by_relevance(
+    audio_files: Iterable[Dict[str, Any]],
+    term: str,
+    limit: int,
+    after: Optional[RankKey] = None,
+) -> List[Tuple[Dict[str, Any], RankKey]]:
+    """Return the `limit` best matching audio files, best first.
+
+    Candidates stream through a bounded heap (`heapq.nlargest`), so ranking n candidates
+    costs O(n log limit) time and O(limit) memory instead of sorting the whole set.
+
+    Args:
+        audio_files: Candidate audio files
+        term: The search term
+        limit: Number of results to keep
+        after: Optional rank key of the last result of a previous page; only results
+            ranked strictly below it are considered
+
+    Returns:
+        (audio file, rank key) pairs in descending rank order
+    """
+    scored = (
+        (
+            audio_file,
+            rank_key(
+                relevance_score(
+                    term, audio_file.get("title"), audio_file.get("description")
+                ),
+                audio_file,
+            ),
+        )
+        for audio_file in audio_files
+    )
+    candidates = (
+        (audio_file, key)
+        for audio_file, key in scored
+        if key[0] > 0 and (after is None or key < after)
+    )
+    return heapq.nlargest(limit, candidates, key=lambda candidate: candidate[1])
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import httpx
+from arcade_core.errors import RetryableToolError
+
+from foundaudio.metrics import registry
+
+# Sustained Supabase requests per second for the whole process; 0 turns limiting off
+RATE_LIMIT_RPS = float(os.getenv("FOUNDAUDIO_RATE_LIMIT_RPS", "100"))
+
+# Requests that may be sent back to back before the sustained rate applies
+RATE_LIMIT_BURST = int(os.getenv("FOUNDAUDIO_RATE_LIMIT_BURST", "50"))
+
+# Requests allowed to wait for a token at once; further requests are shed immediately
+RATE_LIMIT_MAX_WAITERS = int(os.getenv("FOUNDAUDIO_RATE_LIMIT_MAX_WAITERS", "64"))
+
+# Longest a request may wait for a token; requests that would wait longer are shed
+RATE_LIMIT_MAX_WAIT = float(os.getenv("FOUNDAUDIO_RATE_LIMIT_MAX_WAIT", "1.0"))
+
+
+class RateLimitExceeded(RetryableToolError):
+    """A Supabase request was shed because the client-side rate limit is saturated."""
+
+
+class TokenBucket:
+    """A thread-safe token bucket with a bounded, first-come-first-served wait queue.
+
+    Tokens refill at `rate` per second up to `burst`. A request that finds no token
+    reserves the next one and sleeps until it is due, so waiters are served in arrival
+    order. A request is rejected without waiting when `max_waiters` requests are already
+    queued or its token would not be due within `max_wait` seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_waiters: int,
+        max_wait: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_waiters = max_waiters
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._waiters = 0
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.shed = 0
+
+    @property
+    def waiters(self) -> int:
+        """Requests currently sleeping until their token is due."""
+        return self._waiters
+
+    def acquire(self) -> float:
+        """Take one token, waiting for it if needed.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitExceeded: If the wait queue is full or the token is not due in time
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            # Tokens go negative as waiters reserve future ones; -tokens/rate is how long
+            # until this request's token has been refilled
+            wait = max(0.0, (1.0 - self._tokens) / self.rate)
+            if wait > 0 and self._waiters >= self.max_waiters:
+                self.shed += 1
+                raise RateLimitExceeded(
+                    "Too many requests are waiting for the audio database.",
+                    additional_prompt_content="The audio database is busy. Wait a few seconds and try again.",
+                )
+            if wait > self.max_wait:
+                self.shed += 1
+                raise RateLimitExceeded(
+                    "The audio database request rate limit is exhausted.",
+                    additional_prompt_content=f"The audio database is busy for about {wait:.1f} seconds. Wait and try again.",
+                )
+            self._tokens -= 1.0
+            self.admitted += 1
+            if wait == 0:
+                return 0.0
+            self._waiters += 1
+
+        try:
+            self._sleep(wait)
+        finally:
+            with self._lock:
+                self._waiters -= 1
+        return wait
+
+
+def _from_env() -> Optional[TokenBucket]:
+    if RATE_LIMIT_RPS <= 0:
+        return None
+    return TokenBucket(
+        RATE_LIMIT_RPS, RATE_LIMIT_BURST, RATE_LIMIT_MAX_WAITERS, RATE_LIMIT_MAX_WAIT
+    )
+
+
+rate_limited = registry.counter(
+    "foundaudio_supabase_requests_shed_total",
+    "Supabase requests rejected by the client-side rate limiter before being sent.",
+)
+
+# Shared by every pooled client, so the limit applies to the whole worker process
+supabase_limiter: Optional[TokenBucket] = _from_env()
+
+
+def limit_client(client: Any) -> None:
+    """Make every request on a Supabase client's PostgREST session take a token first."""
+    try:
+        session = client.postgrest.session
+    except AttributeError:
+        return
+    if isinstance(session, httpx.Client):
+        session.event_hooks["request"].append(_acquire_token)
+
+
+def _acquire_token(request: httpx.Request) -> None:
+    # Looked up per request so the limiter can be replaced (or turned off) at runtime
+    limiter = supabase_limiter
+    if limiter is None:
+        return
+    try:
+        limiter.acquire()
+    except RateLimitExceeded:
+        rate_limited.inc()
+        raise
@@ -0,0 +1,274 @@
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+from foundaudio import codec
+from foundaudio.cache import CacheBackend, K, V
+
+# Prefix of every key the toolkit writes, so a shared Redis can hold other data too
+KEY_PREFIX = "foundaudio:"
+
+# Socket timeout in seconds; a cache slower than this is treated as unavailable
+REDIS_TIMEOUT = 0.25
+
+# After a connection failure the cache is skipped (every lookup is a miss) for this many
+# seconds, so an unreachable Redis costs one timeout rather than one per call
+RETRY_AFTER = 5.0
+
+# Idle connections kept per cache for reuse by later calls
+MAX_IDLE_CONNECTIONS = 8
+
+Command = Sequence[Union[str, bytes, int]]
+
+
+class RedisError(Exception):
+    """An error reply from the server, or a reply the client cannot parse."""
+
+
+class RedisProtocolError(RedisError):
+    """A reply the client cannot parse; later replies on the connection are out of step."""
+
+
+class RedisConnection:
+    """One connection speaking the Redis serialization protocol (RESP2).
+
+    Commands may be pipelined: `pipeline` writes all of them before reading any reply,
+    so a batch costs one round trip.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: float = REDIS_TIMEOUT,
+    ):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        setup: List[Command] = []
+        if password:
+            setup.append(("AUTH", password))
+        if db:
+            setup.append(("SELECT", db))
+        if setup:
+            self.pipeline(setup)
+
+    def execute(self, *args: Union[str, bytes, int]) -> Any:
+        """Send one command and return its reply."""
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Command]) -> List[Any]:
+        """Send several commands in one write and return their replies in order.
+
+        Raises:
+            RedisError: If any command returned an error reply (after all replies are read)
+        """
+        self._sock.sendall(b"".join(_encode_command(command) for command in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+        finally:
+            self._sock.close()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Connection closed by the cache server")
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count < 0:
+                return None
+            return [self._read_reply() for _ in range(count)]
+        raise RedisProtocolError(f"Unexpected reply {line!r}")
+
+
+def _encode_command(args: Command) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, int):
+            arg = str(arg)
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def parse_redis_url(url: str) -> Dict[str, Any]:
+    """Split a redis://[:password@]host[:port][/db] URL into connection arguments."""
+    parts = urlsplit(url)
+    if parts.scheme != "redis":
+        raise ValueError(f"Unsupported cache URL scheme '{parts.scheme}'")
+    path = parts.path.strip("/")
+    return {
+        "host": parts.hostname or "127.0.0.1",
+        "port": parts.port or 6379,
+        "db": int(path) if path else 0,
+        "password": unquote(parts.password) if parts.password else None,
+    }
+
+
+class RedisCache(CacheBackend[K, V]):
+    """A cache stored in Redis (or any server speaking its protocol) and shared by replicas.
+
+    Values are encoded with `foundaudio.codec` and written with a per-key expiry, so the
+    server enforces the TTL. Cache trouble never fails a tool call: connection errors,
+    timeouts and undecodable entries all count as misses, and after a connection failure
+    the server is not contacted again for RETRY_AFTER seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        namespace: str,
+        ttl: Optional[float] = None,
+        timeout: float = REDIS_TIMEOUT,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._settings = parse_redis_url(url)
+        self._prefix = f"{KEY_PREFIX}{namespace}:".encode("utf-8")
+        self._idle: List[RedisConnection] = []
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+
+    def get(self, key: K) -> Optional[V]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        replies = self._run([("MGET", *[self._key(key) for key in keys])])
+        values = replies[0] if replies else [None] * len(keys)
+
+        found: Dict[K, V] = {}
+        for key, payload in zip(keys, values, strict=True):
+            if payload is not None:
+                try:
+                    found[key] = codec.loads(payload)
+                except codec.CodecError:
+                    pass
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[K, V]]) -> None:
+        commands: List[Command] = []
+        for key, value in items:
+            try:
+                payload = codec.dumps(value)
+            except codec.CodecError:
+                continue
+            command: List[Union[str, bytes, int]] = ["SET", self._key(key), payload]
+            if self.ttl is not None:
+                command += ["PX", max(1, int(self.ttl * 1000))]
+            commands.append(command)
+        if commands:
+            self._run(commands)
+
+    def delete(self, key: K) -> None:
+        self._run([("DEL", self._key(key))])
+
+    def clear(self) -> None:
+        """Delete every key in this cache's namespace and reset the counters."""
+        cursor = b"0"
+        while True:
+            replies = self._run([("SCAN", cursor, "MATCH", self._prefix + b"*", "COUNT", 500)])
+            if not replies:
+                break
+            cursor, keys = replies[0]
+            if keys:
+                self._run([("DEL", *keys)])
+            if cursor in (b"0", "0"):
+                break
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _key(self, key: K) -> bytes:
+        if isinstance(key, str):
+            return self._prefix + key.encode("utf-8")
+        # Composite keys (the listing cache's normalized queries) may hold datetimes, which
+        # the codec does not encode; their repr is deterministic and readable in redis-cli
+        return self._prefix + repr(key).encode("utf-8")
+
+    def _run(self, commands: Sequence[Command]) -> Optional[List[Any]]:
+        """Pipeline commands on a pooled connection; None if the server is unavailable."""
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            connection = self._acquire()
+        except (OSError, RedisError):
+            self._mark_down()
+            return None
+        try:
+            replies = connection.pipeline(commands)
+        except RedisProtocolError:
+            # Replies not read yet would answer the next commands sent on this connection
+            connection.close()
+            with self._lock:
+                self.errors += 1
+            return None
+        except RedisError:
+            # A well-formed error reply is read in full and leaves the connection usable
+            self._release(connection)
+            with self._lock:
+                self.errors += 1
+            return None
+        except (OSError, ValueError):
+            connection.close()
+            self._mark_down()
+            return None
+        self._release(connection)
+        return replies
+
+    def _acquire(self) -> RedisConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return RedisConnection(timeout=self.timeout, **self._settings)
+
+    def _release(self, connection: RedisConnection) -> None:
+        with self._lock:
+            if len(self._idle) < MAX_IDLE_CONNECTIONS:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def _mark_down(self) -> None:
+        with self._lock:
+            self.errors += 1
+            self._down_until = time.monotonic() + RETRY_AFTER
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
@@ -0,0 +1,190 @@
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Iterator, Optional
+
+import httpx
+from arcade_core.errors import RetryableToolError
+
+from foundaudio.metrics import registry
+
+# Seconds a Supabase request may take (connecting, waiting for and reading the response)
+SUPABASE_TIMEOUT = float(os.getenv("FOUNDAUDIO_SUPABASE_TIMEOUT", "10"))
+
+# Extra attempts for a read that failed transiently; 0 turns retries off
+SUPABASE_RETRIES = int(os.getenv("FOUNDAUDIO_SUPABASE_RETRIES", "2"))
+
+# Base of the exponential backoff between attempts, in seconds (full jitter is applied)
+RETRY_BACKOFF = 0.1
+
+# Longest Retry-After honoured; a server asking for more gets no retry within this call
+MAX_RETRY_AFTER = 2.0
+
+# Responses worth another attempt: rate limited, or the gateway could not reach PostgREST
+RETRY_STATUSES = frozenset({429, 502, 503, 504, 520})
+
+# Only reads are retried; a repeated write could apply twice
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+supabase_retries = registry.counter(
+    "foundaudio_supabase_retries_total",
+    "Supabase requests attempted again, by reason (status code, reset, ...).",
+    labels=("reason",),
+)
+
+
+class SupabaseUnavailable(RetryableToolError):
+    """Supabase could not answer a request in time, even after retries."""
+
+
+def _timed_out() -> SupabaseUnavailable:
+    return SupabaseUnavailable(
+        "The audio database did not answer in time.",
+        additional_prompt_content="The audio database is slow right now. Wait a few seconds and try again, or narrow the query.",
+    )
+
+
+def _unreachable() -> SupabaseUnavailable:
+    return SupabaseUnavailable(
+        "The connection to the audio database failed.",
+        additional_prompt_content="The audio database is unreachable right now. Wait a few seconds and try again.",
+    )
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Wrap an httpx transport to retry transient failures and bound each request's time.
+
+    GET and HEAD requests that fail with a status in RETRY_STATUSES or a dropped
+    connection are sent again up to `retries` times, after an exponential backoff with
+    full jitter (or the server's Retry-After, when it is short enough). A request gets
+    `timeout` seconds in total, retries and reading the body included: httpx's own read
+    timeout applies per read, so a server dripping a byte at a time never trips it.
+
+    Every failure that outlives the retries, and every timeout, is raised as
+    `SupabaseUnavailable` so tools report a retryable error instead of a generic database
+    failure. Raising (rather than returning the last 5xx) also keeps newer postgrest
+    clients from starting their own, much slower, retry loop on top.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        retries: int = SUPABASE_RETRIES,
+        timeout: float = SUPABASE_TIMEOUT,
+        backoff: float = RETRY_BACKOFF,
+        max_retry_after: float = MAX_RETRY_AFTER,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.transport = transport
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self._sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        deadline = time.monotonic() + self.timeout
+        retryable = request.method in RETRY_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TimeoutException as e:
+                raise _timed_out() from e
+            except (httpx.NetworkError, httpx.RemoteProtocolError) as e:
+                if not retryable or attempt >= self.retries:
+                    raise _unreachable() from e
+                self._wait(deadline, self._delay(attempt, None), "connection")
+                attempt += 1
+                continue
+
+            if not retryable or response.status_code not in RETRY_STATUSES:
+                response.stream = _DeadlineStream(response.stream, deadline)
+                return response
+
+            retry_after = _retry_after(response)
+            response.close()
+            if attempt >= self.retries or (
+                retry_after is not None and retry_after > self.max_retry_after
+            ):
+                raise SupabaseUnavailable(
+                    f"The audio database is unavailable (HTTP {response.status_code}).",
+                    additional_prompt_content="The audio database is busy. Wait a few seconds and try again.",
+                )
+            self._wait(deadline, self._delay(attempt, retry_after), str(response.status_code))
+            attempt += 1
+
+    def close(self) -> None:
+        self.transport.close()
+
+    def _delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, self.backoff * (2**attempt))
+
+    def _wait(self, deadline: float, delay: float, reason: str) -> None:
+        """Back off before the next attempt, unless that would overrun the deadline."""
+        if time.monotonic() + delay >= deadline:
+            raise _timed_out()
+        supabase_retries.inc(reason)
+        self._sleep(delay)
+
+
+class _DeadlineStream(httpx.SyncByteStream):
+    """A response body that must finish arriving before the request's deadline."""
+
+    def __init__(self, stream: Any, deadline: float):
+        self._stream = stream
+        self._deadline = deadline
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            for chunk in self._stream:
+                if time.monotonic() > self._deadline:
+                    raise _timed_out()
+                yield chunk
+        except httpx.TimeoutException as e:
+            raise _timed_out() from e
+        except (httpx.NetworkError, httpx.RemoteProtocolError) as e:
+            raise _unreachable() from e
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or an HTTP date), if present."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at: float = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - time.time())
+
+
+def hardened_session(transport: Optional[httpx.BaseTransport] = None) -> httpx.Client:
+    """Build the HTTP session for a Supabase client's PostgREST requests.
+
+    Requests get a deadline and are retried on transient failures by a `RetryTransport`
+    around `transport`, which defaults to an HTTP/2-capable connection pool like the one
+    postgrest builds for itself. Hand it to `create_client` as the `httpx_client` of its
+    options. httpx only reads proxy settings from the environment for clients whose
+    transport it builds, so they do not apply to this session.
+    """
+    retrying = RetryTransport(
+        transport if transport is not None else httpx.HTTPTransport(http2=True),
+        retries=max(0, SUPABASE_RETRIES),
+        timeout=SUPABASE_TIMEOUT,
+        backoff=RETRY_BACKOFF,
+        max_retry_after=MAX_RETRY_AFTER,
+    )
+    return httpx.Client(
+        transport=retrying, timeout=httpx.Timeout(SUPABASE_TIMEOUT), follow_redirects=True
+    )
@@ -0,0 +1,96 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from foundaudio.catalog import Record
+from foundaudio.text_features import (
+    TEXT_FEATURE_DIM,
+    feature_terms,
+    synonym_terms,
+    term_bucket,
+    tokenize,
+)
+from foundaudio.text_store import SEARCH_INDEX_DIR, TextFeatureStore, text_store
+
+# Weight of a synonym relative to a term the user actually typed
+SYNONYM_WEIGHT = 0.5
+
+SearchHit = Tuple[str, float]
+
+
+class SearchIndex:
+    """Hashed TF-IDF index of track titles and descriptions for offline semantic search.
+
+    Term frequencies are read from a `TextFeatureStore` (the shared one, or a store of
+    its own backed by a file in `directory`). Queries are expanded with synonyms,
+    weighted by IDF and scored against every track with two matrix-vector products
+    (cosine similarity); the top-k are selected with `argpartition`, so a query over
+    tens of thousands of tracks takes milliseconds.
+    """
+
+    def __init__(
+        self,
+        directory: str = SEARCH_INDEX_DIR,
+        text_dim: int = TEXT_FEATURE_DIM,
+        capacity: int = 1024,
+        store: Optional[TextFeatureStore] = None,
+    ):
+        if store is None:
+            store = TextFeatureStore(directory, text_dim, capacity)
+        self._store = store
+        self.text_dim = self._store.text_dim
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the memory-mapped matrix file, once the first track is indexed."""
+        return self._store.path
+
+    def upsert(self, records: List[Record]) -> None:
+        """Add new records or replace the text features of records already indexed."""
+        self._store.upsert(records)
+
+    def search(self, text: str, limit: int = 100) -> List[SearchHit]:
+        """Return the ids of the tracks whose text best matches `text`.
+
+        Args:
+            text: Free-text query; synonyms of known phrases are matched too
+            limit: Maximum number of hits to return
+
+        Returns:
+            (id, cosine score) pairs with a score above zero, best first; ties are
+            ordered by id descending so results page deterministically
+        """
+        query = self._query_vector(text)
+        if not query.any():
+            return []
+        with self._store.lock:
+            scores = self._store.cosine(query)
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+                candidates = candidates[top]
+            ids = self._store.ids
+            hits = [(ids[index], float(scores[index])) for index in candidates]
+        hits.sort(key=lambda hit: (hit[1], hit[0]), reverse=True)
+        return hits
+
+    def clear(self) -> None:
+        """Drop every indexed track and release the backing file."""
+        self._store.clear()
+
+    def _query_vector(self, text: str) -> np.ndarray:
+        terms = feature_terms(tokenize(text))
+        vector = np.zeros(self.text_dim, dtype=np.float32)
+        for term in terms:
+            vector[term_bucket(term, self.text_dim)] += 1.0
+        for synonym in synonym_terms(terms):
+            bucket = term_bucket(synonym, self.text_dim)
+            vector[bucket] = max(vector[bucket], SYNONYM_WEIGHT)
+        return vector
+
+
+# Semantic search over the shared text features, which follow the local catalog copy
+search_index = SearchIndex(store=text_store)
@@ -0,0 +1,74 @@
+import json
+import math
+from typing import Any, Dict, List, Tuple
+
+# Rough characters per token for JSON-serialized English text. Tokenizers differ, so this
+# errs on the side of over-estimating; budgets are a soft limit, not an exact count.
+CHARS_PER_TOKEN = 4
+
+# Truncated descriptions keep at least this many characters; a shorter fragment is
+# dropped along with its row instead
+MIN_DESCRIPTION_CHARS = 40
+
+ELLIPSIS = "…"
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate how many LLM tokens a value takes up once serialized as JSON."""
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def fit_rows(
+    rows: List[Dict[str, Any]], max_tokens: int
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Keep as many rows as fit in a token budget, truncating descriptions to make room.
+
+    Rows are measured one at a time in order. A row that does not fit with its full
+    description is kept with a shortened description if at least MIN_DESCRIPTION_CHARS
+    of it fit; otherwise it and every later row are dropped. The first row is always
+    kept (with its description cut to the minimum if needed) so the caller can page on.
+
+    Args:
+        rows: The rows to shape; never modified
+        max_tokens: Token budget for the rows
+
+    Returns:
+        The kept rows (copies where a description was shortened) and a report with the
+        estimated tokens used, the ids whose descriptions were truncated and how many
+        rows were omitted
+    """
+    kept: List[Dict[str, Any]] = []
+    truncated: List[str] = []
+    used = 0
+
+    for row in rows:
+        cost = estimate_tokens(row) + 1  # +1 for the separating comma
+        if used + cost <= max_tokens:
+            kept.append(row)
+            used += cost
+            continue
+
+        description = row.get("description")
+        if description:
+            # Characters left for the description once the rest of the row is paid for
+            base_cost = estimate_tokens({**row, "description": ""}) + 1
+            room = (max_tokens - used - base_cost) * CHARS_PER_TOKEN
+            if room >= MIN_DESCRIPTION_CHARS or not kept:
+                room = max(room, MIN_DESCRIPTION_CHARS)
+                shortened = description[: room - len(ELLIPSIS)].rstrip() + ELLIPSIS
+                row = {**row, "description": shortened}
+                kept.append(row)
+                truncated.append(row["id"])
+                used += estimate_tokens(row) + 1
+                break
+        if not kept:
+            kept.append(row)
+            used += cost
+        break
+
+    return kept, {
+        "estimated_tokens": used,
+        "descriptions_truncated": truncated,
+        "rows_omitted": len(rows) - len(kept),
+    }
@@ -0,0 +1,202 @@
+import math
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from foundaudio.catalog import Record, catalog
+from foundaudio.text_features import TEXT_FEATURE_DIM
+from foundaudio.text_store import TextFeatureStore, text_store
+
+# Relative importance of each signal in the combined similarity score
+DEFAULT_WEIGHTS = {"genre": 0.5, "text": 0.3, "duration": 0.2}
+
+SimilarTrack = Tuple[str, float, Dict[str, float]]
+
+
+class SimilarityIndex:
+    """Vectorized nearest-neighbour index over the local catalog.
+
+    Each track is a row in:
+
+    - the hashed term-frequency matrix of title + description in a `TextFeatureStore`
+      (the shared one, which semantic search reads too), weighted by IDF at query time
+    - log duration, so durations compare by ratio rather than absolute seconds
+    - genres as sparse one-hot rows: a posting list of rows per genre and a genre count
+      per row, so a query only touches the tracks that share one of its genres
+
+    Rows are the store's, so the text and the other signals of a track line up. A query
+    scores every track against one track with a few matrix-vector products, so ranking
+    the whole catalog takes milliseconds. Rows are updated in place as the catalog
+    reports new or changed records; arrays grow by doubling. Records are only queued on
+    upsert and indexed by the next query, so a catalog restore costs no feature building.
+
+    Without a `store`, the index keeps its text features in an in-memory store of its
+    own and fills it on `upsert`; the shared store is filled by its own catalog listener.
+    """
+
+    def __init__(
+        self,
+        text_dim: int = TEXT_FEATURE_DIM,
+        capacity: int = 1024,
+        store: Optional[TextFeatureStore] = None,
+    ):
+        self._owns_store = store is None
+        if store is None:
+            store = TextFeatureStore(directory=None, text_dim=text_dim, capacity=capacity)
+        self._store = store
+        self.text_dim = store.text_dim
+        self._lock = threading.Lock()
+        self._row_genres: List[Tuple[str, ...]] = []
+        self._genre_rows: Dict[str, Set[int]] = {}
+        self._genre_counts = np.zeros(capacity, dtype=np.float32)
+        self._log_duration = np.full(capacity, np.nan, dtype=np.float32)
+        # Records upserted but not indexed yet, by id; a later record replaces an earlier
+        self._pending: Dict[str, Record] = {}
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, audio_id: object) -> bool:
+        return audio_id in self._store
+
+    def upsert(self, records: List[Record]) -> None:
+        """Queue new records, or new versions of indexed ones, for the next query."""
+        with self._lock:
+            if self._owns_store:
+                self._store.upsert(records)
+            for record in records:
+                self._pending[record["id"]] = record
+
+    def similar(
+        self,
+        audio_id: str,
+        limit: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> List[SimilarTrack]:
+        """Return the tracks most similar to `audio_id`.
+
+        Args:
+            audio_id: Id of an indexed track
+            limit: Maximum number of similar tracks to return
+            weights: Optional override of DEFAULT_WEIGHTS
+
+        Returns:
+            (id, score, per-signal breakdown) tuples, most similar first
+
+        Raises:
+            KeyError: If the track is not in the index
+        """
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        # Store lock inside the index lock, the order upserts take them in
+        with self._lock, self._store.lock:
+            self._flush()
+            position = self._store.position(audio_id)
+            count = len(self._store)
+            if count < 2:
+                return []
+            # Rows another listener added to the store but this index has not seen yet
+            self._grow_rows(count)
+
+            genre = self._genre_similarity(position, count)
+            text = self._store.cosine(self._store.row(position))
+            duration = self._duration_similarity(position, count)
+            score = (
+                weights["genre"] * genre
+                + weights["text"] * text
+                + weights["duration"] * duration
+            )
+            score[position] = -np.inf
+
+            # argpartition finds the top-k in linear time; only those k get sorted
+            k = min(limit, count - 1)
+            top = np.argpartition(-score, k - 1)[:k]
+            top = top[np.argsort(-score[top], kind="stable")]
+            ids = self._store.ids
+            return [
+                (
+                    ids[index],
+                    float(score[index]),
+                    {
+                        "genre": round(float(genre[index]), 3),
+                        "text": round(float(text[index]), 3),
+                        "duration": round(float(duration[index]), 3),
+                    },
+                )
+                for index in top
+            ]
+
+    def clear(self) -> None:
+        """Drop every indexed track (the arrays keep their capacity)."""
+        with self._lock:
+            if self._owns_store:
+                self._store.clear()
+            self._pending.clear()
+            self._row_genres.clear()
+            self._genre_rows.clear()
+            self._genre_counts[:] = 0.0
+            self._log_duration[:] = np.nan
+
+    def _flush(self) -> None:
+        # Index queued records into the store's rows; callers hold the index lock
+        if not self._pending:
+            return
+        records = list(self._pending.values())
+        self._pending.clear()
+        positions = self._store.reserve(record["id"] for record in records)
+        self._grow_rows(len(self._store))
+        for record, position in zip(records, positions, strict=True):
+            for genre in self._row_genres[position]:
+                self._genre_rows[genre].discard(position)
+            genres = tuple({genre.strip().lower(): None for genre in record.get("genres") or []})
+            for genre in genres:
+                self._genre_rows.setdefault(genre, set()).add(position)
+            self._row_genres[position] = genres
+            self._genre_counts[position] = len(genres)
+
+            duration = record.get("duration")
+            self._log_duration[position] = (
+                math.log(duration) if duration and duration > 0 else np.nan
+            )
+
+    def _genre_similarity(self, position: int, count: int) -> np.ndarray:
+        # Cosine similarity of binary genre vectors: shared genres / sqrt(|a| * |b|).
+        # Only rows sharing a genre get an overlap, found through the posting lists.
+        overlap = np.zeros(count, np.float32)
+        for genre in self._row_genres[position]:
+            rows = np.fromiter(self._genre_rows[genre], dtype=np.intp)
+            overlap[rows] += 1.0
+        sizes = self._genre_counts[:count]
+        denominator = np.sqrt(sizes * sizes[position])
+        similarity: np.ndarray = np.divide(
+            overlap, denominator, out=np.zeros(count, np.float32), where=denominator > 0
+        )
+        return similarity
+
+    def _duration_similarity(self, position: int, count: int) -> np.ndarray:
+        # exp(-|log a - log b|) == shorter / longer, so 30 vs 60 minutes scores 0.5
+        log_duration = self._log_duration[:count]
+        similarity = np.exp(-np.abs(log_duration - log_duration[position]))
+        result: np.ndarray = np.nan_to_num(similarity, nan=0.0).astype(np.float32)
+        return result
+
+    def _grow_rows(self, needed: int) -> None:
+        self._row_genres.extend(() for _ in range(needed - len(self._row_genres)))
+        capacity = self._genre_counts.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._genre_counts = _resize_rows(self._genre_counts, capacity, 0.0)
+        self._log_duration = _resize_rows(self._log_duration, capacity, np.nan)
+
+
+def _resize_rows(array: np.ndarray, rows: int, fill: Any) -> np.ndarray:
+    grown = np.full((rows,) + array.shape[1:], fill, dtype=array.dtype)
+    grown[: array.shape[0]] = array
+    return grown
+
+
+# Shared index kept in sync with the local catalog copy
+similarity_index = SimilarityIndex(store=text_store)
+catalog.subscribe(similarity_index.upsert, reset=similarity_index.clear)
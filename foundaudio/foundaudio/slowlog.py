@@ -0,0 +1,246 @@
+import functools
+import inspect
+import json
+import logging
+import logging.handlers
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+
+from foundaudio.metrics import percentile
+
+# Calls slower than this many milliseconds are written to the slow-query log
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("FOUNDAUDIO_SLOW_QUERY_MS", "500"))
+
+# Where slow calls are logged; unset (the default) turns the log off
+SLOW_QUERY_LOG_PATH = os.getenv("FOUNDAUDIO_SLOW_QUERY_LOG")
+
+# The log is rotated at this size, keeping this many older files (path.1, path.2, ...)
+SLOW_QUERY_LOG_BYTES = int(os.getenv("FOUNDAUDIO_SLOW_QUERY_LOG_BYTES", "5242880"))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("FOUNDAUDIO_SLOW_QUERY_LOG_BACKUPS", "3"))
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Phase timings of the tool call running in the current thread or task, if logged
+_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "foundaudio_phases", default=None
+)
+
+
+class SlowQueryLog:
+    """A rotating JSONL file of tool calls that exceeded a latency threshold.
+
+    Each line is one JSON object with the call's timestamp, tool, normalized query shape,
+    total and per-phase milliseconds, returned row count and error kind (if it failed).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+        max_bytes: int = SLOW_QUERY_LOG_BYTES,
+        backups: int = SLOW_QUERY_LOG_BACKUPS,
+    ):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._handler: Optional[logging.handlers.RotatingFileHandler] = None
+        # Guards opening and closing the file, so concurrent first writes share one handler
+        self._lock = threading.Lock()
+
+    def _open(self) -> logging.handlers.RotatingFileHandler:
+        with self._lock:
+            if self._handler is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                self._handler = logging.handlers.RotatingFileHandler(
+                    self.path,
+                    maxBytes=self.max_bytes,
+                    backupCount=self.backups,
+                    encoding="utf-8",
+                )
+            return self._handler
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Append one entry, rotating the file first if it is full."""
+        handler = self._handler or self._open()
+        line = json.dumps(entry, separators=(",", ":"), default=str)
+        handler.handle(logging.makeLogRecord({"msg": line}))
+
+    def files(self) -> List[Path]:
+        """Return the current file and its rotated backups that exist, newest first."""
+        candidates = [Path(self.path)] + [
+            Path(f"{self.path}.{number}") for number in range(1, self.backups + 1)
+        ]
+        return [path for path in candidates if path.exists()]
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield every logged entry, skipping lines that are not valid JSON."""
+        for path in self.files():
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handler is not None:
+                self._handler.close()
+                self._handler = None
+
+
+# The log used by `log_slow_queries`, or None when it is turned off
+slow_query_log: Optional[SlowQueryLog] = (
+    SlowQueryLog(SLOW_QUERY_LOG_PATH) if SLOW_QUERY_LOG_PATH else None
+)
+
+
+def default_log_path() -> str:
+    """Return the configured log path, or where the README suggests putting it."""
+    return SLOW_QUERY_LOG_PATH or os.path.join(
+        tempfile.gettempdir(), "foundaudio", "slow-queries.jsonl"
+    )
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a phase of the current tool call for its slow-query log entry.
+
+    Costs one context variable lookup when the call is not being logged.
+    """
+    timings = _phases.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def log_slow_queries(
+    name: str, shape: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> Callable[[F], F]:
+    """Decorate a tool function to log calls slower than the threshold.
+
+    Apply it below `@tool`. Phases are timed with `phase()` inside the tool; time spent
+    outside any phase is reported as 'other'.
+
+    Args:
+        name: Tool name stored with each entry
+        shape: Function mapping the call's bound arguments to a normalized, JSON-safe
+            description of the query (which filters were set, never raw user text)
+    """
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            log = slow_query_log
+            if log is None:
+                return func(*args, **kwargs)
+
+            timings: Dict[str, float] = {}
+            token = _phases.set(timings)
+            started = time.perf_counter()
+            result: Any = None
+            error: Optional[str] = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            except RetryableToolError:
+                error = "retryable"
+                raise
+            except ToolExecutionError:
+                error = "execution"
+                raise
+            except Exception:
+                error = "unexpected"
+                raise
+            finally:
+                _phases.reset(token)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if elapsed_ms >= log.threshold_ms:
+                    bound = signature.bind_partial(*args, **kwargs)
+                    query = shape(bound.arguments)
+                    _write_entry(log, name, query, elapsed_ms, timings, result, error)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _write_entry(
+    log: SlowQueryLog,
+    name: str,
+    query: Dict[str, Any],
+    elapsed_ms: float,
+    timings: Dict[str, float],
+    result: Any,
+    error: Optional[str],
+) -> None:
+    phases = {key: round(value, 3) for key, value in timings.items()}
+    phases["other"] = round(max(elapsed_ms - sum(timings.values()), 0.0), 3)
+    entry = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "tool": name,
+        **query,
+        "elapsed_ms": round(elapsed_ms, 3),
+        "phases_ms": phases,
+        "rows": result.get("count") if isinstance(result, dict) else None,
+        "error": error,
+    }
+    try:
+        log.write(entry)
+    except OSError:
+        # A full disk or unwritable path must never fail the tool call
+        pass
+
+
+def summarize(entries: Iterator[Dict[str, Any]], top: int = 10) -> List[Dict[str, Any]]:
+    """Group slow-query entries by tool and shape, slowest total time first.
+
+    Returns:
+        Up to `top` groups with their call count, total/p50/p95/max milliseconds, mean
+        rows and the phase that took the most time overall
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for entry in entries:
+        groups.setdefault((entry.get("tool"), entry.get("shape")), []).append(entry)
+
+    summaries = []
+    for (tool_name, shape), calls in groups.items():
+        elapsed = sorted(call["elapsed_ms"] for call in calls)
+        phases: Dict[str, float] = {}
+        for call in calls:
+            for key, value in call.get("phases_ms", {}).items():
+                phases[key] = phases.get(key, 0.0) + value
+        rows = [call["rows"] for call in calls if call.get("rows") is not None]
+        summaries.append(
+            {
+                "tool": tool_name,
+                "shape": shape,
+                "calls": len(calls),
+                "total_ms": round(sum(elapsed), 1),
+                "p50_ms": round(percentile(elapsed, 0.50), 1),
+                "p95_ms": round(percentile(elapsed, 0.95), 1),
+                "max_ms": round(elapsed[-1], 1),
+                "mean_rows": round(sum(rows) / len(rows), 1) if rows else None,
+                "top_phase": max(phases, key=lambda name: phases[name]) if phases else None,
+                "errors": sum(1 for call in calls if call.get("error")),
+            }
+        )
+    summaries.sort(key=lambda summary: summary["total_ms"], reverse=True)
+    return summaries[:top]
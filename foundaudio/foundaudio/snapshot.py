@@ -0,0 +1,334 @@
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from foundaudio.models import AudioRecord
+
+Record = Mapping[str, Any]
+
+# Bumped whenever the layout changes; readers refuse snapshots of any other version
+FORMAT_VERSION = 1
+
+MAGIC = b"FACATSNP"
+
+# magic, version, column count, row count, created (unix seconds), watermark string ids
+_HEADER = struct.Struct("<8sIIQdII")
+_HEADER_SIZE = 64
+
+# column name, item type code, byte offset, item count
+_COLUMN = struct.Struct("<16ssxxxQQ")
+
+# Item types columns are stored as: uint8, uint32, uint64, float64
+_ITEM_CODES = ("B", "I", "Q", "d")
+
+# Columns start on 8-byte boundaries so every typed view is aligned
+_ALIGNMENT = 8
+
+# String id stored for a missing string (description, or no watermark)
+NULL_STRING = 0xFFFFFFFF
+
+# Per-row string id columns, in record order
+_STRING_COLUMNS = ("id", "title", "description", "user_id", "created_at", "updated_at")
+
+_COLUMNS = _STRING_COLUMNS + (
+    "duration",  # float64 per row, NaN when unknown
+    "genre_offsets",  # uint32 per row + 1: row i's genres are genres[offsets[i]:offsets[i+1]]
+    "genres",  # uint32 string ids
+    "id_order",  # uint32 row numbers sorted by id, for lookups
+    "heap_offsets",  # uint64 per string + 1: string i is heap[offsets[i]:offsets[i+1] - 1]
+    "heap",  # UTF-8 bytes of every distinct string, each followed by a NUL byte
+)
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a catalog snapshot this version can read."""
+
+
+def write_snapshot(
+    path: str,
+    records: Sequence[Record],
+    watermark: Optional[Tuple[str, str]] = None,
+) -> int:
+    """Write catalog records to a snapshot file, replacing it atomically.
+
+    Every distinct string (ids, titles, genres, timestamps) is stored once in the heap,
+    so repeated genres and uploaders cost four bytes per use. Strings are NUL-terminated,
+    which PostgreSQL text columns cannot contain, so the whole heap splits in one pass.
+
+    Args:
+        path: File to write; written next to it first, then renamed over it
+        records: Catalog records (`AudioRecord`s or `audio_file_from_row` dictionaries)
+        watermark: (updated_at, id) of the newest record the catalog has seen
+
+    Returns:
+        The size of the snapshot in bytes
+
+    Raises:
+        ValueError: If a string contains a NUL character; the message names the record
+    """
+    strings: Dict[str, int] = {}
+    heap = bytearray()
+    heap_offsets = [0]
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NULL_STRING
+        index = strings.get(value)
+        if index is None:
+            if "\0" in value:
+                raise ValueError(f"Cannot store a string containing NUL: {value!r}")
+            index = strings[value] = len(heap_offsets) - 1
+            heap.extend(value.encode("utf-8"))
+            heap.append(0)
+            heap_offsets.append(len(heap))
+        return index
+
+    columns: Dict[str, List[int]] = {name: [] for name in _STRING_COLUMNS}
+    durations: List[float] = []
+    genre_offsets = [0]
+    genres: List[int] = []
+    for record in records:
+        try:
+            for name in _STRING_COLUMNS:
+                columns[name].append(intern(record.get(name)))
+            genres.extend(intern(genre) for genre in record.get("genres") or ())
+        except ValueError as e:
+            raise ValueError(f"Record {record.get('id')!r}: {e}") from e
+        duration = record.get("duration")
+        durations.append(math.nan if duration is None else float(duration))
+        genre_offsets.append(len(genres))
+    id_order = sorted(range(len(records)), key=lambda row: records[row]["id"])
+    marks = (intern(watermark[0]), intern(watermark[1])) if watermark else (NULL_STRING,) * 2
+
+    arrays: List[Tuple[str, str, Any, int]] = [
+        (name, "I", columns[name], len(records)) for name in _STRING_COLUMNS
+    ]
+    arrays += [
+        ("duration", "d", durations, len(durations)),
+        ("genre_offsets", "I", genre_offsets, len(genre_offsets)),
+        ("genres", "I", genres, len(genres)),
+        ("id_order", "I", id_order, len(id_order)),
+        ("heap_offsets", "Q", heap_offsets, len(heap_offsets)),
+        ("heap", "B", heap, len(heap)),
+    ]
+
+    offset = _align(_HEADER_SIZE + _COLUMN.size * len(arrays))
+    directory = bytearray()
+    for name, code, _, count in arrays:
+        directory += _COLUMN.pack(name.encode("ascii"), code.encode("ascii"), offset, count)
+        offset = _align(offset + struct.calcsize(code) * count)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(arrays), len(records), time.time(), *marks)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as out:
+            out.write(header.ljust(_HEADER_SIZE, b"\0"))
+            out.write(directory)
+            for _, code, values, _ in arrays:
+                out.write(b"\0" * (_align(out.tell()) - out.tell()))
+                out.write(values if code == "B" else struct.pack(f"<{len(values)}{code}", *values))
+            size = out.tell()
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return size
+
+
+class CatalogSnapshot:
+    """A catalog snapshot mapped into memory, read in place.
+
+    Opening maps the file and checks its header and column directory; no rows are
+    decoded, so it takes about as long for a million rows as for ten. Each column is a
+    typed `memoryview` over the mapping and rows are decoded only when asked for, with
+    pages read from disk by the OS on first touch.
+
+    Use as a context manager, or call `close()`; rows already returned stay valid.
+
+    Raises:
+        SnapshotError: If the file is not a snapshot, has another format version, or is
+            truncated
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            # Columns are little-endian and viewed in place without byte swapping
+            raise SnapshotError("Catalog snapshots can only be read on little-endian hosts")
+        self.path = path
+        with open(path, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise SnapshotError(f"{path} is empty") from e
+        try:
+            self._columns = self._read_layout()
+        except Exception:
+            self._map.close()
+            raise
+        self._heap_offsets = self._columns["heap_offsets"]
+        self._heap = self._columns["heap"]
+
+    def _read_layout(self) -> Dict[str, memoryview]:
+        if len(self._map) < _HEADER_SIZE:
+            raise SnapshotError(f"{self.path} is too short to be a catalog snapshot")
+        magic, version, column_count, rows, created, *marks = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a catalog snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(
+                f"{self.path} has format version {version}, expected {FORMAT_VERSION}"
+            )
+        self.row_count: int = rows
+        self.created_at: float = created
+        self._marks = marks
+
+        if _HEADER_SIZE + column_count * _COLUMN.size > len(self._map):
+            raise SnapshotError(f"{self.path} is truncated (column directory)")
+        layout = {}
+        for index in range(column_count):
+            raw_name, raw_code, offset, count = _COLUMN.unpack_from(
+                self._map, _HEADER_SIZE + index * _COLUMN.size
+            )
+            name = raw_name.rstrip(b"\0").decode("ascii", "replace")
+            code = raw_code.decode("ascii", "replace")
+            if code not in _ITEM_CODES:
+                raise SnapshotError(f"{self.path} has an unknown column type {code!r}")
+            end = offset + struct.calcsize(code) * count
+            if end > len(self._map):
+                raise SnapshotError(f"{self.path} is truncated (column {name})")
+            layout[name] = (code, offset, end)
+        missing = [name for name in _COLUMNS if name not in layout]
+        if missing:
+            raise SnapshotError(f"{self.path} has no column {missing[0]}")
+
+        # Views are only taken once the layout checks out: the map cannot be closed
+        # while any view into it is alive
+        self._data = memoryview(self._map)
+        return {
+            name: self._data[offset:end].cast(code) for name, (code, offset, end) in layout.items()
+        }
+
+    def __enter__(self) -> "CatalogSnapshot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the column views and unmap the file."""
+        for view in self._columns.values():
+            view.release()
+        self._columns = {}
+        self._data.release()
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    @property
+    def watermark(self) -> Optional[Tuple[str, str]]:
+        """(updated_at, id) of the newest record when the snapshot was written."""
+        if NULL_STRING in self._marks:
+            return None
+        return self._string(self._marks[0]), self._string(self._marks[1])
+
+    def column(self, name: str) -> memoryview:
+        """Return a column as a typed view into the file, e.g. column('duration')[row]."""
+        return self._columns[name]
+
+    def _string(self, index: int) -> str:
+        offsets = self._heap_offsets
+        return str(self._heap[offsets[index] : offsets[index + 1] - 1], "utf-8")
+
+    def _text(self, index: int) -> Optional[str]:
+        return None if index == NULL_STRING else self._string(index)
+
+    def row(self, index: int) -> AudioRecord:
+        """Decode one row into a catalog record."""
+        return self._decode(index)
+
+    def get(self, audio_id: str) -> Optional[AudioRecord]:
+        """Find a row by id with a binary search over the id order; None if absent."""
+        ids = self._columns["id"]
+        order = self._columns["id_order"]
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(ids[order[middle]]) < audio_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self._string(ids[order[low]]) == audio_id:
+            return self.row(order[low])
+        return None
+
+    def records(self) -> List[AudioRecord]:
+        """Decode every row, in the order they were written.
+
+        Decodes column by column, splitting the heap into strings once.
+        """
+        columns = self._columns
+        # The heap ends with a NUL, so the split has one extra (empty) item at the end
+        strings = str(self._heap, "utf-8").split("\0")
+
+        def texts(name: str) -> List[Optional[str]]:
+            return [
+                None if index == NULL_STRING else strings[index]
+                for index in columns[name].tolist()
+            ]
+
+        genre_offsets = columns["genre_offsets"].tolist()
+        genre_ids = columns["genres"].tolist()
+        rows = zip(
+            texts("id"),
+            texts("title"),
+            texts("description"),
+            columns["duration"].tolist(),
+            texts("user_id"),
+            texts("created_at"),
+            texts("updated_at"),
+            strict=True,
+        )
+        records = []
+        for index, (audio_id, title, description, duration, user_id, created, updated) in (
+            enumerate(rows)
+        ):
+            genres = genre_ids[genre_offsets[index] : genre_offsets[index + 1]]
+            records.append(
+                AudioRecord(
+                    audio_id,
+                    title,
+                    description,
+                    None if math.isnan(duration) else duration,
+                    [strings[genre] for genre in genres],
+                    user_id,
+                    created,
+                    updated,
+                )
+            )
+        return records
+
+    def _decode(self, index: int) -> AudioRecord:
+        columns = self._columns
+        duration = columns["duration"][index]
+        genre_offsets = columns["genre_offsets"]
+        genres = columns["genres"][genre_offsets[index] : genre_offsets[index + 1]]
+        return AudioRecord(
+            self._string(columns["id"][index]),
+            self._string(columns["title"][index]),
+            self._text(columns["description"][index]),
+            None if math.isnan(duration) else duration,
+            [self._string(genre) for genre in genres],
+            self._string(columns["user_id"][index]),
+            self._string(columns["created_at"][index]),
+            self._string(columns["updated_at"][index]),
+        )
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -0,0 +1,22 @@
+from foundaudio.testing.dataset import generate_dataset
+from foundaudio.testing.fake_supabase import FakeSupabase
+from foundaudio.testing.faults import Fault, fixed, lognormal, uniform
+from foundaudio.testing.postgrest import (
+    PostgrestQueryError,
+    PostgrestStandIn,
+    StandInDatabase,
+)
+from foundaudio.testing.redis import RedisStandIn
+
+__all__ = [
+    "FakeSupabase",
+    "Fault",
+    "fixed",
+    "generate_dataset",
+    "lognormal",
+    "PostgrestQueryError",
+    "PostgrestStandIn",
+    "RedisStandIn",
+    "StandInDatabase",
+    "uniform",
+]
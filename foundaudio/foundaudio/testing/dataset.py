@@ -0,0 +1,120 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+# Usernames referenced by the eval scenarios are always present so that replayed
+# eval traffic resolves to real profiles instead of "username not found" errors.
+SEED_USERNAMES = ["discodude", "houseproducer", "djsample", "fidelio"]
+
+GENRES = [
+    "electronic",
+    "house",
+    "techno",
+    "disco",
+    "jazz",
+    "rock",
+    "hip hop",
+    "ambient",
+    "funk",
+    "drum and bass",
+]
+
+# Title/description vocabulary includes the search terms used by the eval suite
+# ("dance", "party", "high energy", "rock & roll", ...) so searches return rows.
+TITLE_WORDS = [
+    "dance",
+    "party",
+    "pool",
+    "sunset",
+    "midnight",
+    "groove",
+    "deep",
+    "rock & roll",
+    "uptempo",
+    "warehouse",
+    "rooftop",
+    "study",
+    "late night",
+    "sunrise",
+]
+_DESCRIPTION_PHRASES = [
+    "a high energy set recorded live",
+    "mellow grooves for a slow afternoon",
+    "party vibes from start to finish",
+    "deep cuts and rare records",
+    "an uptempo journey through the night",
+    "recorded at a rooftop session",
+    "perfect background music for studying",
+]
+
+
+def generate_dataset(
+    n_tracks: int = 1000,
+    n_users: int = 50,
+    seed: int = 7,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Generate a deterministic Found Audio catalog for the stand-in database.
+
+    The rows mirror the shape of the real `profiles` and `audio_files` tables closely
+    enough for the Supabase client (and therefore the tools) to run unmodified.
+
+    Args:
+        n_tracks: Number of audio_files rows to generate
+        n_users: Number of profiles rows to generate (at least the seed usernames)
+        seed: Random seed so that every run produces the same catalog
+
+    Returns:
+        A mapping of table name to list of row dictionaries
+    """
+    rng = random.Random(seed)
+
+    def new_id() -> str:
+        # uuid4 is not seedable, so derive stable ids from the seeded generator instead
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    usernames = list(SEED_USERNAMES)
+    while len(usernames) < n_users:
+        usernames.append(f"user{len(usernames)}")
+
+    epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    profiles = []
+    for username in usernames:
+        profiles.append(
+            {
+                "id": new_id(),
+                "username": username,
+                "email": f"{username}@example.com",
+                "created_at": _timestamp(epoch + timedelta(days=rng.randint(0, 60))),
+            }
+        )
+
+    audio_files = []
+    for _ in range(n_tracks):
+        owner = rng.choice(profiles)
+        created = epoch + timedelta(minutes=rng.randint(0, 60 * 24 * 600))
+        updated = created + timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        duration: Optional[float] = round(rng.uniform(60.0, 7200.0), 1)
+        if rng.random() < 0.05:
+            duration = None
+        audio_files.append(
+            {
+                "id": new_id(),
+                "title": " ".join(rng.sample(TITLE_WORDS, 2)).title(),
+                "description": (
+                    rng.choice(_DESCRIPTION_PHRASES) if rng.random() < 0.9 else None
+                ),
+                "duration": duration,
+                "genres": rng.sample(GENRES, rng.randint(1, 3)),
+                "user_id": owner["id"],
+                "created_at": _timestamp(created),
+                "updated_at": _timestamp(updated),
+            }
+        )
+
+    return {"profiles": profiles, "audio_files": audio_files}
+
+
+def _timestamp(value: datetime) -> str:
+    """Format a datetime the way PostgREST serializes `timestamptz` columns."""
+    return value.isoformat(timespec="microseconds")
@@ -0,0 +1,128 @@
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+import httpx
+from supabase import Client, ClientOptions, create_client
+
+from foundaudio.retries import hardened_session
+from foundaudio.testing.postgrest import (
+    PostgrestQueryError,
+    Row,
+    StandInDatabase,
+    _content_range,
+)
+
+# Path prefix of PostgREST requests made through a Supabase client
+REST_PREFIX = "/rest/v1/"
+
+# A recorded request: table name and decoded query string pairs, in request order
+RecordedQuery = Tuple[str, List[Tuple[str, str]]]
+
+
+class FakeSupabase:
+    """An in-process Supabase whose query builder runs against in-memory tables.
+
+    `create_client` returns a real Supabase client whose PostgREST session is served by
+    an `httpx.MockTransport` instead of the network, so every query the toolkit builds
+    (filters, `or` groups, ordering, limits, counts) is evaluated by `StandInDatabase`
+    exactly as `PostgrestStandIn` would, but without a server thread, socket or port.
+    Each test gets its own tables, which keeps the suite safe to run in parallel
+    processes (pytest -n auto).
+
+    Patch it in where the toolkit creates clients; the pooled client still gets
+    compression, metrics, the rate limiter and retries wrapped around the transport.
+    Network faults (latency, resets, slow bodies) need a real socket: use
+    `PostgrestStandIn` for those.
+
+    Example:
+        fake = FakeSupabase(generate_dataset(n_tracks=50))
+        monkeypatch.setattr("foundaudio.client.create_client", fake.create_client)
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Row]]] = None):
+        self.database = StandInDatabase(tables)
+        self.queries: List[RecordedQuery] = []
+        self._failures: Dict[str, PostgrestQueryError] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def request_count(self) -> int:
+        """Number of requests the fake has answered (or failed)."""
+        with self._lock:
+            return len(self.queries)
+
+    def insert(self, table: str, rows: Sequence[Row]) -> None:
+        """Seed rows into a table, creating it if needed."""
+        self.database.insert(table, rows)
+
+    def create_client(
+        self, url: str, key: str, options: Optional[ClientOptions] = None
+    ) -> Client:
+        """Create a Supabase client for `url` whose PostgREST requests are answered here.
+
+        Has the signature of `supabase.create_client`, so it can replace it. The client's
+        session is built like the toolkit's, deadline and retries included, around a
+        transport that answers in process.
+        """
+        session = hardened_session(httpx.MockTransport(self._handle))
+        options = (options or ClientOptions()).replace(httpx_client=session)
+        return create_client(url, key, options=options)
+
+    def fail(
+        self, table: str, message: str, status: int = 500, code: str = "XX000"
+    ) -> None:
+        """Answer every later request for `table` with a PostgREST error body."""
+        with self._lock:
+            self._failures[table] = PostgrestQueryError(message, code, status)
+
+    def last_query(self, table: str) -> Dict[str, List[str]]:
+        """Return the query string of the latest request for `table`, by parameter.
+
+        Raises:
+            LookupError: If `table` was never queried
+        """
+        with self._lock:
+            for name, params in reversed(self.queries):
+                if name == table:
+                    query: Dict[str, List[str]] = {}
+                    for key, value in params:
+                        query.setdefault(key, []).append(value)
+                    return query
+        raise LookupError(f"No request for table {table}")
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if not path.startswith(REST_PREFIX):
+            return _json_response(404, {"message": f"Unknown path {path}"})
+        if request.method not in ("GET", "HEAD"):
+            return _json_response(405, {"message": f"{request.method} is not supported"})
+
+        table = path[len(REST_PREFIX) :]
+        query = request.url.query.decode("ascii")
+        params = parse_qsl(query, keep_blank_values=True)
+        with self._lock:
+            self.queries.append((table, params))
+            failure = self._failures.get(table)
+        try:
+            if failure is not None:
+                raise failure
+            rows, total = self.database.query(table, params)
+        except PostgrestQueryError as e:
+            error = {"code": e.code, "message": e.message, "details": None, "hint": None}
+            return _json_response(e.status, error)
+
+        headers = {}
+        if "count=exact" in request.headers.get("Prefer", ""):
+            headers["Content-Range"] = _content_range(query, len(rows), total)
+        return _json_response(200, rows if request.method == "GET" else None, headers)
+
+
+def _json_response(
+    status: int, payload: Any, headers: Optional[Dict[str, str]] = None
+) -> httpx.Response:
+    content = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    response_headers = {"Content-Type": "application/json; charset=utf-8"}
+    response_headers.update(headers or {})
+    return httpx.Response(status, headers=response_headers, content=content)
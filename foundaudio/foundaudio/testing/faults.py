@@ -0,0 +1,57 @@
+import math
+import random
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# A latency distribution draws one delay in milliseconds from a random generator
+LatencyDistribution = Callable[[random.Random], float]
+
+
+def fixed(ms: float) -> LatencyDistribution:
+    """Always wait `ms` milliseconds."""
+    return lambda rng: ms
+
+
+def uniform(low_ms: float, high_ms: float) -> LatencyDistribution:
+    """Wait between `low_ms` and `high_ms` milliseconds, uniformly."""
+    return lambda rng: rng.uniform(low_ms, high_ms)
+
+
+def lognormal(median_ms: float, sigma: float = 0.5) -> LatencyDistribution:
+    """Wait a log-normally distributed time: mostly near `median_ms`, with a long tail.
+
+    This is the usual shape of database latency; sigma=0.5 puts the p99 at about 3.2x
+    the median and sigma=1.0 at about 10x.
+    """
+    mu = math.log(median_ms)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+@dataclass
+class Fault:
+    """A misbehaviour the PostgREST stand-in applies to matching requests.
+
+    Faults are registered per table with `PostgrestStandIn.inject` (or for every table
+    with "*"). Each request draws against `probability`; a fault with `times` set only
+    fires that many times, which models an outage that recovers. Effects combine in
+    order: the latency is waited first, then the connection is reset, or an error
+    status is returned, or the body is sent at `drip_bytes_per_s`.
+
+    Attributes:
+        latency: Extra delay before answering (see `fixed`, `uniform`, `lognormal`)
+        status: Answer with this HTTP status (e.g. 503, 429) and a non-JSON body, as an
+            API gateway does
+        retry_after: Retry-After header sent with `status`, in seconds
+        reset: Drop the connection without answering (a TCP reset)
+        drip_bytes_per_s: Send the normal body this slowly, in small chunks
+        probability: Share of matching requests the fault applies to
+        times: Number of requests the fault applies to before it stops (None: no limit)
+    """
+
+    latency: Optional[LatencyDistribution] = None
+    status: Optional[int] = None
+    retry_after: Optional[float] = None
+    reset: bool = False
+    drip_bytes_per_s: Optional[float] = None
+    probability: float = 1.0
+    times: Optional[int] = None
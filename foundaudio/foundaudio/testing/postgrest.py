@@ -0,0 +1,564 @@
+import json
+import random
+import re
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from foundaudio.compression import choose_encoding, compress
+from foundaudio.testing.faults import Fault
+
+# Bodies shorter than this are sent uncompressed, as gateways in front of PostgREST do
+COMPRESS_MIN_BYTES = 256
+
+# Slow-drip bodies are written in chunks of this many bytes
+DRIP_CHUNK_BYTES = 64
+
+# Query parameters that are part of the PostgREST protocol rather than column filters
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "or", "and", "on_conflict"}
+
+Row = Dict[str, Any]
+Predicate = Callable[[Row], bool]
+# Tests one column value against the literal of a filter
+Matcher = Callable[[Any], bool]
+
+
+class PostgrestQueryError(Exception):
+    """Raised when a request uses syntax the stand-in does not understand.
+
+    The HTTP layer turns this into a 400 response with a PostgREST-style error body,
+    which the Supabase client surfaces as an `APIError` - just like the real server.
+    """
+
+    def __init__(self, message: str, code: str = "PGRST100", status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.status = status
+
+
+class StandInDatabase:
+    """In-memory tables evaluated with (a useful subset of) PostgREST query semantics.
+
+    Supported: `select`, column filters (eq, neq, gt, gte, lt, lte, like, ilike, is,
+    in, cs, cd, ov and their `not.` negations), nested `or`/`and` groups, multi-column
+    `order` with nulls placement, `limit`/`offset` and exact counts.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Row]]] = None):
+        self._tables: Dict[str, List[Row]] = {
+            name: list(rows) for name, rows in (tables or {}).items()
+        }
+        self._lock = threading.Lock()
+
+    def table_names(self) -> List[str]:
+        """Return the names of the tables held by the database."""
+        return list(self._tables)
+
+    def rows(self, table: str) -> List[Row]:
+        """Return a snapshot of every row in a table."""
+        with self._lock:
+            return list(self._get_table(table))
+
+    def insert(self, table: str, rows: Sequence[Row]) -> None:
+        """Append rows to a table, creating it if needed."""
+        with self._lock:
+            self._tables.setdefault(table, []).extend(dict(row) for row in rows)
+
+    def query(
+        self, table: str, params: Sequence[Tuple[str, str]]
+    ) -> Tuple[List[Row], int]:
+        """Evaluate a PostgREST read request.
+
+        Args:
+            table: Table name from the request path
+            params: Decoded query string pairs, in request order
+
+        Returns:
+            The selected page of rows and the total number of matching rows
+        """
+        select = "*"
+        order = ""
+        limit: Optional[int] = None
+        offset = 0
+        predicates: List[Predicate] = []
+
+        for key, value in params:
+            if key == "select":
+                select = value
+            elif key == "order":
+                order = value
+            elif key == "limit":
+                limit = _parse_int(key, value)
+            elif key == "offset":
+                offset = _parse_int(key, value)
+            elif key in ("or", "and"):
+                predicates.append(_parse_group(key, value))
+            elif key not in RESERVED_PARAMS:
+                predicates.append(_parse_filter(key, value))
+
+        with self._lock:
+            matched = [
+                row
+                for row in self._get_table(table)
+                if all(predicate(row) for predicate in predicates)
+            ]
+
+        matched = _apply_order(matched, order)
+        total = len(matched)
+        page = matched[offset:] if limit is None else matched[offset : offset + limit]
+        return [_project(row, select) for row in page], total
+
+    def _get_table(self, table: str) -> List[Row]:
+        if table not in self._tables:
+            raise PostgrestQueryError(
+                f'relation "public.{table}" does not exist', code="42P01", status=404
+            )
+        return self._tables[table]
+
+
+class PostgrestStandIn:
+    """A local HTTP server that speaks enough PostgREST for the Supabase client.
+
+    Point `SUPABASE_URL` at `stand_in.url` and the toolkit runs unmodified against
+    the in-memory tables, which is what the load harness and resilience tests use.
+    Like Supabase's API gateway, it compresses responses with the best encoding the
+    request's Accept-Encoding allows unless `compression` is False.
+
+    Faults (latency distributions, error statuses, connection resets, slow-drip bodies)
+    can be injected per table with `inject`; `seed` makes their random draws repeatable.
+
+    Example:
+        with PostgrestStandIn(generate_dataset()) as stand_in:
+            os.environ["SUPABASE_URL"] = stand_in.url
+            stand_in.inject("audio_files", Fault(status=503, times=2))
+    """
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, List[Row]]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        compression: bool = True,
+        seed: Optional[int] = None,
+    ):
+        self.database = StandInDatabase(tables)
+        self.latency_ms = latency_ms
+        self.compression = compression
+        self.request_count = 0
+        self.faults_applied = 0
+        self._faults: Dict[str, List[Fault]] = {}
+        self._rng = random.Random(seed)
+        self._count_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _StandInRequestHandler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as `SUPABASE_URL`."""
+        host, port = self._server.socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "PostgrestStandIn":
+        """Serve requests on a background daemon thread."""
+        if self._thread is None:
+            # A short poll interval keeps stop() (one per test) from waiting half a second
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                name="postgrest-stand-in",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> "PostgrestStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def inject(self, table: str, fault: Fault) -> Fault:
+        """Apply a fault to requests for `table` ("*" for every table) and return it.
+
+        Faults on a table are checked in the order they were injected, before those for
+        "*"; the first that fires applies.
+        """
+        with self._count_lock:
+            self._faults.setdefault(table, []).append(fault)
+        return fault
+
+    def clear_faults(self) -> None:
+        """Remove every injected fault."""
+        with self._count_lock:
+            self._faults.clear()
+
+    def _record_request(self) -> None:
+        with self._count_lock:
+            self.request_count += 1
+
+    def _draw_fault(self, table: str) -> Tuple[Optional[Fault], float]:
+        """Pick the fault for one request and draw its latency in seconds."""
+        with self._count_lock:
+            for fault in self._faults.get(table, []) + self._faults.get("*", []):
+                if fault.times is not None and fault.times <= 0:
+                    continue
+                if self._rng.random() >= fault.probability:
+                    continue
+                if fault.times is not None:
+                    fault.times -= 1
+                self.faults_applied += 1
+                latency = fault.latency(self._rng) / 1000.0 if fault.latency else 0.0
+                return fault, latency
+        return None, 0.0
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps client connections alive, like a real PostgREST deployment
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY the body waits for the
+    # client's delayed ACK (about 40ms), which would swamp any injected latency
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self._handle_read(include_body=True)
+
+    def do_HEAD(self) -> None:
+        self._handle_read(include_body=False)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Keep load tests and pytest output quiet
+        return
+
+    def _handle_read(self, include_body: bool) -> None:
+        stand_in: PostgrestStandIn = self.server.stand_in  # type: ignore[attr-defined]
+        stand_in._record_request()
+        if stand_in.latency_ms > 0:
+            time.sleep(stand_in.latency_ms / 1000.0)
+
+        parts = urlsplit(self.path)
+        prefix = "/rest/v1/"
+        if not parts.path.startswith(prefix):
+            self._send_json(404, {"message": f"Unknown path {parts.path}"}, include_body)
+            return
+
+        table = parts.path[len(prefix) :]
+        fault, latency = stand_in._draw_fault(table)
+        if fault is not None:
+            if latency > 0:
+                time.sleep(latency)
+            if fault.reset:
+                self._reset_connection()
+                return
+            if fault.status is not None:
+                self._send_gateway_error(fault.status, fault.retry_after, include_body)
+                return
+
+        drip = fault.drip_bytes_per_s if fault is not None else None
+        try:
+            rows, total = stand_in.database.query(
+                table, parse_qsl(parts.query, keep_blank_values=True)
+            )
+        except PostgrestQueryError as e:
+            error = {"code": e.code, "message": e.message, "details": None, "hint": None}
+            self._send_json(e.status, error, include_body)
+            return
+
+        headers = {}
+        if "count=exact" in self.headers.get("Prefer", ""):
+            headers["Content-Range"] = _content_range(parts.query, len(rows), total)
+        self._send_json(200, rows, include_body, headers, drip)
+
+    def _reset_connection(self) -> None:
+        """Drop the connection with a TCP reset instead of answering."""
+        self.connection.setsockopt(
+            socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+        )
+        self.close_connection = True
+        self.connection.close()
+
+    def _send_gateway_error(
+        self, status: int, retry_after: Optional[float], include_body: bool
+    ) -> None:
+        """Answer like the API gateway in front of PostgREST: a plain-text error page."""
+        body = f"{status} {self.responses.get(status, ('Error',))[0]}".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body) if include_body else 0))
+        if retry_after is not None:
+            self.send_header("Retry-After", f"{retry_after:g}")
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def _send_json(
+        self,
+        status: int,
+        payload: Any,
+        include_body: bool,
+        headers: Optional[Dict[str, str]] = None,
+        drip_bytes_per_s: Optional[float] = None,
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        stand_in: PostgrestStandIn = self.server.stand_in  # type: ignore[attr-defined]
+        encoding = "identity"
+        if stand_in.compression and len(body) >= COMPRESS_MIN_BYTES:
+            encoding = choose_encoding(self.headers.get("Accept-Encoding", ""))
+            body = compress(body, encoding)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body) if include_body else 0))
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not include_body:
+            return
+        try:
+            if not drip_bytes_per_s:
+                self.wfile.write(body)
+                return
+            for start in range(0, len(body), DRIP_CHUNK_BYTES):
+                self.wfile.write(body[start : start + DRIP_CHUNK_BYTES])
+                self.wfile.flush()
+                time.sleep(DRIP_CHUNK_BYTES / drip_bytes_per_s)
+        except OSError:
+            # The client gave up waiting (a timeout while latency or a drip was injected)
+            self.close_connection = True
+
+
+# =============================================================================
+# QUERY STRING PARSING
+# =============================================================================
+
+
+def _parse_int(key: str, value: str) -> int:
+    try:
+        return int(value)
+    except ValueError as e:
+        raise PostgrestQueryError(f"Invalid value for {key}: {value}") from e
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas that are not nested in parentheses, braces or quotes."""
+    parts: List[str] = []
+    depth = 0
+    quoted = False
+    current: List[str] = []
+    escaped = False
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == "\\" and quoted:
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char in "({":
+            depth += 1
+        elif not quoted and char in ")}":
+            depth -= 1
+        elif char == "," and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return [part for part in parts if part]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def _parse_group(operator: str, value: str, negate: bool = False) -> Predicate:
+    """Parse an `or=(...)` / `and=(...)` logic tree into a predicate."""
+    if not (value.startswith("(") and value.endswith(")")):
+        raise PostgrestQueryError(f"Invalid logic tree: {operator}={value}")
+
+    children = [_parse_group_item(item) for item in _split_top_level(value[1:-1])]
+    combine = any if operator == "or" else all
+
+    def predicate(row: Row) -> bool:
+        result = combine(child(row) for child in children)
+        return not result if negate else result
+
+    return predicate
+
+
+def _parse_group_item(item: str) -> Predicate:
+    negate = item.startswith("not.")
+    body = item[4:] if negate else item
+    for operator in ("or", "and"):
+        if body.startswith(operator + "("):
+            return _parse_group(operator, body[len(operator) :], negate)
+
+    column, _, expression = item.partition(".")
+    if not expression:
+        raise PostgrestQueryError(f"Invalid filter: {item}")
+    return _parse_filter(column, expression)
+
+
+def _parse_filter(column: str, expression: str) -> Predicate:
+    """Parse a `column=op.value` filter (including `not.op.value`)."""
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    operator, _, raw = expression.partition(".")
+    matcher = _OPERATORS.get(operator)
+    if matcher is None:
+        raise PostgrestQueryError(f"Unsupported operator '{operator}' on {column}")
+    test = matcher(raw)
+
+    def predicate(row: Row) -> bool:
+        value = row.get(column)
+        if operator != "is" and value is None:
+            # SQL comparisons with NULL are never true, negated or not
+            return False
+        result = test(value)
+        return not result if negate else result
+
+    return predicate
+
+
+def _coerce(raw: str, sample: Any) -> Any:
+    """Convert a filter literal to the Python type of the row value."""
+    raw = _unquote(raw)
+    if isinstance(sample, bool):
+        return raw.lower() == "true"
+    if isinstance(sample, (int, float)):
+        try:
+            return float(raw)
+        except ValueError as e:
+            raise PostgrestQueryError(
+                f'invalid input syntax for type numeric: "{raw}"', code="22P02"
+            ) from e
+    return raw
+
+
+def _comparison(compare: Callable[[Any, Any], bool]) -> Callable[[str], Matcher]:
+    def build(raw: str) -> Matcher:
+        return lambda value: compare(value, _coerce(raw, value))
+
+    return build
+
+
+def _pattern(flags: int) -> Callable[[str], Matcher]:
+    def build(raw: str) -> Matcher:
+        pieces = re.split(r"[%*]", _unquote(raw))
+        regex = re.compile(".*".join(re.escape(piece) for piece in pieces), flags)
+        return lambda value: regex.fullmatch(str(value)) is not None
+
+    return build
+
+
+def _is(raw: str) -> Matcher:
+    expected = {"null": None, "true": True, "false": False}
+    if raw not in expected:
+        raise PostgrestQueryError(f"Invalid value for is: {raw}")
+    return lambda value: value is expected[raw]
+
+
+def _in(raw: str) -> Matcher:
+    if not (raw.startswith("(") and raw.endswith(")")):
+        raise PostgrestQueryError(f"Invalid value for in: {raw}")
+    options = [_unquote(option) for option in _split_top_level(raw[1:-1])]
+    return lambda value: any(value == _coerce(option, value) for option in options)
+
+
+def _array_literal(raw: str) -> List[str]:
+    if not (raw.startswith("{") and raw.endswith("}")):
+        raise PostgrestQueryError(f"Invalid array literal: {raw}")
+    return [_unquote(item) for item in _split_top_level(raw[1:-1])]
+
+
+def _set_operator(compare: Callable[[set, set], bool]) -> Callable[[str], Matcher]:
+    def build(raw: str) -> Matcher:
+        expected = set(_array_literal(raw))
+        return lambda value: compare(set(value), expected)
+
+    return build
+
+
+_OPERATORS: Dict[str, Callable[[str], Matcher]] = {
+    "eq": _comparison(lambda a, b: a == b),
+    "neq": _comparison(lambda a, b: a != b),
+    "gt": _comparison(lambda a, b: a > b),
+    "gte": _comparison(lambda a, b: a >= b),
+    "lt": _comparison(lambda a, b: a < b),
+    "lte": _comparison(lambda a, b: a <= b),
+    "like": _pattern(0),
+    "ilike": _pattern(re.IGNORECASE),
+    "is": _is,
+    "in": _in,
+    "cs": _set_operator(lambda value, expected: expected <= value),
+    "cd": _set_operator(lambda value, expected: value <= expected),
+    "ov": _set_operator(lambda value, expected: bool(value & expected)),
+}
+
+
+def _apply_order(rows: List[Row], order: str) -> List[Row]:
+    """Sort rows by a PostgREST `order` parameter (e.g. `duration.desc.nullslast,id.desc`)."""
+    terms = [term.split(".") for term in _split_top_level(order)]
+    # Stable sorts applied from the least to the most significant column
+    for column, *modifiers in reversed(terms):
+        descending = "desc" in modifiers
+        if "nullsfirst" in modifiers:
+            nulls_first = True
+        elif "nullslast" in modifiers:
+            nulls_first = False
+        else:
+            # Postgres default: NULLs sort as if larger than every other value
+            nulls_first = descending
+
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key=itemgetter(column), reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+def _project(row: Row, select: str) -> Row:
+    columns = [column.strip() for column in select.split(",") if column.strip()]
+    if not columns or "*" in columns:
+        return dict(row)
+    for column in columns:
+        if "(" in column or ":" in column:
+            raise PostgrestQueryError(f"Unsupported select expression: {column}")
+    return {column: row.get(column) for column in columns}
+
+
+def _content_range(query: str, page_size: int, total: int) -> str:
+    offset = 0
+    for key, value in parse_qsl(query):
+        if key == "offset" and value.isdigit():
+            offset = int(value)
+    if page_size == 0:
+        return f"*/{total}"
+    return f"{offset}-{offset + page_size - 1}/{total}"
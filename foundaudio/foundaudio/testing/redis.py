@@ -0,0 +1,186 @@
+import fnmatch
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RedisStandIn:
+    """A local TCP server that speaks enough of the Redis protocol for `RedisCache`.
+
+    Supported: PING, AUTH, SELECT, GET, MGET, SET (with EX/PX), DEL, EXISTS, SCAN (with
+    MATCH/COUNT), DBSIZE and FLUSHDB. Expired keys are dropped when read. Point
+    `FOUNDAUDIO_CACHE_URL` at `stand_in.url` to share caches between test replicas.
+    Set `raw_replies[command]` to answer a command with malformed bytes instead.
+
+    Example:
+        with RedisStandIn() as stand_in:
+            cache = RedisCache(stand_in.url, namespace="record", ttl=60)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands: List[str] = []
+        # Raw bytes sent instead of the real reply, by command name
+        self.raw_replies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer((host, port), _RespHandler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL to use as `FOUNDAUDIO_CACHE_URL`."""
+        host, port = self._server.socket.getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "RedisStandIn":
+        """Serve connections on a background daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                name="redis-stand-in",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "RedisStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def execute(self, args: List[bytes]) -> Any:
+        """Run one command and return its reply (an Exception for error replies)."""
+        name = args[0].decode("utf-8").upper()
+        with self._lock:
+            self.commands.append(name)
+            if name in self.raw_replies:
+                return RawReply(self.raw_replies[name])
+            handler = getattr(self, f"_cmd_{name.lower()}", None)
+            if handler is None:
+                return ValueError(f"ERR unknown command '{name}'")
+            return handler(args[1:])
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and time.monotonic() >= expires:
+            del self.data[key]
+            return None
+        return value
+
+    def _cmd_ping(self, args: List[bytes]) -> Any:
+        return SimpleString("PONG")
+
+    def _cmd_auth(self, args: List[bytes]) -> Any:
+        return SimpleString("OK")
+
+    def _cmd_select(self, args: List[bytes]) -> Any:
+        return SimpleString("OK")
+
+    def _cmd_get(self, args: List[bytes]) -> Any:
+        return self._live(args[0])
+
+    def _cmd_mget(self, args: List[bytes]) -> Any:
+        return [self._live(key) for key in args]
+
+    def _cmd_set(self, args: List[bytes]) -> Any:
+        if len(args) % 2:
+            # Every option takes an amount
+            return ValueError("ERR syntax error")
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        expires = None
+        for option, amount in zip(options[::2], args[3::2], strict=True):
+            if option == b"PX":
+                expires = time.monotonic() + int(amount) / 1000.0
+            elif option == b"EX":
+                expires = time.monotonic() + int(amount)
+            else:
+                return ValueError("ERR syntax error")
+        self.data[key] = (value, expires)
+        return SimpleString("OK")
+
+    def _cmd_del(self, args: List[bytes]) -> Any:
+        return sum(1 for key in args if self.data.pop(key, None) is not None)
+
+    def _cmd_exists(self, args: List[bytes]) -> Any:
+        return sum(1 for key in args if self._live(key) is not None)
+
+    def _cmd_scan(self, args: List[bytes]) -> Any:
+        # Everything is returned in one batch, which the protocol allows
+        if len(args) % 2 == 0:
+            return ValueError("ERR syntax error")
+        options = dict(zip([arg.upper() for arg in args[1::2]], args[2::2], strict=True))
+        pattern = options.get(b"MATCH", b"*").decode("latin-1")
+        keys = [
+            key
+            for key in list(self.data)
+            if self._live(key) is not None
+            and fnmatch.fnmatchcase(key.decode("latin-1"), pattern)
+        ]
+        return [b"0", keys]
+
+    def _cmd_dbsize(self, args: List[bytes]) -> Any:
+        return sum(1 for key in list(self.data) if self._live(key) is not None)
+
+    def _cmd_flushdb(self, args: List[bytes]) -> Any:
+        self.data.clear()
+        return SimpleString("OK")
+
+
+class SimpleString(str):
+    """A reply sent as a RESP simple string (`+OK`) rather than a bulk string."""
+
+
+class RawReply(bytes):
+    """A reply sent as it is, without RESP encoding."""
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        stand_in: RedisStandIn = self.server.stand_in  # type: ignore[attr-defined]
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            self.wfile.write(_encode_reply(stand_in.execute(args)))
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line.startswith(b"*"):
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+
+def _encode_reply(reply: Any) -> bytes:
+    if isinstance(reply, RawReply):
+        return bytes(reply)
+    if isinstance(reply, Exception):
+        return b"-" + str(reply).encode("utf-8") + b"\r\n"
+    if isinstance(reply, SimpleString):
+        return b"+" + reply.encode("utf-8") + b"\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode_reply(item) for item in reply)
@@ -0,0 +1,112 @@
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Number of hashed text feature buckets. Collisions are rare enough at this size for
+# catalog titles/descriptions while keeping one float32 row at 4 KiB.
+TEXT_FEATURE_DIM = 1024
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Very common words that carry no signal about what a track sounds like
+STOPWORDS = frozenset(
+    "a an and are at by for from in is it of on or the this to with my our your".split()
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase a text and split it into word tokens, dropping stopwords."""
+    if not text:
+        return []
+    return [
+        token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS
+    ]
+
+
+def feature_terms(tokens: List[str]) -> List[str]:
+    """Expand tokens with adjacent-word bigrams so phrases like "high energy" count."""
+    bigrams = zip(tokens[:-1], tokens[1:], strict=True)
+    return tokens + [f"{first} {second}" for first, second in bigrams]
+
+
+def term_bucket(term: str, dim: int = TEXT_FEATURE_DIM) -> int:
+    """Map a term to a feature bucket.
+
+    CRC32 is used instead of `hash()` because Python randomizes string hashes per
+    process, and feature matrices are persisted and shared between processes.
+    """
+    return zlib.crc32(term.encode("utf-8")) % dim
+
+
+def hashed_term_frequencies(
+    terms: Iterable[str], dim: int = TEXT_FEATURE_DIM
+) -> np.ndarray:
+    """Build a sublinear (1 + log tf) hashed term-frequency vector."""
+    vector = np.zeros(dim, dtype=np.float32)
+    buckets: Dict[int, int] = {}
+    for term, count in Counter(terms).items():
+        bucket = term_bucket(term, dim)
+        buckets[bucket] = buckets.get(bucket, 0) + count
+    for bucket, count in buckets.items():
+        vector[bucket] = 1.0 + math.log(count)
+    return vector
+
+
+def text_vector(*texts: Optional[str], dim: int = TEXT_FEATURE_DIM) -> np.ndarray:
+    """Hashed term-frequency vector for the concatenation of several texts."""
+    tokens: List[str] = []
+    for text in texts:
+        tokens.extend(tokenize(text))
+    return hashed_term_frequencies(feature_terms(tokens), dim)
+
+
+def inverse_document_frequency(document_frequency: np.ndarray, documents: int) -> np.ndarray:
+    """Smoothed IDF weights, computed from per-bucket document counts."""
+    return (np.log((1.0 + documents) / (1.0 + document_frequency)) + 1.0).astype(
+        np.float32
+    )
+
+
+# Words and phrases DJs use interchangeably. A query for any member also matches the
+# others, so "high energy" finds tracks described as "uptempo" without a network model.
+SYNONYM_GROUPS = (
+    ("uptempo", "up tempo", "high energy", "energetic", "banging", "peak time"),
+    ("chill", "chilled", "chillout", "mellow", "relaxed", "laid back", "downtempo"),
+    ("dark", "moody", "brooding"),
+    ("deep", "deeper"),
+    ("hard", "harder", "heavy", "pounding"),
+    ("groovy", "groove", "grooves", "funky"),
+    ("mix", "mixtape", "dj set", "set"),
+    ("live", "live set", "recorded live"),
+    ("dnb", "drum and bass", "jungle"),
+    ("hip hop", "hiphop", "rap"),
+    ("ambient", "atmospheric", "beatless"),
+)
+
+
+def _build_synonym_lookup() -> Dict[str, List[str]]:
+    lookup: Dict[str, List[str]] = {}
+    for group in SYNONYM_GROUPS:
+        terms = [" ".join(tokenize(phrase)) for phrase in group]
+        for term in terms:
+            lookup.setdefault(term, []).extend(other for other in terms if other != term)
+    return lookup
+
+
+_SYNONYMS = _build_synonym_lookup()
+
+
+def synonym_terms(terms: Iterable[str]) -> List[str]:
+    """Return the synonyms of any unigram/bigram terms that are not already present."""
+    terms = list(terms)
+    present = set(terms)
+    expanded: List[str] = []
+    for term in terms:
+        for synonym in _SYNONYMS.get(term, ()):
+            if synonym not in present and synonym not in expanded:
+                expanded.append(synonym)
+    return expanded
@@ -0,0 +1,216 @@
+import atexit
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from foundaudio.catalog import Record, catalog
+from foundaudio.text_features import (
+    TEXT_FEATURE_DIM,
+    inverse_document_frequency,
+    text_vector,
+)
+
+# Where the memory-mapped feature matrix lives (one file per worker process)
+SEARCH_INDEX_DIR = os.getenv(
+    "FOUNDAUDIO_SEARCH_INDEX_DIR", os.path.join(tempfile.gettempdir(), "foundaudio")
+)
+
+
+class TextFeatureStore:
+    """Hashed term frequencies of every catalog track's title and description.
+
+    Semantic search and `get_similar_audio` both score tracks by TF-IDF cosine over the
+    same features, so they read one store instead of each keeping a copy (4 KiB per
+    track at the default dimension). Rows are float32 in a matrix backed by a
+    memory-mapped `.npy` file when `directory` is set, so the features stay off the
+    Python heap and the OS can page them in and out as needed; without a directory the
+    matrix is an ordinary array. The matrix grows by doubling.
+
+    Indexes that keep other per-track arrays reserve their rows here, so every index
+    agrees on a track's row. Hold `lock` to read several rows and scores consistently.
+
+    `upsert` only queues records; they are tokenized and written on the first read,
+    so restoring a whole catalog does not featurize tracks nobody has searched yet.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = SEARCH_INDEX_DIR,
+        text_dim: int = TEXT_FEATURE_DIM,
+        capacity: int = 1024,
+    ):
+        self.directory = directory
+        self.text_dim = text_dim
+        self.lock = threading.RLock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._document_frequency = np.zeros(text_dim, dtype=np.float32)
+        self._path: Optional[str] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._capacity = capacity
+        # Cached per-row squared norms under the current IDF; invalidated by upserts
+        self._squared_norms: Optional[np.ndarray] = None
+        # Records upserted but not featurized yet, by id; a later record replaces an earlier
+        self._pending: Dict[str, Record] = {}
+
+    def __len__(self) -> int:
+        with self.lock:
+            self._flush()
+            return len(self._ids)
+
+    def __contains__(self, audio_id: object) -> bool:
+        with self.lock:
+            self._flush()
+            return audio_id in self._positions
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the memory-mapped matrix file, once the first track is stored."""
+        with self.lock:
+            self._flush()
+            return self._path
+
+    @property
+    def ids(self) -> List[str]:
+        """Track ids by row."""
+        with self.lock:
+            self._flush()
+            return self._ids
+
+    def position(self, audio_id: str) -> int:
+        """Return a track's row.
+
+        Raises:
+            KeyError: If the track is not stored
+        """
+        with self.lock:
+            self._flush()
+            return self._positions[audio_id]
+
+    def reserve(self, audio_ids: Iterable[str]) -> List[int]:
+        """Return the rows of tracks, adding empty rows for tracks not stored yet."""
+        with self.lock:
+            self._flush()
+            positions = []
+            for audio_id in audio_ids:
+                position = self._positions.get(audio_id)
+                if position is None:
+                    position = len(self._ids)
+                    self._ensure_capacity(position + 1)
+                    self._ids.append(audio_id)
+                    self._positions[audio_id] = position
+                positions.append(position)
+            return positions
+
+    def upsert(self, records: List[Record]) -> None:
+        """Queue new records, or new versions of stored ones, for featurizing."""
+        with self.lock:
+            for record in records:
+                self._pending[record["id"]] = record
+
+    def row(self, position: int) -> np.ndarray:
+        """Return a copy of one row's term frequencies."""
+        with self.lock:
+            self._flush()
+            if self._matrix is None:
+                raise IndexError(position)
+            return np.array(self._matrix[position])
+
+    def cosine(self, query: np.ndarray) -> np.ndarray:
+        """TF-IDF cosine similarity of a term-frequency vector to every stored row.
+
+        IDF is computed from the current document frequencies, so incremental updates
+        never go stale. cos(row * idf, q * idf) == row . (q * idf^2) / (|row * idf| |q * idf|),
+        so the IDF is folded into the query instead of weighting a copy of the matrix.
+        """
+        with self.lock:
+            self._flush()
+            count = len(self._ids)
+            matrix = self._matrix
+            if count == 0 or matrix is None:
+                return np.zeros(0, np.float32)
+            idf = inverse_document_frequency(self._document_frequency, count)
+            rows = matrix[:count]
+            if self._squared_norms is None:
+                self._squared_norms = np.square(rows) @ np.square(idf)
+            weighted_query = query * idf
+            dots = rows @ (weighted_query * idf)
+            denominator = np.sqrt(self._squared_norms) * np.linalg.norm(weighted_query)
+            scores: np.ndarray = np.divide(
+                dots, denominator, out=np.zeros(count, np.float32), where=denominator > 0
+            )
+            return scores
+
+    def clear(self) -> None:
+        """Drop every stored track and release the backing file."""
+        with self.lock:
+            self._pending.clear()
+            self._ids.clear()
+            self._positions.clear()
+            self._document_frequency[:] = 0.0
+            self._squared_norms = None
+            self._release()
+
+    def _flush(self) -> None:
+        # Tokenize queued records into their rows; every read calls this under the lock
+        if not self._pending:
+            return
+        records = list(self._pending.values())
+        self._pending.clear()
+        positions = self.reserve(record["id"] for record in records)
+        matrix = self._matrix
+        if matrix is None:
+            return
+        for record, position in zip(records, positions, strict=True):
+            # Rows start empty, so this only removes text the row already had
+            self._document_frequency -= matrix[position] > 0
+            vector = text_vector(
+                record.get("title"), record.get("description"), dim=self.text_dim
+            )
+            matrix[position] = vector
+            self._document_frequency += vector > 0
+        self._squared_norms = None
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if self._matrix is not None and needed <= self._matrix.shape[0]:
+            return
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+
+        path = None
+        matrix: np.ndarray
+        if self.directory is None:
+            matrix = np.zeros((capacity, self.text_dim), dtype=np.float32)
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, path = tempfile.mkstemp(
+                prefix=f"search-{os.getpid()}-", suffix=".npy", dir=self.directory
+            )
+            os.close(handle)
+            matrix = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float32, shape=(capacity, self.text_dim)
+            )
+        if self._matrix is not None:
+            matrix[: self._matrix.shape[0]] = self._matrix
+        self._release()
+        self._matrix, self._path, self._capacity = matrix, path, capacity
+
+    def _release(self) -> None:
+        # Drop the mapping before unlinking so the file can be removed on every OS
+        self._matrix = None
+        if self._path is not None:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+
+# Shared store kept in sync with the local catalog copy, read by search and similarity
+text_store = TextFeatureStore()
+catalog.subscribe(text_store.upsert, reset=text_store.clear)
+atexit.register(text_store.clear)
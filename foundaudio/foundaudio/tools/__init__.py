@@ -1,4 +1,13 @@
+from foundaudio.tools.get_audio_files_by_id import get_audio_files_by_id
 from foundaudio.tools.get_audio_list import get_audio_list
+from foundaudio.tools.get_similar_audio import get_similar_audio
+from foundaudio.tools.get_user_libraries import get_user_libraries
 from foundaudio.tools.hello import say_hello
 
-__all__ = ["say_hello", "get_audio_list"]
+__all__ = [
+    "say_hello",
+    "get_audio_list",
+    "get_audio_files_by_id",
+    "get_similar_audio",
+    "get_user_libraries",
+]
@@ -0,0 +1,116 @@
+from typing import Annotated, Any, Dict, List
+
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+from arcade_tdk import ToolContext, tool
+
+from foundaudio.cache import audio_file_cache
+from foundaudio.client import get_client, supabase_url
+from foundaudio.metrics import observe_tool
+from foundaudio.models import (
+    AUDIO_FILE_FIELDS,
+    audio_file_from_row,
+    audio_id_from_reference,
+)
+
+# Upper bound on ids per call - keeps the `in` filter (and the URL) a sensible size
+MAX_IDS = 100
+
+
+# NOTE: the Supabase [anon key](https://supabase.com/docs/guides/api/api-keys#anon-and-publishable-keys) is actually not a secret!
+# The secret ToolContext was used as a placeholder to show how to properly handle secrets in the toolkit.
+@tool(requires_secrets=["SUPABASE_ANON_KEY"])
+@observe_tool("get_audio_files_by_id")
+def get_audio_files_by_id(
+    context: ToolContext,
+    ids: Annotated[
+        List[str],
+        "Audio file ids (or foundaudio.club audio URLs) from earlier results to fetch details for (max: 100)",
+    ],
+) -> Dict[str, Any]:
+    """Get the details of specific audio files by their ids.
+
+    Use this tool to come back to tracks seen in earlier get_audio_list results instead of
+    re-running a search. Records returned by earlier listings are served from a per-id cache,
+    and any remaining ids are fetched from the Found Audio database in a single query.
+
+    Args:
+        ids: Audio file ids (or audio page URLs) to look up, up to 100 per call
+
+    Returns:
+        A dictionary containing the audio files (in the requested order), the ids that
+        were not found, and how many records were served from the cache
+
+    Raises:
+        RetryableToolError: If there's a recoverable error (e.g., no ids or too many ids)
+        ToolExecutionError: If there's an unrecoverable error (e.g., missing configuration)
+    """
+    # Normalize ids: accept audio page URLs, drop blanks and duplicates but keep the order
+    requested: List[str] = []
+    for raw_id in ids or []:
+        audio_id = audio_id_from_reference(raw_id)
+        if audio_id and audio_id not in requested:
+            requested.append(audio_id)
+
+    # Validate ids parameter - use RetryableToolError for parameter validation
+    if not requested:
+        raise RetryableToolError(
+            "Invalid ids parameter. Please provide at least one audio file id.",
+            additional_prompt_content="Pass the id values of audio files returned by get_audio_list.",
+        )
+    if len(requested) > MAX_IDS:
+        raise RetryableToolError(
+            f"Too many ids. Please request at most {MAX_IDS} audio files per call.",
+            additional_prompt_content=f"Split the ids into batches of at most {MAX_IDS} and call the tool once per batch.",
+        )
+
+    # Serve what we can from the record cache populated by earlier listings
+    found = audio_file_cache.get_many(requested)
+    cache_hits = len(found)
+    missing = [audio_id for audio_id in requested if audio_id not in found]
+
+    if missing:
+        try:
+            # Get Supabase configuration
+            url = supabase_url()
+            supabase_key = context.get_secret("SUPABASE_ANON_KEY")
+
+            if not supabase_key:
+                raise ToolExecutionError("SUPABASE_ANON_KEY secret is not configured")
+
+            # Get the pooled Supabase client
+            supabase = get_client(url, supabase_key)
+
+            # Fetch every id that was not cached in one round trip
+            response = (
+                supabase.from_("audio_files")
+                .select(AUDIO_FILE_FIELDS)
+                .in_("id", missing)
+                .execute()
+            )
+
+            # Rows are JSON objects; the isinstance check narrows the client's JSON type
+            fetched = [
+                audio_file_from_row(item)
+                for item in response.data or []
+                if isinstance(item, dict)
+            ]
+        except RetryableToolError:
+            # Re-raise RetryableToolError as-is (requests shed by the rate limiter)
+            raise
+        except Exception as e:
+            # For unexpected errors, raise ToolExecutionError (will be caught by @tool decorator)
+            raise ToolExecutionError(f"Error accessing audio database: {str(e)}") from e
+
+        audio_file_cache.put_many(
+            (audio_file["id"], dict(audio_file)) for audio_file in fetched
+        )
+        found.update((audio_file["id"], audio_file) for audio_file in fetched)
+
+    # Return copies in the requested order so callers can't mutate cached records
+    audio_files = [dict(found[audio_id]) for audio_id in requested if audio_id in found]
+    return {
+        "audio_files": audio_files,
+        "count": len(audio_files),
+        "not_found": [audio_id for audio_id in requested if audio_id not in found],
+        "cache_hits": cache_hits,
+    }
@@ -1,34 +1,173 @@
-import os
-from typing import Annotated, Any, Dict, List, Optional
+import base64
+import functools
+import json
+import re
+import time
+from datetime import datetime, timezone
+from typing import Annotated, Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from arcade_core.errors import RetryableToolError, ToolExecutionError
 from arcade_tdk import ToolContext, tool
-from pydantic import BaseModel
-from supabase import create_client
 
+from foundaudio.cache import LISTING_CACHE_TTL, audio_file_cache, listing_cache
+from foundaudio.catalog import catalog
+from foundaudio.client import get_client, supabase_url
+from foundaudio.hedging import hedged
+from foundaudio.materialized import materialized_listings
+from foundaudio.metrics import listing_revalidations, observe_tool
+from foundaudio.models import AUDIO_FILE_FIELDS, audio_file_from_row
+from foundaudio.planner import DEFAULT_MAX_STALENESS, planner, query_sources
+from foundaudio.profiles import lookup_user_id
+from foundaudio.profiling import profile_calls
+from foundaudio.queries import keyset_condition
+from foundaudio.ranking import top_by_relevance
+from foundaudio.shaping import estimate_tokens, fit_rows
+from foundaudio.slowlog import log_slow_queries, phase
+from foundaudio.search_index import search_index
+from foundaudio.workload import capture_calls, pseudonym
 
-class AudioFile(BaseModel):
-    """Audio file metadata structure."""
+# Sortable columns and their default direction (newest/longest first, titles A-Z)
+SORT_FIELDS = {
+    "created_at": "desc",
+    "updated_at": "desc",
+    "duration": "desc",
+    "title": "asc",
+}
 
-    id: str
-    title: str
-    description: Optional[str] = None
-    url: str
-    duration: Optional[float] = None
-    genres: List[str] = []
-    user_id: str
-    created_at: str
-    updated_at: str
+# How the search term is matched: literal substrings in the database, substring matches
+# ranked by where they match, or ranked locally by meaning over the catalog's TF-IDF index
+SEARCH_MODES = ("substring", "relevance", "semantic")
+
+# Search modes whose results are ordered by a relevance score instead of a column
+RANKED_SEARCH_MODES = ("relevance", "semantic")
+
+# Newest substring matches ranked per relevance-mode call; a larger pool finds better
+# title matches at the cost of transferring more rows
+RELEVANCE_CANDIDATES = 500
+
+# Semantic candidates are fetched with `id=in.(...)` in batches of this size, which keeps
+# the request URL well under common proxy limits with uuid ids
+SEMANTIC_BATCH_SIZE = 100
+
+# Most semantic candidates considered per call; results past this are not returned
+SEMANTIC_MAX_CANDIDATES = 1000
+
+# Smallest accepted max_response_tokens; below this not even one row reliably fits
+MIN_RESPONSE_TOKENS = 200
+
+# Characters with a meaning inside ilike patterns (PostgREST reads * as %) or in the
+# `or` filter the search is sent in; searches containing them are always sent to the
+# database rather than matched locally
+UNMATCHABLE_SEARCH_CHARS = frozenset('%_*\\,()"')
+
+# Columns the catalog can sort like the database. Titles are excluded because their
+# order follows the database collation, which Python string order does not reproduce.
+LOCAL_SORT_FIELDS = ("created_at", "updated_at", "duration")
+
+# (sort value, id) of a returned row - what a cursor needs to continue after it
+CursorKey = Tuple[Any, str]
+
+# Page size and sort of a call without arguments (the listing the warm-up prefetches)
+DEFAULT_LIMIT = 20
+DEFAULT_SORT = ("created_at", "desc")
+
+# Filters of a call without arguments; the keys match `_apply_filters`
+NO_FILTERS: Dict[str, Any] = {
+    "user_id": None,
+    "search": None,
+    "genre": None,
+    "min_duration": None,
+    "max_duration": None,
+    "created_from": None,
+    "created_to": None,
+}
+
+# Parameters whose presence (never their values) makes up a call's filter shape
+SHAPE_PARAMS = (
+    "username",
+    "search",
+    "genre",
+    "min_duration",
+    "max_duration",
+    "created_after",
+    "created_before",
+    "cursor",
+)
+
+
+def filter_shape(arguments: Dict[str, Any]) -> str:
+    """Describe which filters a call used without exposing their values.
+
+    The shape is a short, low-cardinality label such as 'genre+search|mode=relevance' or
+    'none|sort=duration', suitable for metrics and logs.
+    """
+    used = [
+        name
+        for name in SHAPE_PARAMS
+        if arguments.get(name) is not None and str(arguments[name]).strip()
+    ]
+    shape = "+".join(used) or "none"
+
+    sort = arguments.get("sort")
+    if sort and str(sort).strip():
+        field = re.split(r"[\s.:,]+", str(sort).strip().lower())[0]
+        shape += f"|sort={field if field in SORT_FIELDS else 'invalid'}"
+    mode = arguments.get("search_mode")
+    if mode and str(mode).strip():
+        mode = str(mode).strip().lower()
+        shape += f"|mode={mode if mode in SEARCH_MODES else 'invalid'}"
+    if arguments.get("max_response_tokens") is not None:
+        shape += "|budget"
+    return shape
+
+
+def query_shape(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a call for the slow-query log without keeping any user-supplied text.
+
+    Only the filter shape, the page size and the length of the search term are kept.
+    """
+    search = arguments.get("search")
+    return {
+        "shape": filter_shape(arguments),
+        "limit": arguments.get("limit", DEFAULT_LIMIT),
+        "search_length": len(search.strip()) if isinstance(search, str) else None,
+    }
+
+
+# Parameters holding text the user typed, replaced by pseudonyms in the workload capture
+PSEUDONYMIZED_PARAMS = ("search", "username")
+
+
+def capture_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep a call's parameters for the workload capture without any user-supplied text.
+
+    Searches and usernames become pseudonyms (equal text, equal pseudonym) and a cursor
+    becomes True: it only records that a following page was asked for.
+    """
+    captured: Dict[str, Any] = {}
+    for name, value in arguments.items():
+        if name == "context" or value is None:
+            continue
+        if name in PSEUDONYMIZED_PARAMS and isinstance(value, str) and value.strip():
+            value = pseudonym(value)
+        elif name == "cursor":
+            value = True
+        captured[name] = value
+    return captured
 
 
 # NOTE: the Supabase [anon key](https://supabase.com/docs/guides/api/api-keys#anon-and-publishable-keys) is actually not a secret!
 # The secret ToolContext was used as a placeholder to show how to properly handle secrets in the toolkit.
 @tool(requires_secrets=["SUPABASE_ANON_KEY"])
+@observe_tool("get_audio_list", shape=filter_shape)
+@log_slow_queries("get_audio_list", shape=query_shape)
+@capture_calls("get_audio_list", anonymize=capture_arguments)
+@profile_calls("get_audio_list", shape=filter_shape)
 def get_audio_list(
     context: ToolContext,
     limit: Annotated[
         Optional[int], "Number of audio files to return (default: 20, max: 100)"
-    ] = 20,
+    ] = DEFAULT_LIMIT,
     search: Annotated[
         Optional[str],
         "Search term to filter by title or description. Leave empty to get all audio files.",
@@ -38,10 +177,61 @@ def get_audio_list(
         Optional[str],
         "Username to filter audio files by specific user. If provided, only returns audio files from this user.",
     ] = None,
+    min_duration: Annotated[
+        Optional[float],
+        "Minimum duration in seconds (e.g. 3600 for tracks over an hour)",
+    ] = None,
+    max_duration: Annotated[
+        Optional[float],
+        "Maximum duration in seconds (e.g. 120 for tracks under 2 minutes)",
+    ] = None,
+    created_after: Annotated[
+        Optional[str],
+        "Only return audio files uploaded on or after this ISO 8601 date or datetime (e.g. 2025-01-01)",
+    ] = None,
+    created_before: Annotated[
+        Optional[str],
+        "Only return audio files uploaded on or before this ISO 8601 date or datetime (e.g. 2025-06-30)",
+    ] = None,
+    sort: Annotated[
+        Optional[str],
+        "Sort order: one of created_at, updated_at, duration or title, optionally followed by asc or desc "
+        "(e.g. 'duration desc' for the longest tracks). Default: 'created_at desc'. "
+        "Sorting by duration skips tracks without a known duration.",
+    ] = None,
+    cursor: Annotated[
+        Optional[str],
+        "The next_cursor value from a previous response, to fetch the following page with the same filters and sort",
+    ] = None,
+    search_mode: Annotated[
+        Optional[str],
+        "How the search term is matched: 'substring' (default) finds the exact text in titles or descriptions; "
+        "'relevance' finds the same matches but returns the best ones first (title before description, "
+        "exact before partial); 'semantic' also matches related words (e.g. 'high energy' finds 'uptempo'). "
+        "Relevance and semantic results are ordered by relevance, so sort cannot be set.",
+    ] = None,
+    max_response_tokens: Annotated[
+        Optional[int],
+        "Approximate upper bound on the size of the response in tokens (minimum 200). Long descriptions "
+        "are shortened and rows are left out to fit; use next_cursor to fetch the rest. Default: no limit.",
+    ] = None,
+    max_staleness: Annotated[
+        Optional[float],
+        "Oldest data in seconds the caller accepts (default: 60). Use 0 to read straight from the "
+        "database, e.g. right after an upload; larger values let more calls be answered locally.",
+    ] = None,
 ) -> Dict[str, Any]:
     """Get a list of audio files from the Found Audio database.
 
-    This tool retrieves audio files with optional filtering by search term, genre, or username.
+    This tool retrieves audio files with optional filtering by search term, genre, username,
+    duration range, or upload date range. Duration and date filters are applied by the database
+    so only matching rows are transferred. With search_mode 'semantic', the search term is
+    matched by meaning against a local TF-IDF index of the catalog; with 'relevance', substring
+    matches are ranked so title and exact matches come first. Both return the best matches first.
+    Column-sorted listings are answered by the cheapest source that is fresh enough for
+    max_staleness (a materialized view of the latest uploads, a cached page, the local
+    catalog copy or the database); the response's
+    `source` says which one did.
     When a username is provided, it first looks up the user ID from the profiles table,
     then filters audio files to only show those belonging to that user.
     It returns basic audio file information including title, description, duration, and metadata.
@@ -51,9 +241,22 @@ def get_audio_list(
         search: Optional search term to filter by title or description
         genre: Optional genre to filter by
         username: Optional username to filter audio files by specific user
+        min_duration: Optional minimum duration in seconds (inclusive)
+        max_duration: Optional maximum duration in seconds (inclusive)
+        created_after: Optional ISO 8601 date/datetime; only uploads at or after it
+        created_before: Optional ISO 8601 date/datetime; only uploads at or before it
+            (a plain date includes that whole day)
+        sort: Optional sort column and direction (default: created_at desc)
+        cursor: Optional next_cursor from a previous call to continue paging
+        search_mode: Optional 'substring' (default), 'relevance' or 'semantic' matching of `search`
+        max_response_tokens: Optional approximate token budget for the whole response
+        max_staleness: Optional oldest acceptable data in seconds (0 always queries the database)
 
     Returns:
-        A dictionary containing the audio files list and metadata
+        A dictionary containing the audio files list and metadata. When more rows are
+        available, `next_cursor` can be passed back to fetch the next page. With
+        max_response_tokens, a `trimmed` report lists shortened descriptions and
+        omitted rows.
 
     Raises:
         RetryableToolError: If there's a recoverable error (e.g., invalid parameters, username not found)
@@ -73,44 +276,112 @@ def get_audio_list(
             additional_prompt_content="Please provide a valid username or leave it empty to search all users.",
         )
 
+    # Validate duration range - durations are stored in seconds
+    for name, value in (("min_duration", min_duration), ("max_duration", max_duration)):
+        if value is not None and value < 0:
+            raise RetryableToolError(
+                f"Invalid {name} parameter. Duration cannot be negative.",
+                additional_prompt_content=f"The {name} parameter is a number of seconds and must be 0 or greater.",
+            )
+    if (
+        min_duration is not None
+        and max_duration is not None
+        and min_duration > max_duration
+    ):
+        raise RetryableToolError(
+            "Invalid duration range. min_duration cannot be greater than max_duration.",
+            additional_prompt_content="Please provide a min_duration that is less than or equal to max_duration.",
+        )
+
+    # Validate and normalize the upload date range so PostgREST receives unambiguous timestamps
+    created_from = _parse_timestamp("created_after", created_after, end_of_day=False)
+    created_to = _parse_timestamp("created_before", created_before, end_of_day=True)
+    if created_from and created_to and created_from > created_to:
+        raise RetryableToolError(
+            "Invalid date range. created_after cannot be later than created_before.",
+            additional_prompt_content="Please provide a created_after date that is on or before created_before.",
+        )
+
+    # Validate the search mode; ranked modes order by relevance instead of a column
+    mode = (search_mode or "substring").strip().lower()
+    if mode not in SEARCH_MODES:
+        raise RetryableToolError(
+            f"Invalid search_mode parameter '{search_mode}'.",
+            additional_prompt_content=f"search_mode must be one of {', '.join(SEARCH_MODES)}.",
+        )
+    ranked = mode in RANKED_SEARCH_MODES
+    semantic = mode == "semantic"
+    if ranked and not (search and search.strip()):
+        raise RetryableToolError(
+            f"search_mode '{mode}' requires a search term.",
+            additional_prompt_content="Provide a search term, or omit search_mode to list audio files.",
+        )
+    if ranked and sort and sort.strip():
+        raise RetryableToolError(
+            f"Results of search_mode '{mode}' are ordered by relevance and cannot be sorted.",
+            additional_prompt_content="Omit the sort parameter, or use search_mode 'substring' to sort by a column.",
+        )
+
+    if max_response_tokens is not None and max_response_tokens < MIN_RESPONSE_TOKENS:
+        raise RetryableToolError(
+            f"Invalid max_response_tokens parameter. Please use at least {MIN_RESPONSE_TOKENS}.",
+            additional_prompt_content=f"max_response_tokens must be {MIN_RESPONSE_TOKENS} or greater, or omitted for no limit.",
+        )
+
+    if max_staleness is not None and max_staleness < 0:
+        raise RetryableToolError(
+            "Invalid max_staleness parameter. It cannot be negative.",
+            additional_prompt_content="max_staleness is a number of seconds: 0 for live data, or omit it for the default.",
+        )
+
+    # Validate sort order and paging cursor before touching the database
+    # Ranked modes label their cursors with the mode, as their scores are not comparable
+    sort_field, sort_direction = (mode, "desc") if ranked else _parse_sort(sort)
+    after = _decode_cursor(cursor, sort_field, sort_direction) if cursor else None
+
+    # Echo the applied filters back so the agent can see what the results represent
+    metadata = {
+        "limit": limit,
+        "search": search,
+        "search_mode": mode,
+        "genre": genre,
+        "username": username,
+        "min_duration": min_duration,
+        "max_duration": max_duration,
+        "created_after": created_after,
+        "created_before": created_before,
+        "sort": f"{sort_field} {sort_direction}",
+        "max_response_tokens": max_response_tokens,
+        "max_staleness": max_staleness,
+    }
+
     try:
         # Get Supabase configuration
-        supabase_url = os.getenv(
-            "SUPABASE_URL", "https://msocrbprgpaqvrtrcqpo.supabase.co"
-        )
+        url = supabase_url()
         supabase_key = context.get_secret("SUPABASE_ANON_KEY")
 
         if not supabase_key:
             raise ToolExecutionError("SUPABASE_ANON_KEY secret is not configured")
 
-        # Create Supabase client
-        supabase = create_client(supabase_url, supabase_key)
+        # Get the pooled Supabase client
+        with phase("connect"):
+            supabase = get_client(url, supabase_key)
 
         # Look up user ID if username is provided
         # NOTE: This is where some complexity of dealing with intent-based implementation comes in
         user_id = None
         if username and username.strip():
             try:
-                # Query the profiles table to get user ID by username
-                # Using the exact API pattern from the user's example
-                # Select all fields to match the actual response structure
-                profile_response = (
-                    supabase.from_("profiles")
-                    .select("id, username, email, created_at")
-                    .eq("username", username.strip())
-                    .execute()
-                )
+                # Query the profiles table to get user ID by username (cached per username)
+                with phase("resolve_user"):
+                    user_id = lookup_user_id(supabase, username.strip())
 
-                if not profile_response.data or len(profile_response.data) == 0:
+                if user_id is None:
                     raise RetryableToolError(
                         f"Username '{username}' not found. Please check the username and try again.",
                         additional_prompt_content=f"The username '{username}' does not exist in the system. Please verify the username is correct.",
                     )
 
-                # Extract user ID from the first (and should be only) result
-                # The response structure is: [{"id": "uuid", "username": "discodude", "email": "...", "created_at": "..."}]
-                user_id = profile_response.data[0]["id"]
-
             except RetryableToolError:
                 # Re-raise RetryableToolError as-is (username not found)
                 raise
@@ -120,68 +391,75 @@ def get_audio_list(
                     f"Error looking up username '{username}': {str(e)}"
                 ) from e
 
-        # Build query - select fields that actually exist in the API response
-        select_fields = (
-            "id, title, description, duration, genres, user_id, created_at, updated_at"
-        )
-        query = supabase.from_("audio_files").select(select_fields)
-
-        # Apply user ID filter if username was provided and found
-        if user_id:
-            query = query.eq("user_id", user_id)
-
-        # Apply search filter
-        if search and search.strip():
-            query = query.or_(f"title.ilike.%{search}%,description.ilike.%{search}%")
-
-        # Apply genre filter
-        if genre and genre.strip():
-            query = query.contains("genres", [genre])
-
-        # Apply ordering and limit
-        query = query.order("created_at", desc=True).limit(limit)
-
-        # Execute query
-        response = query.execute()
-
-        if response.data is None:
-            return {
-                "audio_files": [],
-                "count": 0,
-                "limit": limit,
-                "search": search,
-                "genre": genre,
-                "username": username,
-            }
-
-        # Convert the raw data to dictionaries
-        audio_files = []
-        for item in response.data:
-            # Create AudioFile object first for validation
-            audio_file = AudioFile(
-                id=item["id"],
-                title=item["title"],
-                description=item.get("description"),
-                duration=item.get("duration"),
-                genres=item.get("genres", []),
-                user_id=item["user_id"],
-                created_at=item["created_at"],
-                updated_at=item["updated_at"],
-                url="https://foundaudio.club/audio/" + item["id"],
+        filters = {
+            **NO_FILTERS,
+            "user_id": user_id,
+            "search": None if semantic else search,
+            "genre": genre,
+            "min_duration": min_duration,
+            "max_duration": max_duration,
+            "created_from": created_from,
+            "created_to": created_to,
+        }
+
+        audio_files: Optional[List[Dict[str, Any]]]
+        # Ranked modes were validated to carry a search term; the check narrows its type
+        if ranked and search:
+            # Ranked pages always read the rows from the database
+            metadata["source"] = "database"
+            page = _semantic_page if semantic else _relevance_page
+            with phase("query"):
+                audio_files, cursor_keys, more = page(
+                    supabase,
+                    search,
+                    filters,
+                    limit if limit is not None else DEFAULT_LIMIT,
+                    after,
+                )
+            audio_file_cache.put_many(
+                (audio_file["id"], dict(audio_file)) for audio_file in audio_files
             )
+            with phase("shape"):
+                return _build_response(
+                    audio_files,
+                    cursor_keys,
+                    more,
+                    (sort_field, sort_direction),
+                    metadata,
+                    max_response_tokens,
+                )
 
-            # Convert to dictionary for return
-            audio_file_dict = audio_file.model_dump()
-            audio_files.append(audio_file_dict)
+        with phase("query"):
+            audio_files, metadata["source"] = answer_listing(
+                supabase,
+                filters,
+                (sort_field, sort_direction),
+                after,
+                limit,
+                DEFAULT_MAX_STALENESS if max_staleness is None else max_staleness,
+            )
+        if audio_files is None:
+            return {"audio_files": [], "count": 0, **metadata, "next_cursor": None}
 
-        return {
-            "audio_files": audio_files,
-            "count": len(audio_files),
-            "limit": limit,
-            "search": search,
-            "genre": genre,
-            "username": username,
-        }
+        # Remember every returned record so later lookups by id can skip the network
+        audio_file_cache.put_many(
+            (audio_file["id"], dict(audio_file)) for audio_file in audio_files
+        )
+
+        # A full page may have more rows after it; hand back a cursor to continue from
+        cursor_keys = [
+            (audio_file[sort_field], audio_file["id"]) for audio_file in audio_files
+        ]
+        more = limit is not None and len(audio_files) >= limit
+        with phase("shape"):
+            return _build_response(
+                audio_files,
+                cursor_keys,
+                more,
+                (sort_field, sort_direction),
+                metadata,
+                max_response_tokens,
+            )
 
     except RetryableToolError:
         # Re-raise RetryableToolError as-is
@@ -189,3 +467,545 @@ def get_audio_list(
     except Exception as e:
         # For unexpected errors, raise ToolExecutionError (will be caught by @tool decorator)
         raise ToolExecutionError(f"Error accessing audio database: {str(e)}") from e
+
+
+def answer_listing(
+    supabase: Any,
+    filters: Dict[str, Any],
+    sort: Tuple[str, str],
+    after: Optional[CursorKey],
+    limit: Optional[int],
+    max_staleness: float,
+) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+    """Answer one column-sorted page from the cheapest source fresh enough for the caller.
+
+    The planner weighs a materialized view holding the page, a cached copy of the page
+    (each only if no older than `max_staleness`), the local catalog copy (if loaded that recently and able to
+    evaluate the filters and sort) and the database. A database answer goes through
+    `fetch_listing`'s revalidation, so an expired cached page still costs only a probe.
+
+    The catalog does not see deletions until it is reloaded, so a deleted row can be
+    listed from it for as long as the caller's bound allows.
+
+    Returns:
+        The page (copies, safe to modify) or None if the database returned no data, and
+        the source that answered: 'view', 'cache', 'catalog' or 'database'
+    """
+    candidates = {}
+    view = materialized_listings.lookup(filters, sort, after, limit)
+    if view is not None:
+        candidates["view"] = (view[1], 1)
+    cache_key = _listing_key(filters, sort, after, limit)
+    cached = listing_cache.get(cache_key)
+    if cached is not None:
+        candidates["cache"] = (max(0.0, time.time() - cached["checked_at"]), 1)
+    catalog_age = catalog.age
+    if catalog_age is not None and _catalog_can_answer(filters, sort):
+        candidates["catalog"] = (catalog_age, len(catalog))
+    source, _ = planner.plan(candidates, max_staleness)
+
+    started = time.perf_counter()
+    audio_files: Optional[List[Dict[str, Any]]]
+    if source == "view" and view is not None:
+        audio_files = [dict(audio_file) for audio_file in view[0]]
+    elif source == "cache" and cached is not None:
+        audio_files = [dict(audio_file) for audio_file in cached["rows"]]
+    elif source == "catalog":
+        audio_files = _catalog_page(catalog.records(), filters, sort, after, limit)
+    else:
+        audio_files = _fetch_from_database(
+            supabase, cache_key, cached, filters, sort, after, limit
+        )
+    planner.record(
+        source, (time.perf_counter() - started) * 1000, candidates.get(source, (0, 1))[1]
+    )
+    query_sources.inc(source)
+    return audio_files, source
+
+
+def fetch_listing(
+    supabase: Any,
+    filters: Dict[str, Any],
+    sort: Tuple[str, str],
+    after: Optional[CursorKey],
+    limit: Optional[int],
+) -> Optional[List[Dict[str, Any]]]:
+    """Fetch one column-sorted page of audio files, served from the listing cache when fresh.
+
+    A cached page younger than LISTING_CACHE_TTL is returned as is. An older one is
+    revalidated first: a probe reads the newest `updated_at` and the row count of the
+    page's filter scope (one short row), and if both match the values stored with the
+    page it is served again and its TTL restarts. Only a changed scope costs a full
+    refetch. New rows bump the newest `updated_at`, edits do too, and deletions change
+    the count.
+
+    Args:
+        supabase: A Supabase client
+        filters: Keyword arguments for `_apply_filters`
+        sort: (column, direction) to order by
+        after: Optional (sort value, id) of the row to continue after
+        limit: Page size
+
+    Returns:
+        The page of validated audio file dictionaries (copies, safe to modify), or None
+        if the database returned no data
+    """
+    cache_key = _listing_key(filters, sort, after, limit)
+    cached = listing_cache.get(cache_key)
+    if cached is not None and time.time() - cached["checked_at"] <= LISTING_CACHE_TTL:
+        return [dict(audio_file) for audio_file in cached["rows"]]
+    return _fetch_from_database(supabase, cache_key, cached, filters, sort, after, limit)
+
+
+def _listing_key(
+    filters: Dict[str, Any],
+    sort: Tuple[str, str],
+    after: Optional[CursorKey],
+    limit: Optional[int],
+) -> Tuple[Any, ...]:
+    return (tuple(sorted(filters.items())), sort, after, limit)
+
+
+def _fetch_from_database(
+    supabase: Any,
+    cache_key: Tuple[Any, ...],
+    cached: Optional[Dict[str, Any]],
+    filters: Dict[str, Any],
+    sort: Tuple[str, str],
+    after: Optional[CursorKey],
+    limit: Optional[int],
+) -> Optional[List[Dict[str, Any]]]:
+    """Revalidate an expired cached page with a probe, or query the page and cache it."""
+    validator = None
+    if cached is not None:
+        try:
+            validator = _probe_listing(supabase, filters, sort, after)
+        except Exception:
+            # The full query below reports the error if the database is really down
+            listing_revalidations.inc("unavailable")
+        else:
+            if cached["validator"] is None:
+                listing_revalidations.inc("first")
+            elif validator == cached["validator"]:
+                listing_revalidations.inc("unchanged")
+                listing_cache.put(cache_key, {**cached, "checked_at": time.time()})
+                return [dict(audio_file) for audio_file in cached["rows"]]
+            else:
+                listing_revalidations.inc("changed")
+
+    sort_field, sort_direction = sort
+
+    # Build query - select fields that actually exist in the API response
+    query = _listing_query(supabase, AUDIO_FILE_FIELDS, filters, sort, after)
+
+    # Apply ordering (with id as a stable tiebreaker for equal sort values) and limit
+    descending = sort_direction == "desc"
+    query = query.order(sort_field, desc=descending).order("id", desc=descending)
+    query = query.limit(limit)
+
+    # Execute query, hedged against a slow response when FOUNDAUDIO_HEDGING is on
+    response = hedged("audio_files", query.execute)
+
+    if response.data is None:
+        return None
+
+    # Convert the raw data to validated dictionaries. A page fetched on a cold miss has
+    # no validator yet; it gets one the first time it expires, so only pages that are
+    # requested again pay for probes.
+    audio_files = [audio_file_from_row(item) for item in response.data]
+    listing_cache.put(
+        cache_key,
+        {
+            "rows": [dict(audio_file) for audio_file in audio_files],
+            "validator": validator,
+            "checked_at": time.time(),
+        },
+    )
+    return audio_files
+
+
+def _listing_query(
+    supabase: Any,
+    columns: str,
+    filters: Dict[str, Any],
+    sort: Tuple[str, str],
+    after: Optional[CursorKey],
+    count: Optional[str] = None,
+) -> Any:
+    """Select `columns` from the rows a listing page is drawn from (before order and limit)."""
+    sort_field, sort_direction = sort
+    query = supabase.from_("audio_files").select(columns, count=count)
+
+    # Apply user, search, genre, duration and upload date filters
+    query = _apply_filters(query, **filters)
+
+    # Apply keyset pagination: continue strictly after the last row of the previous page.
+    # Unlike OFFSET, this costs the same for every page when (sort column, id) is indexed.
+    if sort_field == "duration":
+        query = query.not_.is_("duration", "null")
+    if after is not None:
+        query = query.or_(keyset_condition(sort_field, sort_direction == "desc", *after))
+    return query
+
+
+def _probe_listing(
+    supabase: Any,
+    filters: Dict[str, Any],
+    sort: Tuple[str, str],
+    after: Optional[CursorKey],
+) -> List[Any]:
+    """Return [newest updated_at, row count] of a listing's scope with one tiny query."""
+    query = _listing_query(supabase, "updated_at", filters, sort, after, count="exact")
+    response = query.order("updated_at", desc=True).limit(1).execute()
+    newest = response.data[0]["updated_at"] if response.data else None
+    return [newest, response.count]
+
+
+def _build_response(
+    audio_files: List[Dict[str, Any]],
+    cursor_keys: List[CursorKey],
+    more: bool,
+    sort: Tuple[str, str],
+    metadata: Dict[str, Any],
+    max_response_tokens: Optional[int],
+) -> Dict[str, Any]:
+    """Assemble the tool response, fitting it to max_response_tokens when one is given.
+
+    The cursor continues after the last row actually returned, so rows left out to stay
+    within the token budget are the first rows of the next page.
+    """
+    trimmed = None
+    if max_response_tokens is not None:
+        # Pay for the envelope (metadata, count, cursor, report) before any rows
+        envelope = {
+            **metadata,
+            "count": 0,
+            "next_cursor": "x" * 96,
+            "trimmed": {
+                "estimated_tokens": 0,
+                "descriptions_truncated": [],
+                "rows_omitted": 0,
+            },
+        }
+        envelope_tokens = estimate_tokens(envelope)
+        audio_files, trimmed = fit_rows(audio_files, max_response_tokens - envelope_tokens)
+        trimmed["estimated_tokens"] += envelope_tokens
+
+    next_cursor = None
+    if audio_files and (more or len(audio_files) < len(cursor_keys)):
+        value, row_id = cursor_keys[len(audio_files) - 1]
+        next_cursor = _encode_cursor(*sort, value, row_id)
+
+    response = {
+        "audio_files": audio_files,
+        "count": len(audio_files),
+        **metadata,
+        "next_cursor": next_cursor,
+    }
+    if trimmed is not None:
+        response["trimmed"] = trimmed
+    return response
+
+
+def _apply_filters(
+    query: Any,
+    user_id: Optional[str],
+    search: Optional[str],
+    genre: Optional[str],
+    min_duration: Optional[float],
+    max_duration: Optional[float],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+) -> Any:
+    """Add the user, search, genre, duration and upload date filters to an audio_files query."""
+    # Apply user ID filter if username was provided and found
+    if user_id:
+        query = query.eq("user_id", user_id)
+
+    # Apply search filter
+    if search and search.strip():
+        query = query.or_(f"title.ilike.%{search}%,description.ilike.%{search}%")
+
+    # Apply genre filter
+    if genre and genre.strip():
+        query = query.contains("genres", [genre])
+
+    # Apply duration and upload date ranges as server-side comparisons
+    if min_duration is not None:
+        query = query.gte("duration", min_duration)
+    if max_duration is not None:
+        query = query.lte("duration", max_duration)
+    if created_from is not None:
+        query = query.gte("created_at", created_from.isoformat())
+    if created_to is not None:
+        query = query.lte("created_at", created_to.isoformat())
+    return query
+
+
+def _catalog_can_answer(filters: Dict[str, Any], sort: Tuple[str, str]) -> bool:
+    """Whether `_catalog_page` returns exactly what the database would for this listing."""
+    search = filters.get("search")
+    if search and search.strip() and UNMATCHABLE_SEARCH_CHARS.intersection(search):
+        return False
+    return sort[0] in LOCAL_SORT_FIELDS
+
+
+def _catalog_page(
+    records: Sequence[Mapping[str, Any]],
+    filters: Dict[str, Any],
+    sort: Tuple[str, str],
+    after: Optional[CursorKey],
+    limit: Optional[int],
+) -> List[Dict[str, Any]]:
+    """Filter, order and page catalog records the way `_fetch_from_database` queries them."""
+    sort_field, sort_direction = sort
+    descending = sort_direction == "desc"
+    if sort_field == "duration":
+        records = [record for record in records if record["duration"] is not None]
+    rows = [record for record in records if _matches_locally(record, **filters)]
+
+    def key(record: Mapping[str, Any]) -> Tuple[Any, str]:
+        return _local_sort_value(sort_field, record[sort_field]), record["id"]
+
+    if after is not None:
+        bound = (_local_sort_value(sort_field, after[0]), after[1])
+        rows = [row for row in rows if (key(row) < bound if descending else key(row) > bound)]
+    rows.sort(key=key, reverse=descending)
+    if limit is not None:
+        rows = rows[:limit]
+    return [dict(row) for row in rows]
+
+
+def _matches_locally(
+    record: Mapping[str, Any],
+    user_id: Optional[str],
+    search: Optional[str],
+    genre: Optional[str],
+    min_duration: Optional[float],
+    max_duration: Optional[float],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+) -> bool:
+    """Evaluate `_apply_filters` against one catalog record."""
+    if user_id and record["user_id"] != user_id:
+        return False
+    if search and search.strip():
+        needle = search.lower()
+        description = record["description"] or ""
+        if needle not in record["title"].lower() and needle not in description.lower():
+            return False
+    if genre and genre.strip() and genre not in record["genres"]:
+        return False
+    duration = record["duration"]
+    if min_duration is not None and (duration is None or duration < min_duration):
+        return False
+    if max_duration is not None and (duration is None or duration > max_duration):
+        return False
+    if created_from is not None or created_to is not None:
+        created_at = _row_timestamp(record["created_at"])
+        if created_from is not None and created_at < created_from:
+            return False
+        if created_to is not None and created_at > created_to:
+            return False
+    return True
+
+
+def _local_sort_value(field: str, value: Any) -> Any:
+    """Make a sort column comparable in Python the way the database compares it."""
+    if field == "duration":
+        return float(value)
+    return _row_timestamp(str(value))
+
+
+@functools.lru_cache(maxsize=65536)
+def _row_timestamp(value: str) -> datetime:
+    """Parse a timestamp as PostgREST returns it (trailing fraction zeros trimmed).
+
+    Python 3.10's fromisoformat needs exactly 3 or 6 fraction digits, so the fraction
+    is padded first. Catalog scans parse the same values on every call, hence the cache.
+    """
+    text = value.strip().replace("Z", "+00:00").replace(" ", "T", 1)
+    match = re.match(r"^(.*T\d{2}:\d{2}:\d{2})\.(\d+)(.*)$", text)
+    if match:
+        text = f"{match.group(1)}.{match.group(2)[:6].ljust(6, '0')}{match.group(3)}"
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _semantic_page(
+    supabase: Any,
+    search: str,
+    filters: Dict[str, Any],
+    limit: int,
+    after: Optional[Tuple[Any, str]],
+) -> Tuple[List[Dict[str, Any]], List[CursorKey], bool]:
+    """Rank the catalog against `search` locally and fetch one page of matches.
+
+    Candidate ids come from the local TF-IDF index (no database scan); they are then
+    fetched with `id=in.(...)` together with the other filters, in relevance order,
+    until a full page of rows survives the filters.
+
+    Returns:
+        The page of audio files (each with a `relevance` score), their cursor keys and
+        whether more matches follow
+    """
+    after_key = None
+    if after is not None:
+        score = after[0]
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise RetryableToolError(
+                "Invalid cursor parameter.",
+                additional_prompt_content="Pass the next_cursor value exactly as returned by the previous call, or omit it to start from the first page.",
+            )
+        after_key = (float(score), after[1])
+
+    catalog.ensure_fresh(supabase)
+    hits = search_index.search(search, limit=SEMANTIC_MAX_CANDIDATES)
+    if after_key is not None:
+        # Continue strictly after the last (score, id) of the previous page
+        hits = [hit for hit in hits if (hit[1], hit[0]) < after_key]
+
+    ranked: List[Tuple[Dict[str, Any], float]] = []
+    for start in range(0, len(hits), SEMANTIC_BATCH_SIZE):
+        batch = hits[start : start + SEMANTIC_BATCH_SIZE]
+        query = supabase.from_("audio_files").select(AUDIO_FILE_FIELDS)
+        query = _apply_filters(query.in_("id", [hit[0] for hit in batch]), **filters)
+        rows = {row["id"]: row for row in query.execute().data or []}
+        for audio_id, score in batch:
+            if audio_id in rows:
+                audio_file = audio_file_from_row(rows[audio_id])
+                audio_file["relevance"] = round(score, 4)
+                ranked.append((audio_file, score))
+        if len(ranked) > limit:
+            break
+
+    # One row past the page proves there is more to fetch
+    page = ranked[:limit]
+    return (
+        [audio_file for audio_file, _ in page],
+        [(score, audio_file["id"]) for audio_file, score in page],
+        len(ranked) > limit,
+    )
+
+
+def _relevance_page(
+    supabase: Any,
+    search: str,
+    filters: Dict[str, Any],
+    limit: int,
+    after: Optional[Tuple[Any, str]],
+) -> Tuple[List[Dict[str, Any]], List[CursorKey], bool]:
+    """Fetch the newest substring matches and return the best-ranked page of them.
+
+    Up to RELEVANCE_CANDIDATES matching rows are fetched in one query and ranked locally
+    with a bounded heap, so the best title match is returned even when it is not among
+    the most recent `limit` uploads.
+
+    Returns:
+        The page of audio files (each with a `relevance` score), their cursor keys and
+        whether more matches follow
+    """
+    after_key = None
+    if after is not None:
+        try:
+            score, created_at = after[0]
+            after_key = (float(score), str(created_at), after[1])
+        except (TypeError, ValueError):
+            raise RetryableToolError(
+                "Invalid cursor parameter.",
+                additional_prompt_content="Pass the next_cursor value exactly as returned by the previous call, or omit it to start from the first page.",
+            ) from None
+
+    query = supabase.from_("audio_files").select(AUDIO_FILE_FIELDS)
+    query = _apply_filters(query, **filters)
+    query = query.order("created_at", desc=True).order("id", desc=True)
+    response = query.limit(RELEVANCE_CANDIDATES).execute()
+    candidates = [audio_file_from_row(item) for item in response.data or []]
+
+    # Keep one extra result to know whether another page exists
+    top = top_by_relevance(candidates, search, limit + 1, after_key)
+    audio_files = []
+    cursor_keys: List[CursorKey] = []
+    for audio_file, (score, created_at, row_id) in top[:limit]:
+        audio_file["relevance"] = score
+        audio_files.append(audio_file)
+        cursor_keys.append(([score, created_at], row_id))
+    return audio_files, cursor_keys, len(top) > limit
+
+
+def _parse_timestamp(
+    name: str, value: Optional[str], end_of_day: bool
+) -> Optional[datetime]:
+    """Parse an ISO 8601 date or datetime parameter into a timezone-aware datetime.
+
+    Plain dates expand to the start of the day, or to the end of the day for upper bounds,
+    so that `created_before="2025-06-30"` includes uploads made on June 30th.
+    Naive values are treated as UTC, matching how Found Audio stores `created_at`.
+    """
+    if value is None or not value.strip():
+        return None
+
+    text = value.strip()
+    try:
+        # datetime.fromisoformat only understands a trailing "Z" from Python 3.11 onwards
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        raise RetryableToolError(
+            f"Invalid {name} parameter. '{value}' is not a valid ISO 8601 date.",
+            additional_prompt_content=f"Please provide {name} as a date like 2025-01-01 or a datetime like 2025-01-01T12:00:00Z.",
+        ) from None
+
+    if len(text) == 10 and end_of_day:
+        parsed = datetime.combine(parsed.date(), datetime.max.time())
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _parse_sort(sort: Optional[str]) -> Tuple[str, str]:
+    """Parse a sort parameter like 'duration desc' into a (column, direction) pair."""
+    if sort is None or not sort.strip():
+        return DEFAULT_SORT
+
+    parts = [part for part in re.split(r"[\s.:,]+", sort.strip().lower()) if part]
+    field = parts[0]
+    direction = parts[1] if len(parts) > 1 else SORT_FIELDS.get(field)
+    if field not in SORT_FIELDS or direction not in ("asc", "desc") or len(parts) > 2:
+        raise RetryableToolError(
+            f"Invalid sort parameter '{sort}'.",
+            additional_prompt_content=(
+                f"Sort must be one of {', '.join(SORT_FIELDS)}, optionally followed by asc or desc "
+                "(e.g. 'duration desc')."
+            ),
+        )
+    return field, direction
+
+
+def _encode_cursor(field: str, direction: str, value: Any, row_id: str) -> str:
+    """Encode the sort key of the last returned row as an opaque, URL-safe cursor."""
+    payload = json.dumps(
+        {"s": f"{field} {direction}", "v": value, "id": row_id}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, field: str, direction: str) -> Tuple[Any, str]:
+    """Decode a cursor into the (sort value, id) of the row to continue after."""
+    try:
+        padded = cursor.strip() + "=" * (-len(cursor.strip()) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort, value, row_id = payload["s"], payload["v"], payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise RetryableToolError(
+            "Invalid cursor parameter.",
+            additional_prompt_content="Pass the next_cursor value exactly as returned by the previous call, or omit it to start from the first page.",
+        ) from None
+
+    if sort != f"{field} {direction}":
+        raise RetryableToolError(
+            f"The cursor was created for sort '{sort}' but sort '{field} {direction}' was requested.",
+            additional_prompt_content="Use the same sort as the call that returned the cursor, or omit the cursor to start over.",
+        )
+    return value, str(row_id)
@@ -0,0 +1,108 @@
+from typing import Annotated, Any, Dict, Optional
+
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+from arcade_tdk import ToolContext, tool
+
+from foundaudio.catalog import catalog
+from foundaudio.client import get_client, supabase_url
+from foundaudio.metrics import observe_tool
+from foundaudio.models import audio_id_from_reference
+from foundaudio.similarity import similarity_index
+
+# Upper bound on similar tracks per call
+MAX_SIMILAR = 50
+
+
+# NOTE: the Supabase [anon key](https://supabase.com/docs/guides/api/api-keys#anon-and-publishable-keys) is actually not a secret!
+# The secret ToolContext was used as a placeholder to show how to properly handle secrets in the toolkit.
+@tool(requires_secrets=["SUPABASE_ANON_KEY"])
+@observe_tool("get_similar_audio")
+def get_similar_audio(
+    context: ToolContext,
+    audio_id: Annotated[
+        str,
+        "Id (or foundaudio.club audio URL) of the audio file to find similar tracks for",
+    ],
+    limit: Annotated[
+        Optional[int], "Maximum number of similar audio files to return (default: 10, max: 50)"
+    ] = 10,
+) -> Dict[str, Any]:
+    """Find audio files similar to a given track.
+
+    Tracks are ranked by a weighted blend of genre overlap, title/description text
+    similarity (TF-IDF) and how close their durations are. Ranking runs against an
+    in-process copy of the catalog that is refreshed incrementally, so only tracks
+    added or changed since the last call are fetched from the Found Audio database.
+
+    Args:
+        audio_id: Id or audio page URL of the track to start from
+        limit: Maximum number of similar audio files to return (1-50)
+
+    Returns:
+        A dictionary containing the source audio file and the most similar audio files,
+        each with an overall similarity score and a per-signal breakdown
+
+    Raises:
+        RetryableToolError: If there's a recoverable error (e.g., invalid parameters, unknown id)
+        ToolExecutionError: If there's an unrecoverable error (e.g., missing configuration)
+    """
+    # Validate parameters - use RetryableToolError for parameter validation
+    source_id = audio_id_from_reference(audio_id or "")
+    if not source_id:
+        raise RetryableToolError(
+            "Invalid audio_id parameter. Please provide an audio file id.",
+            additional_prompt_content="Pass the id of an audio file returned by get_audio_list.",
+        )
+    if limit is None or limit < 1 or limit > MAX_SIMILAR:
+        raise RetryableToolError(
+            f"Invalid limit parameter. Please use a value between 1 and {MAX_SIMILAR}.",
+            additional_prompt_content=f"The limit parameter must be between 1 and {MAX_SIMILAR} inclusive.",
+        )
+
+    try:
+        # Get Supabase configuration
+        url = supabase_url()
+        supabase_key = context.get_secret("SUPABASE_ANON_KEY")
+
+        if not supabase_key:
+            raise ToolExecutionError("SUPABASE_ANON_KEY secret is not configured")
+
+        # Get the pooled Supabase client
+        supabase = get_client(url, supabase_key)
+
+        # Bring the local catalog (and the similarity index subscribed to it) up to date
+        catalog.ensure_fresh(supabase)
+
+        source = catalog.get(source_id)
+        if source is None:
+            raise RetryableToolError(
+                f"Audio file '{source_id}' not found.",
+                additional_prompt_content="Use an id from a recent get_audio_list result.",
+            )
+
+        similar_audio_files = []
+        for similar_id, score, breakdown in similarity_index.similar(source_id, limit):
+            record = catalog.get(similar_id)
+            if record is None:
+                continue
+            similar_audio_files.append(
+                {
+                    **record,
+                    "similarity": round(score, 3),
+                    "similarity_breakdown": breakdown,
+                }
+            )
+
+        return {
+            "audio_file": dict(source),
+            "similar_audio_files": similar_audio_files,
+            "count": len(similar_audio_files),
+            "limit": limit,
+        }
+
+    except RetryableToolError:
+        # Re-raise RetryableToolError as-is (these are user-fixable errors)
+        raise
+    except Exception as e:
+        # For unexpected errors, raise ToolExecutionError (will be caught by @tool decorator)
+        raise ToolExecutionError(f"Error accessing audio database: {str(e)}") from e
@@ -0,0 +1,161 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any, Dict, List, Optional, Tuple
+
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+from arcade_tdk import ToolContext, tool
+
+from foundaudio.cache import audio_file_cache
+from foundaudio.client import get_client, supabase_url
+from foundaudio.metrics import observe_tool
+from foundaudio.models import AUDIO_FILE_FIELDS, audio_file_from_row
+from foundaudio.profiles import resolve_usernames
+
+# Upper bound on usernames per call; each found user costs one concurrent query
+MAX_USERNAMES = 10
+
+# Tracks returned per user unless the caller asks for more (max: 100)
+DEFAULT_LIMIT_PER_USER = 20
+
+
+# NOTE: the Supabase [anon key](https://supabase.com/docs/guides/api/api-keys#anon-and-publishable-keys) is actually not a secret!
+# The secret ToolContext was used as a placeholder to show how to properly handle secrets in the toolkit.
+@tool(requires_secrets=["SUPABASE_ANON_KEY"])
+@observe_tool("get_user_libraries")
+def get_user_libraries(
+    context: ToolContext,
+    usernames: Annotated[
+        List[str],
+        "Usernames of the artists whose uploads to list and compare (max: 10)",
+    ],
+    limit_per_user: Annotated[
+        Optional[int],
+        "Maximum number of audio files to return per user, newest first (default: 20, max: 100)",
+    ] = DEFAULT_LIMIT_PER_USER,
+) -> Dict[str, Any]:
+    """Get the uploads of several users at once, e.g. to compare what artists have published.
+
+    Use this tool instead of calling get_audio_list once per username. All usernames are
+    resolved with a single profiles query, then every user's newest tracks and total
+    upload count are fetched concurrently, so the call costs two round trips however
+    many users are asked for.
+
+    Args:
+        usernames: Usernames to look up, up to 10 per call
+        limit_per_user: Maximum number of audio files per user (1-100)
+
+    Returns:
+        A dictionary containing one library per found user (in the requested order) with
+        their newest audio files, how many were returned and how many they have in total,
+        plus the usernames that were not found
+
+    Raises:
+        RetryableToolError: If there's a recoverable error (e.g., no usernames, none of them found)
+        ToolExecutionError: If there's an unrecoverable error (e.g., missing configuration)
+    """
+    # Normalize usernames: drop blanks and duplicates but keep the order
+    requested: List[str] = []
+    for raw_name in usernames or []:
+        username = raw_name.strip()
+        if username and username not in requested:
+            requested.append(username)
+
+    # Validate parameters - use RetryableToolError for parameter validation
+    if not requested:
+        raise RetryableToolError(
+            "Invalid usernames parameter. Please provide at least one username.",
+            additional_prompt_content="Pass the usernames of the artists to compare.",
+        )
+    if len(requested) > MAX_USERNAMES:
+        raise RetryableToolError(
+            f"Too many usernames. Please request at most {MAX_USERNAMES} users per call.",
+            additional_prompt_content=f"Split the usernames into batches of at most {MAX_USERNAMES} and call the tool once per batch.",
+        )
+    if limit_per_user is None or limit_per_user < 1 or limit_per_user > 100:
+        raise RetryableToolError(
+            "Invalid limit_per_user parameter. Please use a value between 1 and 100.",
+            additional_prompt_content="The limit_per_user parameter must be between 1 and 100 inclusive.",
+        )
+
+    try:
+        # Get Supabase configuration
+        url = supabase_url()
+        supabase_key = context.get_secret("SUPABASE_ANON_KEY")
+
+        if not supabase_key:
+            raise ToolExecutionError("SUPABASE_ANON_KEY secret is not configured")
+
+        # Get the pooled Supabase client
+        supabase = get_client(url, supabase_key)
+
+        # Resolve every username in one profiles query (cached names need none)
+        user_ids = resolve_usernames(supabase, requested)
+        found = [username for username in requested if username in user_ids]
+        if not found:
+            raise RetryableToolError(
+                f"None of the usernames {requested} were found. Please check them and try again.",
+                additional_prompt_content="Verify the usernames are spelled exactly as on foundaudio.club.",
+            )
+
+        # Fetch each user's page concurrently on the pooled (thread-safe) client
+        with ThreadPoolExecutor(
+            max_workers=len(found), thread_name_prefix="foundaudio-library"
+        ) as executor:
+            pages = list(
+                executor.map(
+                    lambda username: fetch_library(
+                        supabase, user_ids[username], limit_per_user
+                    ),
+                    found,
+                )
+            )
+
+    except RetryableToolError:
+        # Re-raise RetryableToolError as-is (unknown users, requests shed by the rate limiter)
+        raise
+    except Exception as e:
+        # For unexpected errors, raise ToolExecutionError (will be caught by @tool decorator)
+        raise ToolExecutionError(f"Error accessing audio database: {str(e)}") from e
+
+    libraries = []
+    for username, (audio_files, total) in zip(found, pages, strict=True):
+        # Remember every returned record so later lookups by id can skip the network
+        audio_file_cache.put_many(
+            (audio_file["id"], dict(audio_file)) for audio_file in audio_files
+        )
+        libraries.append(
+            {
+                "username": username,
+                "user_id": user_ids[username],
+                "audio_files": audio_files,
+                "count": len(audio_files),
+                "total": total,
+            }
+        )
+
+    return {
+        "libraries": libraries,
+        "not_found": [username for username in requested if username not in user_ids],
+        "limit_per_user": limit_per_user,
+    }
+
+
+def fetch_library(
+    supabase: Any, user_id: str, limit: int
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Fetch a user's newest audio files and their total upload count in one query.
+
+    Returns:
+        The validated audio file dictionaries and the user's total number of audio files
+    """
+    response = (
+        supabase.from_("audio_files")
+        .select(AUDIO_FILE_FIELDS, count="exact")
+        .eq("user_id", user_id)
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    audio_files = [audio_file_from_row(item) for item in response.data or []]
+    total = response.count if response.count is not None else len(audio_files)
+    return audio_files, total
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from foundaudio.cache import audio_file_cache
+from foundaudio.catalog import catalog
+from foundaudio.client import get_client, supabase_url
+from foundaudio.profiles import resolve_usernames
+from foundaudio.tools.get_audio_list import (
+    DEFAULT_LIMIT,
+    DEFAULT_SORT,
+    NO_FILTERS,
+    fetch_listing,
+)
+
+# Warm-up is on by default; set FOUNDAUDIO_WARMUP=0 to turn it off
+WARMUP_ENABLED = os.getenv("FOUNDAUDIO_WARMUP", "1").strip().lower() not in (
+    "0",
+    "false",
+    "no",
+)
+
+# Seconds the warm-up may spend before it skips its remaining steps
+WARMUP_BUDGET = float(os.getenv("FOUNDAUDIO_WARMUP_BUDGET", "5"))
+
+# Comma-separated usernames to resolve up front (the most frequently requested ones)
+WARMUP_USERNAMES = [
+    name.strip()
+    for name in os.getenv("FOUNDAUDIO_WARMUP_USERNAMES", "").split(",")
+    if name.strip()
+]
+
+
+def warm_up(
+    url: str,
+    key: str,
+    usernames: Optional[List[str]] = None,
+    budget: float = WARMUP_BUDGET,
+) -> Dict[str, Any]:
+    """Prime the pooled client and caches so the first tool calls are not cold.
+
+    Steps run in order: create the pooled Supabase client, resolve `usernames` into the
+    username cache with one query, then prefetch the no-argument get_audio_list page
+    (which also opens the connection and completes the TLS handshake) and, when the
+    catalog has a snapshot file, restore the catalog from it and catch up. Once `budget`
+    seconds have passed the remaining steps are skipped; a step already in flight is
+    not interrupted. Failures are recorded, never raised, so a slow or unreachable
+    database cannot break worker startup.
+
+    Returns:
+        A report with the completed, skipped and failed steps and the elapsed seconds
+    """
+    started = time.monotonic()
+    report: Dict[str, Any] = {"completed": [], "skipped": [], "errors": {}}
+    state: Dict[str, Any] = {}
+
+    def create_client() -> None:
+        state["client"] = get_client(url, key)
+
+    def resolve() -> None:
+        resolve_usernames(state["client"], usernames or [])
+
+    def prefetch_listing() -> None:
+        audio_files = fetch_listing(
+            state["client"], dict(NO_FILTERS), DEFAULT_SORT, None, DEFAULT_LIMIT
+        )
+        audio_file_cache.put_many(
+            (audio_file["id"], audio_file) for audio_file in audio_files or []
+        )
+
+    steps: List[Tuple[str, Callable[[], None]]] = [("client", create_client)]
+    if usernames:
+        steps.append(("usernames", resolve))
+    steps.append(("default_listing", prefetch_listing))
+    if catalog.snapshot_path:
+        steps.append(("catalog", lambda: catalog.ensure_fresh(state["client"])))
+
+    for name, step in steps:
+        out_of_time = time.monotonic() - started > budget
+        if out_of_time or (name != "client" and "client" not in state):
+            report["skipped"].append(name)
+            continue
+        try:
+            step()
+            report["completed"].append(name)
+        except Exception as e:
+            report["errors"][name] = str(e)
+
+    report["elapsed"] = round(time.monotonic() - started, 3)
+    return report
+
+
+def start_warm_up() -> Optional[threading.Thread]:
+    """Run `warm_up` in a background thread when the toolkit is loaded by a worker.
+
+    Tool secrets normally arrive with each call, so warm-up only runs when the worker
+    process also has SUPABASE_ANON_KEY in its environment. The thread is a daemon, so
+    it never delays startup or shutdown.
+
+    Returns:
+        The started thread, or None when warm-up is disabled or not configured
+    """
+    key = os.getenv("SUPABASE_ANON_KEY")
+    if not WARMUP_ENABLED or not key:
+        return None
+
+    thread = threading.Thread(
+        target=warm_up,
+        args=(supabase_url(), key, WARMUP_USERNAMES, WARMUP_BUDGET),
+        name="foundaudio-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,308 @@
+import functools
+import hashlib
+import hmac
+import inspect
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+
+from foundaudio.metrics import percentile
+from foundaudio.slowlog import SlowQueryLog
+
+# Where captured calls are written; unset (the default) turns capture off
+CAPTURE_LOG_PATH = os.getenv("FOUNDAUDIO_CAPTURE_LOG")
+
+# Fraction of calls captured, from 0 to 1 (every call, the default when capture is on)
+CAPTURE_SAMPLE_RATE = float(os.getenv("FOUNDAUDIO_CAPTURE_SAMPLE_RATE", "1"))
+
+# The capture rotates like the slow-query log, but holds every call, so it is larger
+CAPTURE_LOG_BYTES = int(os.getenv("FOUNDAUDIO_CAPTURE_LOG_BYTES", "52428800"))
+CAPTURE_LOG_BACKUPS = int(os.getenv("FOUNDAUDIO_CAPTURE_LOG_BACKUPS", "3"))
+
+# Key for the pseudonyms that replace user-typed text. Give every replica the same key to
+# make repeats of one search recognizable across replicas; the default is random per
+# process, so pseudonyms cannot be matched against a dictionary of likely searches.
+CAPTURE_KEY = (os.getenv("FOUNDAUDIO_CAPTURE_KEY") or secrets.token_hex(32)).encode("utf-8")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Calls a workload is re-issued through: tool arguments in, tool result (or None) out
+ReplayTarget = Callable[[Dict[str, Any]], Any]
+
+
+# The capture written by `capture_calls`, or None when capture is turned off
+workload_log: Optional[SlowQueryLog] = (
+    SlowQueryLog(CAPTURE_LOG_PATH, 0.0, CAPTURE_LOG_BYTES, CAPTURE_LOG_BACKUPS)
+    if CAPTURE_LOG_PATH
+    else None
+)
+
+
+def pseudonym(text: str) -> Dict[str, str]:
+    """Replace user-typed text with a keyed hash that is equal for equal text."""
+    digest = hmac.new(CAPTURE_KEY, text.strip().encode("utf-8"), hashlib.sha256)
+    return {"pseudonym": digest.hexdigest()[:16]}
+
+
+def capture_calls(
+    name: str, anonymize: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> Callable[[F], F]:
+    """Decorate a tool function to record its calls for later replay.
+
+    Apply it below `@tool`. Each captured call is one JSONL line with the time it
+    started, the tool, its anonymized arguments, the milliseconds it took, the row count,
+    the source that answered it and the error kind (if it failed). The file uses the
+    rotating format of the slow-query log.
+
+    Args:
+        name: Tool name stored with each entry
+        anonymize: Function mapping the call's bound arguments (only those passed) to
+            JSON-safe arguments with user-typed text replaced by `pseudonym`
+    """
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            log = workload_log
+            if log is None or random.random() >= CAPTURE_SAMPLE_RATE:
+                return func(*args, **kwargs)
+
+            started_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            result: Any = None
+            error: Optional[str] = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            except RetryableToolError:
+                error = "retryable"
+                raise
+            except ToolExecutionError:
+                error = "execution"
+                raise
+            except Exception:
+                error = "unexpected"
+                raise
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                arguments = anonymize(signature.bind_partial(*args, **kwargs).arguments)
+                entry = {
+                    "ts": started_at.isoformat(timespec="milliseconds"),
+                    "tool": name,
+                    "args": arguments,
+                    "elapsed_ms": round(elapsed_ms, 3),
+                    "rows": result.get("count") if isinstance(result, dict) else None,
+                    "source": result.get("source") if isinstance(result, dict) else None,
+                    "error": error,
+                }
+                try:
+                    log.write(entry)
+                except OSError:
+                    # A full disk or unwritable path must never fail the tool call
+                    pass
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+
+@dataclass
+class ReplayResult:
+    """How a replayed workload ran, next to how it ran when it was captured."""
+
+    requests: int
+    errors: int
+    elapsed_s: float
+    captured_span_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    captured_p50_ms: float
+    captured_p95_ms: float
+    max_lag_ms: float
+    sources: Dict[str, int] = field(default_factory=dict)
+
+
+def load_workload(entries: Iterable[Dict[str, Any]], tool: str) -> List[Dict[str, Any]]:
+    """Keep the captured calls of one tool, in the order they started.
+
+    Rotated capture files are read newest first, so entries are sorted by timestamp.
+    """
+    calls = [entry for entry in entries if entry.get("tool") == tool and "ts" in entry]
+    calls.sort(key=lambda entry: entry["ts"])
+    return calls
+
+
+class Pseudonyms:
+    """Map pseudonyms back to real values from a replacement vocabulary.
+
+    Each distinct pseudonym gets the next value in order of first appearance, so calls
+    that repeated one search in production repeat one search in the replay and hit the
+    same cache entries. Once the vocabulary is used up, values are reused with a numeric
+    suffix: still distinct, but matching nothing, like long-tail searches usually do.
+    """
+
+    def __init__(self, vocabulary: Sequence[str]):
+        if not vocabulary:
+            raise ValueError("A replacement vocabulary needs at least one value")
+        self.vocabulary = list(vocabulary)
+        self._assigned: Dict[str, str] = {}
+
+    def resolve(self, token: str) -> str:
+        """Return the replacement for a pseudonym, assigning the next one if it is new."""
+        value = self._assigned.get(token)
+        if value is None:
+            index = len(self._assigned)
+            value = self.vocabulary[index % len(self.vocabulary)]
+            if index >= len(self.vocabulary):
+                value = f"{value} {index // len(self.vocabulary)}"
+            self._assigned[token] = value
+        return value
+
+
+def count_pseudonyms(calls: Iterable[Dict[str, Any]], parameter: str) -> int:
+    """Return how many distinct pseudonyms a workload holds for one parameter."""
+    return len(
+        {
+            call["args"][parameter]["pseudonym"]
+            for call in calls
+            if isinstance(call.get("args", {}).get(parameter), dict)
+        }
+    )
+
+
+def replay(
+    calls: Sequence[Dict[str, Any]],
+    target: ReplayTarget,
+    replacements: Dict[str, Sequence[str]],
+    speed: float = 1.0,
+    max_in_flight: int = 64,
+) -> ReplayResult:
+    """Re-issue captured calls with their original spacing, scaled by `speed`.
+
+    The replay is open-loop, as production traffic is: each call starts when it is due
+    whether or not earlier calls have finished, up to `max_in_flight` at once (later
+    calls wait, which shows as lag). speed=2 replays twice as fast; speed=0 issues calls
+    back to back.
+
+    A captured cursor only records that a next page was requested. The replay continues
+    from the next_cursor the target last returned for the same arguments, or asks for the
+    first page when there is none (e.g. for worker targets that return no result).
+
+    Args:
+        calls: Captured calls, in start order (see `load_workload`)
+        target: Issues one call and returns its result
+        replacements: Replacement vocabulary per pseudonymized parameter, e.g.
+            {"search": [...], "username": [...]}
+        speed: Replay speed relative to the capture (0: as fast as possible)
+        max_in_flight: Most calls running at once
+
+    Raises:
+        ValueError: If speed is negative, or a call has a pseudonym for a parameter
+            without a vocabulary
+    """
+    if speed < 0:
+        raise ValueError(f"speed must be 0 or more, got {speed}")
+    pseudonyms = {name: Pseudonyms(values) for name, values in replacements.items()}
+    offsets = _offsets(calls)
+    latencies: List[float] = []
+    lags: List[float] = []
+    sources: Counter = Counter()
+    next_cursors: Dict[str, Optional[str]] = {}
+    lock = threading.Lock()
+    errors = 0
+
+    def issue(arguments: Dict[str, Any], due: float) -> None:
+        nonlocal errors
+        # Pages of one listing share every argument but the cursor
+        chain = json.dumps(
+            {name: value for name, value in arguments.items() if name != "cursor"},
+            sort_keys=True,
+        )
+        if arguments.pop("cursor", None):
+            with lock:
+                cursor = next_cursors.get(chain)
+            if cursor:
+                arguments["cursor"] = cursor
+        started = time.perf_counter()
+        result = None
+        failed = False
+        try:
+            result = target(arguments)
+        except Exception:
+            failed = True
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed_ms)
+            lags.append(max(0.0, started - due) * 1000)
+            if failed:
+                errors += 1
+            if isinstance(result, dict):
+                sources[str(result.get("source"))] += 1
+                next_cursors[chain] = result.get("next_cursor")
+
+    # Resolved up front, in capture order, so pseudonyms map the same way on every run
+    workload = [_resolve(call.get("args", {}), pseudonyms) for call in calls]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as pool:
+        for arguments, offset in zip(workload, offsets, strict=True):
+            due = started + (offset / speed if speed else 0.0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(issue, arguments, due)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    captured = sorted(call["elapsed_ms"] for call in calls if "elapsed_ms" in call)
+    return ReplayResult(
+        requests=len(latencies),
+        errors=errors,
+        elapsed_s=round(elapsed, 3),
+        captured_span_s=round(offsets[-1], 3) if offsets else 0.0,
+        throughput_rps=round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        p50_ms=round(percentile(latencies, 0.50), 2),
+        p95_ms=round(percentile(latencies, 0.95), 2),
+        p99_ms=round(percentile(latencies, 0.99), 2),
+        captured_p50_ms=round(percentile(captured, 0.50), 2),
+        captured_p95_ms=round(percentile(captured, 0.95), 2),
+        max_lag_ms=round(max(lags, default=0.0), 2),
+        sources=dict(sources),
+    )
+
+
+def _offsets(calls: Sequence[Dict[str, Any]]) -> List[float]:
+    """Seconds from the first call's start to each call's start."""
+    if not calls:
+        return []
+    times = [datetime.fromisoformat(call["ts"]) for call in calls]
+    return [(moment - times[0]).total_seconds() for moment in times]
+
+
+def _resolve(arguments: Dict[str, Any], pseudonyms: Dict[str, Pseudonyms]) -> Dict[str, Any]:
+    resolved = {}
+    for name, value in arguments.items():
+        if isinstance(value, dict) and "pseudonym" in value:
+            if name not in pseudonyms:
+                raise ValueError(f"No replacement vocabulary for '{name}'")
+            value = pseudonyms[name].resolve(value["pseudonym"])
+        resolved[name] = value
+    return resolved
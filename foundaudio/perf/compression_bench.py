@@ -0,0 +1,117 @@
+"""Compare response compression for get_audio_list-sized PostgREST pages.
+
+Fetches the default listing query (newest first) from a stand-in database at each page
+size with every encoding the toolkit can negotiate, and reports the bytes on the wire,
+the CPU spent decoding (decompression plus JSON parsing) and how long the transfer
+would take on a slow link. Use it to weigh egress cost and latency against decode CPU.
+
+Usage (from the `foundaudio/` project directory):
+
+    uv run python perf/compression_bench.py
+    uv run python perf/compression_bench.py --limits 20,100 --link-mbps 2 --json bench.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from foundaudio.compression import SUPPORTED_ENCODINGS, decompress
+from foundaudio.models import AUDIO_FILE_FIELDS
+from foundaudio.testing import PostgrestStandIn, generate_dataset
+
+
+def listing_url(base_url: str, limit: int) -> str:
+    """The request get_audio_list makes for a page without filters."""
+    select = AUDIO_FILE_FIELDS.replace(" ", "")
+    return (
+        f"{base_url}/rest/v1/audio_files?select={select}"
+        f"&order=created_at.desc,id.desc&limit={limit}"
+    )
+
+
+def measure(
+    client: httpx.Client,
+    url: str,
+    encoding: str,
+    repeats: int,
+    link_mbps: float,
+) -> Dict[str, Any]:
+    """Fetch one page with an encoding and time decoding its raw body."""
+    with client.stream("GET", url, headers={"Accept-Encoding": encoding}) as response:
+        response.raise_for_status()
+        raw = b"".join(response.iter_raw())
+        served = response.headers.get("content-encoding", "identity")
+
+    started = time.process_time()
+    for _ in range(repeats):
+        rows = json.loads(decompress(raw, served))
+    decode_ms = (time.process_time() - started) * 1000 / repeats
+
+    decoded = len(decompress(raw, served))
+    return {
+        "encoding": served,
+        "rows": len(rows),
+        "wire_bytes": len(raw),
+        "decoded_bytes": decoded,
+        "ratio": round(decoded / len(raw), 2) if raw else None,
+        "decode_cpu_ms": round(decode_ms, 4),
+        "transfer_ms": round(len(raw) * 8 / (link_mbps * 1000), 2),
+    }
+
+
+def run(
+    limits: List[int], tracks: int, repeats: int, link_mbps: float
+) -> List[Dict[str, Any]]:
+    """Measure every (limit, encoding) pair against a fresh stand-in database."""
+    results = []
+    stand_in = PostgrestStandIn(generate_dataset(n_tracks=tracks))
+    with stand_in, httpx.Client() as client:
+        for limit in limits:
+            url = listing_url(stand_in.url, limit)
+            for encoding in ("identity", *SUPPORTED_ENCODINGS):
+                result = measure(client, url, encoding, repeats, link_mbps)
+                results.append({"limit": limit, **result})
+    return results
+
+
+def format_results(results: List[Dict[str, Any]], link_mbps: float) -> str:
+    """Render the measurements as a fixed-width table."""
+    transfer = f"ms @{link_mbps:g}Mbps"
+    lines = [
+        f"{'limit':>5} {'encoding':<9} {'rows':>5} {'wire B':>8} {'decoded B':>10} "
+        f"{'ratio':>6} {'decode ms':>10} {transfer:>13}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result['limit']:>5} {result['encoding']:<9} {result['rows']:>5} "
+            f"{result['wire_bytes']:>8} {result['decoded_bytes']:>10} {result['ratio']:>6} "
+            f"{result['decode_cpu_ms']:>10.3f} {result['transfer_ms']:>13.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limits", default="20,100", help="page sizes, comma separated")
+    parser.add_argument("--tracks", type=int, default=2000, help="audio_files rows")
+    parser.add_argument("--repeats", type=int, default=200, help="decodes timed per page")
+    parser.add_argument(
+        "--link-mbps", type=float, default=2.0, help="link speed used for transfer times"
+    )
+    parser.add_argument("--json", help="also write the measurements to a file")
+    args = parser.parse_args(argv)
+
+    limits = [int(limit) for limit in args.limits.split(",")]
+    results = run(limits, args.tracks, args.repeats, args.link_mbps)
+
+    print(format_results(results, args.link_mbps))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
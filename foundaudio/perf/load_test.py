@@ -0,0 +1,516 @@
+"""Concurrent load-testing harness for the foundaudio toolkit.
+
+Replays a weighted mix of `get_audio_list` calls taken from the eval scenarios in
+`evals/eval_foundaudio.py`, ramps concurrency step by step, and reports the
+throughput/latency curve together with the saturation point. The `replay` command
+instead re-issues a workload captured from real traffic (see foundaudio.workload) with
+its original timing, optionally sped up.
+
+Usage (from the `foundaudio/` project directory):
+
+    # Everything in-process: stand-in database + direct tool calls
+    uv run python perf/load_test.py run --concurrency 1,2,4,8,16
+
+    # Against a locally served worker backed by the stand-in database
+    uv run python perf/load_test.py standin --port 54321
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_ANON_KEY=sb_publishable_stand-in \
+        uv run arcade serve
+    uv run python perf/load_test.py run --worker-url http://localhost:8002 \
+        --worker-secret <worker.toml secret>
+
+    # Re-issue a captured production workload (FOUNDAUDIO_CAPTURE_LOG) at 4x speed
+    uv run python perf/load_test.py replay --capture workload.jsonl --speed 4
+"""
+
+import argparse
+import ast
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from foundaudio.metrics import percentile
+from foundaudio.slowlog import SlowQueryLog
+from foundaudio.testing import PostgrestStandIn, generate_dataset
+from foundaudio.testing.dataset import SEED_USERNAMES, TITLE_WORDS
+from foundaudio.workload import (
+    CAPTURE_LOG_BACKUPS,
+    ReplayResult,
+    count_pseudonyms,
+    load_workload,
+    replay,
+)
+
+EVALS_PATH = Path(__file__).resolve().parent.parent / "evals" / "eval_foundaudio.py"
+DEFAULT_ANON_KEY = "sb_publishable_stand-in"
+
+# Issues one tool call and returns its result, or None when the target cannot see it
+ToolTarget = Callable[[Dict[str, Any]], Any]
+
+
+@dataclass
+class Scenario:
+    """One `get_audio_list` call from the eval suite and its share of the traffic mix."""
+
+    name: str
+    args: Dict[str, Any]
+    weight: float = 1.0
+
+
+@dataclass
+class StepResult:
+    """Latency and throughput measured at a single concurrency level."""
+
+    concurrency: int
+    requests: int
+    errors: int
+    elapsed_s: float
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+# =============================================================================
+# TRAFFIC MIX
+# =============================================================================
+
+
+def load_eval_scenarios(path: Path = EVALS_PATH) -> List[Scenario]:
+    """Extract the expected `get_audio_list` calls from the eval suite source.
+
+    The eval module is parsed rather than imported so the harness does not need
+    the evals extra (or an LLM provider) installed. Cases that expect no tool call
+    (the validation error scenarios) are skipped.
+    """
+    tree = ast.parse(path.read_text())
+    scenarios = []
+    for node in ast.walk(tree):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "add_case"
+        ):
+            continue
+        case = {keyword.arg: keyword.value for keyword in node.keywords}
+        expected_calls = case.get("expected_tool_calls")
+        if "name" not in case or not isinstance(expected_calls, ast.List):
+            continue
+        name = ast.literal_eval(case["name"])
+        for call in expected_calls.elts:
+            if not isinstance(call, ast.Call):
+                continue
+            call_kwargs = {keyword.arg: keyword.value for keyword in call.keywords}
+            func = call_kwargs.get("func")
+            if isinstance(func, ast.Name) and func.id == "get_audio_list":
+                args = ast.literal_eval(call_kwargs["args"]) if "args" in call_kwargs else {}
+                scenarios.append(Scenario(name=name, args=args))
+    return scenarios
+
+
+def apply_weights(scenarios: List[Scenario], overrides: List[str]) -> List[Scenario]:
+    """Apply `NAME=WEIGHT` overrides to the traffic mix (weight 0 removes a case)."""
+    weights = {}
+    for override in overrides:
+        name, _, weight = override.rpartition("=")
+        weights[name] = float(weight)
+    unknown = set(weights) - {scenario.name for scenario in scenarios}
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s) in --weight: {', '.join(sorted(unknown))}")
+    for scenario in scenarios:
+        scenario.weight = weights.get(scenario.name, scenario.weight)
+    return [scenario for scenario in scenarios if scenario.weight > 0]
+
+
+# =============================================================================
+# TARGETS
+# =============================================================================
+
+
+class _StaticContext:
+    """Minimal stand-in for `ToolContext` when calling the tool in-process."""
+
+    def __init__(self, secrets: Dict[str, str]):
+        self._secrets = secrets
+
+    def get_secret(self, key: str) -> Optional[str]:
+        return self._secrets.get(key)
+
+
+def in_process_target(supabase_url: str, anon_key: str) -> ToolTarget:
+    """Call `get_audio_list` directly, the way a worker executes it."""
+    from foundaudio.tools.get_audio_list import get_audio_list
+
+    os.environ["SUPABASE_URL"] = supabase_url
+    context = _StaticContext({"SUPABASE_ANON_KEY": anon_key})
+
+    def call(args: Dict[str, Any]) -> Any:
+        return get_audio_list(context, **args)
+
+    return call
+
+
+def worker_target(
+    worker_url: str,
+    worker_secret: Optional[str],
+    anon_key: str,
+    toolkit: str,
+    tool_name: str,
+) -> ToolTarget:
+    """Invoke the tool through a served worker's `/worker/tools/invoke` endpoint."""
+    import httpx
+
+    headers = {"Content-Type": "application/json"}
+    if worker_secret:
+        import jwt
+
+        token = jwt.encode({"ver": "1", "aud": "worker"}, worker_secret, algorithm="HS256")
+        headers["Authorization"] = f"Bearer {token}"
+
+    invoke_url = worker_url.rstrip("/") + "/worker/tools/invoke"
+    # One keep-alive connection per load-generating thread
+    local = threading.local()
+
+    def call(args: Dict[str, Any]) -> Any:
+        if not hasattr(local, "client"):
+            local.client = httpx.Client(headers=headers, timeout=60.0)
+        payload = {
+            "execution_id": str(uuid.uuid4()),
+            "tool": {"name": tool_name, "toolkit": toolkit, "version": None},
+            "inputs": args,
+            "context": {"secrets": [{"key": "SUPABASE_ANON_KEY", "value": anon_key}]},
+        }
+        response = local.client.post(invoke_url, json=payload)
+        response.raise_for_status()
+        body = response.json()
+        if not body.get("success", False):
+            raise RuntimeError(f"Tool call failed: {body.get('output')}")
+        return (body.get("output") or {}).get("value")
+
+    return call
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+
+def run_step(
+    target: ToolTarget,
+    scenarios: List[Scenario],
+    concurrency: int,
+    duration_s: float,
+    seed: int = 0,
+) -> StepResult:
+    """Run a closed-loop load step: `concurrency` sessions calling back to back."""
+    weights = [scenario.weight for scenario in scenarios]
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    start_barrier = threading.Barrier(concurrency + 1)
+    deadline = 0.0
+
+    def session(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        start_barrier.wait()
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(scenarios, weights=weights)[0]
+            started = time.perf_counter()
+            try:
+                target(dict(scenario.args))
+            except Exception:
+                errors[index] += 1
+            latencies[index].append((time.perf_counter() - started) * 1000.0)
+
+    threads = [
+        threading.Thread(target=session, args=(index,), daemon=True)
+        for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    deadline = started + duration_s
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    merged = sorted(latency for per_session in latencies for latency in per_session)
+    requests = len(merged)
+    return StepResult(
+        concurrency=concurrency,
+        requests=requests,
+        errors=sum(errors),
+        elapsed_s=round(elapsed, 3),
+        throughput_rps=round(requests / elapsed, 2) if elapsed else 0.0,
+        mean_ms=round(sum(merged) / requests, 2) if requests else 0.0,
+        p50_ms=round(percentile(merged, 0.50), 2),
+        p95_ms=round(percentile(merged, 0.95), 2),
+        p99_ms=round(percentile(merged, 0.99), 2),
+    )
+
+
+def find_saturation(
+    results: List[StepResult],
+    min_gain: float = 0.10,
+    latency_factor: float = 2.0,
+) -> Tuple[Optional[int], str]:
+    """Find the highest concurrency level before the worker stops scaling.
+
+    A step is past saturation when throughput grows by less than `min_gain` over the
+    previous step, or when its p95 latency exceeds `latency_factor` times the p95 of
+    the first (least loaded) step.
+
+    Returns:
+        The saturating concurrency level (None if the ramp never saturated) and a
+        short human-readable reason
+    """
+    if not results:
+        return None, "no steps were run"
+    baseline_p95 = results[0].p95_ms
+    for previous, current in zip(results[:-1], results[1:], strict=True):
+        if current.throughput_rps < previous.throughput_rps * (1 + min_gain):
+            return previous.concurrency, (
+                f"throughput grew {current.throughput_rps / max(previous.throughput_rps, 1e-9) - 1:+.0%} "
+                f"from {previous.concurrency} to {current.concurrency} sessions"
+            )
+        if baseline_p95 and current.p95_ms > baseline_p95 * latency_factor:
+            return previous.concurrency, (
+                f"p95 at {current.concurrency} sessions is "
+                f"{current.p95_ms / baseline_p95:.1f}x the single-session p95"
+            )
+    return None, "throughput still scaling at the highest concurrency tested"
+
+
+def format_report(results: List[StepResult], saturation: Tuple[Optional[int], str]) -> str:
+    """Render the throughput/latency curve as a fixed-width table."""
+    lines = [
+        f"{'sessions':>8} {'requests':>9} {'errors':>7} {'rps':>9} "
+        f"{'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.concurrency:>8} {result.requests:>9} {result.errors:>7} "
+            f"{result.throughput_rps:>9.1f} {result.mean_ms:>9.1f} {result.p50_ms:>9.1f} "
+            f"{result.p95_ms:>9.1f} {result.p99_ms:>9.1f}"
+        )
+    level, reason = saturation
+    if level is None:
+        lines.append(f"\nNo saturation point found: {reason}")
+    else:
+        lines.append(f"\nSaturation point: {level} concurrent sessions ({reason})")
+    return "\n".join(lines)
+
+
+def format_replay(result: ReplayResult, speed: float) -> str:
+    """Render a replay next to the captured latencies."""
+    pace = f"{speed:g}x" if speed else "back to back"
+    sources = ", ".join(f"{name} {count}" for name, count in sorted(result.sources.items()))
+    return "\n".join(
+        [
+            f"Replayed {result.requests} calls ({result.errors} errors) in "
+            f"{result.elapsed_s:.1f}s at {pace}; captured over {result.captured_span_s:.1f}s",
+            f"{'':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+            f"{'captured':>9} {result.captured_p50_ms:>9.1f} "
+            f"{result.captured_p95_ms:>9.1f} {'-':>9}",
+            f"{'replayed':>9} {result.p50_ms:>9.1f} {result.p95_ms:>9.1f} {result.p99_ms:>9.1f}",
+            f"Throughput {result.throughput_rps:.1f} rps, "
+            f"start lag up to {result.max_lag_ms:.1f} ms",
+            f"Answered by: {sources or '-'}",
+        ]
+    )
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def _start_stand_in(args: argparse.Namespace, port: int = 0) -> PostgrestStandIn:
+    tables = generate_dataset(n_tracks=args.tracks, n_users=args.users, seed=args.seed)
+    return PostgrestStandIn(tables, port=port, latency_ms=args.db_latency_ms)
+
+
+def _cmd_standin(args: argparse.Namespace) -> None:
+    stand_in = _start_stand_in(args, port=args.port)
+    print(f"Stand-in database listening on {stand_in.url} (Ctrl+C to stop)")
+    try:
+        stand_in.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def _cmd_run(args: argparse.Namespace) -> None:
+    scenarios = apply_weights(load_eval_scenarios(Path(args.evals)), args.weight)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    stand_in = None
+    if args.worker_url:
+        target = worker_target(
+            args.worker_url, args.worker_secret, args.anon_key, args.toolkit, args.tool
+        )
+    else:
+        stand_in = _start_stand_in(args).start()
+        target = in_process_target(stand_in.url, args.anon_key)
+
+    try:
+        # Warm-up pass so imports, connections and first-call costs are not measured
+        for scenario in scenarios:
+            try:
+                target(dict(scenario.args))
+            except Exception as e:
+                print(f"warm-up call '{scenario.name}' failed: {e}", file=sys.stderr)
+
+        results = []
+        for level in levels:
+            result = run_step(target, scenarios, level, args.duration, seed=args.seed)
+            results.append(result)
+            print(
+                f"  {level:>4} sessions: {result.throughput_rps:8.1f} rps, "
+                f"p95 {result.p95_ms:8.1f} ms, {result.errors} errors",
+                file=sys.stderr,
+            )
+    finally:
+        if stand_in is not None:
+            stand_in.stop()
+
+    saturation = find_saturation(results, args.min_gain, args.latency_factor)
+    print(format_report(results, saturation))
+    if args.json:
+        report = {
+            "scenarios": [asdict(scenario) for scenario in scenarios],
+            "steps": [asdict(result) for result in results],
+            "saturation": {"concurrency": saturation[0], "reason": saturation[1]},
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+def _cmd_replay(args: argparse.Namespace) -> None:
+    capture = SlowQueryLog(args.capture, backups=CAPTURE_LOG_BACKUPS)
+    calls = load_workload(capture.entries(), "get_audio_list")
+    if not calls:
+        raise SystemExit(f"No get_audio_list calls captured in {args.capture}")
+
+    stand_in = None
+    usernames = args.usernames.split(",")
+    if args.worker_url:
+        target = worker_target(
+            args.worker_url, args.worker_secret, args.anon_key, args.toolkit, args.tool
+        )
+    elif args.supabase_url:
+        target = in_process_target(args.supabase_url, args.anon_key)
+    else:
+        # One stand-in profile per captured username, so distinct users stay distinct
+        users = max(args.users, count_pseudonyms(calls, "username"))
+        tables = generate_dataset(n_tracks=args.tracks, n_users=users, seed=args.seed)
+        usernames = [profile["username"] for profile in tables["profiles"]]
+        stand_in = PostgrestStandIn(tables, latency_ms=args.db_latency_ms).start()
+        target = in_process_target(stand_in.url, args.anon_key)
+
+    try:
+        # Create the client and open a connection first, with a call no capture holds
+        target({"limit": 1, "max_staleness": 0})
+        result = replay(
+            calls,
+            target,
+            {"search": TITLE_WORDS, "username": usernames},
+            speed=args.speed,
+            max_in_flight=args.max_in_flight,
+        )
+    finally:
+        if stand_in is not None:
+            stand_in.stop()
+
+    print(format_replay(result, args.speed))
+    if args.json:
+        Path(args.json).write_text(json.dumps(asdict(result), indent=2))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    dataset = argparse.ArgumentParser(add_help=False)
+    dataset.add_argument("--tracks", type=int, default=2000, help="audio_files rows")
+    dataset.add_argument("--users", type=int, default=50, help="profiles rows")
+    dataset.add_argument("--seed", type=int, default=7)
+    dataset.add_argument(
+        "--db-latency-ms",
+        type=float,
+        default=5.0,
+        help="simulated database round-trip added to every stand-in request",
+    )
+
+    standin = subcommands.add_parser(
+        "standin", parents=[dataset], help="serve the stand-in database only"
+    )
+    standin.add_argument("--port", type=int, default=54321)
+    standin.set_defaults(handler=_cmd_standin)
+
+    run = subcommands.add_parser("run", parents=[dataset], help="ramp load and report")
+    run.add_argument("--concurrency", default="1,2,4,8,16,32", help="comma separated")
+    run.add_argument("--duration", type=float, default=10.0, help="seconds per step")
+    run.add_argument("--evals", default=str(EVALS_PATH), help="eval suite to replay")
+    run.add_argument(
+        "--weight",
+        action="append",
+        default=[],
+        metavar="NAME=WEIGHT",
+        help="override the weight of an eval case (repeatable)",
+    )
+    run.add_argument("--worker-url", help="served worker to target instead of in-process")
+    run.add_argument("--worker-secret", help="worker secret used to sign requests")
+    run.add_argument("--toolkit", default="Foundaudio")
+    run.add_argument("--tool", default="GetAudioList")
+    run.add_argument(
+        "--anon-key", default=os.getenv("SUPABASE_ANON_KEY", DEFAULT_ANON_KEY)
+    )
+    run.add_argument("--min-gain", type=float, default=0.10)
+    run.add_argument("--latency-factor", type=float, default=2.0)
+    run.add_argument("--json", help="write the curve and saturation point to a file")
+    run.set_defaults(handler=_cmd_run)
+
+    replay_parser = subcommands.add_parser(
+        "replay", parents=[dataset], help="re-issue a captured workload"
+    )
+    replay_parser.add_argument(
+        "--capture", required=True, help="capture file written via FOUNDAUDIO_CAPTURE_LOG"
+    )
+    replay_parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="multiple of the captured pace (2: twice as fast, 0: back to back)",
+    )
+    replay_parser.add_argument("--max-in-flight", type=int, default=64)
+    replay_parser.add_argument(
+        "--supabase-url", help="database (e.g. staging) to call in-process instead of a stand-in"
+    )
+    replay_parser.add_argument(
+        "--usernames",
+        default=",".join(SEED_USERNAMES),
+        help="comma separated users of the staging database that captured users become; "
+        "captured users beyond these replay as unknown usernames",
+    )
+    replay_parser.add_argument("--worker-url", help="served worker to replay against")
+    replay_parser.add_argument("--worker-secret", help="worker secret used to sign requests")
+    replay_parser.add_argument("--toolkit", default="Foundaudio")
+    replay_parser.add_argument("--tool", default="GetAudioList")
+    replay_parser.add_argument(
+        "--anon-key", default=os.getenv("SUPABASE_ANON_KEY", DEFAULT_ANON_KEY)
+    )
+    replay_parser.add_argument("--json", help="write the replay report to a file")
+    replay_parser.set_defaults(handler=_cmd_replay)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Measure the memory get_audio_list allocates per call and the caches keep per record.
+
+Runs get_audio_list in-process against an in-memory Supabase (`FakeSupabase`, so no
+sockets or server threads are traced) under `tracemalloc`, and reports for each page
+size the peak bytes a call allocates on top of what was live before it, and the bytes
+it leaves behind (mostly cache entries). Then fills each long-lived store (the record
+cache, the listing cache and the catalog) with the same rows as plain dictionaries
+and as the `AudioRecord`s the toolkit keeps, and reports the resident bytes per record.
+
+Usage (from the `foundaudio/` project directory):
+
+    uv run python perf/memory_bench.py
+    uv run python perf/memory_bench.py --limits 20,100 --records 20000 --json memory.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Measure the calls alone: no warm-up, view refresh or catalog snapshot in the background
+os.environ["FOUNDAUDIO_WARMUP"] = "0"
+os.environ["FOUNDAUDIO_VIEWS"] = "0"
+os.environ.pop("FOUNDAUDIO_CATALOG_SNAPSHOT", None)
+
+from foundaudio.cache import LRUCache, audio_file_cache, listing_cache  # noqa: E402
+from foundaudio.catalog import Catalog  # noqa: E402
+from foundaudio.models import AudioRecord, audio_file_from_row  # noqa: E402
+from foundaudio.testing import FakeSupabase, generate_dataset  # noqa: E402
+from foundaudio.tools.get_audio_list import get_audio_list  # noqa: E402
+
+KEY = "sb_publishable_memory-bench"
+
+
+class _StaticContext:
+    """Minimal stand-in for `ToolContext` when calling the tool in-process."""
+
+    def __init__(self, secrets: Dict[str, str]):
+        self._secrets = secrets
+
+    def get_secret(self, key: str) -> Optional[str]:
+        return self._secrets.get(key)
+
+
+def _live_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def measure_call(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Call get_audio_list once and report the bytes it allocated and kept."""
+    context = _StaticContext({"SUPABASE_ANON_KEY": KEY})
+    before = _live_bytes()
+    tracemalloc.reset_peak()
+    result = get_audio_list(context, **arguments)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    source, rows = result["source"], result["count"]
+    response_bytes = len(json.dumps(result))
+    del result
+    return {
+        "source": source,
+        "rows": rows,
+        "response_bytes": response_bytes,
+        "peak_bytes": peak,
+        "retained_bytes": _live_bytes() - before,
+    }
+
+
+def measure_validation(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Report the peak bytes of turning one page of raw rows into response dictionaries."""
+    raw = json.dumps(rows)
+    before = _live_bytes()
+    tracemalloc.reset_peak()
+    page = [audio_file_from_row(row) for row in json.loads(raw)]
+    peak = tracemalloc.get_traced_memory()[1] - before
+    del page
+    return {"source": "validate", "rows": len(rows), "peak_bytes": peak}
+
+
+def measure_store(raw: str, store: Callable[[List[Dict[str, Any]]], Any]) -> float:
+    """Bytes per record a store keeps after parsing, validating and storing `raw` rows."""
+    before = _live_bytes()
+    rows = json.loads(raw)
+    kept = store([audio_file_from_row(row) for row in rows])
+    count = len(rows)
+    del rows
+    per_record = (_live_bytes() - before) / count
+    del kept
+    return per_record
+
+
+def _record_cache(compact: bool) -> Callable[[List[Dict[str, Any]]], Any]:
+    def store(records: List[Dict[str, Any]]) -> Any:
+        cache = LRUCache(len(records), compact=AudioRecord.from_dict if compact else None)
+        cache.put_many((record["id"], record) for record in records)
+        return cache
+
+    return store
+
+
+def _listing_cache(compact: bool) -> Callable[[List[Dict[str, Any]]], Any]:
+    def store(records: List[Dict[str, Any]]) -> Any:
+        pages = [records[start : start + 100] for start in range(0, len(records), 100)]
+        if compact:
+            pages = [[AudioRecord.from_dict(record) for record in page] for page in pages]
+        return [{"rows": page, "validator": None, "checked_at": 0.0} for page in pages]
+
+    return store
+
+
+def _catalog(compact: bool) -> Callable[[List[Dict[str, Any]]], Any]:
+    def store(records: List[Dict[str, Any]]) -> Any:
+        if not compact:
+            # What the catalog kept before it stored AudioRecords
+            return {record["id"]: record for record in records}
+        catalog = Catalog(snapshot_path=None)
+        catalog.apply(records)
+        return catalog
+
+    return store
+
+
+def run(limits: List[int], tracks: int, records: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Measure calls at each page size, then the per-record footprint of each store."""
+    dataset = generate_dataset(n_tracks=max(tracks, records), n_users=50)
+    fake = FakeSupabase({"audio_files": dataset["audio_files"][:tracks]})
+    fake.insert("profiles", dataset["profiles"])
+    os.environ["SUPABASE_URL"] = "https://memory-bench.supabase.co"
+
+    import foundaudio.client
+
+    foundaudio.client.create_client = fake.create_client
+    tracemalloc.start()
+    try:
+        # Create the pooled client outside the measurements
+        measure_call({"limit": 1})
+
+        calls = []
+        for limit in limits:
+            listing_cache.clear()
+            audio_file_cache.clear()
+            calls.append({"limit": limit, **measure_call({"limit": limit, "max_staleness": 0})})
+            calls.append({"limit": limit, **measure_call({"limit": limit})})
+            calls.append(
+                {"limit": limit, **measure_validation(dataset["audio_files"][:limit])}
+            )
+
+        raw = json.dumps(dataset["audio_files"][:records])
+        stores = []
+        for name, build in (
+            ("record cache", _record_cache),
+            ("listing cache", _listing_cache),
+            ("catalog", _catalog),
+        ):
+            for compact in (False, True):
+                stores.append(
+                    {
+                        "store": name,
+                        "storage": "AudioRecord" if compact else "dict",
+                        "records": records,
+                        "bytes_per_record": round(measure_store(raw, build(compact))),
+                    }
+                )
+    finally:
+        tracemalloc.stop()
+    return {"calls": calls, "stores": stores}
+
+
+def format_results(results: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Render the measurements as two fixed-width tables."""
+    lines = [
+        f"{'limit':>5} {'source':<9} {'rows':>5} {'response B':>11} "
+        f"{'peak KiB':>9} {'retained KiB':>13}"
+    ]
+    for call in results["calls"]:
+        response = call.get("response_bytes", "")
+        retained = call.get("retained_bytes")
+        lines.append(
+            f"{call['limit']:>5} {call['source']:<9} {call['rows']:>5} {response:>11} "
+            f"{call['peak_bytes'] / 1024:>9.1f} "
+            f"{'' if retained is None else f'{retained / 1024:.1f}':>13}"
+        )
+    lines += ["", f"{'store':<14} {'storage':<12} {'records':>8} {'bytes/record':>13}"]
+    for store in results["stores"]:
+        lines.append(
+            f"{store['store']:<14} {store['storage']:<12} {store['records']:>8} "
+            f"{store['bytes_per_record']:>13}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limits", default="20,100", help="page sizes, comma separated")
+    parser.add_argument("--tracks", type=int, default=2000, help="audio_files rows")
+    parser.add_argument(
+        "--records", type=int, default=5000, help="records put in each store"
+    )
+    parser.add_argument("--json", help="also write the measurements to a file")
+    args = parser.parse_args(argv)
+
+    limits = [int(limit) for limit in args.limits.split(",")]
+    results = run(limits, args.tracks, args.records)
+
+    print(format_results(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Summarize the slow-query log written by the foundaudio toolkit.
+
+Groups the entries of the rotating JSONL log (FOUNDAUDIO_SLOW_QUERY_LOG) by query shape
+and lists the shapes that spent the most time in slow calls, with their latency
+percentiles, typical row count and the phase that dominated. Use it to decide which
+access patterns need an index or a cache.
+
+Usage (from the `foundaudio/` project directory):
+
+    uv run python perf/slow_queries.py --log /var/log/foundaudio/slow-queries.jsonl
+    uv run python perf/slow_queries.py --top 5 --tool get_audio_list --json top.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from foundaudio.slowlog import SlowQueryLog, default_log_path, summarize
+
+
+def format_summary(summaries: List[Dict[str, Any]]) -> str:
+    """Render the slowest shapes as a fixed-width table."""
+    if not summaries:
+        return "No slow queries logged."
+    width = max(len("shape"), *(len(str(summary["shape"])) for summary in summaries))
+    lines = [
+        f"{'shape':<{width}} {'calls':>6} {'total ms':>10} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'max ms':>9} {'rows':>6} {'errors':>6}  top phase"
+    ]
+    for summary in summaries:
+        rows = "-" if summary["mean_rows"] is None else f"{summary['mean_rows']:.0f}"
+        lines.append(
+            f"{str(summary['shape']):<{width}} {summary['calls']:>6} {summary['total_ms']:>10.1f} "
+            f"{summary['p50_ms']:>9.1f} {summary['p95_ms']:>9.1f} {summary['max_ms']:>9.1f} "
+            f"{rows:>6} {summary['errors']:>6}  {summary['top_phase'] or '-'}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", default=default_log_path(), help="slow-query log to read")
+    parser.add_argument("--top", type=int, default=10, help="number of shapes to list")
+    parser.add_argument("--tool", help="only include entries of this tool")
+    parser.add_argument("--json", help="also write the summary to a file")
+    args = parser.parse_args(argv)
+
+    entries = SlowQueryLog(args.log).entries()
+    if args.tool:
+        entries = (entry for entry in entries if entry.get("tool") == args.tool)
+    summaries = summarize(entries, top=args.top)
+
+    print(format_summary(summaries))
+    if args.json:
+        Path(args.json).write_text(json.dumps(summaries, indent=2))
+
+
+if __name__ == "__main__":
+    main()
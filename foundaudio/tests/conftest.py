@@ -0,0 +1,86 @@
+import os
+from typing import Optional
+from unittest.mock import Mock
+
+# Tests must never start the background warm-up or view refresh (CI exports
+# SUPABASE_ANON_KEY), so disable them before the toolkit package is first imported
+os.environ["FOUNDAUDIO_WARMUP"] = "0"
+os.environ["FOUNDAUDIO_VIEWS"] = "0"
+# Nor may they restore or save a catalog snapshot configured for the machine
+os.environ.pop("FOUNDAUDIO_CATALOG_SNAPSHOT", None)
+
+import pytest  # noqa: E402
+from arcade_tdk import ToolContext  # noqa: E402
+
+from foundaudio.cache import audio_file_cache, listing_cache, username_cache  # noqa: E402
+from foundaudio.catalog import catalog  # noqa: E402
+from foundaudio.client import clear_clients  # noqa: E402
+from foundaudio.hedging import hedger  # noqa: E402
+from foundaudio.materialized import materialized_listings  # noqa: E402
+from foundaudio.metrics import registry  # noqa: E402
+from foundaudio.planner import planner  # noqa: E402
+from foundaudio.testing import FakeSupabase, PostgrestStandIn, generate_dataset  # noqa: E402
+
+# Test backends, cheapest first: `fake_supabase` answers the toolkit's queries in process
+# and is the default; `stand_in` serves the same tables over a real socket and is only
+# for faults that need one (latency, resets, slow bodies). Mock chains are for pinning
+# the exact calls a unit under test makes, or failures the fakes cannot produce.
+
+
+def tool_context(secret: Optional[str] = "test-secret-key") -> Mock:
+    """Build a ToolContext whose SUPABASE_ANON_KEY secret is `secret`."""
+    context = Mock(spec=ToolContext)
+    context.get_secret.return_value = secret
+    return context
+
+
+def _reset() -> None:
+    for cache in (audio_file_cache, listing_cache, username_cache):
+        cache.clear()
+    catalog.clear()
+    clear_clients()
+    registry.clear()
+    hedger.clear()
+    planner.clear()
+    materialized_listings.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Start every test with empty toolkit caches, no pooled clients, zeroed metrics and
+    the planner's prior cost estimates."""
+    _reset()
+    yield
+    _reset()
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """An empty in-process Supabase that every client the toolkit creates talks to.
+
+    Seed it with `fake_supabase.insert(table, rows)`; queries are evaluated over those
+    rows and recorded in `fake_supabase.queries`.
+    """
+    fake = FakeSupabase()
+    monkeypatch.setattr("foundaudio.client.create_client", fake.create_client)
+    return fake
+
+
+@pytest.fixture
+def catalog_db(fake_supabase):
+    """`fake_supabase` seeded with a generated catalog of 120 tracks by 5 users."""
+    for table, rows in generate_dataset(n_tracks=120, n_users=5, seed=3).items():
+        fake_supabase.insert(table, rows)
+    return fake_supabase
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    """A PostgREST stand-in serving the generated catalog, with `SUPABASE_URL` at it.
+
+    Fault draws are seeded, so a test injecting random faults sees the same ones every run.
+    """
+    tables = generate_dataset(n_tracks=120, n_users=5, seed=11)
+    with PostgrestStandIn(tables, seed=11) as server:
+        monkeypatch.setenv("SUPABASE_URL", server.url)
+        yield server
@@ -0,0 +1,137 @@
+from unittest.mock import patch
+
+import pytest
+
+from foundaudio.cache import CacheBackend, LRUCache, audio_file_cache, listing_cache
+from foundaudio.models import AudioRecord, audio_file_from_row
+from foundaudio.testing import generate_dataset
+
+# =============================================================================
+# LRU CACHE TESTS
+# These tests verify eviction order, expiry and hit/miss accounting
+# =============================================================================
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """NORMAL OPERATION: Test that the least recently used entry is evicted first.
+
+    Reading an entry refreshes it, so the untouched entry is the one evicted
+    when the cache grows past maxsize.
+    """
+    # SETUP: Cache with room for two entries
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put_many([("a", 1), ("b", 2)])
+
+    # EXECUTE: Touch "a", then insert a third entry
+    cache.get("a")
+    cache.put("c", 3)
+
+    # VERIFY: "b" was evicted, hit/miss counters reflect the lookups
+    if cache.keys() != ["a", "c"]:
+        raise AssertionError(f"Expected keys ['a', 'c'], got {cache.keys()}")
+    if cache.get_many(["a", "b", "c"]) != {"a": 1, "c": 3}:
+        raise AssertionError("Expected only a and c to be cached")
+    if (cache.hits, cache.misses) != (3, 1):
+        raise AssertionError(f"Expected 3 hits / 1 miss, got {cache.hits} / {cache.misses}")
+
+
+def test_lru_cache_ttl_expiry():
+    """NORMAL OPERATION: Test that entries older than the TTL are treated as missing."""
+    cache: LRUCache[str, int] = LRUCache(maxsize=10, ttl=60)
+
+    with patch("foundaudio.cache.time.monotonic") as mock_monotonic:
+        # SETUP: Store at t=0
+        mock_monotonic.return_value = 0.0
+        cache.put("a", 1)
+
+        # VERIFY: Fresh within the TTL, gone after it
+        mock_monotonic.return_value = 59.0
+        if cache.get("a") != 1:
+            raise AssertionError("Expected entry to be fresh before the TTL")
+        mock_monotonic.return_value = 61.0
+        if cache.get("a") is not None:
+            raise AssertionError("Expected entry to expire after the TTL")
+        if len(cache) != 0:
+            raise AssertionError("Expected expired entry to be dropped")
+
+
+def test_lru_cache_rejects_invalid_size():
+    """INPUT VALIDATION: Test that a cache must hold at least one entry."""
+    with pytest.raises(ValueError, match="maxsize must be at least 1"):
+        LRUCache(maxsize=0)
+
+
+def test_backend_must_implement_interface():
+    """INPUT VALIDATION: Test that a backend missing part of the interface cannot be built."""
+
+    class GetOnly(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        GetOnly()
+
+
+# =============================================================================
+# COMPACT RECORD TESTS
+# These tests verify cached audio files are stored compactly and read back unchanged
+# =============================================================================
+
+
+def _audio_files(count: int) -> list:
+    rows = generate_dataset(n_tracks=count, n_users=2, seed=4)["audio_files"]
+    return [audio_file_from_row(row) for row in rows]
+
+
+def test_record_cache_stores_compact_records():
+    """NORMAL OPERATION: Test that cached audio files come back as equal AudioRecords."""
+    # SETUP: Two tracks by one uploader sharing a genre, as equal but separate strings
+    # (as two rows parsed from JSON would have)
+    first, second = _audio_files(2)
+    second.update(user_id="".join(first["user_id"]), genres=["".join(first["genres"][0])])
+    if second["user_id"] is first["user_id"]:
+        raise AssertionError("Expected the setup to use separate string objects")
+
+    # EXECUTE
+    audio_file_cache.put_many([(first["id"], dict(first)), (second["id"], dict(second))])
+    cached = audio_file_cache.get_many([first["id"], second["id"]])
+
+    # VERIFY: Equal to the original, copied like a dict, sharing repeated strings
+    record = cached[first["id"]]
+    if not isinstance(record, AudioRecord) or record != first or dict(record) != first:
+        raise AssertionError("Expected an AudioRecord equal to the cached audio file")
+    if list(dict(record)) != list(first) or record["url"] != first["url"]:
+        raise AssertionError("Expected the same keys, in order, and the derived URL")
+    other = cached[second["id"]]
+    if other.user_id is not record.user_id or other.genres[0] is not record.genres[0]:
+        raise AssertionError("Expected uploader ids and genres to be shared")
+    copy = dict(record)
+    copy["genres"].append("changed")
+    if "changed" in record["genres"]:
+        raise AssertionError("Expected copies not to modify the cached record")
+
+
+def test_listing_cache_stores_pages_of_compact_records():
+    """NORMAL OPERATION: Test that a cached page's rows are stored as AudioRecords."""
+    page = _audio_files(3)
+
+    listing_cache.put("key", {"rows": page, "validator": None, "checked_at": 0.0})
+    cached = listing_cache.get("key")
+
+    if not all(isinstance(row, AudioRecord) for row in cached["rows"]):
+        raise AssertionError("Expected the rows to be stored as AudioRecords")
+    if [dict(row) for row in cached["rows"]] != page or cached["validator"] is not None:
+        raise AssertionError("Expected the page to read back unchanged")
+
+
+def test_partial_values_are_cached_as_given():
+    """ERROR HANDLING: Test that values that are not full audio files are not compacted."""
+    partial = {"id": "a", "title": "Only a title"}
+
+    audio_file_cache.put("a", partial)
+    listing_cache.put("key", [])
+
+    if audio_file_cache.get("a") is not partial or listing_cache.get("key") != []:
+        raise AssertionError("Expected partial values to be stored as they are")
+    with pytest.raises(KeyError):
+        AudioRecord.from_dict(partial)
@@ -0,0 +1,231 @@
+import struct
+
+import pytest
+
+from foundaudio.catalog import Catalog
+from foundaudio.client import get_client
+from foundaudio.models import audio_file_from_row
+from foundaudio.similarity import SimilarityIndex
+from foundaudio.snapshot import FORMAT_VERSION, CatalogSnapshot, SnapshotError, write_snapshot
+from foundaudio.testing import generate_dataset
+from foundaudio.text_features import text_vector
+from foundaudio.text_store import TextFeatureStore
+
+URL = "https://test.supabase.co"
+
+
+def _records(fake) -> list:
+    return [audio_file_from_row(row) for row in fake.database.rows("audio_files")]
+
+
+def _by_id(records) -> dict:
+    return {record["id"]: record for record in records}
+
+
+def _upload(fake, audio_id: str) -> dict:
+    """Add a copy of the first track under a new id, updated after every other row."""
+    row = dict(fake.database.rows("audio_files")[0])
+    row.update(id=audio_id, title="Fresh upload", updated_at="2099-01-01T00:00:00+00:00")
+    fake.insert("audio_files", [row])
+    return row
+
+
+def _load(fake, path) -> Catalog:
+    """Refresh a catalog that saves to `path`, waiting for the snapshot to be written."""
+    catalog = Catalog(page_size=50, snapshot_path=str(path))
+    catalog.refresh(get_client(URL, "test-secret-key"))
+    if catalog.snapshot_writer is not None:
+        catalog.snapshot_writer.join()
+    return catalog
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify snapshots read back exactly and restored catalogs only catch up
+# =============================================================================
+
+
+def test_snapshot_round_trips_records(tmp_path):
+    """NORMAL OPERATION: Test that every record reads back equal, in bulk and one by one."""
+    # SETUP: Rows with and without descriptions and durations, and non-ASCII text
+    rows = generate_dataset(n_tracks=60, n_users=4, seed=5)["audio_files"]
+    rows[0].update(title="Café ☕ sessions", description=None, duration=None, genres=[])
+    records = [audio_file_from_row(row) for row in rows]
+    path = str(tmp_path / "catalog.snap")
+
+    # EXECUTE
+    write_snapshot(path, records, ("2025-01-01T00:00:00+00:00", records[-1]["id"]))
+    with CatalogSnapshot(path) as snapshot:
+        restored = snapshot.records()
+        one = snapshot.row(0)
+        found = snapshot.get(records[37]["id"])
+        missing = snapshot.get("not-an-id")
+        durations = snapshot.column("duration").tolist()
+        watermark = snapshot.watermark
+
+    # VERIFY
+    if restored != records or one != records[0] or found != records[37]:
+        raise AssertionError("Expected the snapshot to return the records it was written with")
+    if missing is not None:
+        raise AssertionError("Expected no record for an unknown id")
+    if len(durations) != 60 or durations[1] != records[1]["duration"]:
+        raise AssertionError("Expected the duration column to be readable in place")
+    if watermark != ("2025-01-01T00:00:00+00:00", records[-1]["id"]):
+        raise AssertionError(f"Unexpected watermark {watermark}")
+
+
+def test_restored_catalog_fetches_only_changes(catalog_db, tmp_path):
+    """NORMAL OPERATION: Test that a catalog restored from a snapshot fetches one small page."""
+    # SETUP: A first worker loads the table and saves it; one track is uploaded after
+    path = tmp_path / "catalog.snap"
+    _load(catalog_db, path)
+    upload = _upload(catalog_db, "ffffffff-0000-4000-8000-000000000001")
+    requests = catalog_db.request_count
+
+    # EXECUTE: A second worker starts from the snapshot
+    restored = _load(catalog_db, path)
+
+    # VERIFY: One request, starting after the snapshot's watermark
+    if catalog_db.request_count - requests != 1:
+        raise AssertionError("Expected a single request to catch up")
+    if "or" not in catalog_db.last_query("audio_files"):
+        raise AssertionError("Expected the request to start after the snapshot's watermark")
+    if _by_id(restored.records()) != _by_id(_records(catalog_db)):
+        raise AssertionError("Expected the restored catalog to match the table")
+    if restored.get(upload["id"])["title"] != "Fresh upload":
+        raise AssertionError("Expected the upload made after the snapshot")
+
+
+def test_large_changes_rewrite_snapshot(catalog_db, tmp_path, monkeypatch):
+    """NORMAL OPERATION: Test that a refresh changing many rows rewrites the snapshot."""
+    monkeypatch.setattr("foundaudio.catalog.SNAPSHOT_REWRITE_ROWS", 2)
+    path = tmp_path / "catalog.snap"
+    _load(catalog_db, path)
+    _upload(catalog_db, "ffffffff-0000-4000-8000-000000000001")
+    _upload(catalog_db, "ffffffff-0000-4000-8000-000000000002")
+
+    _load(catalog_db, path)
+
+    with CatalogSnapshot(str(path)) as snapshot:
+        if len(snapshot) != 122:
+            raise AssertionError(f"Expected the uploads in the snapshot, got {len(snapshot)}")
+        if snapshot.watermark[1] != "ffffffff-0000-4000-8000-000000000002":
+            raise AssertionError(f"Unexpected watermark {snapshot.watermark}")
+
+
+def test_restore_defers_feature_building(tmp_path, monkeypatch):
+    """NORMAL OPERATION: Test that a restore leaves tokenizing to the first search."""
+    # SETUP: Indexes listening to a catalog, with the tokenizer counted
+    records = [
+        audio_file_from_row(row)
+        for row in generate_dataset(n_tracks=40, n_users=3, seed=7)["audio_files"]
+    ]
+    path = str(tmp_path / "catalog.snap")
+    write_snapshot(path, records, ("2025-01-01T00:00:00+00:00", records[-1]["id"]))
+    calls = []
+    monkeypatch.setattr(
+        "foundaudio.text_store.text_vector",
+        lambda *args, **kwargs: calls.append(args) or text_vector(*args, **kwargs),
+    )
+    local = Catalog()
+    store = TextFeatureStore(directory=None, text_dim=64)
+    similarity = SimilarityIndex(store=store)
+    local.subscribe(store.upsert, reset=store.clear)
+    local.subscribe(similarity.upsert, reset=similarity.clear)
+
+    # EXECUTE
+    restored = local.load_snapshot(path)
+    tokenized_on_restore = len(calls)
+    similar = similarity.similar(records[0]["id"], limit=3)
+
+    # VERIFY: Nothing tokenized until the query, then every track once
+    if restored != 40 or tokenized_on_restore != 0:
+        raise AssertionError(f"Expected no tokenizing on restore, got {tokenized_on_restore}")
+    if len(calls) != 40 or len(similar) != 3:
+        raise AssertionError(f"Expected 40 tracks tokenized once, got {len(calls)}")
+
+
+# =============================================================================
+# INPUT VALIDATION TESTS
+# These tests verify files that are not readable snapshots are refused
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        lambda data: b"NOTASNAP" + data[8:],
+        lambda data: data[:8] + struct.pack("<I", FORMAT_VERSION + 1) + data[12:],
+        lambda data: data[: len(data) // 2],
+        lambda data: data[:20],
+        lambda data: b"",
+    ],
+    ids=["magic", "version", "truncated", "header", "empty"],
+)
+def test_unreadable_snapshots_are_refused(tmp_path, damage):
+    """INPUT VALIDATION: Test that damaged or other-version files raise SnapshotError."""
+    path = tmp_path / "catalog.snap"
+    records = [audio_file_from_row(row) for row in generate_dataset(n_tracks=20)["audio_files"]]
+    write_snapshot(str(path), records)
+    path.write_bytes(damage(path.read_bytes()))
+
+    with pytest.raises(SnapshotError):
+        CatalogSnapshot(str(path))
+
+
+def test_strings_with_nul_are_refused(tmp_path):
+    """INPUT VALIDATION: Test that a string the heap cannot terminate is not written."""
+    record = audio_file_from_row(generate_dataset(n_tracks=1)["audio_files"][0])
+    record["title"] = "bad\0title"
+    path = tmp_path / "catalog.snap"
+
+    with pytest.raises(ValueError, match="NUL"):
+        write_snapshot(str(path), [record])
+    if list(tmp_path.iterdir()):
+        raise AssertionError("Expected no file to be left behind")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify unusable snapshots fall back to a full load and get replaced
+# =============================================================================
+
+
+@pytest.mark.parametrize("problem", ["corrupt", "too_old"])
+def test_unusable_snapshot_falls_back_to_full_load(catalog_db, tmp_path, monkeypatch, problem):
+    """ERROR HANDLING: Test that a corrupt or outdated snapshot is ignored and rewritten."""
+    # SETUP
+    path = tmp_path / "catalog.snap"
+    if problem == "corrupt":
+        path.write_bytes(b"garbage")
+    else:
+        _load(catalog_db, path)
+        monkeypatch.setattr("foundaudio.catalog.CATALOG_SNAPSHOT_MAX_AGE", 0.0)
+    requests = catalog_db.request_count
+
+    # EXECUTE
+    catalog = _load(catalog_db, path)
+
+    # VERIFY: Every page fetched, and a readable snapshot written in its place
+    if catalog_db.request_count - requests != 3 or len(catalog) != 120:
+        raise AssertionError("Expected a full load of 120 rows in 3 pages")
+    with CatalogSnapshot(str(path)) as snapshot:
+        if len(snapshot) != 120:
+            raise AssertionError("Expected the snapshot to be rewritten")
+
+
+def test_unwritable_record_is_logged(catalog_db, tmp_path, caplog):
+    """ERROR HANDLING: Test that a record the snapshot cannot store is logged by id."""
+    # SETUP: A track whose title holds a NUL, which the heap cannot terminate
+    row = _upload(catalog_db, "ffffffff-0000-4000-8000-00000000000a")
+    catalog_db.database.rows("audio_files")[-1]["title"] = "bad\0title"
+
+    # EXECUTE
+    with caplog.at_level("WARNING", logger="foundaudio.catalog"):
+        catalog = _load(catalog_db, tmp_path / "catalog.snap")
+
+    # VERIFY: The refresh still succeeds, and the warning names the record
+    if len(catalog) != 121:
+        raise AssertionError("Expected the refresh to succeed without a snapshot")
+    if row["id"] not in caplog.text:
+        raise AssertionError(f"Expected a warning naming {row['id']}, got {caplog.text!r}")
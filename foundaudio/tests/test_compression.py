@@ -0,0 +1,73 @@
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from foundaudio.client import get_client
+from foundaudio.compression import (
+    SUPPORTED_ENCODINGS,
+    choose_encoding,
+    compress,
+    decompress,
+    negotiate_compression,
+)
+from foundaudio.metrics import supabase_decoded_bytes, supabase_response_bytes
+from foundaudio.testing import PostgrestStandIn, generate_dataset
+from foundaudio.tools.get_audio_list import DEFAULT_SORT, NO_FILTERS, fetch_listing
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify compressed responses are negotiated and both sizes are counted
+# =============================================================================
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", "br, gzip", "identity"])
+def test_listing_is_decoded_and_sizes_recorded(accept_encoding):
+    """NORMAL OPERATION: Test that a negotiated listing decodes and counts wire/decoded bytes."""
+    # SETUP: A stand-in database that compresses like Supabase's gateway
+    tables = generate_dataset(n_tracks=60, n_users=5, seed=5)
+    with PostgrestStandIn(tables) as stand_in, patch(
+        "foundaudio.compression.ACCEPT_ENCODING", accept_encoding
+    ):
+        client = get_client(stand_in.url, "sb_publishable_stand-in")
+
+        # EXECUTE: Fetch a 50-row page
+        page = fetch_listing(client, dict(NO_FILTERS), DEFAULT_SORT, None, 50)
+
+    # VERIFY: Same rows whatever the encoding, and compressed bytes are smaller
+    encoding = choose_encoding(accept_encoding)
+    if len(page) != 50:
+        raise AssertionError(f"Expected 50 rows, got {len(page)}")
+    wire = supabase_response_bytes.value("audio_files")
+    decoded = supabase_decoded_bytes.value("audio_files", encoding)
+    if decoded == 0 or (wire < decoded) != (encoding != "identity"):
+        raise AssertionError(f"Unexpected sizes for {encoding}: wire={wire}, decoded={decoded}")
+
+
+def test_choose_encoding_prefers_best_supported():
+    """NORMAL OPERATION: Test Accept-Encoding parsing, q-values and fallbacks."""
+    expected = {
+        "gzip, deflate": "gzip",
+        "br;q=0, gzip": "gzip",
+        "deflate": "identity",
+        "": "identity",
+        "br, gzip": SUPPORTED_ENCODINGS[0],
+    }
+    for header, encoding in expected.items():
+        chosen = choose_encoding(header)
+        if chosen != encoding:
+            raise AssertionError(f"Expected {encoding} for {header!r}, got {chosen}")
+    for encoding in (*SUPPORTED_ENCODINGS, "identity"):
+        if decompress(compress(b"[1,2,3]" * 50, encoding), encoding) != b"[1,2,3]" * 50:
+            raise AssertionError(f"Expected {encoding} to round-trip")
+
+
+def test_negotiate_compression_sets_session_header():
+    """NORMAL OPERATION: Test that pooled clients send the configured Accept-Encoding."""
+    client = Mock()
+    client.postgrest.session = httpx.Client()
+
+    negotiate_compression(client, "gzip")
+
+    if client.postgrest.session.headers["Accept-Encoding"] != "gzip":
+        raise AssertionError("Expected the Accept-Encoding header on the session")
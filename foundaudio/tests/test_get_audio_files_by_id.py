@@ -0,0 +1,165 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+from arcade_tdk import ToolContext
+
+from foundaudio.cache import audio_file_cache
+from foundaudio.tools.get_audio_files_by_id import get_audio_files_by_id
+from foundaudio.tools.get_audio_list import get_audio_list
+
+
+def _row(audio_id: str, title: str) -> dict:
+    """Build a raw audio_files row as PostgREST returns it."""
+    return {
+        "id": audio_id,
+        "title": title,
+        "description": None,
+        "duration": 120.0,
+        "genres": ["house"],
+        "user_id": "user1",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify cache-first lookups and the single batched fetch
+# =============================================================================
+
+
+def test_get_audio_files_by_id_uses_listing_cache():
+    """NORMAL OPERATION: Test that ids seen in a listing are served without a query.
+
+    This test verifies that get_audio_list populates the per-id record cache and
+    that get_audio_files_by_id then answers entirely from it (zero network calls),
+    including ids passed as audio page URLs.
+    """
+    with patch("foundaudio.client.os.getenv") as mock_getenv, patch(
+        "foundaudio.client.create_client"
+    ) as mock_create_client:
+
+        # SETUP: Mock environment variables for Supabase configuration
+        mock_getenv.side_effect = lambda key, default=None: {
+            "SUPABASE_URL": "https://test.supabase.co"
+        }.get(key, default)
+
+        # SETUP: Mock ToolContext with valid secret
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+
+        # SETUP: Listing query returns two tracks
+        mock_response = Mock()
+        mock_response.data = [_row("a1", "First"), _row("a2", "Second")]
+        query_mock = Mock()
+        query_mock.order.return_value.order.return_value.limit.return_value.execute.return_value = (
+            mock_response
+        )
+        mock_create_client.return_value.from_.return_value.select.return_value = (
+            query_mock
+        )
+
+        # EXECUTE: List, then look both tracks up again (one by URL)
+        get_audio_list(mock_context)
+        result = get_audio_files_by_id(
+            mock_context, ids=["https://foundaudio.club/audio/a2", "a1"]
+        )
+
+        # VERIFY: Records come back in the requested order, all from the cache
+        titles = [audio_file["title"] for audio_file in result["audio_files"]]
+        if titles != ["Second", "First"]:
+            raise AssertionError(f"Expected ['Second', 'First'], got {titles}")
+        if result["cache_hits"] != 2:
+            raise AssertionError(f"Expected 2 cache hits, got {result['cache_hits']}")
+        if result["not_found"] != []:
+            raise AssertionError(f"Expected no missing ids, got {result['not_found']}")
+        query_mock.in_.assert_not_called()
+
+
+def test_get_audio_files_by_id_fetches_missing_ids_in_one_query():
+    """NORMAL OPERATION: Test that uncached ids are fetched with a single in_() query.
+
+    This test verifies that only the ids missing from the cache are requested,
+    that unknown ids are reported in not_found, and that fetched records are
+    cached for the next call.
+    """
+    with patch("foundaudio.client.os.getenv") as mock_getenv, patch(
+        "foundaudio.client.create_client"
+    ) as mock_create_client:
+
+        # SETUP: Mock environment variables for Supabase configuration
+        mock_getenv.side_effect = lambda key, default=None: {
+            "SUPABASE_URL": "https://test.supabase.co"
+        }.get(key, default)
+
+        # SETUP: Mock ToolContext with valid secret
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+
+        # SETUP: One id already cached, the database knows one of the other two
+        audio_file_cache.put("cached", {"id": "cached", "title": "Cached"})
+        mock_response = Mock()
+        mock_response.data = [_row("remote", "Remote")]
+        query_mock = mock_create_client.return_value.from_.return_value.select.return_value
+        query_mock.in_.return_value.execute.return_value = mock_response
+
+        # EXECUTE: Look up cached, remote and unknown ids
+        result = get_audio_files_by_id(mock_context, ids=["cached", "remote", "unknown"])
+
+        # VERIFY: Only the uncached ids hit the database, in a single query
+        query_mock.in_.assert_called_once_with("id", ["remote", "unknown"])
+        if [audio_file["id"] for audio_file in result["audio_files"]] != ["cached", "remote"]:
+            raise AssertionError(f"Unexpected audio files: {result['audio_files']}")
+        if result["audio_files"][1]["url"] != "https://foundaudio.club/audio/remote":
+            raise AssertionError(f"Unexpected URL: {result['audio_files'][1]['url']}")
+        if result["not_found"] != ["unknown"]:
+            raise AssertionError(f"Expected ['unknown'] not found, got {result['not_found']}")
+        if result["cache_hits"] != 1:
+            raise AssertionError(f"Expected 1 cache hit, got {result['cache_hits']}")
+
+        # VERIFY: The fetched record is now cached
+        if audio_file_cache.get("remote") is None:
+            raise AssertionError("Expected fetched record to be cached")
+
+
+# =============================================================================
+# INPUT VALIDATION AND ERROR HANDLING TESTS
+# =============================================================================
+
+
+def test_get_audio_files_by_id_invalid_ids():
+    """INPUT VALIDATION: Test validation of the ids parameter.
+
+    This test verifies that empty id lists and oversized batches raise
+    RetryableToolError so the agent can correct the call.
+    """
+    # SETUP: Mock ToolContext for validation tests
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+
+    # TEST: No usable ids
+    with pytest.raises(RetryableToolError, match="Invalid ids parameter"):
+        get_audio_files_by_id(mock_context, ids=["", "  "])
+
+    # TEST: More ids than a single call allows
+    with pytest.raises(RetryableToolError, match="Too many ids"):
+        get_audio_files_by_id(mock_context, ids=[f"id{i}" for i in range(101)])
+
+
+def test_get_audio_files_by_id_missing_secret():
+    """ERROR HANDLING: Test error handling when the secret is missing.
+
+    This test verifies that a cache miss without SUPABASE_ANON_KEY configured
+    raises ToolExecutionError (a configuration problem the user can't fix).
+    """
+    # SETUP: Mock ToolContext with missing secret
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = None
+
+    # TEST: Missing secret raises ToolExecutionError
+    with pytest.raises(
+        ToolExecutionError,
+        match="Error accessing audio database: SUPABASE_ANON_KEY secret is not configured",
+    ):
+        get_audio_files_by_id(mock_context, ids=["a1"])
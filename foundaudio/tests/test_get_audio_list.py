@@ -1,11 +1,40 @@
-import os
-from unittest.mock import Mock, patch
 
 import pytest
 from arcade_core.errors import RetryableToolError, ToolExecutionError
-from arcade_tdk import ToolContext
 
-from foundaudio.tools.get_audio_list import get_audio_list
+from foundaudio.testing import generate_dataset
+from foundaudio.tools.get_audio_list import SORT_FIELDS, _encode_cursor, get_audio_list
+from tests.conftest import tool_context
+
+
+def _track(audio_id, title, created_at="2024-01-01T00:00:00Z", **columns) -> dict:
+    """Build an audio_files row; columns not given get neutral values."""
+    row = {
+        "id": audio_id,
+        "title": title,
+        "description": None,
+        "duration": 180.0,
+        "genres": [],
+        "user_id": "user1",
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+    row.update(columns)
+    return row
+
+
+def _profile(user_id, username) -> dict:
+    return {
+        "id": user_id,
+        "username": username,
+        "email": f"{username}@example.com",
+        "created_at": "2024-12-02T06:47:48.71477+00:00",
+    }
+
+
+def _ids(result: dict) -> list:
+    return [audio_file["id"] for audio_file in result["audio_files"]]
+
 
 # =============================================================================
 # NORMAL OPERATION TESTS
@@ -13,98 +42,185 @@ from foundaudio.tools.get_audio_list import get_audio_list
 # =============================================================================
 
 
-def test_get_audio_list_basic():
+def test_get_audio_list_basic(fake_supabase):
     """NORMAL OPERATION: Test basic functionality without filters.
 
     This test verifies that the tool can successfully retrieve audio files
     from the database without any search or genre filters applied.
     """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv, patch(
-        "foundaudio.tools.get_audio_list.create_client"
-    ) as mock_create_client:
-
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
-
-        # SETUP: Mock ToolContext with valid secret
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = "test-secret-key"
-
-        # SETUP: Mock Supabase client and database response
-        mock_client = mock_create_client.return_value
-        mock_response = Mock()
-        # Simulate database returning one audio file record
-        mock_response.data = [
-            {
-                "id": "123",
-                "title": "Test Track",
-                "description": "A test track",
-                "duration": 180.5,
-                "genres": ["electronic"],
-                "user_id": "user123",
-                "created_at": "2024-01-01T00:00:00Z",
-                "updated_at": "2024-01-01T00:00:00Z",
-            }
-        ]
-
-        # SETUP: Mock the Supabase query chain (from -> select -> order -> limit -> execute)
-        query_mock = Mock()
-        query_mock.order.return_value.limit.return_value.execute.return_value = (
-            mock_response
+    # SETUP: One audio file in the database
+    fake_supabase.insert(
+        "audio_files",
+        [
+            _track(
+                "123",
+                "Test Track",
+                description="A test track",
+                duration=180.5,
+                genres=["electronic"],
+                user_id="user123",
+            )
+        ],
+    )
+
+    # EXECUTE: Call the function under test
+    result = get_audio_list(tool_context())
+
+    # VERIFY: Check that result has correct structure and data
+    if not isinstance(result, dict):
+        raise AssertionError(f"Expected result to be dict, got {type(result)}")
+    if "audio_files" not in result:
+        raise AssertionError("Expected 'audio_files' key in result")
+
+    # Verify audio_files is a list with expected count
+    if not isinstance(result["audio_files"], list):
+        raise AssertionError(
+            f"Expected audio_files to be list, got {type(result['audio_files'])}"
+        )
+    if len(result["audio_files"]) != 1:
+        raise AssertionError(
+            f"Expected 1 audio file, got {len(result['audio_files'])}"
         )
-        mock_client.from_.return_value.select.return_value = query_mock
 
-        # EXECUTE: Call the function under test
-        result = get_audio_list(mock_context)
+    # Verify individual audio file structure and content
+    audio_file = result["audio_files"][0]
+    if audio_file["title"] != "Test Track":
+        raise AssertionError(f"Expected title 'Test Track', got {audio_file['title']}")
+    if audio_file["genres"] != ["electronic"]:
+        raise AssertionError(
+            f"Expected genres ['electronic'], got {audio_file['genres']}"
+        )
+    if audio_file["updated_at"] != "2024-01-01T00:00:00Z":
+        raise AssertionError(
+            f"Expected updated_at '2024-01-01T00:00:00Z', got {audio_file['updated_at']}"
+        )
 
-        # VERIFY: Check that result has correct structure and data
-        # Verify return type is dictionary
-        if not isinstance(result, dict):
-            raise AssertionError(f"Expected result to be dict, got {type(result)}")
-        if "audio_files" not in result:
-            raise AssertionError("Expected 'audio_files' key in result")
+    # Verify URL generation - should be generated from ID
+    expected_url = "https://foundaudio.club/audio/123"
+    if audio_file["url"] != expected_url:
+        raise AssertionError(f"Expected URL '{expected_url}', got {audio_file['url']}")
 
-        # Verify audio_files is a list with expected count
-        if not isinstance(result["audio_files"], list):
-            raise AssertionError(
-                f"Expected audio_files to be list, got {type(result['audio_files'])}"
-            )
-        if len(result["audio_files"]) != 1:
-            raise AssertionError(
-                f"Expected 1 audio file, got {len(result['audio_files'])}"
-            )
+    # Verify metadata fields and the query sent: newest first, id as tiebreaker
+    if result["count"] != 1:
+        raise AssertionError(f"Expected count 1, got {result['count']}")
+    query = fake_supabase.last_query("audio_files")
+    if query["order"] != ["created_at.desc,id.desc"] or query["limit"] != ["20"]:
+        raise AssertionError(f"Unexpected order or limit in {query}")
 
-        # Verify individual audio file structure and content
-        if not isinstance(result["audio_files"][0], dict):
-            raise AssertionError(
-                f"Expected audio file to be dict, got {type(result['audio_files'][0])}"
-            )
-        if result["audio_files"][0]["title"] != "Test Track":
-            raise AssertionError(
-                f"Expected title 'Test Track', got {result['audio_files'][0]['title']}"
-            )
-        if result["audio_files"][0]["genres"] != ["electronic"]:
-            raise AssertionError(
-                f"Expected genres ['electronic'], got {result['audio_files'][0]['genres']}"
-            )
-        if result["audio_files"][0]["updated_at"] != "2024-01-01T00:00:00Z":
-            raise AssertionError(
-                f"Expected updated_at '2024-01-01T00:00:00Z', got {result['audio_files'][0]['updated_at']}"
-            )
 
-        # Verify URL generation - should be generated from ID
-        expected_url = "https://foundaudio.club/audio/123"
-        if result["audio_files"][0]["url"] != expected_url:
+def test_get_audio_list_no_results(fake_supabase):
+    """NORMAL OPERATION: Test when no audio files are found.
+
+    This test verifies that the tool gracefully handles the case where
+    the database query returns no results, returning an empty list
+    rather than failing or returning None.
+    """
+    # SETUP: An empty audio_files table
+    fake_supabase.insert("audio_files", [])
+
+    # EXECUTE: Call the function under test
+    result = get_audio_list(tool_context())
+
+    # VERIFY: Should return empty result structure instead of None
+    if not isinstance(result["audio_files"], list):
+        raise AssertionError(
+            f"Expected audio_files to be list, got {type(result['audio_files'])}"
+        )
+    if len(result["audio_files"]) != 0:
+        raise AssertionError(
+            f"Expected 0 audio files, got {len(result['audio_files'])}"
+        )
+    if result["count"] != 0:
+        raise AssertionError(f"Expected count 0, got {result['count']}")
+
+
+def test_get_audio_list_with_filters(fake_supabase):
+    """NORMAL OPERATION: Test functionality with search and genre filters.
+
+    This test verifies that the tool correctly applies search and genre
+    filters to the database query and returns properly filtered results.
+    It also tests that the returned metadata includes the applied filters.
+    """
+    # SETUP: One row matching both filters, and rows matching only one of them
+    fake_supabase.insert(
+        "audio_files",
+        [
+            _track(
+                "456",
+                "House Track",
+                "2024-01-02T00:00:00Z",
+                description="A house music track",
+                duration=240.0,
+                genres=["house"],
+            ),
+            _track("457", "Warehouse Techno", genres=["techno"]),
+            _track("458", "Sunday Groove", description="Soulful", genres=["house"]),
+        ],
+    )
+
+    # EXECUTE: Call the function under test with search and genre filters
+    result = get_audio_list(tool_context(), limit=10, search="house", genre="house")
+
+    # VERIFY: Only the row matching both filters is returned
+    if _ids(result) != ["456"]:
+        raise AssertionError(f"Expected only audio file 456, got {_ids(result)}")
+    audio_file = result["audio_files"][0]
+    if audio_file["title"] != "House Track" or audio_file["genres"] != ["house"]:
+        raise AssertionError(f"Unexpected audio file {audio_file}")
+    if audio_file["updated_at"] != "2024-01-02T00:00:00Z":
+        raise AssertionError(
+            f"Expected updated_at '2024-01-02T00:00:00Z', got {audio_file['updated_at']}"
+        )
+    if audio_file["url"] != "https://foundaudio.club/audio/456":
+        raise AssertionError(f"Unexpected URL {audio_file['url']}")
+
+    # Verify metadata fields include applied filters
+    if result["count"] != 1:
+        raise AssertionError(f"Expected count 1, got {result['count']}")
+    if result["limit"] != 10:
+        raise AssertionError(f"Expected limit 10, got {result['limit']}")
+    if result["search"] != "house":
+        raise AssertionError(f"Expected search 'house', got {result['search']}")
+    if result["genre"] != "house":
+        raise AssertionError(f"Expected genre to be 'house', got {result['genre']}")
+
+    # VERIFY: Both filters were sent to the database rather than applied locally
+    query = fake_supabase.last_query("audio_files")
+    if query["or"] != ["(title.ilike.%house%,description.ilike.%house%)"]:
+        raise AssertionError(f"Unexpected search filter {query.get('or')}")
+    if query["genres"] != ["cs.{house}"] or query["limit"] != ["10"]:
+        raise AssertionError(f"Unexpected genre filter or limit in {query}")
+
+
+def test_get_audio_list_url_generation(fake_supabase):
+    """NORMAL OPERATION: Test URL generation format and consistency.
+
+    This test verifies that the tool correctly generates URLs for audio files
+    using the expected pattern: https://foundaudio.club/audio/{id}
+    """
+    # SETUP: Two audio files with different IDs
+    fake_supabase.insert(
+        "audio_files",
+        [
+            _track("abc123", "Track One", "2024-01-01T00:00:00Z", genres=["rock"]),
+            _track("xyz789", "Track Two", "2024-01-02T00:00:00Z", genres=["jazz"]),
+        ],
+    )
+
+    # EXECUTE: Call the function under test
+    result = get_audio_list(tool_context())
+
+    # VERIFY: Newest first, and every URL is the base URL followed by the ID
+    if _ids(result) != ["xyz789", "abc123"]:
+        raise AssertionError(f"Expected newest first, got {_ids(result)}")
+    base_url = "https://foundaudio.club/audio/"
+    for audio_file in result["audio_files"]:
+        expected_url = base_url + audio_file["id"]
+        if audio_file["url"] != expected_url:
             raise AssertionError(
-                f"Expected URL '{expected_url}', got {result['audio_files'][0]['url']}"
+                f"Expected URL '{expected_url}', got {audio_file['url']}"
             )
 
-        # Verify metadata fields
-        if result["count"] != 1:
-            raise AssertionError(f"Expected count 1, got {result['count']}")
-
 
 # =============================================================================
 # INPUT VALIDATION TESTS
@@ -119,74 +235,13 @@ def test_get_audio_list_invalid_limit():
     and raises RetryableToolError for values outside the valid range (1-100).
     RetryableToolError indicates the user can retry with corrected input.
     """
-    # SETUP: Mock ToolContext for validation tests
-    mock_context = Mock(spec=ToolContext)
-    mock_context.get_secret.return_value = "test-secret-key"
-
     # TEST: Verify limit parameter validation - too low (boundary test)
-    # Should raise RetryableToolError because user can fix by providing valid limit
     with pytest.raises(RetryableToolError, match="Invalid limit parameter"):
-        get_audio_list(mock_context, limit=0)
+        get_audio_list(tool_context(), limit=0)
 
     # TEST: Verify limit parameter validation - too high (boundary test)
-    # Should raise RetryableToolError because user can fix by providing valid limit
     with pytest.raises(RetryableToolError, match="Invalid limit parameter"):
-        get_audio_list(mock_context, limit=101)
-
-
-def test_get_audio_list_no_results():
-    """NORMAL OPERATION: Test when no audio files are found.
-
-    This test verifies that the tool gracefully handles the case where
-    the database query returns no results, returning an empty list
-    rather than failing or returning None.
-    """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv, patch(
-        "foundaudio.tools.get_audio_list.create_client"
-    ) as mock_create_client:
-
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
-
-        # SETUP: Mock ToolContext with valid secret
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = "test-secret-key"
-
-        # SETUP: Mock Supabase client with no results
-        mock_client = mock_create_client.return_value
-        mock_response = Mock()
-        mock_response.data = None  # Simulate database returning no results
-
-        # SETUP: Mock the Supabase query chain
-        query_mock = Mock()
-        query_mock.order.return_value.limit.return_value.execute.return_value = (
-            mock_response
-        )
-        mock_client.from_.return_value.select.return_value = query_mock
-
-        # EXECUTE: Call the function under test
-        result = get_audio_list(mock_context)
-
-        # VERIFY: Should return empty result structure instead of None
-        # Verify return type is dictionary
-        if not isinstance(result, dict):
-            raise AssertionError(f"Expected result to be dict, got {type(result)}")
-        if "audio_files" not in result:
-            raise AssertionError("Expected 'audio_files' key in result")
-
-        # Verify empty results are handled correctly
-        if not isinstance(result["audio_files"], list):
-            raise AssertionError(
-                f"Expected audio_files to be list, got {type(result['audio_files'])}"
-            )
-        if len(result["audio_files"]) != 0:
-            raise AssertionError(
-                f"Expected 0 audio files, got {len(result['audio_files'])}"
-            )
-        if result["count"] != 0:
-            raise AssertionError(f"Expected count 0, got {result['count']}")
+        get_audio_list(tool_context(), limit=101)
 
 
 # =============================================================================
@@ -195,241 +250,23 @@ def test_get_audio_list_no_results():
 # =============================================================================
 
 
-def test_get_audio_list_missing_secret():
+def test_get_audio_list_missing_secret(fake_supabase):
     """ERROR HANDLING: Test error handling when secret is missing.
 
     This test verifies that the tool properly handles missing configuration
     (SUPABASE_ANON_KEY secret) and raises ToolExecutionError for system issues
     that cannot be resolved by the user retrying with different input.
     """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv:
-
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
+    # TEST: Verify that missing secret raises ToolExecutionError (not retryable)
+    with pytest.raises(
+        ToolExecutionError,
+        match="Error accessing audio database: SUPABASE_ANON_KEY secret is not configured",
+    ):
+        get_audio_list(tool_context(secret=None))
 
-        # SETUP: Mock ToolContext with missing secret (system configuration issue)
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = None  # Simulate missing secret
-
-        # TEST: Verify that missing secret raises ToolExecutionError (not retryable)
-        # This is a system/configuration error that user cannot fix by changing input
-        with pytest.raises(
-            ToolExecutionError,
-            match="Error accessing audio database: SUPABASE_ANON_KEY secret is not configured",
-        ):
-            get_audio_list(mock_context)
-
-
-def test_get_audio_list_with_filters():
-    """NORMAL OPERATION: Test functionality with search and genre filters.
-
-    This test verifies that the tool correctly applies search and genre
-    filters to the database query and returns properly filtered results.
-    It also tests that the returned metadata includes the applied filters.
-    """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv, patch(
-        "foundaudio.tools.get_audio_list.create_client"
-    ) as mock_create_client:
-
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
-
-        # SETUP: Mock ToolContext with valid secret
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = "test-secret-key"
-
-        # SETUP: Mock Supabase client and filtered response
-        mock_client = mock_create_client.return_value
-        mock_response = Mock()
-        # Simulate database returning filtered results matching search and genre
-        mock_response.data = [
-            {
-                "id": "456",
-                "title": "House Track",
-                "description": "A house music track",
-                "duration": 240.0,
-                "genres": ["house"],
-                "user_id": "user456",
-                "created_at": "2024-01-02T00:00:00Z",
-                "updated_at": "2024-01-02T00:00:00Z",
-            }
-        ]
-
-        # SETUP: Create detailed mocks for chained method calls with filters
-        query_mock = Mock()
-        or_mock = Mock()
-        contains_mock = Mock()
-        order_mock = Mock()
-        limit_mock = Mock()
-
-        # SETUP: Mock the complex query chain with filters: from_ -> select -> or_ -> contains -> order -> limit -> execute
-        mock_client.from_.return_value.select.return_value = query_mock
-        query_mock.or_.return_value = or_mock
-        or_mock.contains.return_value = contains_mock
-        contains_mock.order.return_value = order_mock
-        order_mock.limit.return_value = limit_mock
-        limit_mock.execute.return_value = mock_response
-
-        # EXECUTE: Call the function under test with search and genre filters
-        result = get_audio_list(mock_context, limit=10, search="house", genre="house")
-
-        # VERIFY: Check that result has correct structure and filtered data
-        # Verify return type is dictionary
-        if not isinstance(result, dict):
-            raise AssertionError(f"Expected result to be dict, got {type(result)}")
-        if "audio_files" not in result:
-            raise AssertionError("Expected 'audio_files' key in result")
-
-        # Verify filtered results structure
-        if not isinstance(result["audio_files"], list):
-            raise AssertionError(
-                f"Expected audio_files to be list, got {type(result['audio_files'])}"
-            )
-        if len(result["audio_files"]) != 1:
-            raise AssertionError(
-                f"Expected 1 audio file, got {len(result['audio_files'])}"
-            )
-
-        # Verify individual audio file content matches filters
-        if not isinstance(result["audio_files"][0], dict):
-            raise AssertionError(
-                f"Expected audio file to be dict, got {type(result['audio_files'][0])}"
-            )
-        if result["audio_files"][0]["title"] != "House Track":
-            raise AssertionError(
-                f"Expected title 'House Track', got {result['audio_files'][0]['title']}"
-            )
-        if result["audio_files"][0]["genres"] != ["house"]:
-            raise AssertionError(
-                f"Expected genres ['house'], got {result['audio_files'][0]['genres']}"
-            )
-        if result["audio_files"][0]["updated_at"] != "2024-01-02T00:00:00Z":
-            raise AssertionError(
-                f"Expected updated_at '2024-01-02T00:00:00Z', got {result['audio_files'][0]['updated_at']}"
-            )
-
-        # Verify URL generation for filtered results - should be generated from ID
-        expected_url = "https://foundaudio.club/audio/456"
-        if result["audio_files"][0]["url"] != expected_url:
-            raise AssertionError(
-                f"Expected URL '{expected_url}', got {result['audio_files'][0]['url']}"
-            )
-
-        # Verify metadata fields include applied filters
-        if result["count"] != 1:
-            raise AssertionError(f"Expected count 1, got {result['count']}")
-        if result["limit"] != 10:
-            raise AssertionError(f"Expected limit 10, got {result['limit']}")
-        if result["search"] != "house":
-            raise AssertionError(f"Expected search 'house', got {result['search']}")
-        if result["genre"] != "house":
-            raise AssertionError(f"Expected genre to be 'house', got {result['genre']}")
-
-        # VERIFY: Check that the correct query methods were called with expected parameters
-        query_mock.or_.assert_called_once_with(
-            "title.ilike.%house%,description.ilike.%house%"
-        )
-        or_mock.contains.assert_called_once_with("genres", ["house"])
-        contains_mock.order.assert_called_once_with("created_at", desc=True)
-        order_mock.limit.assert_called_once_with(10)
-
-
-def test_get_audio_list_url_generation():
-    """NORMAL OPERATION: Test URL generation format and consistency.
-
-    This test verifies that the tool correctly generates URLs for audio files
-    using the expected pattern: https://foundaudio.club/audio/{id}
-    """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv, patch(
-        "foundaudio.tools.get_audio_list.create_client"
-    ) as mock_create_client:
-
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
-
-        # SETUP: Mock ToolContext with valid secret
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = "test-secret-key"
-
-        # SETUP: Mock Supabase client with multiple audio files to test URL generation
-        mock_client = mock_create_client.return_value
-        mock_response = Mock()
-        # Simulate database returning multiple audio files with different IDs
-        mock_response.data = [
-            {
-                "id": "abc123",
-                "title": "Track One",
-                "description": "First test track",
-                "duration": 120.0,
-                "genres": ["rock"],
-                "user_id": "user1",
-                "created_at": "2024-01-01T00:00:00Z",
-                "updated_at": "2024-01-01T00:00:00Z",
-            },
-            {
-                "id": "xyz789",
-                "title": "Track Two",
-                "description": "Second test track",
-                "duration": 180.0,
-                "genres": ["jazz"],
-                "user_id": "user2",
-                "created_at": "2024-01-02T00:00:00Z",
-                "updated_at": "2024-01-02T00:00:00Z",
-            },
-        ]
-
-        # SETUP: Mock the Supabase query chain
-        query_mock = Mock()
-        query_mock.order.return_value.limit.return_value.execute.return_value = (
-            mock_response
-        )
-        mock_client.from_.return_value.select.return_value = query_mock
-
-        # EXECUTE: Call the function under test
-        result = get_audio_list(mock_context)
-
-        # VERIFY: Check that URLs are generated correctly for each audio file
-        if not isinstance(result, dict) or "audio_files" not in result:
-            raise AssertionError("Expected result with audio_files key")
-
-        audio_files = result["audio_files"]
-        if len(audio_files) != 2:
-            raise AssertionError(f"Expected 2 audio files, got {len(audio_files)}")
-
-        # Verify URL format for first audio file
-        expected_url_1 = "https://foundaudio.club/audio/abc123"
-        if audio_files[0]["url"] != expected_url_1:
-            raise AssertionError(
-                f"Expected URL '{expected_url_1}', got {audio_files[0]['url']}"
-            )
-
-        # Verify URL format for second audio file
-        expected_url_2 = "https://foundaudio.club/audio/xyz789"
-        if audio_files[1]["url"] != expected_url_2:
-            raise AssertionError(
-                f"Expected URL '{expected_url_2}', got {audio_files[1]['url']}"
-            )
-
-        # Verify that URLs follow the expected pattern (base URL + ID)
-        base_url = "https://foundaudio.club/audio/"
-        for i, audio_file in enumerate(audio_files):
-            if not audio_file["url"].startswith(base_url):
-                raise AssertionError(
-                    f"Expected URL to start with '{base_url}', got {audio_file['url']}"
-                )
-            # Extract ID from URL and verify it matches the original ID
-            url_id = audio_file["url"].replace(base_url, "")
-            expected_id = mock_response.data[i]["id"]
-            if url_id != expected_id:
-                raise AssertionError(
-                    f"Expected URL to contain ID '{expected_id}', got '{url_id}'"
-                )
+    # VERIFY: The database was never queried
+    if fake_supabase.request_count != 0:
+        raise AssertionError("Expected no request without a secret")
 
 
 # =============================================================================
@@ -438,365 +275,325 @@ def test_get_audio_list_url_generation():
 # =============================================================================
 
 
-def test_get_audio_list_with_username():
+def test_get_audio_list_with_username(fake_supabase):
     """NORMAL OPERATION: Test functionality with username parameter.
 
     This test verifies that the tool correctly looks up a user ID from the profiles table
     and filters audio files to only show those belonging to that specific user.
     """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv, patch(
-        "foundaudio.tools.get_audio_list.create_client"
-    ) as mock_create_client:
-
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
-
-        # SETUP: Mock ToolContext with valid secret
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = "test-secret-key"
-
-        # SETUP: Mock Supabase client
-        mock_client = mock_create_client.return_value
-
-        # SETUP: Mock profile lookup response (first query to profiles table)
-        # Using the actual response structure from the API
-        mock_profile_response = Mock()
-        mock_profile_response.data = [
-            {
-                "id": "user123",
-                "username": "discodude",
-                "email": "discodude889+1@gmail.com",
-                "created_at": "2024-12-02T06:47:48.71477+00:00",
-            }
-        ]
-
-        # SETUP: Mock audio files response (second query to audio_files table)
-        mock_audio_response = Mock()
-        mock_audio_response.data = [
-            {
-                "id": "audio123",
-                "title": "User's Track",
-                "description": "A track by the specific user",
-                "duration": 200.0,
-                "genres": ["electronic"],
-                "user_id": "user123",
-                "created_at": "2024-01-01T00:00:00Z",
-                "updated_at": "2024-01-01T00:00:00Z",
-            }
-        ]
-
-        # SETUP: Mock the Supabase query chains
-        # First query: profiles table lookup
-        profile_query_mock = Mock()
-        profile_query_mock.eq.return_value.execute.return_value = mock_profile_response
-
-        # Second query: audio_files table with user filter
-        audio_query_mock = Mock()
-        audio_query_mock.eq.return_value.order.return_value.limit.return_value.execute.return_value = (
-            mock_audio_response
+    # SETUP: Two users, each with one track
+    fake_supabase.insert(
+        "profiles", [_profile("user123", "discodude"), _profile("user999", "other")]
+    )
+    fake_supabase.insert(
+        "audio_files",
+        [
+            _track("audio123", "User's Track", user_id="user123"),
+            _track("audio999", "Someone Else's Track", user_id="user999"),
+        ],
+    )
+
+    # EXECUTE: Call the function under test with username
+    result = get_audio_list(tool_context(), username="discodude")
+
+    # VERIFY: Only the user's track is returned
+    if _ids(result) != ["audio123"]:
+        raise AssertionError(f"Expected only the user's track, got {_ids(result)}")
+    if result["audio_files"][0]["user_id"] != "user123":
+        raise AssertionError(
+            f"Expected user_id 'user123', got {result['audio_files'][0]['user_id']}"
         )
+    if result["username"] != "discodude":
+        raise AssertionError(f"Expected username 'discodude', got {result['username']}")
 
-        # SETUP: Configure the client to return different query mocks for different tables
-        def mock_from_side_effect(table_name):
-            if table_name == "profiles":
-                mock_table = Mock()
-                mock_table.select.return_value = profile_query_mock
-                return mock_table
-            elif table_name == "audio_files":
-                mock_table = Mock()
-                mock_table.select.return_value = audio_query_mock
-                return mock_table
-            return Mock()
-
-        mock_client.from_.side_effect = mock_from_side_effect
-
-        # EXECUTE: Call the function under test with username
-        result = get_audio_list(mock_context, username="discodude")
-
-        # VERIFY: Check that result has correct structure and user-specific data
-        if not isinstance(result, dict):
-            raise AssertionError(f"Expected result to be dict, got {type(result)}")
-        if "audio_files" not in result:
-            raise AssertionError("Expected 'audio_files' key in result")
-
-        # Verify audio_files is a list with expected count
-        if not isinstance(result["audio_files"], list):
-            raise AssertionError(
-                f"Expected audio_files to be list, got {type(result['audio_files'])}"
-            )
-        if len(result["audio_files"]) != 1:
-            raise AssertionError(
-                f"Expected 1 audio file, got {len(result['audio_files'])}"
-            )
+    # VERIFY: The lookup and the user filter were both sent to the database
+    if fake_supabase.last_query("profiles")["username"] != ["eq.discodude"]:
+        raise AssertionError("Expected the profiles lookup by username")
+    if fake_supabase.last_query("audio_files")["user_id"] != ["eq.user123"]:
+        raise AssertionError("Expected audio files filtered by user_id")
 
-        # Verify individual audio file structure and content
-        if not isinstance(result["audio_files"][0], dict):
-            raise AssertionError(
-                f"Expected audio file to be dict, got {type(result['audio_files'][0])}"
-            )
-        if result["audio_files"][0]["title"] != "User's Track":
-            raise AssertionError(
-                f"Expected title 'User's Track', got {result['audio_files'][0]['title']}"
-            )
-        if result["audio_files"][0]["user_id"] != "user123":
-            raise AssertionError(
-                f"Expected user_id 'user123', got {result['audio_files'][0]['user_id']}"
-            )
-
-        # Verify metadata fields include username
-        if result["count"] != 1:
-            raise AssertionError(f"Expected count 1, got {result['count']}")
-        if result["username"] != "discodude":
-            raise AssertionError(
-                f"Expected username 'discodude', got {result['username']}"
-            )
-
-        # VERIFY: Check that the correct query methods were called with expected parameters
-        profile_query_mock.eq.assert_called_once_with("username", "discodude")
-        audio_query_mock.eq.assert_called_once_with("user_id", "user123")
 
+def test_get_audio_list_username_with_other_filters(fake_supabase):
+    """NORMAL OPERATION: Test username filtering combined with search and genre filters.
 
-def test_get_audio_list_username_not_found():
+    This test verifies that the tool correctly applies username filtering along with
+    search and genre filters, ensuring all filters work together properly.
+    """
+    # SETUP: Only one track is by the user, matches the search and has the genre
+    fake_supabase.insert(
+        "profiles",
+        [_profile("user456", "houseproducer"), _profile("user789", "technohead")],
+    )
+    fake_supabase.insert(
+        "audio_files",
+        [
+            _track(
+                "audio456",
+                "House Music Track",
+                description="A house music track by the user",
+                genres=["house"],
+                user_id="user456",
+            ),
+            _track("audio457", "Ambient House", genres=["ambient"], user_id="user456"),
+            _track("audio458", "Deep Cuts", genres=["house"], user_id="user456"),
+            _track("audio789", "House Party", genres=["house"], user_id="user789"),
+        ],
+    )
+
+    # EXECUTE: Call the function with username, search, and genre filters
+    result = get_audio_list(
+        tool_context(), username="houseproducer", search="house", genre="house", limit=5
+    )
+
+    # VERIFY: Only the row passing every filter is returned
+    if _ids(result) != ["audio456"]:
+        raise AssertionError(f"Expected only audio456, got {_ids(result)}")
+
+    # Verify metadata fields include all applied filters
+    expected = {
+        "count": 1,
+        "username": "houseproducer",
+        "search": "house",
+        "genre": "house",
+        "limit": 5,
+    }
+    for key, value in expected.items():
+        if result[key] != value:
+            raise AssertionError(f"Expected {key} {value!r}, got {result[key]!r}")
+
+
+def test_get_audio_list_username_not_found(fake_supabase):
     """INPUT VALIDATION: Test error handling when username is not found.
 
     This test verifies that the tool properly handles the case where a username
     does not exist in the profiles table and raises RetryableToolError.
     """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv, patch(
-        "foundaudio.tools.get_audio_list.create_client"
-    ) as mock_create_client:
+    # SETUP: A profiles table without the requested username
+    fake_supabase.insert("profiles", [_profile("user123", "discodude")])
 
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
+    # TEST: Verify that non-existent username raises RetryableToolError
+    with pytest.raises(RetryableToolError, match="Username 'nonexistent' not found"):
+        get_audio_list(tool_context(), username="nonexistent")
 
-        # SETUP: Mock ToolContext with valid secret
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = "test-secret-key"
 
-        # SETUP: Mock Supabase client with empty profile response (username not found)
-        mock_client = mock_create_client.return_value
-        mock_profile_response = Mock()
-        mock_profile_response.data = []  # Empty response - username not found
-
-        # SETUP: Mock the profiles query chain
-        profile_query_mock = Mock()
-        profile_query_mock.eq.return_value.execute.return_value = mock_profile_response
+def test_get_audio_list_empty_username():
+    """INPUT VALIDATION: Test validation of empty username parameter.
 
-        # SETUP: Configure the client to return profile query mock
-        mock_table = Mock()
-        mock_table.select.return_value = profile_query_mock
-        mock_client.from_.return_value = mock_table
+    This test verifies that the tool properly validates empty username parameters
+    and raises RetryableToolError for empty or whitespace-only usernames.
+    """
+    # TEST: Verify empty username parameter validation
+    with pytest.raises(RetryableToolError, match="Invalid username parameter"):
+        get_audio_list(tool_context(), username="")
 
-        # TEST: Verify that non-existent username raises RetryableToolError
-        with pytest.raises(
-            RetryableToolError, match="Username 'nonexistent' not found"
-        ):
-            get_audio_list(mock_context, username="nonexistent")
+    # TEST: Verify whitespace-only username parameter validation
+    with pytest.raises(RetryableToolError, match="Invalid username parameter"):
+        get_audio_list(tool_context(), username="   ")
 
 
-def test_get_audio_list_username_with_other_filters():
-    """NORMAL OPERATION: Test username filtering combined with search and genre filters.
+def test_get_audio_list_username_lookup_error(fake_supabase):
+    """ERROR HANDLING: Test error handling during username lookup.
 
-    This test verifies that the tool correctly applies username filtering along with
-    search and genre filters, ensuring all filters work together properly.
+    This test verifies that the tool properly handles unexpected errors
+    during the username lookup process and raises ToolExecutionError.
     """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv, patch(
-        "foundaudio.tools.get_audio_list.create_client"
-    ) as mock_create_client:
-
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
-
-        # SETUP: Mock ToolContext with valid secret
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = "test-secret-key"
-
-        # SETUP: Mock Supabase client
-        mock_client = mock_create_client.return_value
-
-        # SETUP: Mock profile lookup response
-        # Using the actual response structure from the API
-        mock_profile_response = Mock()
-        mock_profile_response.data = [
-            {
-                "id": "user456",
-                "username": "houseproducer",
-                "email": "houseproducer@example.com",
-                "created_at": "2024-12-01T10:30:00.00000+00:00",
-            }
-        ]
-
-        # SETUP: Mock audio files response with filtered results
-        mock_audio_response = Mock()
-        mock_audio_response.data = [
-            {
-                "id": "audio456",
-                "title": "House Music Track",
-                "description": "A house music track by the user",
-                "duration": 300.0,
-                "genres": ["house"],
-                "user_id": "user456",
-                "created_at": "2024-01-02T00:00:00Z",
-                "updated_at": "2024-01-02T00:00:00Z",
-            }
-        ]
-
-        # SETUP: Mock the Supabase query chains with complex filtering
-        profile_query_mock = Mock()
-        profile_query_mock.eq.return_value.execute.return_value = mock_profile_response
-
-        # Complex audio query chain: eq -> or_ -> contains -> order -> limit -> execute
-        audio_query_mock = Mock()
-        or_mock = Mock()
-        contains_mock = Mock()
-        order_mock = Mock()
-        limit_mock = Mock()
-
-        audio_query_mock.eq.return_value = or_mock
-        or_mock.or_.return_value = contains_mock
-        contains_mock.contains.return_value = order_mock
-        order_mock.order.return_value = limit_mock
-        limit_mock.limit.return_value = limit_mock
-        limit_mock.execute.return_value = mock_audio_response
-
-        # SETUP: Configure the client to return different query mocks for different tables
-        def mock_from_side_effect(table_name):
-            if table_name == "profiles":
-                mock_table = Mock()
-                mock_table.select.return_value = profile_query_mock
-                return mock_table
-            elif table_name == "audio_files":
-                mock_table = Mock()
-                mock_table.select.return_value = audio_query_mock
-                return mock_table
-            return Mock()
-
-        mock_client.from_.side_effect = mock_from_side_effect
-
-        # EXECUTE: Call the function with username, search, and genre filters
-        result = get_audio_list(
-            mock_context,
-            username="houseproducer",
-            search="house",
-            genre="house",
-            limit=5,
-        )
+    # SETUP: The profiles table answers every request with a database error
+    fake_supabase.fail("profiles", "Database connection error")
 
-        # VERIFY: Check that result has correct structure and filtered data
-        if not isinstance(result, dict) or "audio_files" not in result:
-            raise AssertionError("Expected result with audio_files key")
+    # TEST: Verify that database errors during username lookup raise ToolExecutionError
+    with pytest.raises(
+        ToolExecutionError,
+        match="Error looking up username 'testuser': .*Database connection error",
+    ):
+        get_audio_list(tool_context(), username="testuser")
 
-        # Verify filtered results structure
-        if not isinstance(result["audio_files"], list):
-            raise AssertionError(
-                f"Expected audio_files to be list, got {type(result['audio_files'])}"
-            )
-        if len(result["audio_files"]) != 1:
-            raise AssertionError(
-                f"Expected 1 audio file, got {len(result['audio_files'])}"
-            )
+    # VERIFY: The error is not transient, so it was not retried
+    if fake_supabase.request_count != 1:
+        raise AssertionError(f"Expected one request, got {fake_supabase.request_count}")
 
-        # Verify individual audio file content matches all filters
-        audio_file = result["audio_files"][0]
-        if not isinstance(audio_file, dict):
-            raise AssertionError(
-                f"Expected audio file to be dict, got {type(audio_file)}"
-            )
-        if audio_file["title"] != "House Music Track":
-            raise AssertionError(
-                f"Expected title 'House Music Track', got {audio_file['title']}"
-            )
-        if audio_file["user_id"] != "user456":
-            raise AssertionError(
-                f"Expected user_id 'user456', got {audio_file['user_id']}"
-            )
-        if audio_file["genres"] != ["house"]:
-            raise AssertionError(
-                f"Expected genres ['house'], got {audio_file['genres']}"
-            )
 
-        # Verify metadata fields include all applied filters
-        if result["count"] != 1:
-            raise AssertionError(f"Expected count 1, got {result['count']}")
-        if result["username"] != "houseproducer":
-            raise AssertionError(
-                f"Expected username 'houseproducer', got {result['username']}"
-            )
-        if result["search"] != "house":
-            raise AssertionError(f"Expected search 'house', got {result['search']}")
-        if result["genre"] != "house":
-            raise AssertionError(f"Expected genre 'house', got {result['genre']}")
-        if result["limit"] != 5:
-            raise AssertionError(f"Expected limit 5, got {result['limit']}")
-
-        # VERIFY: Check that the correct query methods were called with expected parameters
-        profile_query_mock.eq.assert_called_once_with("username", "houseproducer")
-        audio_query_mock.eq.assert_called_once_with("user_id", "user456")
-        or_mock.or_.assert_called_once_with(
-            "title.ilike.%house%,description.ilike.%house%"
+# =============================================================================
+# DURATION AND DATE RANGE FILTER TESTS
+# These tests verify duration/upload date filters are pushed down to PostgREST
+# =============================================================================
+
+
+def test_get_audio_list_with_duration_and_date_filters(fake_supabase):
+    """NORMAL OPERATION: Test duration and created_at range filters.
+
+    This test verifies that min/max duration and created_after/created_before are
+    sent to the database as gte/lte filters (instead of being filtered client-side)
+    and that plain dates are expanded to cover the whole day for upper bounds.
+    """
+    # SETUP: One long mix from this year, plus rows failing each bound
+    fake_supabase.insert(
+        "audio_files",
+        [
+            _track("long1", "Three Hour Journey", "2025-03-01T00:00:00Z", duration=10800.0),
+            _track("short1", "Radio Edit", "2025-03-02T00:00:00Z", duration=210.0),
+            _track("huge1", "Day Long Stream", "2025-03-03T00:00:00Z", duration=86400.0),
+            _track("old1", "Last Year's Mix", "2024-12-31T23:00:00Z", duration=7200.0),
+            _track("eve1", "New Year's Eve", "2025-12-31T23:30:00Z", duration=5400.0),
+        ],
+    )
+
+    # EXECUTE: "mixes over an hour from this year"
+    result = get_audio_list(
+        tool_context(),
+        min_duration=3600,
+        max_duration=14400,
+        created_after="2025-01-01",
+        created_before="2025-12-31",
+    )
+
+    # VERIFY: Rows inside both ranges, including the last day in full
+    if _ids(result) != ["eve1", "long1"]:
+        raise AssertionError(f"Expected eve1 and long1, got {_ids(result)}")
+    if result["min_duration"] != 3600 or result["max_duration"] != 14400:
+        raise AssertionError(
+            f"Expected duration range 3600-14400, got {result['min_duration']}-{result['max_duration']}"
+        )
+    if result["created_after"] != "2025-01-01":
+        raise AssertionError(
+            f"Expected created_after '2025-01-01', got {result['created_after']}"
         )
-        contains_mock.contains.assert_called_once_with("genres", ["house"])
-        order_mock.order.assert_called_once_with("created_at", desc=True)
-        limit_mock.limit.assert_called_once_with(5)
 
+    # VERIFY: Filters were pushed down as gte/lte comparisons
+    query = fake_supabase.last_query("audio_files")
+    if sorted(query["duration"]) != ["gte.3600", "lte.14400"]:
+        raise AssertionError(f"Unexpected duration filters {query['duration']}")
+    if sorted(query["created_at"]) != [
+        "gte.2025-01-01T00:00:00+00:00",
+        "lte.2025-12-31T23:59:59.999999+00:00",
+    ]:
+        raise AssertionError(f"Unexpected created_at filters {query['created_at']}")
 
-def test_get_audio_list_empty_username():
-    """INPUT VALIDATION: Test validation of empty username parameter.
 
-    This test verifies that the tool properly validates empty username parameters
-    and raises RetryableToolError for empty or whitespace-only usernames.
+def test_get_audio_list_invalid_duration_and_date_filters():
+    """INPUT VALIDATION: Test validation of duration and date range parameters.
+
+    This test verifies that negative durations, inverted ranges and unparseable
+    dates raise RetryableToolError before any database call is made.
     """
-    # SETUP: Mock ToolContext for validation tests
-    mock_context = Mock(spec=ToolContext)
-    mock_context.get_secret.return_value = "test-secret-key"
+    # TEST: Negative durations are rejected
+    with pytest.raises(RetryableToolError, match="Invalid min_duration parameter"):
+        get_audio_list(tool_context(), min_duration=-1)
 
-    # TEST: Verify empty username parameter validation
-    with pytest.raises(RetryableToolError, match="Invalid username parameter"):
-        get_audio_list(mock_context, username="")
+    # TEST: min_duration greater than max_duration is rejected
+    with pytest.raises(RetryableToolError, match="Invalid duration range"):
+        get_audio_list(tool_context(), min_duration=600, max_duration=60)
 
-    # TEST: Verify whitespace-only username parameter validation
-    with pytest.raises(RetryableToolError, match="Invalid username parameter"):
-        get_audio_list(mock_context, username="   ")
+    # TEST: Dates that are not ISO 8601 are rejected
+    with pytest.raises(RetryableToolError, match="Invalid created_after parameter"):
+        get_audio_list(tool_context(), created_after="last year")
 
+    # TEST: created_after later than created_before is rejected
+    with pytest.raises(RetryableToolError, match="Invalid date range"):
+        get_audio_list(tool_context(), created_after="2025-06-01", created_before="2025-01-01")
 
-def test_get_audio_list_username_lookup_error():
-    """ERROR HANDLING: Test error handling during username lookup.
 
-    This test verifies that the tool properly handles unexpected errors
-    during the username lookup process and raises ToolExecutionError.
+# =============================================================================
+# SORT AND CURSOR PAGINATION TESTS
+# These tests verify selectable sort orders and keyset (cursor) pagination
+# =============================================================================
+
+
+def test_get_audio_list_sort_and_cursor(fake_supabase):
+    """NORMAL OPERATION: Test sorting by duration and continuing from a cursor.
+
+    This test verifies that a full page returns a next_cursor, and that passing it
+    back adds a keyset filter (sort value, id) instead of an OFFSET, with id as the
+    ordering tiebreaker.
     """
-    with patch("foundaudio.tools.get_audio_list.os.getenv") as mock_getenv, patch(
-        "foundaudio.tools.get_audio_list.create_client"
-    ) as mock_create_client:
-
-        # SETUP: Mock environment variables for Supabase configuration
-        mock_getenv.side_effect = lambda key, default=None: {
-            "SUPABASE_URL": "https://test.supabase.co"
-        }.get(key, default)
-
-        # SETUP: Mock ToolContext with valid secret
-        mock_context = Mock(spec=ToolContext)
-        mock_context.get_secret.return_value = "test-secret-key"
-
-        # SETUP: Mock Supabase client that raises an exception during profile lookup
-        mock_client = mock_create_client.return_value
-        mock_table = Mock()
-        mock_query = Mock()
-        mock_query.eq.return_value.execute.side_effect = Exception(
-            "Database connection error"
-        )
-        mock_table.select.return_value = mock_query
-        mock_client.from_.return_value = mock_table
-
-        # TEST: Verify that database errors during username lookup raise ToolExecutionError
-        with pytest.raises(
-            ToolExecutionError,
-            match="Error looking up username 'testuser': Database connection error",
-        ):
-            get_audio_list(mock_context, username="testuser")
+    # SETUP: Tracks of different lengths, one without a duration
+    fake_supabase.insert(
+        "audio_files",
+        [
+            _track("long1", "Marathon Mix", duration=7200.5, genres=["techno"]),
+            _track("mid1", "Club Set", duration=3600.0),
+            _track("none1", "Unknown Length", duration=None),
+        ],
+    )
+
+    # EXECUTE: First page sorted by longest duration
+    first_page = get_audio_list(tool_context(), limit=1, sort="duration desc")
+
+    # VERIFY: Sort is echoed, nulls are skipped and a cursor is returned
+    if first_page["sort"] != "duration desc" or _ids(first_page) != ["long1"]:
+        raise AssertionError(f"Expected long1 first, got {_ids(first_page)}")
+    if not first_page["next_cursor"]:
+        raise AssertionError("Expected a next_cursor for a full page")
+    query = fake_supabase.last_query("audio_files")
+    if query["duration"] != ["not.is.null"] or "or" in query:
+        raise AssertionError(f"Unexpected filters on the first page {query}")
+    if query["order"] != ["duration.desc,id.desc"]:
+        raise AssertionError(f"Unexpected order {query['order']}")
+
+    # EXECUTE: Continue from the cursor
+    second_page = get_audio_list(
+        tool_context(), limit=1, sort="duration desc", cursor=first_page["next_cursor"]
+    )
+
+    # VERIFY: The second query continues strictly after (7200.5, long1)
+    if _ids(second_page) != ["mid1"]:
+        raise AssertionError(f"Expected mid1 second, got {_ids(second_page)}")
+    query = fake_supabase.last_query("audio_files")
+    if query["or"] != ['(duration.lt."7200.5",and(duration.eq."7200.5",id.lt.long1))']:
+        raise AssertionError(f"Unexpected keyset filter {query.get('or')}")
+
+
+def test_get_audio_list_keyset_pages_cover_catalog(fake_supabase):
+    """NORMAL OPERATION: Test that keyset pages visit every row exactly once.
+
+    This test pages through a generated catalog with get_audio_list for every sort
+    order, following next_cursor, and verifies pages neither skip nor repeat rows
+    even when sort values tie.
+    """
+    # SETUP: Catalog with duplicated titles so the id tiebreaker matters
+    fake_supabase.insert(
+        "audio_files", generate_dataset(n_tracks=120, n_users=5)["audio_files"]
+    )
+
+    for field in SORT_FIELDS:
+        for direction in ("asc", "desc"):
+            # EXECUTE: Walk all pages following next_cursor
+            seen = []
+            cursor = None
+            while True:
+                page = get_audio_list(
+                    tool_context(), limit=7, sort=f"{field} {direction}", cursor=cursor
+                )
+                seen.extend(_ids(page))
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+
+            # VERIFY: Same rows, same order as a single unpaged query
+            params = [("order", f"{field}.{direction},id.{direction}")]
+            if field == "duration":
+                params.append(("duration", "not.is.null"))
+            expected, _ = fake_supabase.database.query("audio_files", params)
+            if seen != [row["id"] for row in expected]:
+                raise AssertionError(
+                    f"Keyset paging by {field} {direction} skipped or repeated rows"
+                )
+
+
+def test_get_audio_list_invalid_sort_and_cursor():
+    """INPUT VALIDATION: Test validation of sort and cursor parameters.
+
+    This test verifies that unknown sort columns, garbled cursors and cursors
+    reused with a different sort raise RetryableToolError.
+    """
+    # TEST: Unknown sort column
+    with pytest.raises(RetryableToolError, match="Invalid sort parameter"):
+        get_audio_list(tool_context(), sort="popularity")
+
+    # TEST: Cursor that is not one the tool produced
+    with pytest.raises(RetryableToolError, match="Invalid cursor parameter"):
+        get_audio_list(tool_context(), cursor="not-a-cursor")
+
+    # TEST: Cursor from a different sort order
+    cursor = _encode_cursor("title", "asc", "Deep House", "a3")
+    with pytest.raises(RetryableToolError, match="was created for sort 'title asc'"):
+        get_audio_list(tool_context(), sort="duration desc", cursor=cursor)
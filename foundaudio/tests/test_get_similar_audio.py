@@ -0,0 +1,303 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+from arcade_tdk import ToolContext
+
+from foundaudio.catalog import Catalog
+from foundaudio.search_index import SearchIndex
+from foundaudio.similarity import SimilarityIndex
+from foundaudio.text_store import TextFeatureStore
+from foundaudio.tools.get_similar_audio import get_similar_audio
+
+
+def _row(
+    audio_id: str,
+    title: str,
+    genres: list,
+    duration: float = 3600.0,
+    description: str = None,
+    updated_at: str = "2024-01-01T00:00:00Z",
+) -> dict:
+    """Build a raw audio_files row as PostgREST returns it."""
+    return {
+        "id": audio_id,
+        "title": title,
+        "description": description,
+        "duration": duration,
+        "genres": genres,
+        "user_id": "user1",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": updated_at,
+    }
+
+
+CATALOG_ROWS = [
+    _row("deep1", "Deep House Sunset", ["house", "deep house"], 3600.0),
+    _row("deep2", "Deep House Sunrise", ["house", "deep house"], 3500.0),
+    _row("tech1", "Warehouse Techno", ["techno"], 3600.0),
+    _row("amb1", "Ambient Drift", ["ambient"], 600.0, "slow beatless textures"),
+]
+
+
+def _mock_catalog_client(mock_create_client: Mock, pages: list) -> Mock:
+    """Wire a Supabase client mock whose catalog refresh returns the given pages."""
+    query_mock = Mock()
+    query_mock.or_.return_value = query_mock
+    responses = []
+    for page in pages:
+        response = Mock()
+        response.data = page
+        responses.append(response)
+    query_mock.order.return_value.order.return_value.limit.return_value.execute.side_effect = (
+        responses
+    )
+    mock_create_client.return_value.from_.return_value.select.return_value = query_mock
+    return query_mock
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify ranking and the incremental catalog refresh
+# =============================================================================
+
+
+def test_get_similar_audio_ranks_by_genre_text_and_duration():
+    """NORMAL OPERATION: Test that the closest track ranks first with a score breakdown.
+
+    The other deep house track shares both genres, most title words and nearly the
+    same duration, so it must outrank the techno mix (same duration only) and the
+    short ambient piece (nothing in common).
+    """
+    with patch("foundaudio.client.os.getenv") as mock_getenv, patch(
+        "foundaudio.client.create_client"
+    ) as mock_create_client:
+
+        # SETUP: Mock environment variables for Supabase configuration
+        mock_getenv.side_effect = lambda key, default=None: {
+            "SUPABASE_URL": "https://test.supabase.co"
+        }.get(key, default)
+
+        # SETUP: Mock ToolContext with valid secret
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+
+        # SETUP: The catalog fits in a single page
+        _mock_catalog_client(mock_create_client, [CATALOG_ROWS])
+
+        # EXECUTE: Find tracks like the first deep house set, passed as a URL
+        result = get_similar_audio(
+            mock_context, audio_id="https://foundaudio.club/audio/deep1", limit=3
+        )
+
+        # VERIFY: Source excluded, best match first, breakdown attached
+        ids = [audio_file["id"] for audio_file in result["similar_audio_files"]]
+        if ids != ["deep2", "tech1", "amb1"]:
+            raise AssertionError(f"Expected ['deep2', 'tech1', 'amb1'], got {ids}")
+        if result["audio_file"]["id"] != "deep1":
+            raise AssertionError("Expected the source audio file to be returned")
+        best = result["similar_audio_files"][0]
+        if best["similarity_breakdown"]["genre"] != 1.0:
+            raise AssertionError(f"Expected full genre overlap, got {best['similarity_breakdown']}")
+        if not 0 < best["similarity"] <= 1:
+            raise AssertionError(f"Expected a score in (0, 1], got {best['similarity']}")
+        if best["url"] != "https://foundaudio.club/audio/deep2":
+            raise AssertionError("Expected records to carry their audio page URL")
+
+
+def test_get_similar_audio_refreshes_catalog_incrementally():
+    """NORMAL OPERATION: Test that later refreshes only fetch rows past the watermark.
+
+    The first call loads the catalog; after it goes stale the next call asks only for
+    rows updated after the newest (updated_at, id) seen, and the new track becomes
+    rankable without rebuilding the index.
+    """
+    with patch("foundaudio.client.os.getenv") as mock_getenv, patch(
+        "foundaudio.client.create_client"
+    ) as mock_create_client, patch("foundaudio.catalog.time.monotonic") as mock_monotonic:
+
+        # SETUP: Mock environment variables for Supabase configuration
+        mock_getenv.side_effect = lambda key, default=None: {
+            "SUPABASE_URL": "https://test.supabase.co"
+        }.get(key, default)
+
+        # SETUP: Mock ToolContext with valid secret
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+
+        # SETUP: Initial load, then one newly uploaded deep house track
+        new_row = _row(
+            "deep3",
+            "Deep House Sunset Part Two",
+            ["house", "deep house"],
+            3600.0,
+            updated_at="2024-02-01T00:00:00Z",
+        )
+        query_mock = _mock_catalog_client(mock_create_client, [CATALOG_ROWS, [new_row]])
+
+        # EXECUTE: First call at t=0, second call after the catalog max age
+        mock_monotonic.return_value = 0.0
+        get_similar_audio(mock_context, audio_id="deep1")
+        mock_monotonic.return_value = 10_000.0
+        result = get_similar_audio(mock_context, audio_id="deep1", limit=1)
+
+        # VERIFY: The refresh filtered on the watermark and the new track ranks first
+        query_mock.or_.assert_called_once_with(
+            'updated_at.gt."2024-01-01T00:00:00Z",'
+            'and(updated_at.eq."2024-01-01T00:00:00Z",id.gt.tech1)'
+        )
+        ids = [audio_file["id"] for audio_file in result["similar_audio_files"]]
+        if ids != ["deep3"]:
+            raise AssertionError(f"Expected ['deep3'], got {ids}")
+
+
+def test_similarity_index_updates_rows_in_place():
+    """NORMAL OPERATION: Test that re-indexing a record replaces its features.
+
+    Changing a track's genres must move it in the ranking, and the index must grow
+    past its initial capacity.
+    """
+    # SETUP: Tiny initial capacity to force growth
+    index = SimilarityIndex(text_dim=64, capacity=1)
+    index.upsert(
+        [
+            {"id": "a", "title": "one", "genres": ["house"], "duration": 60},
+            {"id": "b", "title": "two", "genres": ["techno"], "duration": 60},
+            {"id": "c", "title": "three", "genres": ["house"], "duration": 60},
+        ]
+    )
+
+    # EXECUTE: Retag "b" as house and "c" as techno
+    index.upsert(
+        [
+            {"id": "b", "title": "two", "genres": ["house"], "duration": 60},
+            {"id": "c", "title": "three", "genres": ["techno"], "duration": 60},
+        ]
+    )
+
+    # VERIFY: "b" is now the nearest neighbour of "a"
+    ranked = [audio_id for audio_id, _, _ in index.similar("a", limit=2)]
+    if ranked != ["b", "c"]:
+        raise AssertionError(f"Expected ['b', 'c'], got {ranked}")
+    if len(index) != 3:
+        raise AssertionError(f"Expected 3 indexed tracks, got {len(index)}")
+
+
+def test_similarity_text_scores_follow_updates():
+    """NORMAL OPERATION: Test that cached text norms are recomputed after an update."""
+    # SETUP: Score once so the norms are cached, then retitle "b" to match "a"
+    index = SimilarityIndex(text_dim=64, capacity=4)
+    index.upsert(
+        [
+            {"id": "a", "title": "deep sunset groove", "genres": [], "duration": 60},
+            {"id": "b", "title": "industrial noise", "genres": [], "duration": 60},
+        ]
+    )
+    before = index.similar("a", limit=1)[0][2]["text"]
+
+    # EXECUTE
+    index.upsert([{"id": "b", "title": "deep sunset groove", "genres": [], "duration": 60}])
+    after = index.similar("a", limit=1)[0][2]["text"]
+
+    # VERIFY: Unrelated titles score 0, identical titles score 1
+    if (before, after) != (0.0, 1.0):
+        raise AssertionError(f"Expected text scores 0.0 then 1.0, got {before}, {after}")
+
+
+def test_similarity_and_search_share_text_store(tmp_path):
+    """NORMAL OPERATION: Test that search and similarity read one row per track."""
+    # SETUP: Both indexes on one store, filled the way the catalog listeners fill it
+    store = TextFeatureStore(directory=str(tmp_path), text_dim=64, capacity=1)
+    search = SearchIndex(store=store)
+    similarity = SimilarityIndex(store=store)
+    records = [
+        {"id": "a", "title": "deep sunset groove", "genres": ["house"], "duration": 60},
+        {"id": "b", "title": "deep sunset groove", "genres": ["house"], "duration": 60},
+        {"id": "c", "title": "industrial noise", "genres": ["techno"], "duration": 600},
+    ]
+
+    # EXECUTE
+    store.upsert(records)
+    similarity.upsert(records)
+    hits = search.search("sunset", limit=3)
+    similar = similarity.similar("a", limit=1)
+
+    # VERIFY: One row per track, both paths score from it
+    if len(store) != 3 or len(search) != 3 or len(similarity) != 3:
+        raise AssertionError(f"Expected 3 shared rows, got {len(store)}")
+    if sorted(hit[0] for hit in hits) != ["a", "b"]:
+        raise AssertionError(f"Expected search hits a, b, got {hits}")
+    if similar[0][0] != "b" or similar[0][2]["text"] != 1.0:
+        raise AssertionError(f"Expected b with text score 1.0, got {similar}")
+    store.clear()
+
+
+def test_catalog_pages_through_full_table():
+    """NORMAL OPERATION: Test that a first load keeps fetching until a short page."""
+    # SETUP: A full first page followed by a short second page
+    client = Mock()
+    query_mock = Mock()
+    query_mock.or_.return_value = query_mock
+    query_mock.order.return_value.order.return_value.limit.return_value.execute.side_effect = [
+        Mock(data=CATALOG_ROWS[:2]),
+        Mock(data=CATALOG_ROWS[2:3]),
+    ]
+    client.from_.return_value.select.return_value = query_mock
+
+    # EXECUTE: Load a catalog with two rows per page
+    local = Catalog(page_size=2)
+    applied = local.refresh(client)
+
+    # VERIFY: Both pages applied, the second one continued after the first
+    if applied != 3 or len(local) != 3:
+        raise AssertionError(f"Expected 3 records, got {applied} / {len(local)}")
+    query_mock.or_.assert_called_once_with(
+        'updated_at.gt."2024-01-01T00:00:00Z",'
+        'and(updated_at.eq."2024-01-01T00:00:00Z",id.gt.deep2)'
+    )
+
+# =============================================================================
+# INPUT VALIDATION TESTS
+# These tests verify parameter validation and unknown ids
+# =============================================================================
+
+
+@pytest.mark.parametrize("audio_id, limit", [("", 10), ("deep1", 0), ("deep1", 51)])
+def test_get_similar_audio_invalid_parameters(audio_id, limit):
+    """INPUT VALIDATION: Test that bad parameters raise RetryableToolError before any query."""
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        with pytest.raises(RetryableToolError):
+            get_similar_audio(mock_context, audio_id=audio_id, limit=limit)
+        mock_create_client.assert_not_called()
+
+
+def test_get_similar_audio_unknown_id():
+    """INPUT VALIDATION: Test that an id missing from the catalog is user-fixable."""
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+        _mock_catalog_client(mock_create_client, [CATALOG_ROWS])
+
+        with pytest.raises(RetryableToolError, match="Audio file 'missing' not found"):
+            get_similar_audio(mock_context, audio_id="missing")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify database errors are wrapped
+# =============================================================================
+
+
+def test_get_similar_audio_database_error():
+    """ERROR HANDLING: Test that refresh failures raise ToolExecutionError and retry later."""
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+        mock_create_client.return_value.from_.side_effect = Exception("Connection refused")
+
+        with pytest.raises(ToolExecutionError, match="Error accessing audio database"):
+            get_similar_audio(mock_context, audio_id="deep1")
+
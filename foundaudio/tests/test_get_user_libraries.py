@@ -0,0 +1,107 @@
+from collections import Counter
+
+import pytest
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+
+from foundaudio.cache import audio_file_cache
+from foundaudio.tools.get_user_libraries import get_user_libraries
+from tests.conftest import tool_context
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify several users' libraries are fetched with one lookup and one query each
+# =============================================================================
+
+
+def test_get_user_libraries_fetches_each_user_once(catalog_db):
+    """NORMAL OPERATION: Test that libraries come back per user with totals.
+
+    This test verifies one profiles query resolves every username and each found user
+    costs exactly one audio_files query, whose count gives the user's total.
+    """
+    # SETUP: How many tracks each generated user really has
+    profiles = {row["username"]: row["id"] for row in catalog_db.database.rows("profiles")}
+    totals = Counter(row["user_id"] for row in catalog_db.database.rows("audio_files"))
+
+    # EXECUTE: Compare two artists, with an unknown name in between
+    result = get_user_libraries(
+        tool_context(), usernames=["discodude", "nobody", "houseproducer"], limit_per_user=5
+    )
+
+    # VERIFY: Libraries in the requested order, capped per user, with real totals
+    names = [library["username"] for library in result["libraries"]]
+    if names != ["discodude", "houseproducer"] or result["not_found"] != ["nobody"]:
+        raise AssertionError(f"Unexpected libraries {names} / {result['not_found']}")
+    for library in result["libraries"]:
+        expected_total = totals[profiles[library["username"]]]
+        if library["total"] != expected_total or library["count"] != min(5, expected_total):
+            raise AssertionError(f"Unexpected counts for {library['username']}: {library}")
+        created = [audio_file["created_at"] for audio_file in library["audio_files"]]
+        if created != sorted(created, reverse=True):
+            raise AssertionError("Expected the newest tracks first")
+    if catalog_db.request_count != 3:
+        raise AssertionError(f"Expected 3 requests (1 profiles), got {catalog_db.request_count}")
+
+
+def test_get_user_libraries_populates_record_cache(catalog_db):
+    """NORMAL OPERATION: Test that returned tracks can be looked up by id without a query."""
+    result = get_user_libraries(tool_context(), usernames=["djsample"])
+
+    audio_id = result["libraries"][0]["audio_files"][0]["id"]
+    if audio_file_cache.get(audio_id) is None:
+        raise AssertionError("Expected returned records to be cached by id")
+
+
+# =============================================================================
+# INPUT VALIDATION TESTS
+# These tests verify bad parameters are rejected before any query
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "usernames, limit_per_user",
+    [
+        ([], 20),
+        (["  "], 20),
+        ([f"user{number}" for number in range(11)], 20),
+        (["discodude"], 0),
+        (["discodude"], 101),
+    ],
+)
+def test_get_user_libraries_rejects_invalid_parameters(usernames, limit_per_user):
+    """INPUT VALIDATION: Test that empty, oversized and out-of-range inputs are retryable."""
+    context = tool_context()
+
+    with pytest.raises(RetryableToolError):
+        get_user_libraries(context, usernames=usernames, limit_per_user=limit_per_user)
+
+    context.get_secret.assert_not_called()
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify unknown users and database errors are reported properly
+# =============================================================================
+
+
+def test_get_user_libraries_no_user_found(catalog_db):
+    """ERROR HANDLING: Test that a call where no username exists is retryable."""
+    with pytest.raises(RetryableToolError) as exc_info:
+        get_user_libraries(tool_context(), usernames=["nobody", "ghost"])
+
+    if "were found" not in str(exc_info.value):
+        raise AssertionError(f"Unexpected message {exc_info.value}")
+
+
+def test_get_user_libraries_database_error(catalog_db):
+    """ERROR HANDLING: Test that query failures become ToolExecutionError."""
+    # SETUP: The profiles lookup fails
+    catalog_db.fail("profiles", "permission denied for table profiles", status=401)
+
+    # EXECUTE & VERIFY
+    with pytest.raises(ToolExecutionError) as exc_info:
+        get_user_libraries(tool_context(), usernames=["discodude"])
+
+    if "Error accessing audio database" not in str(exc_info.value):
+        raise AssertionError(f"Unexpected message {exc_info.value}")
@@ -0,0 +1,166 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from foundaudio.hedging import Hedger, hedged, hedges
+from foundaudio.profiles import lookup_user_id
+
+
+def _trained(budget: float = 1.0, p95: float = 0.01) -> Hedger:
+    """Build a hedger whose 'profiles' window already has a p95 of `p95` seconds."""
+    hedger = Hedger(budget=budget, min_delay=0.0, min_samples=5)
+    for _ in range(20):
+        hedger.record("profiles", p95)
+    return hedger
+
+
+class SlowFirstRequest:
+    """A request whose first call blocks until released and whose later calls are fast."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> str:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            self.release.wait(5)
+            return "primary"
+        return "hedge"
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify slow reads are duplicated after the p95 and the first reply wins
+# =============================================================================
+
+
+def test_slow_request_is_hedged_and_hedge_wins():
+    """NORMAL OPERATION: Test that a request slower than p95 is duplicated."""
+    # SETUP: A window with a 10ms p95 and a primary that hangs
+    hedger = _trained()
+    request = SlowFirstRequest()
+
+    # EXECUTE: Call through the hedger
+    try:
+        result = hedger.call("profiles", request)
+    finally:
+        request.release.set()
+
+    # VERIFY: The hedge answered, and fire/win were counted
+    if result != "hedge" or request.calls != 2:
+        raise AssertionError(f"Expected the hedge to win, got {result} after {request.calls} calls")
+    if (hedges.value("profiles", "fired"), hedges.value("profiles", "won")) != (1, 1):
+        raise AssertionError("Expected one fired and one won hedge")
+
+
+def test_fast_request_is_not_hedged():
+    """NORMAL OPERATION: Test that requests within the p95 are sent once."""
+    hedger = _trained(p95=1.0)
+    request = Mock(return_value="rows")
+
+    if hedger.call("profiles", request) != "rows" or request.call_count != 1:
+        raise AssertionError("Expected a single request")
+    if hedges.value("profiles", "fired") != 0:
+        raise AssertionError("Expected no hedge")
+
+
+def test_primary_is_not_queued_behind_busy_pool():
+    """NORMAL OPERATION: Test that a primary request starts even when every hedge worker is busy."""
+    # SETUP: A one-worker pool held by a hung request, and a 1s hedge delay
+    hedger = Hedger(budget=1.0, min_delay=1.0, min_samples=5, max_workers=1)
+    for _ in range(20):
+        hedger.record("profiles", 0.001)
+    release = threading.Event()
+    busy = hedger._executor.submit(release.wait, 5)
+
+    # EXECUTE
+    try:
+        result = hedger.call("profiles", lambda: "rows")
+        still_busy = not busy.done()
+    finally:
+        release.set()
+
+    # VERIFY: Answered while the pool was still busy, without waiting for a hedge
+    if result != "rows" or not still_busy:
+        raise AssertionError("Expected the primary to run outside the hedge pool")
+    if hedges.value("profiles", "fired") != 0:
+        raise AssertionError("Expected no hedge for a primary that was never queued")
+
+
+def test_budget_caps_hedges():
+    """NORMAL OPERATION: Test that hedges stop once the budget is spent."""
+    # SETUP: A budget of half a hedge per call
+    hedger = _trained(budget=0.5)
+
+    # EXECUTE: Two slow calls; only the second has earned a whole hedge
+    results = []
+    for _ in range(2):
+        request = SlowFirstRequest()
+        timer = threading.Timer(0.1, request.release.set)
+        timer.start()
+        results.append(hedger.call("profiles", request))
+        timer.cancel()
+        request.release.set()
+
+    # VERIFY: First call waited for its primary, second was hedged
+    if results != ["primary", "hedge"]:
+        raise AssertionError(f"Unexpected results {results}")
+    if hedges.value("profiles", "over_budget") != 1 or hedges.value("profiles", "fired") != 1:
+        raise AssertionError("Expected one over-budget call and one hedge")
+
+
+def test_disabled_hedging_calls_directly(monkeypatch):
+    """NORMAL OPERATION: Test that lookups run inline when hedging is off (the default)."""
+    monkeypatch.setattr("foundaudio.hedging.HEDGING_ENABLED", False)
+    client = Mock()
+    query = client.from_.return_value.select.return_value.eq.return_value
+    query.execute.return_value = Mock(data=[{"id": "user1"}])
+
+    if lookup_user_id(client, "discodude") != "user1":
+        raise AssertionError("Expected the profile id")
+    if hedged("profiles", lambda: threading.current_thread()) is not threading.current_thread():
+        raise AssertionError("Expected the request to run on the calling thread")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify failures of one copy do not hide the other's reply
+# =============================================================================
+
+
+def test_failed_primary_falls_back_to_hedge():
+    """ERROR HANDLING: Test that an error from one copy waits for the other."""
+    hedger = _trained()
+    release = threading.Event()
+    calls = []
+
+    def request() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            raise ConnectionError("reset by peer")
+        release.set()
+        return "hedge"
+
+    if hedger.call("profiles", request) != "hedge":
+        raise AssertionError("Expected the hedge's reply")
+
+
+def test_both_copies_failing_raises():
+    """ERROR HANDLING: Test that the error is raised when both copies fail."""
+    hedger = _trained()
+    started = threading.Event()
+
+    def request() -> str:
+        if not started.is_set():
+            started.set()
+            threading.Event().wait(0.05)
+        raise TimeoutError("read timed out")
+
+    with pytest.raises(TimeoutError):
+        hedger.call("profiles", request)
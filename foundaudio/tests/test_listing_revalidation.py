@@ -0,0 +1,114 @@
+from unittest.mock import Mock, patch
+
+from foundaudio.cache import listing_cache
+from foundaudio.client import get_client, supabase_url
+from foundaudio.metrics import listing_revalidations
+from foundaudio.testing import FakeSupabase
+from foundaudio.tools.get_audio_list import DEFAULT_SORT, NO_FILTERS, fetch_listing
+
+HOUSE = {**NO_FILTERS, "genre": "house"}
+HOUSE_KEY = (tuple(sorted(HOUSE.items())), DEFAULT_SORT, None, 50)
+
+
+def _fetch() -> list:
+    """Fetch the newest 50 house tracks through a pooled client."""
+    client = get_client(supabase_url(), "test-secret-key")
+    return fetch_listing(client, dict(HOUSE), DEFAULT_SORT, None, 50)
+
+
+def _new_track(fake: FakeSupabase, updated_at: str) -> dict:
+    """Build a house track row newer than every generated one."""
+    row = dict(fake.database.rows("audio_files")[0])
+    row.update(id="new-track", genres=["house"], created_at=updated_at, updated_at=updated_at)
+    return row
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify expired pages are revalidated with a probe instead of refetched
+# =============================================================================
+
+
+def test_unchanged_scope_extends_cached_page(catalog_db):
+    """NORMAL OPERATION: Test that an unchanged scope is served again after one probe.
+
+    The first expiry of a page fetched on a cold miss stores a validator with a full
+    refetch; later expiries need only the probe.
+    """
+    with patch("foundaudio.tools.get_audio_list.LISTING_CACHE_TTL", -1):
+        # EXECUTE: Cold miss, first expiry, then a revalidated expiry
+        first = _fetch()
+        _fetch()
+        requests_before = catalog_db.request_count
+        third = _fetch()
+
+    # VERIFY: Last call made one request (the probe) and returned the same page
+    requests = catalog_db.request_count - requests_before
+    if requests != 1:
+        raise AssertionError(f"Expected only the probe, got {requests} requests")
+    if [row["id"] for row in third] != [row["id"] for row in first]:
+        raise AssertionError("Expected the cached page to be served")
+    outcomes = [listing_revalidations.value(result) for result in ("first", "unchanged")]
+    if outcomes != [1, 1]:
+        raise AssertionError("Expected one first probe and one unchanged revalidation")
+
+
+def test_changed_scope_refetches(catalog_db):
+    """NORMAL OPERATION: Test that a new row in the scope triggers a full refetch."""
+    with patch("foundaudio.tools.get_audio_list.LISTING_CACHE_TTL", -1):
+        # SETUP: A page with a validator
+        _fetch()
+        _fetch()
+
+        # EXECUTE: A new house track is uploaded, then the page expires again
+        new_track = _new_track(catalog_db, "2030-01-01T00:00:00+00:00")
+        catalog_db.insert("audio_files", [new_track])
+        page = _fetch()
+
+    # VERIFY: The new track leads the refetched page
+    if page[0]["id"] != "new-track" or listing_revalidations.value("changed") != 1:
+        raise AssertionError(f"Expected a refetch with the new track, got {page[0]['id']}")
+
+
+def test_fresh_page_skips_probe(catalog_db):
+    """NORMAL OPERATION: Test that pages within the TTL are served without any request."""
+    _fetch()
+    requests_before = catalog_db.request_count
+
+    _fetch()
+
+    if catalog_db.request_count != requests_before:
+        raise AssertionError("Expected a fresh page to need no request")
+    if listing_cache.get(HOUSE_KEY)["validator"] is not None:
+        raise AssertionError("Expected a cold-miss page to have no validator yet")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify a failing probe falls back to the full query
+# =============================================================================
+
+
+def test_failed_probe_falls_back_to_refetch():
+    """ERROR HANDLING: Test that a probe error refetches instead of serving stale rows."""
+    # SETUP: A cached page that has expired
+    listing_cache.put(
+        HOUSE_KEY,
+        {
+            "rows": [{"id": "stale"}],
+            "validator": ["2024-01-01T00:00:00Z", 1],
+            "checked_at": 0.0,
+        },
+    )
+    supabase = Mock()
+    query_mock = supabase.from_.return_value.select.return_value.contains.return_value
+    query_mock.order.return_value.limit.return_value.execute.side_effect = Exception("timeout")
+    listing = query_mock.order.return_value.order.return_value.limit.return_value
+    listing.execute.return_value = Mock(data=[])
+
+    # EXECUTE: Fetch the expired page
+    page = fetch_listing(supabase, dict(HOUSE), DEFAULT_SORT, None, 50)
+
+    # VERIFY: Fresh (empty) result from the full query
+    if page != [] or listing_revalidations.value("unavailable") != 1:
+        raise AssertionError(f"Expected a refetched empty page, got {page}")
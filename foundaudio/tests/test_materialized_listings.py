@@ -0,0 +1,177 @@
+import time
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+from postgrest.exceptions import APIError
+
+from foundaudio.client import get_client, supabase_url
+from foundaudio.materialized import (
+    MaterializedListings,
+    materialized_listings,
+    start_view_refresh,
+    view_refreshes,
+)
+from foundaudio.tools.get_audio_list import get_audio_list
+from tests.conftest import tool_context
+
+SECRET = "test-secret-key"
+
+
+def _refresh() -> None:
+    materialized_listings.refresh(get_client(supabase_url(), SECRET))
+
+
+def _ids(result: dict) -> list:
+    return [audio_file["id"] for audio_file in result["audio_files"]]
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify the latest listings are served from views that match the database
+# =============================================================================
+
+
+def test_latest_listings_are_served_from_views(catalog_db):
+    """NORMAL OPERATION: Test that the default and top-genre listings need no query."""
+    # SETUP: Refresh the views; the top genre is the most common among recent uploads
+    _refresh()
+    genres = Counter(
+        genre for row in catalog_db.database.rows("audio_files") for genre in row["genres"]
+    )
+    top_genre = genres.most_common(1)[0][0]
+    requests = catalog_db.request_count
+
+    # EXECUTE
+    latest = get_audio_list(tool_context())
+    by_genre = get_audio_list(tool_context(), genre=top_genre, limit=10)
+
+    # VERIFY: Answered by the views without a request, same rows as the database
+    if (latest["source"], by_genre["source"]) != ("view", "view"):
+        raise AssertionError(f"Expected views, got {latest['source']}, {by_genre['source']}")
+    if catalog_db.request_count != requests:
+        raise AssertionError("Expected no database request")
+    if top_genre not in materialized_listings.view_genres():
+        raise AssertionError(f"Expected a view for {top_genre}")
+    live = get_audio_list(tool_context(), genre=top_genre, limit=10, max_staleness=0)
+    if _ids(by_genre) != _ids(live):
+        raise AssertionError("Expected the view to match the database")
+
+
+def test_cursor_pages_within_view(catalog_db):
+    """NORMAL OPERATION: Test that following pages are served while they fit in the view."""
+    _refresh()
+
+    first = get_audio_list(tool_context(), limit=50)
+    second = get_audio_list(tool_context(), limit=50, cursor=first["next_cursor"])
+    live = get_audio_list(tool_context(), limit=50, cursor=first["next_cursor"], max_staleness=0)
+
+    if second["source"] != "view" or _ids(second) != _ids(live):
+        raise AssertionError("Expected the second page from the view, equal to the database")
+    if second["next_cursor"] != live["next_cursor"]:
+        raise AssertionError("Expected the same cursor as the database page")
+
+
+def test_refresh_swaps_in_new_uploads(catalog_db):
+    """NORMAL OPERATION: Test that an upload appears after the next refresh, not before."""
+    _refresh()
+    upload = dict(catalog_db.database.rows("audio_files")[0])
+    upload["id"] = "ffffffff-0000-4000-8000-000000000001"
+    upload["created_at"] = "2099-01-01T00:00:00+00:00"
+    catalog_db.insert("audio_files", [upload])
+
+    before = get_audio_list(tool_context(), limit=5)
+    _refresh()
+    after = get_audio_list(tool_context(), limit=5)
+
+    if upload["id"] in _ids(before) or _ids(after)[0] != upload["id"]:
+        raise AssertionError("Expected the upload to appear only after the refresh")
+
+
+def test_background_refresh_runs_until_stopped(catalog_db):
+    """NORMAL OPERATION: Test that the refresh thread loads the views and stops cleanly."""
+    views = MaterializedListings(size=20, genres=2)
+
+    thread = views.start(supabase_url(), SECRET, interval=0.05)
+    deadline = time.monotonic() + 5
+    while view_refreshes.value("ok") < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    views.stop()
+
+    if view_refreshes.value("ok") < 2 or thread.is_alive():
+        raise AssertionError("Expected repeated refreshes and a stopped thread")
+    if len(views.view_genres()) != 2 or views.age is None:
+        raise AssertionError("Expected the overall view and two genre views")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify failed refreshes keep the old snapshot and unfit listings go live
+# =============================================================================
+
+
+def test_failed_refresh_keeps_previous_snapshot(catalog_db):
+    """ERROR HANDLING: Test that a failing refresh leaves the last good views in place."""
+    _refresh()
+    catalog_db.fail("audio_files", "canceling statement due to statement timeout")
+
+    with pytest.raises(APIError):
+        _refresh()
+    result = get_audio_list(tool_context(), limit=5)
+
+    if result["source"] != "view" or view_refreshes.value("failed") != 1:
+        raise AssertionError("Expected the previous views to keep serving")
+
+
+def test_stale_views_are_not_used(catalog_db, monkeypatch):
+    """ERROR HANDLING: Test that views older than the staleness bound are skipped."""
+    _refresh()
+    views, _ = materialized_listings._snapshot
+    monkeypatch.setattr(materialized_listings, "_snapshot", (views, time.monotonic() - 120))
+
+    result = get_audio_list(tool_context(), limit=5)
+
+    if result["source"] != "database":
+        raise AssertionError(f"Expected the database, got {result['source']}")
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"search": "sun"},
+        {"sort": "duration desc"},
+        {"genre": "not-a-genre"},
+        {"username": "discodude"},
+    ],
+)
+def test_other_listings_go_to_database(catalog_db, arguments):
+    """ERROR HANDLING: Test that listings no view holds are not answered from one."""
+    _refresh()
+
+    result = get_audio_list(tool_context(), limit=5, **arguments)
+
+    if result["source"] != "database":
+        raise AssertionError(f"Expected the database for {arguments}, got {result['source']}")
+
+
+def test_page_past_view_goes_to_database(catalog_db, monkeypatch):
+    """ERROR HANDLING: Test that a page extending past the view's rows is fetched live."""
+    monkeypatch.setattr(materialized_listings, "size", 30)
+    _refresh()
+
+    first = get_audio_list(tool_context(), limit=20)
+    second = get_audio_list(tool_context(), limit=20, cursor=first["next_cursor"])
+
+    if (first["source"], second["source"]) != ("view", "database"):
+        raise AssertionError(f"Unexpected sources {first['source']}, {second['source']}")
+
+
+def test_start_view_refresh_requires_anon_key(monkeypatch):
+    """ERROR HANDLING: Test that the refresh thread does not start without SUPABASE_ANON_KEY."""
+    monkeypatch.delenv("SUPABASE_ANON_KEY", raising=False)
+    monkeypatch.setattr("foundaudio.materialized.VIEWS_ENABLED", True)
+
+    with patch("foundaudio.materialized.threading.Thread") as mock_thread:
+        if start_view_refresh() is not None:
+            raise AssertionError("Expected no refresh thread without an anon key")
+        mock_thread.assert_not_called()
@@ -0,0 +1,233 @@
+import urllib.request
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+from arcade_tdk import ToolContext
+
+from foundaudio.cache import listing_cache
+from foundaudio.metrics import (
+    Registry,
+    _record_response,
+    instrument_client,
+    percentile,
+    start_metrics_server,
+    supabase_decoded_bytes,
+    supabase_requests,
+    supabase_response_bytes,
+    tool_duration,
+    tool_errors,
+)
+from foundaudio.tools.get_audio_list import filter_shape, get_audio_list
+
+
+def _mock_context() -> Mock:
+    """Build a ToolContext mock with a valid secret."""
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+    return mock_context
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify metrics are recorded and rendered in the Prometheus format
+# =============================================================================
+
+
+def test_registry_renders_counters_and_histograms():
+    """NORMAL OPERATION: Test the text exposition format for counters and histograms."""
+    # SETUP: A registry with one counter and one histogram
+    metrics = Registry()
+    requests = metrics.counter("requests_total", "Requests.", labels=("table",))
+    latency = metrics.histogram("latency_seconds", "Latency.", labels=("tool",), buckets=(0.1, 1))
+
+    # EXECUTE: Record values and render
+    requests.inc("audio_files")
+    requests.inc("audio_files", amount=2)
+    latency.observe(0.05, "list")
+    latency.observe(0.1, "list")
+    latency.observe(3, "list")
+    text = metrics.render()
+
+    # VERIFY: HELP/TYPE lines, cumulative buckets with an +Inf bucket, sum and count
+    expected = [
+        "# TYPE requests_total counter",
+        'requests_total{table="audio_files"} 3',
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{tool="list",le="0.1"} 2',
+        'latency_seconds_bucket{tool="list",le="1"} 2',
+        'latency_seconds_bucket{tool="list",le="+Inf"} 3',
+        'latency_seconds_sum{tool="list"} 3.15',
+        'latency_seconds_count{tool="list"} 3',
+    ]
+    for line in expected:
+        if line not in text.splitlines():
+            raise AssertionError(f"Expected line {line!r} in:\n{text}")
+
+
+def test_observe_tool_records_latency_by_shape():
+    """NORMAL OPERATION: Test that tool calls are timed under their filter shape."""
+    with patch("foundaudio.client.create_client") as mock_create_client:
+
+        # SETUP: Mock client returning no rows for a genre + search listing
+        query_mock = Mock()
+        query_mock.execute.return_value = Mock(data=[])
+        for method in ("eq", "or_", "contains", "gte", "lte", "order", "limit"):
+            getattr(query_mock, method).return_value = query_mock
+        mock_create_client.return_value.from_.return_value.select.return_value = query_mock
+
+        # EXECUTE: Two calls with the same shape and different values
+        get_audio_list(_mock_context(), genre="house", search="deep")
+        get_audio_list(_mock_context(), genre="techno", search="acid")
+
+        # VERIFY: Both recorded under one shape label
+        count = tool_duration.count("get_audio_list", "search+genre")
+        if count != 2:
+            raise AssertionError(f"Expected 2 observations for search+genre, got {count}")
+
+
+def test_filter_shape_never_contains_values():
+    """NORMAL OPERATION: Test that shape labels name the filters used, not their values."""
+    shape = filter_shape(
+        {
+            "username": "discodude",
+            "genre": "deep house",
+            "min_duration": 0,
+            "sort": "duration asc",
+            "search_mode": "relevance",
+            "search": "sunset",
+            "max_response_tokens": 500,
+        }
+    )
+
+    if shape != "username+search+genre+min_duration|sort=duration|mode=relevance|budget":
+        raise AssertionError(f"Unexpected shape {shape!r}")
+    if filter_shape({}) != "none":
+        raise AssertionError(f"Expected 'none' without filters, got {filter_shape({})!r}")
+
+
+def test_percentile_uses_nearest_rank():
+    """NORMAL OPERATION: Test the percentile every latency summary shares."""
+    values = [float(value) for value in range(1, 21)]
+
+    results = [percentile(values, fraction) for fraction in (0.0, 0.5, 0.95, 0.99, 1.0)]
+
+    if results != [1.0, 10.0, 19.0, 20.0, 20.0]:
+        raise AssertionError(f"Unexpected percentiles {results}")
+    if percentile([], 0.5) != 0.0 or percentile([7.0], 0.95) != 7.0:
+        raise AssertionError("Expected 0.0 for no values and the value itself for one")
+
+
+def test_record_response_counts_requests_and_bytes():
+    """NORMAL OPERATION: Test that PostgREST responses are counted by table and status."""
+    # SETUP: An httpx client answering every request with a fixed body
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            404 if "missing" in request.url.path else 200, content=b"[1,2,3]"
+        )
+    )
+    client = httpx.Client(transport=transport, event_hooks={"response": [_record_response]})
+
+    # EXECUTE: Query two tables
+    client.get("https://test.supabase.co/rest/v1/audio_files?select=*")
+    client.get("https://test.supabase.co/rest/v1/audio_files?select=*")
+    client.get("https://test.supabase.co/rest/v1/missing")
+
+    # VERIFY: Requests by table/method/status and bytes by table
+    if supabase_requests.value("audio_files", "GET", "2xx") != 2:
+        raise AssertionError("Expected two successful audio_files requests")
+    if supabase_requests.value("missing", "GET", "4xx") != 1:
+        raise AssertionError("Expected one 4xx request")
+    if supabase_response_bytes.value("audio_files") != 14:
+        raise AssertionError(f"Expected 14 bytes, got {supabase_response_bytes.value('audio_files')}")
+
+
+def test_record_response_counts_bytes_as_body_is_read():
+    """NORMAL OPERATION: Test that the hook counts a streamed body as it is read, not itself."""
+    # SETUP: A body that arrives in chunks, as it does over a socket
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, stream=httpx.ByteStream(b"[1,2,3,4]"))
+    )
+    client = httpx.Client(transport=transport, event_hooks={"response": [_record_response]})
+
+    # EXECUTE: Let the hook run, then read the body
+    with client.stream("GET", "https://test.supabase.co/rest/v1/audio_files") as response:
+        before = supabase_response_bytes.value("audio_files")
+        body = response.read()
+
+    # VERIFY: Nothing counted until the body was read, then its size
+    if before != 0:
+        raise AssertionError("Expected the hook to leave the body unread")
+    if body != b"[1,2,3,4]" or supabase_decoded_bytes.value("audio_files", "identity") != 9:
+        raise AssertionError("Expected the decoded bytes to be counted as the body was read")
+
+
+def test_instrument_client_adds_response_hook():
+    """NORMAL OPERATION: Test that pooled clients get the response hook on their session."""
+    client = Mock()
+    client.postgrest.session = httpx.Client()
+
+    instrument_client(client)
+
+    if _record_response not in client.postgrest.session.event_hooks["response"]:
+        raise AssertionError("Expected the response hook to be installed")
+
+
+def test_cache_hit_ratio_and_scrape_endpoint():
+    """NORMAL OPERATION: Test that cache hit ratios are served from /metrics."""
+    # SETUP: One hit and three misses on the listing cache
+    listing_cache.put("key", [])
+    listing_cache.get("key")
+    for _ in range(3):
+        listing_cache.get("other")
+
+    # EXECUTE: Scrape a server on a free port
+    server = start_metrics_server(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            content_type = response.headers["Content-Type"]
+            text = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # VERIFY: Prometheus content type and the listing cache lines
+    if not content_type.startswith("text/plain; version=0.0.4"):
+        raise AssertionError(f"Unexpected content type {content_type}")
+    for line in (
+        'foundaudio_cache_requests_total{cache="listing",result="hit"} 1',
+        'foundaudio_cache_requests_total{cache="listing",result="miss"} 3',
+        'foundaudio_cache_hit_ratio{cache="listing"} 0.25',
+    ):
+        if line not in text.splitlines():
+            raise AssertionError(f"Expected line {line!r} in scrape")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify failed calls are counted by error kind
+# =============================================================================
+
+
+def test_observe_tool_counts_error_kinds():
+    """ERROR HANDLING: Test that retryable and execution errors are counted separately."""
+    with patch("foundaudio.client.create_client") as mock_create_client:
+
+        # SETUP: Database failure for the second call
+        mock_create_client.return_value.from_.side_effect = Exception("Connection refused")
+
+        # EXECUTE: One invalid call, one failing call
+        with pytest.raises(RetryableToolError):
+            get_audio_list(_mock_context(), limit=0)
+        with pytest.raises(ToolExecutionError):
+            get_audio_list(_mock_context())
+
+        # VERIFY: One error of each kind, and both calls still timed
+        if tool_errors.value("get_audio_list", "retryable") != 1:
+            raise AssertionError("Expected one retryable error")
+        if tool_errors.value("get_audio_list", "execution") != 1:
+            raise AssertionError("Expected one execution error")
+        if tool_duration.count("get_audio_list", "none") != 2:
+            raise AssertionError("Expected both failed calls to be timed")
@@ -0,0 +1,174 @@
+import json
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import pytest
+
+from foundaudio.testing import (
+    PostgrestQueryError,
+    PostgrestStandIn,
+    StandInDatabase,
+    generate_dataset,
+)
+
+# A tiny hand-written catalog keeps expectations in these tests easy to read
+TABLES = {
+    "audio_files": [
+        {
+            "id": "a1",
+            "title": "House Party",
+            "description": "party vibes",
+            "duration": 3600.0,
+            "genres": ["house", "disco"],
+            "user_id": "u1",
+            "created_at": "2024-01-03T00:00:00+00:00",
+        },
+        {
+            "id": "a2",
+            "title": "Jazz Night",
+            "description": None,
+            "duration": None,
+            "genres": ["jazz"],
+            "user_id": "u2",
+            "created_at": "2024-01-02T00:00:00+00:00",
+        },
+        {
+            "id": "a3",
+            "title": "Deep House",
+            "description": "a high energy set",
+            "duration": 1800.0,
+            "genres": ["house"],
+            "user_id": "u1",
+            "created_at": "2024-01-01T00:00:00+00:00",
+        },
+    ],
+    "profiles": [{"id": "u1", "username": "discodude"}],
+}
+
+# =============================================================================
+# QUERY EVALUATION TESTS
+# These tests verify the stand-in applies PostgREST filter semantics correctly
+# =============================================================================
+
+
+def test_stand_in_filters_and_ordering():
+    """NORMAL OPERATION: Test the filters the toolkit sends to PostgREST.
+
+    This test verifies that the same query parameters the Supabase client produces
+    for get_audio_list (eq, or/ilike, cs, order, limit) select the expected rows.
+    """
+    # SETUP: Database with the fixed catalog
+    database = StandInDatabase(TABLES)
+
+    # EXECUTE: Search + genre filter ordered by created_at desc
+    rows, total = database.query(
+        "audio_files",
+        [
+            ("select", "id, title"),
+            ("or", "(title.ilike.%house%,description.ilike.%house%)"),
+            ("genres", "cs.{house}"),
+            ("order", "created_at.desc"),
+            ("limit", "1"),
+        ],
+    )
+
+    # VERIFY: Both house tracks match, the newest comes first, projection applied
+    if total != 2:
+        raise AssertionError(f"Expected 2 matching rows, got {total}")
+    if rows != [{"id": "a1", "title": "House Party"}]:
+        raise AssertionError(f"Unexpected page: {rows}")
+
+    # EXECUTE: Numeric comparison and in() against the same table
+    rows, _ = database.query(
+        "audio_files", [("duration", "gte.2000"), ("user_id", "in.(u1,u2)")]
+    )
+
+    # VERIFY: NULL durations never satisfy a comparison
+    if [row["id"] for row in rows] != ["a1"]:
+        raise AssertionError(f"Expected only a1, got {rows}")
+
+
+def test_stand_in_null_ordering_and_negation():
+    """NORMAL OPERATION: Test nulls placement and negated filters in order/where.
+
+    This test verifies Postgres defaults (NULLs first when descending) and the
+    explicit nullslast modifier, plus `not.` and `is.null` filters.
+    """
+    database = StandInDatabase(TABLES)
+
+    # EXECUTE: Descending order with the Postgres default nulls placement
+    rows, _ = database.query("audio_files", [("order", "duration.desc")])
+    if [row["id"] for row in rows] != ["a2", "a1", "a3"]:
+        raise AssertionError(f"Expected NULL first, got {[r['id'] for r in rows]}")
+
+    # EXECUTE: Same order with nullslast and an id tiebreaker
+    rows, _ = database.query("audio_files", [("order", "duration.desc.nullslast,id.asc")])
+    if [row["id"] for row in rows] != ["a1", "a3", "a2"]:
+        raise AssertionError(f"Expected NULL last, got {[r['id'] for r in rows]}")
+
+    # EXECUTE: Negated and null checks
+    rows, _ = database.query(
+        "audio_files", [("duration", "not.is.null"), ("title", "not.ilike.*party*")]
+    )
+    if [row["id"] for row in rows] != ["a3"]:
+        raise AssertionError(f"Expected only a3, got {rows}")
+
+
+def test_stand_in_rejects_unknown_syntax():
+    """ERROR HANDLING: Test that unsupported queries fail loudly.
+
+    Silently ignoring an unknown operator would make tests pass against the
+    stand-in that fail against the real PostgREST server.
+    """
+    database = StandInDatabase(TABLES)
+
+    with pytest.raises(PostgrestQueryError, match="Unsupported operator"):
+        database.query("audio_files", [("title", "fts.house")])
+
+    with pytest.raises(PostgrestQueryError, match="does not exist"):
+        database.query("missing_table", [])
+
+
+# =============================================================================
+# HTTP SERVER TESTS
+# These tests verify the stand-in speaks PostgREST over HTTP
+# =============================================================================
+
+
+def test_stand_in_http_round_trip():
+    """NORMAL OPERATION: Test reading rows and exact counts over HTTP.
+
+    This test verifies the response body and Content-Range header the Supabase
+    client relies on, using the generated dataset.
+    """
+    # SETUP: Serve the deterministic generated catalog
+    tables = generate_dataset(n_tracks=50, n_users=5)
+    with PostgrestStandIn(tables) as stand_in:
+        query = urlencode({"select": "id,title", "limit": "10"})
+        request = Request(
+            f"{stand_in.url}/rest/v1/audio_files?{query}",
+            headers={"Prefer": "count=exact"},
+        )
+
+        # EXECUTE: Read the first page
+        with urlopen(request) as response:
+            body = json.loads(response.read())
+            content_range = response.headers["Content-Range"]
+
+        # VERIFY: Page size, projected columns and total count
+        if len(body) != 10:
+            raise AssertionError(f"Expected 10 rows, got {len(body)}")
+        if set(body[0]) != {"id", "title"}:
+            raise AssertionError(f"Expected id/title only, got {set(body[0])}")
+        if content_range != "0-9/50":
+            raise AssertionError(f"Expected Content-Range 0-9/50, got {content_range}")
+
+        # EXECUTE: An invalid filter returns a PostgREST-style 400 error
+        with pytest.raises(HTTPError) as error:
+            urlopen(f"{stand_in.url}/rest/v1/audio_files?duration=gte.long")
+        if error.value.code != 400:
+            raise AssertionError(f"Expected HTTP 400, got {error.value.code}")
+
+        if stand_in.request_count != 2:
+            raise AssertionError(f"Expected 2 requests, got {stand_in.request_count}")
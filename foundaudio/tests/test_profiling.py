@@ -0,0 +1,109 @@
+import json
+import pstats
+
+import pytest
+from arcade_core.errors import RetryableToolError
+
+from foundaudio.profiling import CallProfiler
+from foundaudio.tools.get_audio_list import get_audio_list
+from tests.conftest import tool_context
+
+
+def _use_profiler(monkeypatch, profiler: CallProfiler) -> CallProfiler:
+    monkeypatch.setattr("foundaudio.profiling.call_profiler", profiler)
+    return profiler
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify sampled calls leave a loadable profile and their parameters
+# =============================================================================
+
+
+def test_sampled_call_writes_profile_and_parameters(catalog_db, monkeypatch, tmp_path):
+    """NORMAL OPERATION: Test that a sampled call is profiled with its parameters."""
+    # SETUP: Profile every call
+    profiler = _use_profiler(monkeypatch, CallProfiler(str(tmp_path), sample_rate=1.0))
+
+    # EXECUTE: One genre listing
+    get_audio_list(tool_context(), genre="house", limit=5)
+
+    # VERIFY: A pstats file covering the query, next to the call's parameters
+    captures = profiler.captures()
+    if len(captures) != 1:
+        raise AssertionError(f"Expected one capture, got {captures}")
+    functions = {function for _, _, function in pstats.Stats(str(captures[0])).stats}
+    if "answer_listing" not in functions:
+        raise AssertionError("Expected answer_listing in the profile")
+    entry = json.loads(captures[0].with_suffix(".json").read_text())
+    if entry["shape"] != "genre" or entry["parameters"]["genre"] != "house":
+        raise AssertionError(f"Unexpected entry {entry}")
+    if "context" in entry["parameters"] or entry["rows"] != 5:
+        raise AssertionError("Expected parameters without the context and the row count")
+
+
+def test_shape_filter_and_rate_limit_sampling(catalog_db, monkeypatch, tmp_path):
+    """NORMAL OPERATION: Test that only the configured shape is sampled, and rate 0 is off."""
+    profiler = _use_profiler(
+        monkeypatch, CallProfiler(str(tmp_path), sample_rate=1.0, shape="search")
+    )
+
+    get_audio_list(tool_context(), genre="house", limit=5)
+    get_audio_list(tool_context(), search="dance", limit=5)
+    profiler.sample_rate = 0.0
+    get_audio_list(tool_context(), search="party", limit=5)
+
+    entries = [capture.with_suffix(".json").read_text() for capture in profiler.captures()]
+    shapes = [json.loads(entry)["shape"] for entry in entries]
+    if shapes != ["search"]:
+        raise AssertionError(f"Expected only the first search call, got {shapes}")
+
+
+def test_directory_is_trimmed_oldest_first(catalog_db, monkeypatch, tmp_path):
+    """NORMAL OPERATION: Test size-based rotation keeps the newest captures."""
+    # SETUP: Room for roughly one capture
+    profiler = _use_profiler(monkeypatch, CallProfiler(str(tmp_path), sample_rate=1.0))
+    get_audio_list(tool_context(), limit=5)
+    profiler.max_bytes = sum(path.stat().st_size for path in tmp_path.iterdir())
+
+    # EXECUTE: Two more calls
+    get_audio_list(tool_context(), genre="house", limit=5)
+    get_audio_list(tool_context(), genre="techno", limit=5)
+
+    # VERIFY: Only the newest capture (and its parameters) is left
+    captures = profiler.captures()
+    entry = json.loads(captures[-1].with_suffix(".json").read_text())
+    if len(captures) != 1 or entry["parameters"]["genre"] != "techno":
+        raise AssertionError(f"Expected only the newest capture, got {captures}")
+    if len(list(tmp_path.iterdir())) != 2:
+        raise AssertionError("Expected the .json files of trimmed captures to be removed")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify failed calls are captured and capture trouble never fails a call
+# =============================================================================
+
+
+def test_failed_call_is_captured_and_reraised(monkeypatch, tmp_path):
+    """ERROR HANDLING: Test that a failing call still leaves its profile."""
+    profiler = _use_profiler(monkeypatch, CallProfiler(str(tmp_path), sample_rate=1.0))
+
+    with pytest.raises(RetryableToolError):
+        get_audio_list(tool_context(), limit=0)
+
+    entry = json.loads(profiler.captures()[0].with_suffix(".json").read_text())
+    if entry["error"] != "RetryableToolError":
+        raise AssertionError(f"Expected the error kind, got {entry['error']}")
+
+
+def test_unwritable_directory_does_not_fail_call(catalog_db, monkeypatch, tmp_path):
+    """ERROR HANDLING: Test that a capture that cannot be written is dropped."""
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    _use_profiler(monkeypatch, CallProfiler(str(blocker / "profiles"), sample_rate=1.0))
+
+    result = get_audio_list(tool_context(), limit=5)
+
+    if result["count"] != 5:
+        raise AssertionError("Expected the call to succeed")
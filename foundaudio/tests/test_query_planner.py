@@ -0,0 +1,161 @@
+import time
+
+import pytest
+from arcade_core.errors import RetryableToolError
+
+from foundaudio.cache import listing_cache
+from foundaudio.catalog import catalog
+from foundaudio.client import get_client, supabase_url
+from foundaudio.planner import QueryPlanner, query_sources
+from foundaudio.tools.get_audio_list import get_audio_list
+from tests.conftest import tool_context
+
+
+def _load_catalog() -> None:
+    catalog.refresh(get_client(supabase_url(), "test-secret-key"))
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify the cheapest fresh-enough source answers, and answers correctly
+# =============================================================================
+
+
+def test_planner_picks_cheapest_fresh_source():
+    """NORMAL OPERATION: Test that stale sources are ruled out and the cheapest wins."""
+    # SETUP: A 10s-old cached page and a 10s-old catalog of 1000 records
+    planner = QueryPlanner(priors={"cache": 0.1, "catalog": 0.01, "database": 50.0})
+    candidates = {"cache": (10.0, 1), "catalog": (10.0, 1000)}
+
+    # EXECUTE: Plan with a loose, a tight and a zero freshness bound
+    loose, estimates = planner.plan(candidates, max_staleness=60)
+    tight, _ = planner.plan({"catalog": (10.0, 1000)}, max_staleness=60)
+    live, live_estimates = planner.plan(candidates, max_staleness=0)
+
+    # VERIFY
+    if (loose, tight, live) != ("cache", "catalog", "database"):
+        raise AssertionError(f"Unexpected plans {loose}, {tight}, {live}")
+    if estimates != {"database": 50.0, "cache": 0.1, "catalog": 10.0}:
+        raise AssertionError(f"Unexpected estimates {estimates}")
+    if list(live_estimates) != ["database"]:
+        raise AssertionError("Expected only the database to be eligible at staleness 0")
+
+
+def test_planner_learns_observed_costs():
+    """NORMAL OPERATION: Test that estimates follow observed costs, per record for the catalog."""
+    planner = QueryPlanner(priors={"cache": 0.1, "catalog": 0.01, "database": 50.0})
+
+    for _ in range(50):
+        planner.record("database", 2.0)
+    planner.record("catalog", 30.0, work=1000)
+
+    if abs(planner.estimate("database") - 2.0) > 0.01:
+        raise AssertionError(f"Expected ~2ms, got {planner.estimate('database')}")
+    if planner.estimate("catalog", 2000) != 2 * planner.estimate("catalog", 1000):
+        raise AssertionError("Expected the catalog estimate to scale with its size")
+    # A catalog costing more than the database loses even when fresh
+    source, _ = planner.plan({"catalog": (0.0, 1000)}, max_staleness=60)
+    if source != "database":
+        raise AssertionError(f"Expected the cheaper database, got {source}")
+
+
+def test_repeat_call_uses_cache_unless_live_data_is_required(catalog_db):
+    """NORMAL OPERATION: Test that a repeat is answered locally and max_staleness=0 goes live."""
+    first = get_audio_list(tool_context(), genre="jazz", limit=5)
+    requests = catalog_db.request_count
+    repeat = get_audio_list(tool_context(), genre="jazz", limit=5)
+    cached_requests = catalog_db.request_count
+    live = get_audio_list(tool_context(), genre="jazz", limit=5, max_staleness=0)
+
+    if (first["source"], repeat["source"], live["source"]) != ("database", "cache", "database"):
+        raise AssertionError(f"Unexpected sources {first['source']}, {repeat['source']}")
+    if cached_requests != requests or catalog_db.request_count == cached_requests:
+        raise AssertionError("Expected only the live call to reach the database")
+    if query_sources.value("cache") != 1 or query_sources.value("database") != 2:
+        raise AssertionError("Expected the sources to be counted")
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {},
+        {"genre": "jazz", "limit": 7},
+        {"min_duration": 600, "max_duration": 3000, "sort": "duration asc"},
+        {"created_after": "2024-06-01", "created_before": "2024-09-30"},
+        {"search": "sun", "sort": "updated_at"},
+        {"username": "discodude", "limit": 5},
+    ],
+)
+def test_catalog_answers_like_the_database(catalog_db, arguments):
+    """NORMAL OPERATION: Test that catalog pages, and their cursors, match database pages."""
+    # SETUP: A freshly loaded catalog
+    _load_catalog()
+
+    # EXECUTE: Two pages from the database, then the same two pages from the catalog
+    pages = {}
+    for source, max_staleness in (("database", 0), ("catalog", None)):
+        listing_cache.clear()
+        first = get_audio_list(tool_context(), **arguments, max_staleness=max_staleness)
+        requests = catalog_db.request_count
+        second = get_audio_list(
+            tool_context(), **arguments, cursor=first["next_cursor"], max_staleness=max_staleness
+        )
+        if (first["source"], second["source"]) != (source, source):
+            raise AssertionError(f"Expected {source}, got {first['source']}")
+        if source == "catalog" and catalog_db.request_count != requests:
+            raise AssertionError("Expected catalog pages to need no request")
+        pages[source] = [
+            ([audio_file["id"] for audio_file in page["audio_files"]], page["next_cursor"])
+            for page in (first, second)
+        ]
+
+    # VERIFY: Same rows, same order, same cursors
+    if pages["catalog"] != pages["database"]:
+        raise AssertionError(f"Expected identical pages for {arguments}")
+    if not pages["database"][0][0]:
+        raise AssertionError("Expected the filters to match some rows")
+
+
+# =============================================================================
+# INPUT VALIDATION TESTS
+# These tests verify the freshness bound is validated before any query
+# =============================================================================
+
+
+def test_negative_max_staleness_is_rejected():
+    """INPUT VALIDATION: Test that a negative max_staleness is a retryable error."""
+    with pytest.raises(RetryableToolError) as exc_info:
+        get_audio_list(tool_context(), max_staleness=-1)
+
+    if "max_staleness" not in str(exc_info.value):
+        raise AssertionError(f"Unexpected message {exc_info.value}")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify listings the catalog cannot reproduce, or too old, go live
+# =============================================================================
+
+
+def test_unreproducible_listings_go_to_database(catalog_db):
+    """ERROR HANDLING: Test that title order and pattern characters are left to the database."""
+    _load_catalog()
+
+    by_title = get_audio_list(tool_context(), sort="title", limit=5)
+    pattern = get_audio_list(tool_context(), search="sun_", limit=5)
+
+    if (by_title["source"], pattern["source"]) != ("database", "database"):
+        raise AssertionError(f"Expected the database, got {by_title['source']}")
+
+
+def test_stale_catalog_is_not_used(catalog_db, monkeypatch):
+    """ERROR HANDLING: Test that a catalog older than the bound is skipped."""
+    _load_catalog()
+    monkeypatch.setattr(catalog, "_refreshed_at", time.monotonic() - 120)
+
+    default = get_audio_list(tool_context(), genre="funk", limit=5)
+    listing_cache.clear()
+    relaxed = get_audio_list(tool_context(), genre="funk", limit=5, max_staleness=300)
+
+    if (default["source"], relaxed["source"]) != ("database", "catalog"):
+        raise AssertionError(f"Unexpected sources {default['source']}, {relaxed['source']}")
@@ -0,0 +1,144 @@
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+from arcade_core.errors import RetryableToolError
+from arcade_tdk import ToolContext
+
+from foundaudio.ratelimit import RateLimitExceeded, TokenBucket, limit_client, rate_limited
+from foundaudio.tools.get_audio_files_by_id import get_audio_files_by_id
+
+
+class FakeClock:
+    """A manually advanced clock; sleeping records the duration without advancing."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+
+
+def _bucket(clock: FakeClock, **overrides) -> TokenBucket:
+    """Build a bucket of 10 requests/second with a burst of 2 on the fake clock."""
+    settings = {"rate": 10.0, "burst": 2, "max_waiters": 2, "max_wait": 1.0}
+    settings.update(overrides)
+    return TokenBucket(clock=clock, sleep=clock.sleep, **settings)
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify bursts pass immediately and later requests queue in order
+# =============================================================================
+
+
+def test_burst_passes_then_requests_wait_in_order():
+    """NORMAL OPERATION: Test that requests past the burst wait for their reserved token."""
+    # SETUP: Burst of 2 at 10 requests/second
+    clock = FakeClock()
+    bucket = _bucket(clock, max_waiters=10)
+
+    # EXECUTE: Five requests at the same instant
+    waits = [bucket.acquire() for _ in range(5)]
+
+    # VERIFY: Two immediate, then 0.1s apart in arrival order
+    if [round(wait, 6) for wait in waits] != [0.0, 0.0, 0.1, 0.2, 0.3]:
+        raise AssertionError(f"Unexpected waits {waits}")
+    if clock.sleeps != [0.1, 0.2, 0.3] or bucket.waiters != 0:
+        raise AssertionError(f"Expected three sleeps and an empty queue, got {clock.sleeps}")
+
+
+def test_tokens_refill_up_to_burst():
+    """NORMAL OPERATION: Test that idle time refills tokens, capped at the burst size."""
+    clock = FakeClock()
+    bucket = _bucket(clock)
+    bucket.acquire()
+    bucket.acquire()
+
+    clock.now = 60.0
+    waits = [bucket.acquire(), bucket.acquire(), bucket.acquire()]
+
+    if [round(wait, 6) for wait in waits] != [0.0, 0.0, 0.1]:
+        raise AssertionError(f"Expected a refilled burst of 2, got {waits}")
+
+
+def test_limited_client_takes_a_token_per_request():
+    """NORMAL OPERATION: Test that every request on a limited client passes the limiter."""
+    # SETUP: A client session with the limiter hook and a bucket of 1
+    clock = FakeClock()
+    bucket = _bucket(clock, burst=1, max_waiters=0)
+    client = Mock()
+    client.postgrest.session = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=[]))
+    )
+    limit_client(client)
+
+    with patch("foundaudio.ratelimit.supabase_limiter", bucket):
+        # EXECUTE: Two requests with one token and no queue
+        client.postgrest.session.get("https://test.supabase.co/rest/v1/audio_files")
+        with pytest.raises(RateLimitExceeded):
+            client.postgrest.session.get("https://test.supabase.co/rest/v1/audio_files")
+
+    # VERIFY: One admitted, one shed and counted
+    if (bucket.admitted, bucket.shed, rate_limited.value()) != (1, 1, 1):
+        raise AssertionError(f"Unexpected counts {bucket.admitted}, {bucket.shed}")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify load is shed early instead of queueing without bound
+# =============================================================================
+
+
+def test_full_queue_sheds_requests():
+    """ERROR HANDLING: Test that requests are rejected once max_waiters are queued."""
+    # SETUP: A sleep that never returns while the test checks the queue
+    clock = FakeClock()
+    bucket = _bucket(clock, max_waiters=1)
+    bucket.acquire()
+    bucket.acquire()
+
+    def blocked_sleep(seconds: float) -> None:
+        # EXECUTE: While the first waiter sleeps, another request arrives
+        with pytest.raises(RateLimitExceeded, match="waiting"):
+            bucket.acquire()
+
+    bucket._sleep = blocked_sleep
+    bucket.acquire()
+
+    # VERIFY: Shed request is counted and the queue drained
+    if bucket.shed != 1 or bucket.waiters != 0:
+        raise AssertionError(f"Expected one shed request, got {bucket.shed}")
+
+
+def test_request_past_max_wait_is_shed():
+    """ERROR HANDLING: Test that a token due after max_wait is not reserved."""
+    clock = FakeClock()
+    bucket = _bucket(clock, max_waiters=10, max_wait=0.15)
+    for _ in range(3):
+        bucket.acquire()
+
+    with pytest.raises(RateLimitExceeded, match="rate limit"):
+        bucket.acquire()
+
+    # A rejected request reserves nothing, so the next slot is still 0.2s away
+    clock.now = 0.05
+    if round(bucket.acquire(), 6) != 0.15:
+        raise AssertionError("Expected the shed request not to consume a token")
+
+
+def test_shed_request_surfaces_as_retryable_error():
+    """ERROR HANDLING: Test that tools return shed requests as RetryableToolError."""
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        query = mock_create_client.return_value.from_.return_value.select.return_value
+        query.in_.return_value.execute.side_effect = RateLimitExceeded("busy")
+
+        with pytest.raises(RetryableToolError, match="busy"):
+            get_audio_files_by_id(mock_context, ids=["a1"])
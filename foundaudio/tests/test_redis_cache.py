@@ -0,0 +1,173 @@
+import json
+import socket
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from foundaudio import codec
+from foundaudio.cache import LRUCache, make_cache
+from foundaudio.redis_cache import RedisCache, parse_redis_url
+from foundaudio.testing import RedisStandIn
+
+
+def _record(audio_id: str) -> dict:
+    """Build a validated audio file dictionary as the record cache stores it."""
+    return {
+        "id": audio_id,
+        "title": f"Track {audio_id}",
+        "description": "Deep house for late nights",
+        "duration": 3600.5,
+        "genres": ["house", "deep house"],
+        "user_id": "user1",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "audio_url": f"https://foundaudio.club/audio/{audio_id}",
+    }
+
+
+@pytest.fixture
+def redis_stand_in():
+    with RedisStandIn() as stand_in:
+        yield stand_in
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify the binary codec and that replicas share cached entries
+# =============================================================================
+
+
+def test_codec_round_trips_and_is_smaller_than_json():
+    """NORMAL OPERATION: Test that cached payloads decode unchanged and beat JSON on size."""
+    # SETUP: A page of records and a listing-cache key with tuples and negatives
+    page = [_record(f"a{number}") for number in range(20)]
+    key = ((("genre", "house"), ("min_duration", None)), ("created_at", "desc"), (-3, "a1"), 20)
+
+    # EXECUTE: Encode and decode
+    payload = codec.dumps(page)
+
+    # VERIFY: Exact round trips, including tuples, bools, floats and empty containers
+    if codec.loads(payload) != page or codec.loads(codec.dumps(key)) != key:
+        raise AssertionError("Expected values to round-trip unchanged")
+    for value in (True, False, 0, -1, 2**70, 1.5, "", "ü", b"\x00", [], {}, ()):
+        if codec.loads(codec.dumps(value)) != value:
+            raise AssertionError(f"Expected {value!r} to round-trip")
+    if len(payload) > 0.7 * len(json.dumps(page).encode("utf-8")):
+        raise AssertionError(f"Expected a compact payload, got {len(payload)} bytes")
+
+
+def test_replicas_share_entries(redis_stand_in):
+    """NORMAL OPERATION: Test that one replica's writes are hits for another."""
+    # SETUP: Two caches in the same namespace, as two workers would have
+    first = RedisCache(redis_stand_in.url, namespace="record", ttl=60)
+    second = RedisCache(redis_stand_in.url, namespace="record", ttl=60)
+
+    # EXECUTE: Write on the first, read on the second
+    first.put_many([("a1", _record("a1")), ("a2", _record("a2"))])
+    found = second.get_many(["a1", "a2", "a3"])
+
+    # VERIFY: Two hits and one miss, values intact
+    if found != {"a1": _record("a1"), "a2": _record("a2")}:
+        raise AssertionError(f"Unexpected values {found}")
+    if (second.hits, second.misses) != (2, 1):
+        raise AssertionError(f"Expected 2 hits and 1 miss, got {second.hits}/{second.misses}")
+    if second.get("a1") != _record("a1"):
+        raise AssertionError("Expected a single-key hit")
+
+
+def test_ttl_namespaces_and_clear(redis_stand_in):
+    """NORMAL OPERATION: Test expiry, namespace isolation, composite keys and clear."""
+    records = RedisCache(redis_stand_in.url, namespace="record", ttl=0.05)
+    listings = RedisCache(redis_stand_in.url, namespace="listing", ttl=60)
+    created_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    key = ((("created_from", created_from), ("genre", "house")), ("created_at", "desc"), None, 20)
+
+    records.put("a1", _record("a1"))
+    listings.put(key, [_record("a1")])
+    listings.put("a1", "other namespace")
+    time.sleep(0.1)
+
+    if records.get("a1") is not None:
+        raise AssertionError("Expected the record to expire")
+    if listings.get(key) != [_record("a1")] or listings.get("a1") != "other namespace":
+        raise AssertionError("Expected listing entries to be unaffected")
+
+    listings.clear()
+    if listings.get(key) is not None or (listings.hits, listings.misses) != (0, 1):
+        raise AssertionError("Expected clear to remove entries and reset counters")
+
+
+def test_make_cache_selects_backend(redis_stand_in, monkeypatch):
+    """NORMAL OPERATION: Test that FOUNDAUDIO_CACHE_URL switches caches to Redis."""
+    if not isinstance(make_cache("record", maxsize=10, ttl=60), LRUCache):
+        raise AssertionError("Expected the in-memory backend by default")
+
+    monkeypatch.setattr("foundaudio.cache.CACHE_URL", redis_stand_in.url)
+    cache = make_cache("record", maxsize=10, ttl=60)
+
+    if not isinstance(cache, RedisCache) or cache.namespace != "record":
+        raise AssertionError(f"Expected a Redis cache, got {cache!r}")
+    if parse_redis_url("redis://:s%40cret@cache:6380/2") != {
+        "host": "cache",
+        "port": 6380,
+        "db": 2,
+        "password": "s@cret",
+    }:
+        raise AssertionError("Unexpected parsed URL")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify cache trouble degrades to misses instead of failing calls
+# =============================================================================
+
+
+def test_unreachable_server_is_a_miss():
+    """ERROR HANDLING: Test that an unreachable server makes every lookup a miss."""
+    # SETUP: A port nothing listens on
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    cache = RedisCache(f"redis://127.0.0.1:{port}/0", namespace="record", ttl=60)
+
+    # EXECUTE: Write and read
+    cache.put("a1", _record("a1"))
+    value = cache.get("a1")
+
+    # VERIFY: Miss, error counted, and the server is skipped for a while
+    if value is not None or cache.misses != 1 or cache.errors != 1:
+        raise AssertionError(f"Expected one miss and one error, got {cache.misses}/{cache.errors}")
+
+
+def test_unparsable_reply_discards_connection(redis_stand_in):
+    """ERROR HANDLING: Test that a malformed reply is a miss and its connection is dropped."""
+    # SETUP: A cached record, then an MGET answered with an unknown reply type followed
+    # by bytes that would be read as the next command's reply on the same connection
+    cache = RedisCache(redis_stand_in.url, namespace="record", ttl=60)
+    cache.put("a1", _record("a1"))
+    redis_stand_in.raw_replies["MGET"] = b"%1\r\n+stray\r\n+stray\r\n"
+
+    # EXECUTE
+    malformed = cache.get("a1")
+    del redis_stand_in.raw_replies["MGET"]
+    value = cache.get("a1")
+
+    # VERIFY: One miss and error, then the record from a fresh connection
+    if malformed is not None or cache.errors != 1:
+        raise AssertionError(f"Expected a miss and an error, got {malformed} / {cache.errors}")
+    if value != _record("a1"):
+        raise AssertionError(f"Expected the cached record, got {value}")
+
+
+def test_undecodable_entry_is_a_miss(redis_stand_in):
+    """ERROR HANDLING: Test that entries from another format version are ignored."""
+    cache = RedisCache(redis_stand_in.url, namespace="record", ttl=60)
+    redis_stand_in.data[b"foundaudio:record:a1"] = (b"\xffgarbage", None)
+
+    if cache.get("a1") is not None or cache.misses != 1:
+        raise AssertionError("Expected an undecodable entry to be a miss")
+    with pytest.raises(codec.CodecError):
+        codec.loads(codec.dumps([1, 2])[:-1])
+    with pytest.raises(codec.CodecError):
+        codec.dumps({"value": object()})
@@ -0,0 +1,163 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from arcade_core.errors import RetryableToolError
+from arcade_tdk import ToolContext
+
+from foundaudio.ranking import (
+    DESCRIPTION_PARTIAL,
+    DESCRIPTION_WORD,
+    TITLE_EXACT,
+    TITLE_PARTIAL,
+    TITLE_WORD,
+    relevance_score,
+    top_by_relevance,
+)
+from foundaudio.tools.get_audio_list import (
+    RELEVANCE_CANDIDATES,
+    _encode_cursor,
+    get_audio_list,
+)
+
+
+def _row(
+    audio_id: str,
+    title: str,
+    description: str = None,
+    created_at: str = "2024-01-01T00:00:00Z",
+) -> dict:
+    """Build a raw audio_files row as PostgREST returns it."""
+    return {
+        "id": audio_id,
+        "title": title,
+        "description": description,
+        "duration": 3600.0,
+        "genres": ["house"],
+        "user_id": "user1",
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+# Newest first, as the candidate query returns them; the exact title match is the oldest
+CANDIDATE_ROWS = [
+    _row("desc1", "Sunday Session", "a pool party warm up", "2024-03-01T00:00:00Z"),
+    _row("part1", "Whirlpool Partytime", None, "2024-02-01T00:00:00Z"),
+    _row("word1", "Rooftop Pool Party Vol. 2", None, "2024-01-15T00:00:00Z"),
+    _row("exact1", "Pool Party", "pool party classics", "2024-01-01T00:00:00Z"),
+]
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify scoring tiers and relevance-ordered pages
+# =============================================================================
+
+
+def test_relevance_score_tiers():
+    """NORMAL OPERATION: Test that title beats description and exact beats partial."""
+    cases = [
+        ("Pool Party", None, TITLE_EXACT),
+        ("Rooftop Pool Party", None, TITLE_WORD),
+        ("Whirlpool Partytime", None, TITLE_PARTIAL),
+        ("Pool Parties", None, 0.0),
+        ("Sunday", "a pool party warm up", DESCRIPTION_WORD),
+        ("Sunday", "whirlpool party", DESCRIPTION_PARTIAL),
+        ("Pool Party", "  POOL   party ", TITLE_EXACT + DESCRIPTION_WORD),
+    ]
+    for title, description, expected in cases:
+        score = relevance_score("pool party", title, description)
+        if score != expected:
+            raise AssertionError(f"Expected {expected} for {title!r}/{description!r}, got {score}")
+
+
+def test_top_by_relevance_keeps_best_matches():
+    """NORMAL OPERATION: Test that only the top results are kept, ties broken by recency."""
+    audio_files = [dict(row) for row in CANDIDATE_ROWS] + [
+        dict(_row("exact2", "pool party", "Pool Party", "2024-05-01T00:00:00Z"))
+    ]
+
+    top = top_by_relevance(audio_files, "pool party", limit=3)
+
+    ids = [audio_file["id"] for audio_file, _ in top]
+    if ids != ["exact2", "exact1", "word1"]:
+        raise AssertionError(f"Expected ['exact2', 'exact1', 'word1'], got {ids}")
+
+
+def test_get_audio_list_relevance_mode_ranks_candidates():
+    """NORMAL OPERATION: Test that relevance mode returns the best match from a larger pool.
+
+    The database returns candidates newest first, as substring mode would; the exact
+    title match is the oldest but must come back first, and the cursor must continue
+    with the next-best match.
+    """
+    with patch("foundaudio.client.create_client") as mock_create_client:
+
+        # SETUP: Mock ToolContext with valid secret
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+
+        # SETUP: Candidate query returns the rows newest first
+        query_mock = Mock()
+        mock_response = Mock()
+        mock_response.data = CANDIDATE_ROWS
+        query_mock.or_.return_value.order.return_value.order.return_value.limit.return_value.execute.return_value = (
+            mock_response
+        )
+        mock_create_client.return_value.from_.return_value.select.return_value = query_mock
+
+        # EXECUTE: Ask for the single best match
+        result = get_audio_list(
+            mock_context, search="pool party", search_mode="relevance", limit=1
+        )
+
+        # VERIFY: A larger candidate pool was requested with the substring filter
+        query_mock.or_.assert_called_once_with(
+            "title.ilike.%pool party%,description.ilike.%pool party%"
+        )
+        query_mock.or_.return_value.order.return_value.order.return_value.limit.assert_called_once_with(
+            RELEVANCE_CANDIDATES
+        )
+
+        # VERIFY: The exact title match wins despite being the oldest
+        if [audio_file["id"] for audio_file in result["audio_files"]] != ["exact1"]:
+            raise AssertionError(f"Expected ['exact1'], got {result['audio_files']}")
+        if result["audio_files"][0]["relevance"] != TITLE_EXACT + DESCRIPTION_WORD:
+            raise AssertionError(f"Unexpected relevance {result['audio_files'][0]['relevance']}")
+
+        # EXECUTE: Continue from the cursor
+        next_page = get_audio_list(
+            mock_context,
+            search="pool party",
+            search_mode="relevance",
+            limit=5,
+            cursor=result["next_cursor"],
+        )
+
+        # VERIFY: Remaining matches in relevance order, title matches first
+        ids = [audio_file["id"] for audio_file in next_page["audio_files"]]
+        if ids != ["word1", "part1", "desc1"]:
+            raise AssertionError(f"Expected ['word1', 'part1', 'desc1'], got {ids}")
+        if next_page["next_cursor"] is not None:
+            raise AssertionError("Expected no cursor after the last match")
+
+
+# =============================================================================
+# INPUT VALIDATION TESTS
+# These tests verify cursors from other orderings are rejected
+# =============================================================================
+
+
+def test_get_audio_list_relevance_mode_rejects_foreign_cursor():
+    """INPUT VALIDATION: Test that a semantic-mode cursor cannot page relevance results."""
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+
+    with patch("foundaudio.client.create_client"):
+        with pytest.raises(RetryableToolError, match="Invalid cursor parameter"):
+            get_audio_list(
+                mock_context,
+                search="pool party",
+                search_mode="relevance",
+                cursor=_encode_cursor("relevance", "desc", 0.42, "exact1"),
+            )
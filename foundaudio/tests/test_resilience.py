@@ -0,0 +1,188 @@
+import time
+
+import pytest
+from arcade_core.errors import RetryableToolError, ToolExecutionError
+
+from foundaudio.cache import listing_cache
+from foundaudio.metrics import percentile
+from foundaudio.retries import SupabaseUnavailable, supabase_retries
+from foundaudio.testing import Fault, fixed, lognormal
+from foundaudio.tools.get_audio_list import get_audio_list
+from tests.conftest import tool_context
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    """Retry with fast backoff and no client-side rate limit."""
+    monkeypatch.setattr("foundaudio.retries.RETRY_BACKOFF", 0.01)
+    monkeypatch.setattr("foundaudio.ratelimit.supabase_limiter", None)
+
+
+def _timed_call(**arguments) -> float:
+    """Run one get_audio_list call and return its latency in milliseconds."""
+    started = time.perf_counter()
+    get_audio_list(tool_context(), **arguments)
+    return (time.perf_counter() - started) * 1000
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify transient faults are retried and how latency degrades under each
+# =============================================================================
+
+
+def test_transient_503_is_retried(stand_in):
+    """NORMAL OPERATION: Test that a short gateway outage is hidden by retries."""
+    # SETUP: The next two audio_files requests fail with 503
+    stand_in.inject("audio_files", Fault(status=503, times=2))
+
+    # EXECUTE
+    result = get_audio_list(tool_context(), limit=5)
+
+    # VERIFY: Three attempts, two retries counted, rows returned
+    if result["count"] != 5 or stand_in.request_count != 3:
+        raise AssertionError(f"Expected 5 rows after 3 requests, got {stand_in.request_count}")
+    if supabase_retries.value("503") != 2:
+        raise AssertionError("Expected two retries for 503")
+
+
+def test_connection_reset_is_retried(stand_in):
+    """NORMAL OPERATION: Test that a dropped connection is retried on a new one."""
+    stand_in.inject("audio_files", Fault(reset=True, times=1))
+
+    result = get_audio_list(tool_context(), limit=5)
+
+    if result["count"] != 5 or supabase_retries.value("connection") != 1:
+        raise AssertionError("Expected one retry after the reset")
+
+
+def test_retry_after_is_honoured(stand_in):
+    """NORMAL OPERATION: Test that a 429 is retried after the server's Retry-After."""
+    stand_in.inject("audio_files", Fault(status=429, retry_after=0.2, times=1))
+
+    elapsed_ms = _timed_call(limit=5)
+
+    if elapsed_ms < 200 or supabase_retries.value("429") != 1:
+        raise AssertionError(f"Expected to wait out Retry-After, took {elapsed_ms:.0f}ms")
+
+
+@pytest.mark.xdist_group("timing")
+def test_latency_degradation_under_faults(stand_in):
+    """NORMAL OPERATION: Test how p50/p95 latency degrades under each kind of fault.
+
+    Every profile runs the same 20 listings, uncached. Retries must keep all
+    calls succeeding at a 10% fault rate, and each fault may only cost what it injects
+    plus the backoff: no fault may push the p95 past two seconds, a bound loose enough
+    for a loaded CI machine. Injected latency is checked as a floor, which a slow
+    machine can only raise.
+    """
+    profiles = {
+        "baseline": None,
+        "lognormal latency": Fault(latency=lognormal(median_ms=50, sigma=0.5)),
+        "10% 503": Fault(status=503, probability=0.1),
+        "10% 429": Fault(status=429, retry_after=0.05, probability=0.1),
+        "10% reset": Fault(reset=True, probability=0.1),
+        "10% slow drip": Fault(drip_bytes_per_s=50_000, probability=0.1),
+    }
+
+    # The first call pays for creating the client; keep it out of the baseline
+    _timed_call(limit=1)
+
+    report = {}
+    for name, fault in profiles.items():
+        stand_in.clear_faults()
+        listing_cache.clear()
+        if fault is not None:
+            stand_in.inject("audio_files", fault)
+        latencies = sorted(_timed_call(limit=number + 1) for number in range(20))
+        report[name] = (percentile(latencies, 0.5), percentile(latencies, 0.95))
+
+    summary = ", ".join(
+        f"{name}: p50={p50:.0f}ms p95={p95:.0f}ms" for name, (p50, p95) in report.items()
+    )
+    if any(p95 > 2000 for _, p95 in report.values()):
+        raise AssertionError(f"Expected every p95 under 2s, got {summary}")
+    if report["lognormal latency"][0] < 25:
+        raise AssertionError(f"Expected injected latency to show in the p50, got {summary}")
+    if stand_in.faults_applied == 0:
+        raise AssertionError("Expected faults to have been applied")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify timeouts and exhausted retries map to the right tool errors
+# =============================================================================
+
+
+def test_persistent_503_becomes_retryable_error(stand_in):
+    """ERROR HANDLING: Test that an outage outlasting the retries is a retryable error."""
+    stand_in.inject("audio_files", Fault(status=503))
+
+    with pytest.raises(RetryableToolError) as exc_info:
+        get_audio_list(tool_context(), limit=5)
+
+    if not isinstance(exc_info.value, SupabaseUnavailable) or stand_in.request_count != 3:
+        raise AssertionError(f"Expected 3 attempts, got {stand_in.request_count}")
+    if "HTTP 503" not in str(exc_info.value):
+        raise AssertionError(f"Unexpected message {exc_info.value}")
+
+
+def test_long_retry_after_is_not_waited(stand_in):
+    """ERROR HANDLING: Test that a Retry-After beyond the cap fails fast instead of waiting."""
+    stand_in.inject("audio_files", Fault(status=429, retry_after=30))
+
+    with pytest.raises(RetryableToolError):
+        get_audio_list(tool_context(), limit=5)
+
+    if stand_in.request_count != 1:
+        raise AssertionError(f"Expected no retry, got {stand_in.request_count} requests")
+
+
+def test_slow_drip_body_hits_deadline(stand_in, monkeypatch):
+    """ERROR HANDLING: Test that a body trickling in never holds a call past the deadline.
+
+    httpx's read timeout restarts with every chunk, so only the total deadline stops a
+    response that arrives a few bytes at a time. Dripping 50 rows takes about 40 seconds,
+    so the call only fails if the deadline stops it; an httpx timeout would be chained.
+    """
+    monkeypatch.setattr("foundaudio.retries.SUPABASE_TIMEOUT", 0.3)
+    stand_in.inject("audio_files", Fault(drip_bytes_per_s=500))
+
+    with pytest.raises(SupabaseUnavailable) as exc_info:
+        get_audio_list(tool_context(), limit=50)
+
+    if "did not answer in time" not in str(exc_info.value) or stand_in.request_count != 1:
+        raise AssertionError("Expected one attempt stopped by the deadline")
+    if exc_info.value.__cause__ is not None:
+        raise AssertionError(f"Expected the deadline, not {exc_info.value.__cause__!r}")
+
+
+def test_slow_response_times_out(stand_in, monkeypatch):
+    """ERROR HANDLING: Test that a response slower than the timeout is a retryable error."""
+    monkeypatch.setattr("foundaudio.retries.SUPABASE_TIMEOUT", 0.2)
+    stand_in.inject("audio_files", Fault(latency=fixed(600)))
+
+    with pytest.raises(RetryableToolError) as exc_info:
+        get_audio_list(tool_context(), limit=5)
+
+    if "did not answer in time" not in str(exc_info.value) or stand_in.request_count != 1:
+        raise AssertionError("Expected one timed-out attempt and no retry")
+
+
+def test_server_error_is_not_retried(stand_in):
+    """ERROR HANDLING: Test that a 500 (not transient) fails once as an execution error."""
+    stand_in.inject("audio_files", Fault(status=500))
+
+    with pytest.raises(ToolExecutionError):
+        get_audio_list(tool_context(), limit=5)
+
+    if stand_in.request_count != 1:
+        raise AssertionError(f"Expected no retry, got {stand_in.request_count} requests")
+
+
+def test_username_lookup_outage_is_retryable(stand_in):
+    """ERROR HANDLING: Test that a profiles outage during the username lookup is retryable."""
+    stand_in.inject("profiles", Fault(status=503))
+
+    with pytest.raises(RetryableToolError):
+        get_audio_list(tool_context(), username="discodude")
@@ -0,0 +1,130 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from arcade_core.errors import RetryableToolError
+from arcade_tdk import ToolContext
+
+from foundaudio.cache import audio_file_cache
+from foundaudio.shaping import ELLIPSIS, MIN_DESCRIPTION_CHARS, estimate_tokens, fit_rows
+from foundaudio.tools.get_audio_list import _decode_cursor, get_audio_list
+
+
+def _row(audio_id: str, description: str) -> dict:
+    """Build a raw audio_files row as PostgREST returns it."""
+    return {
+        "id": audio_id,
+        "title": f"Track {audio_id}",
+        "description": description,
+        "duration": 3600.0,
+        "genres": ["house"],
+        "user_id": "user1",
+        "created_at": f"2024-01-{audio_id}T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+LONG_DESCRIPTION = "An extended journey through deep and dubby house grooves. " * 20
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify rows are kept, shortened or left out to fit the budget
+# =============================================================================
+
+
+def test_fit_rows_truncates_then_stops():
+    """NORMAL OPERATION: Test that the row crossing the budget is shortened and later rows dropped."""
+    # SETUP: Three rows; the budget covers one full row plus part of the second
+    rows = [_row("01", "short"), _row("02", LONG_DESCRIPTION), _row("03", "short")]
+    budget = estimate_tokens(rows[0]) + 1 + estimate_tokens(_row("02", "")) + 40
+
+    # EXECUTE: Fit the rows
+    kept, report = fit_rows(rows, budget)
+
+    # VERIFY: Second row kept with a shortened description, third row omitted
+    if [row["id"] for row in kept] != ["01", "02"]:
+        raise AssertionError(f"Expected rows 01 and 02, got {[row['id'] for row in kept]}")
+    description = kept[1]["description"]
+    if not description.endswith(ELLIPSIS) or len(description) < MIN_DESCRIPTION_CHARS:
+        raise AssertionError(f"Expected a shortened description, got {description!r}")
+    if report["descriptions_truncated"] != ["02"] or report["rows_omitted"] != 1:
+        raise AssertionError(f"Unexpected report {report}")
+    if report["estimated_tokens"] > budget:
+        raise AssertionError(f"Expected at most {budget} tokens, used {report['estimated_tokens']}")
+    if rows[1]["description"] != LONG_DESCRIPTION:
+        raise AssertionError("Expected the input rows to be left untouched")
+
+
+def test_fit_rows_always_keeps_first_row():
+    """NORMAL OPERATION: Test that a tiny budget still returns one row to page from."""
+    kept, report = fit_rows([_row("01", LONG_DESCRIPTION), _row("02", "short")], 1)
+
+    if [row["id"] for row in kept] != ["01"]:
+        raise AssertionError(f"Expected only row 01, got {[row['id'] for row in kept]}")
+    if len(kept[0]["description"]) != MIN_DESCRIPTION_CHARS:
+        raise AssertionError(f"Expected a minimal description, got {kept[0]['description']!r}")
+    if report["rows_omitted"] != 1:
+        raise AssertionError(f"Expected one omitted row, got {report}")
+
+
+def test_get_audio_list_max_response_tokens():
+    """NORMAL OPERATION: Test that a budgeted listing reports trimming and pages on correctly.
+
+    The cursor must continue after the last row returned (not the last row fetched), and
+    the record cache must keep the full, untruncated descriptions.
+    """
+    with patch("foundaudio.client.create_client") as mock_create_client:
+
+        # SETUP: Mock ToolContext with valid secret
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+
+        # SETUP: Ten rows with long descriptions, newest first
+        rows = [_row(f"{day:02d}", LONG_DESCRIPTION) for day in range(10, 0, -1)]
+        mock_response = Mock()
+        mock_response.data = rows
+        query_mock = Mock()
+        query_mock.order.return_value.order.return_value.limit.return_value.execute.return_value = (
+            mock_response
+        )
+        mock_create_client.return_value.from_.return_value.select.return_value = query_mock
+
+        # EXECUTE: Ask for ten rows within roughly 800 tokens
+        result = get_audio_list(mock_context, limit=10, max_response_tokens=800)
+
+        # VERIFY: Fewer rows, trimming reported, response within budget
+        trimmed = result["trimmed"]
+        if not 0 < result["count"] < 10:
+            raise AssertionError(f"Expected some rows to be left out, got {result['count']}")
+        if trimmed["rows_omitted"] != 10 - result["count"]:
+            raise AssertionError(f"Unexpected report {trimmed}")
+        if estimate_tokens(result) > 800:
+            raise AssertionError(f"Expected at most 800 tokens, got {estimate_tokens(result)}")
+
+        # VERIFY: Cursor continues after the last returned row
+        last = result["audio_files"][-1]
+        value, row_id = _decode_cursor(result["next_cursor"], "created_at", "desc")
+        if (value, row_id) != (last["created_at"], last["id"]):
+            raise AssertionError(f"Expected cursor at {last['id']}, got {row_id}")
+
+        # VERIFY: Cached records keep the full description
+        for audio_id in trimmed["descriptions_truncated"]:
+            if audio_file_cache.get(audio_id)["description"] != LONG_DESCRIPTION:
+                raise AssertionError(f"Expected cached record {audio_id} to be complete")
+
+
+# =============================================================================
+# INPUT VALIDATION TESTS
+# These tests verify the budget parameter is validated before any query
+# =============================================================================
+
+
+def test_get_audio_list_invalid_max_response_tokens():
+    """INPUT VALIDATION: Test that a budget too small for one row raises RetryableToolError."""
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        with pytest.raises(RetryableToolError, match="max_response_tokens"):
+            get_audio_list(mock_context, max_response_tokens=50)
+        mock_create_client.assert_not_called()
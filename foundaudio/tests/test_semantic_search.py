@@ -0,0 +1,178 @@
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from arcade_core.errors import RetryableToolError
+from arcade_tdk import ToolContext
+
+from foundaudio.search_index import SearchIndex
+from foundaudio.tools.get_audio_list import _encode_cursor, get_audio_list
+
+
+def _row(audio_id: str, title: str, description: str = None) -> dict:
+    """Build a raw audio_files row as PostgREST returns it."""
+    return {
+        "id": audio_id,
+        "title": title,
+        "description": description,
+        "duration": 3600.0,
+        "genres": ["house"],
+        "user_id": "user1",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+CATALOG_ROWS = [
+    _row("up1", "Saturday Warm Up", "an uptempo workout for the dancefloor"),
+    _row("up2", "Peak Time Pressure", "banging tracks only"),
+    _row("chill1", "Sunday Morning", "mellow downtempo grooves"),
+    _row("pool1", "Pool Party", "high energy house by the pool"),
+]
+
+
+def _mock_semantic_client(mock_create_client: Mock, fetched_rows: list) -> Mock:
+    """Wire a Supabase client mock for a catalog load followed by `in_` fetches."""
+    query_mock = Mock()
+    query_mock.order.return_value.order.return_value.limit.return_value.execute.return_value = Mock(
+        data=CATALOG_ROWS
+    )
+    query_mock.in_.return_value.execute.return_value = Mock(data=fetched_rows)
+    mock_create_client.return_value.from_.return_value.select.return_value = query_mock
+    return query_mock
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify synonym-aware ranking and paging over the local index
+# =============================================================================
+
+
+def test_search_index_matches_synonyms(tmp_path):
+    """NORMAL OPERATION: Test that a query matches tracks that only use a synonym.
+
+    "high energy" never appears in the first two tracks, but "uptempo" and "peak time"
+    are synonyms, so they must be returned; the literal match ranks first and the
+    downtempo track is not returned at all.
+    """
+    # SETUP: Index backed by a memory-mapped file in a temporary directory
+    index = SearchIndex(directory=str(tmp_path), capacity=2)
+    index.upsert(
+        [
+            {"id": row["id"], "title": row["title"], "description": row["description"]}
+            for row in CATALOG_ROWS
+        ]
+    )
+
+    # EXECUTE: Search for a phrase only one track contains literally
+    hits = index.search("high energy", limit=10)
+
+    # VERIFY: Literal match first, synonyms next, unrelated track excluded
+    ids = [audio_id for audio_id, _ in hits]
+    if ids[0] != "pool1" or set(ids) != {"pool1", "up1", "up2"}:
+        raise AssertionError(f"Expected pool1 first, then up1/up2, got {ids}")
+    if not os.path.exists(index.path) or not index.path.startswith(str(tmp_path)):
+        raise AssertionError(f"Expected a memory-mapped file in {tmp_path}, got {index.path}")
+
+    # VERIFY: Clearing the index removes the backing file
+    path = index.path
+    index.clear()
+    if os.path.exists(path) or index.search("high energy") != []:
+        raise AssertionError("Expected clear() to drop the index and its file")
+
+
+def test_get_audio_list_semantic_mode_fetches_ranked_ids():
+    """NORMAL OPERATION: Test that semantic mode fetches index hits with `in_` in rank order.
+
+    The database returns rows in arbitrary order; the tool must restore relevance order,
+    attach scores and hand back a relevance cursor when more hits remain.
+    """
+    with patch("foundaudio.client.create_client") as mock_create_client:
+
+        # SETUP: Mock ToolContext with valid secret
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+
+        # SETUP: Database returns the candidate rows in reverse order
+        query_mock = _mock_semantic_client(
+            mock_create_client, list(reversed(CATALOG_ROWS))
+        )
+
+        # EXECUTE: Semantic search for one result
+        result = get_audio_list(
+            mock_context, search="high energy", search_mode="semantic", limit=1
+        )
+
+        # VERIFY: Only index hits were requested, and the best match comes back
+        requested_ids = query_mock.in_.call_args[0][1]
+        if set(requested_ids) != {"pool1", "up1", "up2"} or requested_ids[0] != "pool1":
+            raise AssertionError(f"Expected ranked hit ids, got {requested_ids}")
+        query_mock.or_.assert_not_called()
+        if [audio_file["id"] for audio_file in result["audio_files"]] != ["pool1"]:
+            raise AssertionError(f"Expected ['pool1'], got {result['audio_files']}")
+        if not result["audio_files"][0]["relevance"] > 0:
+            raise AssertionError("Expected a relevance score on each result")
+        if result["sort"] != "semantic desc" or result["search_mode"] != "semantic":
+            raise AssertionError(f"Unexpected metadata: {result['sort']}, {result['search_mode']}")
+
+        # EXECUTE: Continue from the cursor
+        next_page = get_audio_list(
+            mock_context,
+            search="high energy",
+            search_mode="semantic",
+            limit=5,
+            cursor=result["next_cursor"],
+        )
+
+        # VERIFY: The second page holds the synonym matches only
+        ids = {audio_file["id"] for audio_file in next_page["audio_files"]}
+        if ids != {"up1", "up2"}:
+            raise AssertionError(f"Expected up1 and up2 on the next page, got {ids}")
+        if next_page["next_cursor"] is not None:
+            raise AssertionError("Expected no cursor after the last hit")
+
+
+# =============================================================================
+# INPUT VALIDATION TESTS
+# These tests verify search_mode combinations are rejected before any query
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"search": "house", "search_mode": "fuzzy"},
+        {"search_mode": "semantic"},
+        {"search": "house", "search_mode": "semantic", "sort": "duration desc"},
+    ],
+)
+def test_get_audio_list_invalid_search_mode(kwargs):
+    """INPUT VALIDATION: Test that invalid search_mode combinations raise RetryableToolError."""
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        with pytest.raises(RetryableToolError):
+            get_audio_list(mock_context, **kwargs)
+        mock_create_client.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        _encode_cursor("relevance", "desc", [0.5, "2024-01-01T00:00:00Z"], "up1"),
+        _encode_cursor("semantic", "desc", [0.5, "2024-01-01T00:00:00Z"], "up1"),
+    ],
+    ids=["relevance_cursor", "wrong_shape"],
+)
+def test_semantic_search_rejects_other_cursors(cursor):
+    """INPUT VALIDATION: Test that a relevance-mode cursor is refused by semantic mode."""
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        _mock_semantic_client(mock_create_client, CATALOG_ROWS)
+        with pytest.raises(RetryableToolError):
+            get_audio_list(
+                mock_context, search="high energy", search_mode="semantic", cursor=cursor
+            )
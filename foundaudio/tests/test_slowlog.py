@@ -0,0 +1,213 @@
+import json
+import logging.handlers
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from arcade_core.errors import RetryableToolError
+from arcade_tdk import ToolContext
+
+from foundaudio.slowlog import SlowQueryLog, summarize
+from foundaudio.tools.get_audio_list import get_audio_list
+
+
+def _mock_context() -> Mock:
+    """Build a ToolContext mock with a valid secret."""
+    mock_context = Mock(spec=ToolContext)
+    mock_context.get_secret.return_value = "test-secret-key"
+    return mock_context
+
+
+def _mock_rows(mock_create_client: Mock, rows: list) -> Mock:
+    """Wire a Supabase client mock whose filtered listing returns `rows`."""
+    query_mock = Mock()
+    query_mock.execute.return_value = Mock(data=rows)
+    for method in ("eq", "or_", "contains", "gte", "lte", "order", "limit"):
+        getattr(query_mock, method).return_value = query_mock
+    mock_create_client.return_value.from_.return_value.select.return_value = query_mock
+    return query_mock
+
+
+ROW = {
+    "id": "a1",
+    "title": "Sunset Session",
+    "description": None,
+    "duration": 120.0,
+    "genres": ["house"],
+    "user_id": "user1",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify slow calls are logged with their shape and phases, and summarized
+# =============================================================================
+
+
+def test_slow_call_is_logged_without_user_text(tmp_path, monkeypatch):
+    """NORMAL OPERATION: Test that a slow call is logged by shape, phases and row count.
+
+    The entry must not contain the search term or genre the user typed.
+    """
+    log = SlowQueryLog(str(tmp_path / "slow.jsonl"), threshold_ms=0)
+    monkeypatch.setattr("foundaudio.slowlog.slow_query_log", log)
+
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        # SETUP: One matching row
+        _mock_rows(mock_create_client, [ROW])
+
+        # EXECUTE: A filtered listing
+        get_audio_list(_mock_context(), search="secret sunset", genre="house", limit=5)
+
+    # VERIFY: One entry with the normalized shape, phases and row count
+    text = (tmp_path / "slow.jsonl").read_text()
+    if "secret" in text or "house" in text:
+        raise AssertionError(f"Expected no raw user text in the log, got {text}")
+    entries = [json.loads(line) for line in text.splitlines()]
+    if len(entries) != 1:
+        raise AssertionError(f"Expected one entry, got {len(entries)}")
+    entry = entries[0]
+    expected = {
+        "tool": "get_audio_list",
+        "shape": "search+genre",
+        "limit": 5,
+        "search_length": 13,
+        "rows": 1,
+        "error": None,
+    }
+    if {key: entry[key] for key in expected} != expected:
+        raise AssertionError(f"Unexpected entry {entry}")
+    if not {"connect", "query", "shape", "other"} <= set(entry["phases_ms"]):
+        raise AssertionError(f"Expected connect/query/shape phases, got {entry['phases_ms']}")
+
+
+def test_fast_call_is_not_logged(tmp_path, monkeypatch):
+    """NORMAL OPERATION: Test that calls under the threshold leave no entry."""
+    log = SlowQueryLog(str(tmp_path / "slow.jsonl"), threshold_ms=60_000)
+    monkeypatch.setattr("foundaudio.slowlog.slow_query_log", log)
+
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        _mock_rows(mock_create_client, [ROW])
+        get_audio_list(_mock_context())
+
+    if (tmp_path / "slow.jsonl").exists():
+        raise AssertionError("Expected no slow-query log for a fast call")
+
+
+def test_log_rotates_and_reads_back_all_files(tmp_path):
+    """NORMAL OPERATION: Test that the log rotates by size and keeps a bounded history."""
+    # SETUP: A log of about three entries per file, with two backups
+    log = SlowQueryLog(str(tmp_path / "slow.jsonl"), max_bytes=300, backups=2)
+
+    # EXECUTE: Write twenty entries
+    for number in range(20):
+        log.write({"tool": "get_audio_list", "shape": "none", "elapsed_ms": float(number)})
+    log.close()
+
+    # VERIFY: Current file plus two backups, each under the size limit, all readable
+    files = log.files()
+    if [path.name for path in files] != ["slow.jsonl", "slow.jsonl.1", "slow.jsonl.2"]:
+        raise AssertionError(f"Unexpected log files {files}")
+    if any(path.stat().st_size > 300 for path in files):
+        raise AssertionError("Expected every file to stay under max_bytes")
+    elapsed = sorted(entry["elapsed_ms"] for entry in log.entries())
+    if not elapsed or elapsed[-1] != 19.0 or len(elapsed) >= 20:
+        raise AssertionError(f"Expected the newest entries only, got {elapsed}")
+
+
+def test_concurrent_first_writes_open_one_handler(tmp_path):
+    """NORMAL OPERATION: Test that threads writing the first entries together share one file."""
+    # SETUP: A handler that is slow to open, so unguarded threads would each open one
+    log = SlowQueryLog(str(tmp_path / "slow.jsonl"))
+    barrier = threading.Barrier(8)
+    real_handler = logging.handlers.RotatingFileHandler
+
+    def slow_handler(*args, **kwargs):
+        time.sleep(0.05)
+        return real_handler(*args, **kwargs)
+
+    def write(number: int) -> None:
+        barrier.wait()
+        log.write({"tool": "get_audio_list", "shape": "none", "elapsed_ms": float(number)})
+
+    # EXECUTE
+    with patch("logging.handlers.RotatingFileHandler", side_effect=slow_handler) as opened:
+        threads = [threading.Thread(target=write, args=(number,)) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    log.close()
+
+    # VERIFY: One handler opened and every entry written through it
+    if opened.call_count != 1:
+        raise AssertionError(f"Expected one handler, got {opened.call_count}")
+    if len(list(log.entries())) != 8:
+        raise AssertionError("Expected all eight entries in the log")
+
+
+def test_summarize_ranks_shapes_by_total_time():
+    """NORMAL OPERATION: Test that shapes are ranked by total slow time with their top phase."""
+    def entry(shape: str, elapsed_ms: float, rows, phases: dict, error=None) -> dict:
+        return {
+            "tool": "get_audio_list",
+            "shape": shape,
+            "elapsed_ms": elapsed_ms,
+            "rows": rows,
+            "phases_ms": phases,
+            "error": error,
+        }
+
+    entries = [
+        entry("genre", 600.0, 20, {"query": 550.0, "other": 50.0}),
+        entry("genre", 700.0, 10, {"query": 650.0, "other": 50.0}),
+        entry("username", 900.0, None, {"resolve_user": 880.0}, error="retryable"),
+    ]
+
+    summaries = summarize(iter(entries), top=5)
+
+    if [summary["shape"] for summary in summaries] != ["genre", "username"]:
+        raise AssertionError(f"Unexpected order {summaries}")
+    genre = summaries[0]
+    observed = (genre["calls"], genre["total_ms"], genre["max_ms"], genre["mean_rows"])
+    if observed != (2, 1300.0, 700.0, 15.0) or genre["top_phase"] != "query":
+        raise AssertionError(f"Unexpected genre summary {genre}")
+    if summaries[1]["errors"] != 1 or summaries[1]["mean_rows"] is not None:
+        raise AssertionError(f"Unexpected username summary {summaries[1]}")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify failed calls are logged and logging never breaks a call
+# =============================================================================
+
+
+def test_failed_call_is_logged_with_error_kind(tmp_path, monkeypatch):
+    """ERROR HANDLING: Test that a slow failing call is logged with its error kind."""
+    log = SlowQueryLog(str(tmp_path / "slow.jsonl"), threshold_ms=0)
+    monkeypatch.setattr("foundaudio.slowlog.slow_query_log", log)
+
+    with pytest.raises(RetryableToolError):
+        get_audio_list(_mock_context(), limit=500)
+
+    entry = json.loads((tmp_path / "slow.jsonl").read_text())
+    if entry["error"] != "retryable" or entry["rows"] is not None or entry["limit"] != 500:
+        raise AssertionError(f"Unexpected entry {entry}")
+
+
+def test_unwritable_log_does_not_fail_call(tmp_path, monkeypatch):
+    """ERROR HANDLING: Test that a log path that cannot be written is ignored."""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    log = SlowQueryLog(str(blocker / "slow.jsonl"), threshold_ms=0)
+    monkeypatch.setattr("foundaudio.slowlog.slow_query_log", log)
+
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        _mock_rows(mock_create_client, [ROW])
+        result = get_audio_list(_mock_context())
+
+    if result["count"] != 1:
+        raise AssertionError(f"Expected the call to succeed, got {result}")
@@ -0,0 +1,126 @@
+from unittest.mock import Mock, patch
+
+from arcade_tdk import ToolContext
+
+from foundaudio.cache import audio_file_cache, username_cache
+from foundaudio.tools.get_audio_list import get_audio_list
+from foundaudio.warmup import start_warm_up, warm_up
+
+
+def _row(audio_id: str) -> dict:
+    """Build a raw audio_files row as PostgREST returns it."""
+    return {
+        "id": audio_id,
+        "title": f"Track {audio_id}",
+        "description": None,
+        "duration": 120.0,
+        "genres": ["house"],
+        "user_id": "user1",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def _mock_client(mock_create_client: Mock) -> Mock:
+    """Wire a Supabase client mock for the profiles `in_` lookup and the default listing."""
+    query_mock = Mock()
+    query_mock.in_.return_value.execute.return_value = Mock(
+        data=[{"id": "user1", "username": "discodude"}]
+    )
+    listing = query_mock.order.return_value.order.return_value.limit.return_value
+    listing.execute.return_value = Mock(data=[_row("a1"), _row("a2")])
+    mock_create_client.return_value.from_.return_value.select.return_value = query_mock
+    return query_mock
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify the first real calls are served from primed caches
+# =============================================================================
+
+
+def test_warm_up_primes_client_usernames_and_default_listing():
+    """NORMAL OPERATION: Test that after warm-up the first calls need no extra queries.
+
+    The no-argument listing must come from the listing cache and the username must
+    resolve from the username cache, with the client created exactly once.
+    """
+    with patch("foundaudio.client.create_client") as mock_create_client:
+
+        # SETUP: Mock client for the warm-up queries
+        query_mock = _mock_client(mock_create_client)
+
+        # EXECUTE: Warm up, then make the first "real" call
+        report = warm_up(
+            "https://test.supabase.co", "test-secret-key", usernames=["discodude"]
+        )
+        mock_context = Mock(spec=ToolContext)
+        mock_context.get_secret.return_value = "test-secret-key"
+        with patch("foundaudio.client.os.getenv") as mock_getenv:
+            mock_getenv.side_effect = lambda key, default=None: {
+                "SUPABASE_URL": "https://test.supabase.co"
+            }.get(key, default)
+            result = get_audio_list(mock_context)
+
+        # VERIFY: Every step completed and nothing was fetched twice
+        if report["completed"] != ["client", "usernames", "default_listing"]:
+            raise AssertionError(f"Unexpected warm-up report {report}")
+        if [audio_file["id"] for audio_file in result["audio_files"]] != ["a1", "a2"]:
+            raise AssertionError(f"Expected the prefetched listing, got {result['audio_files']}")
+        listing = query_mock.order.return_value.order.return_value.limit.return_value
+        if listing.execute.call_count != 1:
+            raise AssertionError(f"Expected one listing query, got {listing.execute.call_count}")
+        mock_create_client.assert_called_once()
+        if mock_create_client.call_args.args != ("https://test.supabase.co", "test-secret-key"):
+            raise AssertionError(f"Unexpected client {mock_create_client.call_args}")
+        query_mock.in_.assert_called_once_with("username", ["discodude"])
+        if username_cache.get("discodude") != "user1" or audio_file_cache.get("a1") is None:
+            raise AssertionError("Expected username and record caches to be primed")
+
+
+def test_warm_up_skips_steps_past_budget():
+    """NORMAL OPERATION: Test that steps are skipped once the time budget is spent."""
+    with patch("foundaudio.client.create_client") as mock_create_client, patch(
+        "foundaudio.warmup.time.monotonic"
+    ) as mock_monotonic:
+
+        # SETUP: Creating the client takes 10 seconds of a 5 second budget
+        _mock_client(mock_create_client)
+        mock_monotonic.side_effect = [0.0, 0.0, 10.0, 10.0, 10.0]
+
+        # EXECUTE: Warm up
+        report = warm_up("https://test.supabase.co", "key", usernames=["discodude"], budget=5)
+
+        # VERIFY: Only the client was created
+        if report["completed"] != ["client"] or report["skipped"] != ["usernames", "default_listing"]:
+            raise AssertionError(f"Unexpected warm-up report {report}")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify warm-up never raises and stays off without configuration
+# =============================================================================
+
+
+def test_warm_up_records_failures():
+    """ERROR HANDLING: Test that a failing database is reported, not raised."""
+    with patch("foundaudio.client.create_client") as mock_create_client:
+        mock_create_client.return_value.from_.side_effect = Exception("Connection refused")
+
+        report = warm_up("https://test.supabase.co", "key")
+
+        if report["completed"] != ["client"]:
+            raise AssertionError(f"Expected only the client step to succeed, got {report}")
+        if "Connection refused" not in report["errors"]["default_listing"]:
+            raise AssertionError(f"Expected the listing error to be recorded, got {report}")
+
+
+def test_start_warm_up_requires_anon_key(monkeypatch):
+    """ERROR HANDLING: Test that warm-up does not start without SUPABASE_ANON_KEY."""
+    monkeypatch.delenv("SUPABASE_ANON_KEY", raising=False)
+    monkeypatch.setattr("foundaudio.warmup.WARMUP_ENABLED", True)
+
+    with patch("foundaudio.warmup.threading.Thread") as mock_thread:
+        if start_warm_up() is not None:
+            raise AssertionError("Expected no warm-up thread without an anon key")
+        mock_thread.assert_not_called()
@@ -0,0 +1,204 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from arcade_core.errors import RetryableToolError
+
+from foundaudio.slowlog import SlowQueryLog
+from foundaudio.tools.get_audio_list import get_audio_list
+from foundaudio.workload import Pseudonyms, load_workload, pseudonym, replay
+from tests.conftest import tool_context
+
+
+@pytest.fixture
+def capture(tmp_path, monkeypatch):
+    """Capture every get_audio_list call to a file in the test's directory."""
+    log = SlowQueryLog(str(tmp_path / "workload.jsonl"), 0.0)
+    monkeypatch.setattr("foundaudio.workload.workload_log", log)
+    monkeypatch.setattr("foundaudio.workload.CAPTURE_SAMPLE_RATE", 1.0)
+    yield log
+    log.close()
+
+
+def _call(arguments: dict) -> dict:
+    return get_audio_list(tool_context(), **arguments)
+
+
+def _workload(*arguments: dict, spacing_ms: float = 0.0) -> list:
+    """Build captured calls with the given arguments, `spacing_ms` apart."""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "ts": (start + timedelta(milliseconds=index * spacing_ms)).isoformat(),
+            "tool": "get_audio_list",
+            "args": args,
+            "elapsed_ms": 10.0,
+        }
+        for index, args in enumerate(arguments)
+    ]
+
+
+# =============================================================================
+# NORMAL OPERATION TESTS
+# These tests verify calls are captured without user text and replayed faithfully
+# =============================================================================
+
+
+def test_calls_are_captured_without_user_text(catalog_db, capture):
+    """NORMAL OPERATION: Test that searches and usernames are stored only as pseudonyms."""
+    # SETUP / EXECUTE: A search, a repeat of it, a user's listing and a next page
+    listing = {"search": "midnight", "genre": "house", "limit": 2}
+    first = _call(listing)
+    _call(listing)
+    _call({"username": "discodude"})
+    _call({**listing, "cursor": first["next_cursor"]})
+
+    # VERIFY: No typed text in the file; equal text gets equal pseudonyms
+    text = Path(capture.path).read_text(encoding="utf-8")
+    if "midnight" in text or "discodude" in text:
+        raise AssertionError("Expected user-typed text to be left out of the capture")
+    calls = load_workload(capture.entries(), "get_audio_list")
+    if len(calls) != 4:
+        raise AssertionError(f"Expected 4 captured calls, got {len(calls)}")
+    if calls[0]["args"] != {**listing, "search": pseudonym("midnight")}:
+        raise AssertionError(f"Unexpected captured arguments {calls[0]['args']}")
+    if calls[1]["args"]["search"] != calls[0]["args"]["search"]:
+        raise AssertionError("Expected a repeated search to get the same pseudonym")
+    if calls[3]["args"]["cursor"] is not True:
+        raise AssertionError("Expected the cursor to be recorded only as present")
+    if calls[0]["source"] != "database" or calls[1]["source"] != "cache":
+        raise AssertionError("Expected the answering source to be captured")
+    if calls[0]["rows"] != first["count"] or calls[0]["elapsed_ms"] <= 0:
+        raise AssertionError("Expected the row count and latency to be captured")
+
+
+def test_replay_reissues_calls_with_resolved_pseudonyms():
+    """NORMAL OPERATION: Test that replay maps pseudonyms consistently, in capture order."""
+    # SETUP: Two distinct searches, one of them repeated
+    calls = _workload(
+        {"search": {"pseudonym": "aaaa"}, "limit": 5},
+        {"search": {"pseudonym": "bbbb"}},
+        {"search": {"pseudonym": "aaaa"}, "limit": 5},
+        {"genre": "jazz"},
+    )
+    issued = []
+
+    # EXECUTE
+    result = replay(calls, issued.append, {"search": ["sunset", "party"]}, speed=0)
+
+    # VERIFY: Same pseudonym, same term; other arguments untouched
+    expected = [
+        {"search": "sunset", "limit": 5},
+        {"search": "party"},
+        {"search": "sunset", "limit": 5},
+        {"genre": "jazz"},
+    ]
+    if sorted(issued, key=json.dumps) != sorted(expected, key=json.dumps):
+        raise AssertionError(f"Unexpected replayed calls {issued}")
+    if result.requests != 4 or result.errors != 0:
+        raise AssertionError(f"Expected 4 calls without errors, got {result}")
+
+
+@pytest.mark.xdist_group("timing")
+def test_replay_keeps_original_spacing_scaled_by_speed():
+    """NORMAL OPERATION: Test that replay takes the captured span divided by the speed.
+
+    Sleeps never end early, so the spans are checked as floors; the ceilings only have
+    to tell the two speeds apart, leaving room for a loaded CI machine.
+    """
+    calls = _workload(*({"limit": 1} for _ in range(5)), spacing_ms=100)
+
+    timings = {}
+    for speed in (1.0, 4.0):
+        started = time.perf_counter()
+        result = replay(calls, lambda arguments: None, {}, speed=speed)
+        timings[speed] = time.perf_counter() - started
+        if result.captured_span_s != 0.4:
+            raise AssertionError(f"Expected a 0.4s span, got {result.captured_span_s}")
+
+    if not 0.38 <= timings[1.0] < 2.0 or not 0.09 <= timings[4.0] < 0.38:
+        raise AssertionError(f"Unexpected replay durations {timings}")
+
+
+def test_replay_against_fake_follows_cursors(catalog_db):
+    """NORMAL OPERATION: Test that a captured next page continues the replayed listing."""
+    # SETUP: A listing followed by two next-page requests
+    calls = _workload(
+        {"genre": "house", "limit": 5},
+        {"genre": "house", "limit": 5, "cursor": True},
+        {"genre": "house", "limit": 5, "cursor": True},
+    )
+    page = _call({"genre": "house", "limit": 15, "max_staleness": 0})
+    expected = [audio_file["id"] for audio_file in page["audio_files"]]
+    results = []
+
+    def target(arguments):
+        response = _call(arguments)
+        results.append(response)
+        return response
+
+    # EXECUTE: One call at a time so each page sees the previous page's cursor
+    replay(calls, target, {}, speed=0, max_in_flight=1)
+
+    # VERIFY: The three pages are the first 15 rows, in order
+    replayed = [audio_file["id"] for result in results for audio_file in result["audio_files"]]
+    if replayed != expected:
+        raise AssertionError("Expected the replayed pages to walk the listing")
+
+
+# =============================================================================
+# INPUT VALIDATION TESTS
+# These tests verify replay settings and capture contents are checked
+# =============================================================================
+
+
+def test_replay_rejects_negative_speed_and_unknown_pseudonyms():
+    """INPUT VALIDATION: Test that a negative speed or missing vocabulary is refused."""
+    calls = _workload({"username": {"pseudonym": "cccc"}})
+
+    with pytest.raises(ValueError, match="speed"):
+        replay(calls, lambda arguments: None, {"username": ["discodude"]}, speed=-1)
+    with pytest.raises(ValueError, match="username"):
+        replay(calls, lambda arguments: None, {"search": ["sunset"]})
+
+
+def test_pseudonyms_past_vocabulary_stay_distinct():
+    """INPUT VALIDATION: Test that more pseudonyms than values still map one to one."""
+    pseudonyms = Pseudonyms(["sunset", "party"])
+
+    values = [pseudonyms.resolve(token) for token in ("a", "b", "c", "a", "d")]
+
+    if values != ["sunset", "party", "sunset 1", "sunset", "party 1"]:
+        raise AssertionError(f"Unexpected replacements {values}")
+
+
+# =============================================================================
+# ERROR HANDLING TESTS
+# These tests verify failed calls are captured and counted, and capture stays optional
+# =============================================================================
+
+
+def test_failed_calls_are_captured_and_replayed(catalog_db, capture):
+    """ERROR HANDLING: Test that a failing call is captured with its error and replayed."""
+    with pytest.raises(RetryableToolError):
+        _call({"username": "nobody-by-this-name"})
+    calls = load_workload(capture.entries(), "get_audio_list")
+
+    result = replay(calls, _call, {"username": ["nobody-here-either"]}, speed=0)
+
+    if calls[0]["error"] != "retryable" or calls[0]["rows"] is not None:
+        raise AssertionError(f"Unexpected captured failure {calls[0]}")
+    if result.errors != 1:
+        raise AssertionError(f"Expected the replayed call to fail, got {result}")
+
+
+def test_capture_is_off_by_default(catalog_db, tmp_path, monkeypatch):
+    """ERROR HANDLING: Test that nothing is written without FOUNDAUDIO_CAPTURE_LOG."""
+    monkeypatch.setattr("foundaudio.workload.workload_log", None)
+
+    result = _call({"limit": 3})
+
+    if result["count"] != 3 or list(tmp_path.iterdir()):
+        raise AssertionError("Expected the call to run without writing a capture")